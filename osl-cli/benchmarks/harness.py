@@ -0,0 +1,249 @@
+"""Minimal benchmark harness (asv-style, standard library only).
+
+Benchmarks register with :func:`benchmark`. A benchmark function receives
+the shared :class:`Env` and one parameter value, does its setup, and
+returns either the callable to time or a ``(prepare, run)`` pair where
+``prepare`` runs untimed before every round (for benchmarks that mutate
+their input, such as migrations).
+
+Results are JSON documents with machine metadata; :func:`compare` checks a
+result set against a baseline using per-benchmark tolerances.
+"""
+
+import json
+import os
+import platform
+import shutil
+import socket
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from dataclasses import dataclass, field
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+FORMAT_VERSION = 1
+DEFAULT_TOLERANCE = 0.25  # 25% slower than baseline median fails
+MIN_DELTA_MS = 0.1  # ignore differences below timer noise
+
+
+@dataclass
+class Benchmark:
+    """A registered benchmark."""
+    name: str
+    func: Callable[..., Any]
+    params: Sequence[Any] = (None,)
+    rounds: int = 5
+    number: int = 1  # calls per round
+    tags: Tuple[str, ...] = ()
+
+
+REGISTRY: List[Benchmark] = []
+
+
+def benchmark(name: str, params: Sequence[Any] = (None,), rounds: int = 5,
+              number: int = 1, tags: Tuple[str, ...] = ()) -> Callable:
+    """Register a benchmark function."""
+    def decorate(func: Callable) -> Callable:
+        REGISTRY.append(Benchmark(name, func, params, rounds, number, tags))
+        return func
+    return decorate
+
+
+@dataclass
+class Env:
+    """Shared, lazily built fixtures for one suite run."""
+    workdir: Path = field(default_factory=lambda: Path(tempfile.mkdtemp(prefix="osl-bench-")))
+    _datasets: Dict[str, Path] = field(default_factory=dict)
+
+    def dataset(self, scale: float, years: float = 1.0) -> Path:
+        """Project directory with a synthetic history (built once per run)."""
+        from osl_cli.dev.synth import HistoryGenerator
+
+        key = f"{scale:g}x-{years:g}y"
+        if key not in self._datasets:
+            output = self.workdir / key
+            HistoryGenerator(output, scale=scale, years=years, seed=1234,
+                             end=datetime(2026, 1, 1)).generate()
+            self._datasets[key] = output
+        return self._datasets[key]
+
+    def scratch(self, name: str) -> Path:
+        """Fresh empty directory."""
+        path = Path(tempfile.mkdtemp(prefix=f"{name}-", dir=self.workdir))
+        return path
+
+
+def key(name: str, param: Any) -> str:
+    """Result key for a benchmark and parameter."""
+    return name if param is None else f"{name}[{param}]"
+
+
+def machine_info() -> Dict[str, Any]:
+    """Metadata identifying where results were measured."""
+    try:
+        commit = subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=ROOT,
+                                capture_output=True, text=True, timeout=10).stdout.strip()
+    except (OSError, subprocess.SubprocessError):
+        commit = ""
+    return {
+        "host": socket.gethostname(),
+        "platform": platform.platform(),
+        "machine": platform.machine(),
+        "processor": platform.processor(),
+        "cpu_count": os.cpu_count(),
+        "python": platform.python_version(),
+        "implementation": platform.python_implementation(),
+        "commit": commit or None,
+    }
+
+
+def _time(bench: Benchmark, env: Env, param: Any, rounds: int) -> Dict[str, Any]:
+    target = bench.func(env, param)
+    prepare, run = target if isinstance(target, tuple) else (None, target)
+
+    # One untimed warm-up round
+    if prepare:
+        prepare()
+    run()
+
+    samples = []
+    for _ in range(rounds):
+        if prepare:
+            prepare()
+        start = time.perf_counter()
+        for _ in range(bench.number):
+            run()
+        samples.append((time.perf_counter() - start) / bench.number * 1000)
+
+    return {
+        "median_ms": round(statistics.median(samples), 4),
+        "min_ms": round(min(samples), 4),
+        "mean_ms": round(statistics.fmean(samples), 4),
+        "stdev_ms": round(statistics.stdev(samples), 4) if len(samples) > 1 else 0.0,
+        "rounds": rounds,
+        "number": bench.number,
+    }
+
+
+def run_suite(select: Optional[List[str]] = None, rounds: Optional[int] = None,
+              progress: Callable[[str], None] = lambda line: None,
+              keep: bool = False) -> Dict[str, Any]:
+    """Run registered benchmarks.
+
+    Args:
+        select: Name prefixes to run (defaults to all)
+        rounds: Override each benchmark's round count
+        progress: Called with one line per finished benchmark
+        keep: Leave the fixture directory in place instead of removing it
+
+    Returns:
+        Result document
+    """
+    env = Env()
+    results: Dict[str, Any] = {}
+    started = time.perf_counter()
+    try:
+        for bench in REGISTRY:
+            if select and not any(bench.name.startswith(s) for s in select):
+                continue
+            for param in bench.params:
+                stats = _time(bench, env, param, rounds or bench.rounds)
+                results[key(bench.name, param)] = stats
+                progress(f"{key(bench.name, param):<48} {stats['median_ms']:>10.2f} ms")
+    finally:
+        if keep:
+            progress(f"fixtures kept in {env.workdir}")
+        else:
+            shutil.rmtree(env.workdir, ignore_errors=True)
+    return {
+        "format": FORMAT_VERSION,
+        "created_at": datetime.now().isoformat(timespec="seconds"),
+        "seconds": round(time.perf_counter() - started, 1),
+        "machine": machine_info(),
+        "results": results,
+    }
+
+
+def load(path: Path) -> Dict[str, Any]:
+    """Read a result or baseline document."""
+    with open(path) as f:
+        return json.load(f)
+
+
+def save(path: Path, document: Dict[str, Any]) -> None:
+    """Write a result or baseline document."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path, "w") as f:
+        json.dump(document, f, indent=2, sort_keys=True)
+        f.write("\n")
+
+
+def tolerance_for(baseline: Dict[str, Any], name: str, default: Optional[float] = None) -> float:
+    """Tolerance for a result key.
+
+    Looks up the exact key (``state.save_current_session[64]``), then the
+    benchmark name, then each shorter dotted prefix (``state``), then the
+    default.
+    """
+    overrides = baseline.get("tolerances", {})
+    if name in overrides:
+        return overrides[name]
+    parts = name.split("[", 1)[0].split(".")
+    for i in range(len(parts), 0, -1):
+        prefix = ".".join(parts[:i])
+        if prefix in overrides:
+            return overrides[prefix]
+    if default is not None:
+        return default
+    return baseline.get("tolerance", DEFAULT_TOLERANCE)
+
+
+def compare(baseline: Dict[str, Any], current: Dict[str, Any],
+            tolerance: Optional[float] = None) -> List[Dict[str, Any]]:
+    """Compare medians of a result set against a baseline.
+
+    Args:
+        baseline: Baseline document (may carry ``tolerance``/``tolerances``)
+        current: Result document
+        tolerance: Override the default tolerance (per-benchmark overrides
+            in the baseline still apply)
+
+    Returns:
+        One row per benchmark present in both, with ``status`` of
+        ``ok``, ``faster``, ``regressed`` or ``new``/``missing``
+    """
+    rows = []
+    base_results = baseline.get("results", {})
+    cur_results = current.get("results", {})
+    for name in sorted(set(base_results) | set(cur_results)):
+        if name not in cur_results:
+            rows.append({"name": name, "status": "missing"})
+            continue
+        if name not in base_results:
+            rows.append({"name": name, "status": "new", "current_ms": cur_results[name]["median_ms"]})
+            continue
+        before = base_results[name]["median_ms"]
+        after = cur_results[name]["median_ms"]
+        limit = tolerance_for(baseline, name, tolerance)
+        ratio = after / before if before else float("inf")
+        status = "ok"
+        if after - before > MIN_DELTA_MS and ratio > 1 + limit:
+            status = "regressed"
+        elif before - after > MIN_DELTA_MS and ratio < 1 / (1 + limit):
+            status = "faster"
+        rows.append({
+            "name": name,
+            "status": status,
+            "baseline_ms": before,
+            "current_ms": after,
+            "ratio": round(ratio, 3),
+            "tolerance": limit,
+        })
+    return rows
@@ -0,0 +1,107 @@
+"""Run the OSL benchmark suite and gate on regressions.
+
+Usage::
+
+    python benchmarks/run.py run                       # results/<stamp>.json
+    python benchmarks/run.py run --select state. --rounds 10
+    python benchmarks/run.py compare results/latest.json
+    python benchmarks/run.py run --compare             # run, then gate
+    python benchmarks/run.py run --save-baseline       # refresh baseline.json
+
+``compare`` exits with status 1 when any benchmark's median is slower than
+the baseline by more than its tolerance. The default tolerance and
+per-benchmark overrides live in ``baseline.json`` (``tolerance`` and
+``tolerances``) and survive ``--save-baseline``; ``--tolerance`` overrides
+the default for one run. Baselines are machine specific: refresh it on the
+machine that runs the gate.
+"""
+
+import argparse
+import sys
+from datetime import datetime
+from pathlib import Path
+
+import harness
+import suite  # noqa: F401  (registers benchmarks)
+
+HERE = Path(__file__).resolve().parent
+BASELINE = HERE / "baseline.json"
+RESULTS = HERE / "results"
+
+
+def _print_comparison(rows, baseline, current) -> bool:
+    if baseline.get("machine", {}).get("host") != current.get("machine", {}).get("host"):
+        print("warning: baseline was recorded on a different machine "
+              f"({baseline.get('machine', {}).get('host')})")
+    print(f"{'benchmark':<48} {'baseline':>10} {'current':>10} {'ratio':>7}  status")
+    failed = False
+    for row in rows:
+        if row["status"] in ("new", "missing"):
+            print(f"{row['name']:<48} {'':>10} {'':>10} {'':>7}  {row['status']}")
+            continue
+        print(f"{row['name']:<48} {row['baseline_ms']:>10.2f} {row['current_ms']:>10.2f} "
+              f"{row['ratio']:>7.2f}  {row['status']}"
+              + (f" (> {row['tolerance']:.0%})" if row["status"] == "regressed" else ""))
+        failed |= row["status"] == "regressed"
+    return failed
+
+
+def cmd_run(args) -> int:
+    document = harness.run_suite(args.select, args.rounds, progress=print, keep=args.keep)
+    output = args.output or RESULTS / f"{datetime.now():%Y%m%d_%H%M%S}.json"
+    harness.save(output, document)
+    print(f"results written to {output} ({document['seconds']}s)")
+
+    if args.save_baseline:
+        previous = harness.load(BASELINE) if BASELINE.exists() else {}
+        document["tolerance"] = previous.get("tolerance", harness.DEFAULT_TOLERANCE)
+        document["tolerances"] = previous.get("tolerances", {})
+        if args.select:
+            # Partial run: refresh only the benchmarks that ran
+            document["results"] = dict(previous.get("results", {}), **document["results"])
+        harness.save(BASELINE, document)
+        print(f"baseline updated: {BASELINE}")
+        return 0
+
+    if args.compare:
+        baseline = harness.load(BASELINE)
+        rows = harness.compare(baseline, document, args.tolerance)
+        if args.select:
+            rows = [r for r in rows if r["status"] != "missing"]
+        return 1 if _print_comparison(rows, baseline, document) else 0
+    return 0
+
+
+def cmd_compare(args) -> int:
+    baseline = harness.load(args.baseline)
+    current = harness.load(args.results)
+    rows = harness.compare(baseline, current, args.tolerance)
+    return 1 if _print_comparison(rows, baseline, current) else 0
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    run = sub.add_parser("run", help="Run benchmarks and write a result file")
+    run.add_argument("--select", nargs="+", help="Benchmark name prefixes")
+    run.add_argument("--rounds", type=int, help="Override rounds per benchmark")
+    run.add_argument("--output", type=Path, help="Result file (default: results/<stamp>.json)")
+    run.add_argument("--compare", action="store_true", help="Gate against baseline.json")
+    run.add_argument("--tolerance", type=float, help="Default allowed slowdown, e.g. 0.25")
+    run.add_argument("--save-baseline", action="store_true", help="Write results to baseline.json")
+    run.add_argument("--keep", action="store_true", help="Keep the generated fixture directory")
+    run.set_defaults(handler=cmd_run)
+
+    compare = sub.add_parser("compare", help="Compare a result file with the baseline")
+    compare.add_argument("results", type=Path)
+    compare.add_argument("--baseline", type=Path, default=BASELINE)
+    compare.add_argument("--tolerance", type=float, help="Default allowed slowdown, e.g. 0.25")
+    compare.set_defaults(handler=cmd_compare)
+
+    args = parser.parse_args()
+    return args.handler(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
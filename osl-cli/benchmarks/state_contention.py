@@ -0,0 +1,148 @@
+"""Stress benchmark: state file throughput under parallel writers.
+
+Spawns N writer processes (and optionally readers) against one temporary
+OSL directory and reports throughput plus an integrity check:
+
+- ``cas``: every writer increments a counter with ``update_coach_state``;
+  the final count must equal writers x updates.
+- ``merge``: every writer loads, appends a book and saves with
+  ``save_coach_state``; three-way merging must keep every book.
+
+Usage::
+
+    python benchmarks/state_contention.py --writers 8 --updates 50 --readers 2
+"""
+
+import argparse
+import multiprocessing as mp
+import sys
+import tempfile
+import time
+from datetime import datetime
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from osl_cli.state.manager import StateManager  # noqa: E402
+from osl_cli.state.schemas import (  # noqa: E402
+    BookState,
+    CoachState,
+    GovernanceStatus,
+    GovernanceThreshold,
+    GovernanceThresholds,
+)
+
+
+def make_coach_state() -> CoachState:
+    """Coach state with the same defaults as ``osl init``."""
+    now = datetime.now()
+    return CoachState(
+        governance_thresholds=GovernanceThresholds(
+            calibration_gate=GovernanceThreshold(min=75, current=80, max=85, last_adjusted=now),
+            card_debt_multiplier=GovernanceThreshold(min=1.5, current=2.0, max=2.5, last_adjusted=now),
+            max_new_cards=GovernanceThreshold(min=4, current=8, max=10, last_adjusted=now),
+            interleaving_per_week=GovernanceThreshold(min=1, current=2, max=3, last_adjusted=now),
+        ),
+        governance_status=GovernanceStatus(
+            calibration_gate="passing",
+            card_debt_gate="passing",
+            transfer_gate="passing",
+            overall_state="NORMAL",
+        ),
+    )
+
+
+def _increment(state: CoachState) -> None:
+    state.performance_metrics.cards_completed_today += 1
+
+
+def writer(base_path: str, mode: str, worker: int, updates: int, start: "mp.Event") -> None:
+    manager = StateManager(Path(base_path))
+    start.wait()
+    for i in range(updates):
+        if mode == "cas":
+            manager.update_coach_state(_increment)
+        else:
+            state = manager.load_coach_state()
+            state.active_books.append(BookState(
+                id=f"w{worker}-{i}", title="t", author="a",
+                start_date=datetime.now(), current_page=0, total_pages=1,
+            ))
+            manager.save_coach_state(state)
+
+
+def reader(base_path: str, stop: "mp.Event", start: "mp.Event", counter: "mp.Value") -> None:
+    manager = StateManager(Path(base_path))
+    start.wait()
+    reads = 0
+    while not stop.is_set():
+        manager.load_coach_state()
+        reads += 1
+    with counter.get_lock():
+        counter.value += reads
+
+
+def run(writers: int, updates: int, readers: int, mode: str) -> dict:
+    """Run one contention scenario and return its measurements."""
+    base_path = Path(tempfile.mkdtemp()) / "osl"
+    (base_path / "ai_state").mkdir(parents=True)
+    manager = StateManager(base_path)
+    manager.save_coach_state(make_coach_state())
+
+    start, stop = mp.Event(), mp.Event()
+    reads = mp.Value("i", 0)
+    procs = [mp.Process(target=writer, args=(str(base_path), mode, w, updates, start))
+             for w in range(writers)]
+    readers_procs = [mp.Process(target=reader, args=(str(base_path), stop, start, reads))
+                     for _ in range(readers)]
+    for p in procs + readers_procs:
+        p.start()
+
+    began = time.perf_counter()
+    start.set()
+    for p in procs:
+        p.join()
+    elapsed = time.perf_counter() - began
+    stop.set()
+    for p in readers_procs:
+        p.join()
+
+    final = manager.load_coach_state()
+    expected = writers * updates
+    observed = (final.performance_metrics.cards_completed_today if mode == "cas"
+                else len(final.active_books))
+    return {
+        "mode": mode,
+        "writers": writers,
+        "readers": readers,
+        "updates": expected,
+        "seconds": round(elapsed, 3),
+        "writes_per_s": round(expected / elapsed, 1),
+        "reads_per_s": round(reads.value / elapsed, 1),
+        "lost_updates": expected - observed,
+        "revision": final.revision,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--writers", type=int, nargs="+", default=[1, 2, 4, 8])
+    parser.add_argument("--updates", type=int, default=50)
+    parser.add_argument("--readers", type=int, default=2)
+    parser.add_argument("--mode", choices=["cas", "merge", "both"], default="both")
+    args = parser.parse_args()
+
+    modes = ["cas", "merge"] if args.mode == "both" else [args.mode]
+    print(f"{'mode':<6} {'writers':>7} {'readers':>7} {'writes/s':>9} {'reads/s':>9} {'lost':>5}")
+    failed = False
+    for mode in modes:
+        for n in args.writers:
+            r = run(n, args.updates, args.readers, mode)
+            failed |= r["lost_updates"] != 0
+            print(f"{r['mode']:<6} {r['writers']:>7} {r['readers']:>7} "
+                  f"{r['writes_per_s']:>9} {r['reads_per_s']:>9} {r['lost_updates']:>5}")
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
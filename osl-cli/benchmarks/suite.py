@@ -0,0 +1,175 @@
+"""OSL benchmark definitions.
+
+Data comes from ``osl dev synth`` histories (fixed seed and end date), so
+every machine measures the same inputs. Sizes are chosen to keep a full
+run to a couple of minutes; use ``--select`` to focus on one area.
+"""
+
+import json
+import os
+import re
+import shutil
+import subprocess
+import sys
+
+from harness import ROOT, Env, benchmark
+
+from osl_cli.governance.gates import GovernanceChecker
+from osl_cli.state.manager import StateManager
+from osl_cli.state.migration import MigrationManager
+from osl_cli.state.schemas import BookState, CoachState, SessionState
+from osl_cli.validation.hash import HashRegistry
+
+
+WIKILINK = re.compile(r"\[\[([^\]|#]+)")
+
+
+def _session(env: Env, loops: int) -> SessionState:
+    """An archived synthetic session padded to ``loops`` micro-loops."""
+    logs = env.dataset(0.25) / "osl" / "ai_state" / "session_logs"
+    data = json.loads(min(logs.glob("*.json")).read_text())
+    template = data["micro_loops"]
+    data["micro_loops"] = [dict(template[i % len(template)], loop_id=i + 1) for i in range(loops)]
+    return SessionState.model_validate(data)
+
+
+def _coach_state(env: Env, books: int) -> CoachState:
+    """Synthetic coach state with ``books`` active books."""
+    state = StateManager(env.dataset(0.25) / "osl").load_coach_state()
+    template = state.active_books
+    state.active_books = [
+        BookState(**dict(template[i % len(template)].model_dump(), id=f"book_{i:05d}"))
+        for i in range(books)
+    ]
+    return state
+
+
+# ----------------------------------------------------------------------
+# CLI
+# ----------------------------------------------------------------------
+
+@benchmark("cli.cold_start", params=["--version", "state show", "governance check"], rounds=5)
+def cli_cold_start(env: Env, command: str):
+    """Fresh interpreter running one command (no daemon)."""
+    cwd = env.dataset(0.25)
+    argv = [sys.executable, "-m", "osl_cli.main", *command.split()]
+    environ = dict(os.environ, OSL_NO_DAEMON="1", PYTHONPATH=str(ROOT), COLUMNS="120")
+    environ.pop("OSL_TRACE", None)
+
+    def run():
+        subprocess.run(argv, cwd=cwd, env=environ, stdout=subprocess.DEVNULL,
+                       stderr=subprocess.DEVNULL)
+    return run
+
+
+# ----------------------------------------------------------------------
+# State files
+# ----------------------------------------------------------------------
+
+@benchmark("state.load_coach_state", params=[8, 80, 800], rounds=20)
+def load_coach_state(env: Env, books: int):
+    base = env.scratch("coach") / "osl"
+    (base / "ai_state").mkdir(parents=True)
+    manager = StateManager(base)
+    manager.save_coach_state(_coach_state(env, books))
+    return manager.load_coach_state
+
+
+@benchmark("state.save_current_session", params=[4, 16, 64], rounds=20)
+def save_current_session(env: Env, loops: int):
+    base = env.scratch("session") / "osl"
+    (base / "ai_state").mkdir(parents=True)
+    manager = StateManager(base)
+    session = _session(env, loops)
+    return lambda: manager.save_current_session(session)
+
+
+@benchmark("state.load_current_session", params=[4, 16, 64], rounds=20)
+def load_current_session(env: Env, loops: int):
+    base = env.scratch("session") / "osl"
+    (base / "ai_state").mkdir(parents=True)
+    manager = StateManager(base)
+    manager.save_current_session(_session(env, loops))
+    return manager.load_current_session
+
+
+# ----------------------------------------------------------------------
+# Governance
+# ----------------------------------------------------------------------
+
+@benchmark("governance.check_all_gates", params=[8, 80, 800], rounds=20, number=20)
+def check_all_gates(env: Env, books: int):
+    checker = GovernanceChecker(_coach_state(env, books))
+    return checker.check_all_gates
+
+
+# ----------------------------------------------------------------------
+# Validation and migration
+# ----------------------------------------------------------------------
+
+@benchmark("hash_registry.register", params=[100, 400], rounds=3)
+def hash_registry_register(env: Env, entries: int):
+    """Register ``entries`` contents into one session registry."""
+    texts = [f"recall {i} " * 60 for i in range(entries)]
+    state = {"n": 0}
+
+    def prepare():
+        state["n"] += 1
+        state["registry"] = HashRegistry(f"bench_{state['n']}", env.scratch("hashes"))
+
+    def run():
+        registry = state["registry"]
+        for i, text in enumerate(texts):
+            registry.register_content(f"recall_{i}", text, "recall")
+    return prepare, run
+
+
+@benchmark("migration.migrate_all_state_files", params=[0.1, 0.5], rounds=3)
+def migrate_all_state_files(env: Env, scale: float):
+    """Migrate every archived session of a v2.0 history to 3.0."""
+    template = env.scratch("migration-template") / "osl"
+    shutil.copytree(env.dataset(scale) / "osl" / "ai_state", template / "ai_state",
+                    ignore=shutil.ignore_patterns("cards", "questions", "misconceptions",
+                                                  "hash_registry", "session_inputs"))
+    for path in (template / "ai_state" / "session_logs").glob("*.json"):
+        data = json.loads(path.read_text())
+        data["version"] = "2.0"
+        path.write_text(json.dumps(data, indent=2))
+    coach = template / "ai_state" / "coach_state.json"
+    coach.write_text(coach.read_text().replace('"version": "3.0"', '"version": "2.0"', 1))
+    state = {}
+
+    def prepare():
+        target = env.scratch("migration") / "osl"
+        shutil.copytree(template, target)
+        state["manager"] = MigrationManager(target)
+
+    return prepare, lambda: state["manager"].migrate_all_state_files()
+
+
+# ----------------------------------------------------------------------
+# Scans
+# ----------------------------------------------------------------------
+
+@benchmark("scan.archive", params=[0.25, 1.0], rounds=3)
+def scan_archive(env: Env, scale: float):
+    """Load and validate every archived session."""
+    logs = env.dataset(scale) / "osl" / "ai_state" / "session_logs"
+
+    def run():
+        for path in sorted(logs.glob("*.json")):
+            SessionState.model_validate(json.loads(path.read_text()))
+    return run
+
+
+@benchmark("scan.vault", params=[0.25, 1.0], rounds=3)
+def scan_vault(env: Env, scale: float):
+    """Read every vault note and resolve its wikilinks."""
+    vault = env.dataset(scale) / "osl" / "obsidian"
+
+    def run():
+        notes = {}
+        for path in vault.rglob("*.md"):
+            notes[path.stem] = WIKILINK.findall(path.read_text())
+        return sum(1 for links in notes.values() for link in links if link not in notes)
+    return run
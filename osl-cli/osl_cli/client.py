@@ -0,0 +1,151 @@
+"""Thin ``osl`` entry point.
+
+When an ``osl daemon`` is serving the current OSL directory, read-only
+commands are forwarded to it over a Unix socket and this process never
+imports click, rich or pydantic. Anything else (interactive commands,
+``--profile``/``OSL_TRACE`` runs, or no daemon) falls through to the
+normal in-process CLI.
+
+Keep this module's imports to the standard library.
+"""
+
+import hashlib
+import json
+import os
+import socket
+import sys
+import tempfile
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+
+# Leading command words of commands that never prompt
+FORWARDABLE = {
+    ("state",),
+    ("governance", "check"), ("governance", "timeline"),
+    ("book", "list"),
+    ("book", "stats"),
+    ("metrics", "show"),
+    ("metrics", "trends"),
+    ("misconception", "list"),
+    ("questions", "list"),
+    ("review", "due"),
+    ("review", "schedule"),
+    ("perf", "report"),
+}
+
+CONNECT_TIMEOUT = 0.05
+REPLY_TIMEOUT = 30.0
+
+
+def socket_path(base_path: Path) -> Path:
+    """Socket the daemon for an OSL directory listens on.
+
+    Sockets live in a per-user runtime directory rather than under the
+    OSL directory, which may be too deep for AF_UNIX path limits.
+
+    Args:
+        base_path: OSL directory (``<project>/osl``)
+
+    Returns:
+        Socket path
+    """
+    runtime = os.environ.get("XDG_RUNTIME_DIR") or tempfile.gettempdir()
+    digest = hashlib.sha1(str(base_path.resolve()).encode()).hexdigest()[:16]
+    return Path(runtime) / f"osl-{os.getuid()}" / f"{digest}.sock"
+
+
+def _forwardable(argv: List[str]) -> bool:
+    if not argv or argv[0].startswith("-"):
+        return False
+    if any(a in ("--help", "-h") for a in argv):
+        return False
+    return tuple(argv[:1]) in FORWARDABLE or tuple(argv[:2]) in FORWARDABLE
+
+
+def _color_system() -> Optional[str]:
+    if not sys.stdout.isatty() or os.environ.get("NO_COLOR"):
+        return None
+    if os.environ.get("COLORTERM", "").lower() in ("truecolor", "24bit"):
+        return "truecolor"
+    return "256" if "256" in os.environ.get("TERM", "") else "standard"
+
+
+def request(path: Path, payload: Dict[str, Any], timeout: float = REPLY_TIMEOUT) -> Optional[Dict[str, Any]]:
+    """Send one request to a daemon socket.
+
+    Args:
+        path: Daemon socket
+        payload: JSON request
+        timeout: Seconds to wait for the reply
+
+    Returns:
+        Decoded reply, or None if no daemon answered
+    """
+    if not path.exists():
+        return None
+    sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        sock.settimeout(CONNECT_TIMEOUT)
+        sock.connect(str(path))
+        sock.settimeout(timeout)
+        sock.sendall(json.dumps(payload).encode() + b"\n")
+        chunks = []
+        while True:
+            chunk = sock.recv(65536)
+            if not chunk:
+                break
+            chunks.append(chunk)
+        return json.loads(b"".join(chunks)) if chunks else None
+    except (OSError, ValueError):
+        return None
+    finally:
+        sock.close()
+
+
+def forward(argv: List[str]) -> Optional[int]:
+    """Run a command through the daemon if possible.
+
+    Args:
+        argv: Command-line arguments (without the program name)
+
+    Returns:
+        Exit code, or None if the command must run locally
+    """
+    if os.environ.get("OSL_NO_DAEMON") or os.environ.get("OSL_TRACE"):
+        return None
+    if not _forwardable(argv):
+        return None
+
+    cwd = Path.cwd()
+    try:
+        width = os.get_terminal_size(sys.stdout.fileno()).columns
+    except OSError:
+        width = 80
+    reply = request(socket_path(cwd / "osl"), {
+        "op": "run",
+        "argv": argv,
+        "cwd": str(cwd),
+        "width": width,
+        "color_system": _color_system(),
+    })
+    if reply is None or reply.get("fallback"):
+        return None
+
+    sys.stdout.write(reply.get("output", ""))
+    sys.stdout.flush()
+    return int(reply.get("exit_code", 0))
+
+
+def main() -> None:
+    """Console-script entry point."""
+    code = forward(sys.argv[1:])
+    if code is not None:
+        sys.exit(code)
+
+    from osl_cli.main import cli
+    cli()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,353 @@
+"""Audit commands for archived history."""
+
+import json
+import sys
+import time
+import click
+from pathlib import Path
+from typing import Optional
+from rich.console import Console
+from rich.panel import Panel
+from rich.table import Table
+
+from osl_cli.state.manager import StateManager
+from osl_cli.state.merkle import TreeDiff, archive_index, check_index, compare_indexes
+from osl_cli.validation.conformance import check_archive
+from osl_cli.validation.diff import compare_archive
+from osl_cli.validation.markers import scan_archive
+from osl_cli.validation.verifier import MAX_ERROR_RATE, verify_archive, verify_session
+
+
+def _print_tree_diff(console: Console, result: TreeDiff, title: str, seconds: float,
+                     labels: tuple = ("Changed", "Added", "Removed")) -> None:
+    console.print(
+        Panel(
+            f"Files: {result.files} ({result.hashed} hashed)\n"
+            f"Root: {result.root[:16]}\n"
+            f"Other: {result.other_root[:16]}\n"
+            f"[dim]{result.comparisons} node comparisons, {seconds:.3f}s[/dim]",
+            title=title,
+            style="green" if result.match else "red"
+        )
+    )
+    for label, keys in zip(labels, (result.changed, result.added, result.removed)):
+        for key in keys[:20]:
+            console.print(f"[yellow]{label}:[/yellow] {key}")
+        if len(keys) > 20:
+            console.print(f"[dim]... {len(keys) - 20} more {label.lower()}[/dim]")
+
+
+@click.group(name="audit", invoke_without_command=True)
+@click.option("--quick", is_flag=True,
+              help="Check session_logs and hash_registry against their Merkle index")
+@click.option("--rehash", is_flag=True,
+              help="With --quick: rehash every file, not only those whose size or mtime changed")
+@click.option("--record", is_flag=True,
+              help="With --quick: accept the current files as the new index")
+@click.option("--json", "as_json", is_flag=True, help="With --quick: output result as JSON")
+@click.pass_context
+def audit_group(ctx: click.Context, quick: bool, rehash: bool, record: bool, as_json: bool) -> None:
+    """Audit archived sessions against the OSL methodology.
+
+    With --quick, proves the archive unchanged since it was recorded by
+    comparing Merkle roots; only files whose size or mtime changed are
+    rehashed. Exits with status 1 if anything changed.
+    """
+    if ctx.invoked_subcommand is not None:
+        return
+    if not quick:
+        click.echo(ctx.get_help())
+        return
+
+    console: Console = ctx.obj['console']
+    index = archive_index(StateManager().base_path)
+    started = time.perf_counter()
+
+    if record or not index.exists():
+        root = index.rebuild(rehash=rehash)
+        console.print(f"[green]Recorded {len(index.load())} files, root {root[:16]}[/green]")
+        return
+
+    result = check_index(index, rehash=rehash)
+    seconds = time.perf_counter() - started
+    if as_json:
+        console.print_json(json.dumps({**result.to_dict(), "seconds": round(seconds, 3)}))
+    else:
+        _print_tree_diff(console, result, "Archive Integrity", seconds)
+    if not result.match:
+        sys.exit(1)
+
+
+@audit_group.command(name="compare")
+@click.argument("other", type=click.Path(exists=True, file_okay=False, path_type=Path))
+@click.option("--rehash", is_flag=True,
+              help="Rehash every file, not only those whose size or mtime changed")
+@click.option("--json", "as_json", is_flag=True, help="Output result as JSON")
+@click.option("--strict", is_flag=True, help="Exit with status 1 if the archives differ")
+@click.pass_context
+def compare(ctx: click.Context, other: Path, rehash: bool, as_json: bool, strict: bool) -> None:
+    """Compare this archive with another OSL directory's.
+
+    OTHER is the other OSL directory. Each side is hashed into a Merkle
+    tree (reusing its index for unchanged files) and only differing
+    subtrees are descended into.
+    """
+    console: Console = ctx.obj['console']
+    started = time.perf_counter()
+    result = compare_indexes(archive_index(StateManager().base_path), archive_index(other),
+                             rehash=rehash)
+    seconds = time.perf_counter() - started
+
+    if as_json:
+        console.print_json(json.dumps({**result.to_dict(), "seconds": round(seconds, 3)}))
+    else:
+        _print_tree_diff(console, result, "Archive Comparison", seconds,
+                         labels=("Differs", "Only there", "Only here"))
+    if strict and not result.match:
+        sys.exit(1)
+
+
+@audit_group.command(name="conformance")
+@click.option("--workers", "-w", type=click.IntRange(min=1),
+              help="Worker processes (default: CPU count)")
+@click.option("--json", "as_json", is_flag=True, help="Output report as JSON")
+@click.option("--strict", is_flag=True, help="Exit with status 1 if any session violates a rule")
+@click.pass_context
+def conformance(ctx: click.Context, workers: Optional[int], as_json: bool, strict: bool) -> None:
+    """Replay archived sessions through the workflow state machine.
+
+    Every recorded transition is checked against the transition table,
+    the state's required inputs and the minimum requirements (recall
+    words, Feynman sentences, card limits). Violations are counted per
+    rule and state.
+    """
+    console: Console = ctx.obj['console']
+    state_manager = StateManager()
+
+    report = check_archive(state_manager.base_path, workers=workers)
+
+    if as_json:
+        console.print_json(json.dumps(report.to_dict()))
+    else:
+        style = "green" if report.conforming == report.checked else "yellow"
+        console.print(
+            Panel(
+                f"Sessions: {report.sessions} ({report.unrecorded} without history, "
+                f"{len(report.unreadable)} unreadable)\n"
+                f"Conforming: {report.conforming}/{report.checked} "
+                f"({report.conformance_rate:.1%})\n"
+                f"[dim]Checked in {report.seconds:.2f}s[/dim]",
+                title="Workflow Conformance",
+                style=style
+            )
+        )
+
+        rows = report.rows()
+        if rows:
+            table = Table(title="Violations by Rule")
+            table.add_column("Rule", style="cyan")
+            table.add_column("State", style="white")
+            table.add_column("Violations", justify="right", style="red")
+            table.add_column("Sessions", justify="right", style="yellow")
+            table.add_column("Examples", style="dim")
+            for row in rows:
+                table.add_row(
+                    row["rule"],
+                    row["state"] or "-",
+                    str(row["violations"]),
+                    str(row["sessions"]),
+                    ", ".join(row["examples"][:3]),
+                )
+            console.print(table)
+
+        for path in report.unreadable[:5]:
+            console.print(f"[red]Unreadable: {path}[/red]")
+
+    if strict and report.conforming < report.checked:
+        sys.exit(1)
+
+
+@audit_group.command(name="inputs")
+@click.option("--session", "session_id", help="Verify one session and list its failing fields")
+@click.option("--workers", "-w", type=click.IntRange(min=1),
+              help="Worker processes (default: CPU count)")
+@click.option("--max-error-rate", type=click.FloatRange(0.0, 0.5), default=MAX_ERROR_RATE,
+              show_default=True, help="Share of a field's characters a fuzzy match may edit")
+@click.option("--json", "as_json", is_flag=True, help="Output report as JSON")
+@click.option("--strict", is_flag=True, help="Exit with status 1 if any field is not found")
+@click.pass_context
+def inputs(ctx: click.Context, session_id: Optional[str], workers: Optional[int],
+           max_error_rate: float, as_json: bool, strict: bool) -> None:
+    """Re-verify AI-parsed fields against the raw learner input.
+
+    Key points and parsed items must be found in the input stored in
+    ai_state/session_inputs: exactly, ignoring case and spacing, or
+    within a bounded edit distance (fuzzy). Anything else is not found.
+    """
+    console: Console = ctx.obj['console']
+    state_manager = StateManager()
+
+    if session_id:
+        report = verify_session(state_manager.base_path, session_id, max_error_rate)
+        if not report.inputs_indexed:
+            console.print(f"[yellow]No stored raw inputs to verify for session {session_id}[/yellow]")
+            return
+    else:
+        report = verify_archive(state_manager.base_path, workers=workers,
+                                max_error_rate=max_error_rate)
+
+    if as_json:
+        console.print_json(json.dumps(report.to_dict()))
+    else:
+        results = report.to_dict()["results"]
+        style = "green" if not results["not_found"] else "red"
+        console.print(
+            Panel(
+                f"Sessions: {report.sessions} ({report.sessions_failing} with fields not found)\n"
+                f"Fields: {report.fields} from {report.inputs_indexed} raw inputs\n"
+                f"Exact: {results['exact_match']}  Case: {results['case_match']}  "
+                f"Fuzzy: {results['fuzzy_match']}  Not found: {results['not_found']}\n"
+                f"[dim]Verified in {report.seconds:.2f}s[/dim]",
+                title="Parsed Field Verification",
+                style=style
+            )
+        )
+
+        examples = report.examples.get("not_found", []) + report.examples.get("fuzzy_match", [])
+        if examples:
+            table = Table(title="Unverified Fields")
+            table.add_column("Session", style="cyan")
+            table.add_column("Source", style="white")
+            table.add_column("Field", style="white")
+            table.add_column("Edits", justify="right", style="yellow")
+            table.add_column("Value", style="dim")
+            for example in examples:
+                table.add_row(
+                    example["session_id"],
+                    example["source"],
+                    example["field"],
+                    "-" if example["distance"] < 0 else str(example["distance"]),
+                    example["value"][:60],
+                )
+            console.print(table)
+
+        for item in report.unreadable[:5]:
+            console.print(f"[red]Unreadable: {item}[/red]")
+
+    if strict and report.results["not_found"]:
+        sys.exit(1)
+
+
+@audit_group.command(name="markers")
+@click.option("--marker", "-m", "markers", multiple=True,
+              help="Scan for this marker instead of the configured set (repeatable)")
+@click.option("--ignore-case/--match-case", default=None,
+              help="Override the configured case sensitivity")
+@click.option("--workers", "-w", type=click.IntRange(min=1),
+              help="Worker processes (default: CPU count)")
+@click.option("--json", "as_json", is_flag=True, help="Output report as JSON")
+@click.option("--strict", is_flag=True, help="Exit with status 1 if any marker is found")
+@click.pass_context
+def markers(ctx: click.Context, markers: tuple, ignore_case: Optional[bool],
+            workers: Optional[int], as_json: bool, strict: bool) -> None:
+    """Scan learner content for AI-paraphrase markers.
+
+    Every verbatim recall, Feynman explanation, card and vault note is
+    scanned once for all markers in config/ai_markers.json (phrases like
+    "In summary," that suggest an AI rewrote the learner's words).
+    """
+    console: Console = ctx.obj['console']
+    state_manager = StateManager()
+
+    report = scan_archive(state_manager.base_path, workers=workers,
+                          markers=markers or None,
+                          case_sensitive=None if ignore_case is None else not ignore_case)
+
+    if as_json:
+        console.print_json(json.dumps(report.to_dict()))
+    else:
+        data = report.to_dict()
+        flagged = sum(data["flagged"].values())
+        scanned = ", ".join(f"{data['scanned'][kind]} {kind}s" for kind in data["scanned"])
+        console.print(
+            Panel(
+                f"Scanned: {scanned}\n"
+                f"Texts with markers: {flagged}\n"
+                f"[dim]{len(report.markers)} markers over {report.characters:,} characters "
+                f"in {report.seconds:.2f}s[/dim]",
+                title="AI Marker Scan",
+                style="green" if not flagged else "yellow"
+            )
+        )
+
+        table = Table(title="Hits by Marker")
+        table.add_column("Marker", style="cyan")
+        table.add_column("Hits", justify="right", style="red")
+        table.add_column("Texts", justify="right", style="yellow")
+        table.add_column("Examples", style="dim")
+        for row in data["markers"]:
+            table.add_row(row["marker"], str(row["hits"]), str(row["texts"]),
+                          ", ".join(row["examples"][:2]))
+        console.print(table)
+
+        for path in report.unreadable[:5]:
+            console.print(f"[red]Unreadable: {path}[/red]")
+
+    if strict and sum(report.flagged.values()):
+        sys.exit(1)
+
+
+@audit_group.command(name="modifications")
+@click.option("--workers", "-w", type=click.IntRange(min=1),
+              help="Worker processes (default: CPU count)")
+@click.option("--json", "as_json", is_flag=True, help="Output report as JSON")
+@click.option("--strict", is_flag=True, help="Exit with status 1 if any text was modified")
+@click.pass_context
+def modifications(ctx: click.Context, workers: Optional[int], as_json: bool, strict: bool) -> None:
+    """Measure how far archived recalls and explanations drifted from raw input.
+
+    Each archived text is diffed against the raw input stored in
+    ai_state/session_inputs when it was entered, giving the edit
+    distance and the percent of the original preserved.
+    """
+    console: Console = ctx.obj['console']
+    state_manager = StateManager()
+
+    report = compare_archive(state_manager.base_path, workers=workers)
+
+    if as_json:
+        console.print_json(json.dumps(report.to_dict()))
+    else:
+        console.print(
+            Panel(
+                f"Compared: {report.compared} texts ({report.missing} missing from the archive)\n"
+                f"Modified: {report.modified}, {report.edit_distance:,} character edits\n"
+                f"Preserved: {report.percent_preserved:.2f}% of original characters\n"
+                f"[dim]Compared in {report.seconds:.2f}s[/dim]",
+                title="Verbatim Preservation",
+                style="green" if not report.modified else "yellow"
+            )
+        )
+
+        if report.examples:
+            table = Table(title="Modified Texts")
+            table.add_column("Session", style="cyan")
+            table.add_column("Input", style="white")
+            table.add_column("Edits", justify="right", style="red")
+            table.add_column("Preserved", justify="right", style="yellow")
+            table.add_column("Spans", justify="right", style="dim")
+            for example in report.examples:
+                table.add_row(
+                    example["session_id"],
+                    example["input"],
+                    str(example["edit_distance"]),
+                    f"{example['percent_preserved']}%",
+                    str(example["spans"]),
+                )
+            console.print(table)
+
+        for session_id in report.unreadable[:5]:
+            console.print(f"[red]Unreadable: {session_id}[/red]")
+
+    if strict and report.modified:
+        sys.exit(1)
@@ -0,0 +1,177 @@
+"""Backup commands - deduplicated snapshots of the OSL directory."""
+
+import json
+import sys
+import click
+from pathlib import Path
+from typing import Optional, Tuple
+from rich.console import Console
+from rich.panel import Panel
+from rich.prompt import Confirm
+from rich.table import Table
+
+from osl_cli.state.backup import BackupRepository
+from osl_cli.state.manager import StateManager
+
+
+repo_option = click.option(
+    "--repo", type=click.Path(file_okay=False, path_type=Path),
+    help="Backup repository (default: osl/backups)"
+)
+
+
+def _repository(repo: Optional[Path]) -> BackupRepository:
+    return BackupRepository(StateManager().base_path, repo)
+
+
+def _size(n: int) -> str:
+    for unit in ("B", "KB", "MB"):
+        if n < 1024:
+            return f"{n:.0f} {unit}" if unit == "B" else f"{n:.1f} {unit}"
+        n /= 1024
+    return f"{n:.1f} GB"
+
+
+@click.group(name="backup")
+@click.pass_context
+def backup_group(ctx: click.Context) -> None:
+    """Snapshot and restore the OSL directory.
+
+    Snapshots share content-defined chunks, so each one only stores what
+    changed since earlier snapshots.
+    """
+    pass
+
+
+@backup_group.command(name="create")
+@repo_option
+@click.option("--note", "-m", default="", help="Label for the snapshot")
+@click.option("--rehash", is_flag=True, help="Read every file, not just changed ones")
+@click.option("--json", "as_json", is_flag=True, help="Output report as JSON")
+@click.pass_context
+def create_backup(ctx: click.Context, repo: Optional[Path], note: str, rehash: bool,
+                  as_json: bool) -> None:
+    """Snapshot the whole OSL directory."""
+    console: Console = ctx.obj['console']
+    repository = _repository(repo)
+
+    if not (repository.base_path / "ai_state").is_dir():
+        console.print(f"[red]Not an OSL directory: {repository.base_path}[/red]")
+        sys.exit(1)
+
+    report = repository.create(note=note, rehash=rehash)
+
+    if as_json:
+        console.print_json(json.dumps(report.to_dict()))
+    elif report.unchanged:
+        console.print(f"[green]Nothing changed since snapshot {report.snapshot}[/green]")
+    else:
+        console.print(
+            Panel(
+                f"[cyan]Snapshot:[/cyan] {report.snapshot}\n"
+                f"Files: {report.files} ({_size(report.bytes)}), "
+                f"{report.reused_files} unchanged\n"
+                f"New chunks: {report.new_chunks} of {report.chunks} "
+                f"({_size(report.new_bytes)} -> {_size(report.stored_bytes)} stored)\n"
+                f"[dim]{report.seconds:.2f}s[/dim]",
+                title="Backup",
+                style="green"
+            )
+        )
+
+
+@backup_group.command(name="list")
+@repo_option
+@click.option("--json", "as_json", is_flag=True, help="Output as JSON")
+@click.pass_context
+def list_backups(ctx: click.Context, repo: Optional[Path], as_json: bool) -> None:
+    """List snapshots, oldest first."""
+    console: Console = ctx.obj['console']
+    repository = _repository(repo)
+    snapshots = repository.snapshots()
+
+    if as_json:
+        console.print_json(json.dumps({"snapshots": snapshots, "stats": repository.stats()}))
+        return
+    if not snapshots:
+        console.print("[yellow]No snapshots yet[/yellow]")
+        console.print("Create one: [cyan]osl backup create[/cyan]")
+        return
+
+    table = Table(title="Snapshots")
+    table.add_column("ID", style="cyan")
+    table.add_column("Created")
+    table.add_column("Files", justify="right")
+    table.add_column("Size", justify="right")
+    table.add_column("Added", justify="right")
+    table.add_column("Note", style="dim")
+    for snapshot in snapshots:
+        table.add_row(
+            snapshot["id"],
+            snapshot["created_at"][:16].replace("T", " "),
+            str(snapshot["files"]),
+            _size(snapshot["bytes"]),
+            _size(snapshot["stored_bytes"]),
+            snapshot.get("note", ""),
+        )
+    console.print(table)
+
+    stats = repository.stats()
+    console.print(f"[dim]{stats['chunks']} chunks, {_size(stats['bytes'])} on disk[/dim]")
+
+
+@backup_group.command(name="restore")
+@click.argument("snapshot")
+@repo_option
+@click.option("--to", "target", type=click.Path(file_okay=False, path_type=Path),
+              help="Restore into this directory instead of the OSL directory")
+@click.option("--path", "paths", multiple=True,
+              help="Only restore files under this path (repeatable), e.g. ai_state/cards")
+@click.option("--yes", "-y", is_flag=True, help="Do not ask for confirmation")
+@click.option("--json", "as_json", is_flag=True, help="Output report as JSON")
+@click.pass_context
+def restore_backup(ctx: click.Context, snapshot: str, repo: Optional[Path],
+                   target: Optional[Path], paths: Tuple[str, ...], yes: bool,
+                   as_json: bool) -> None:
+    """Restore a snapshot.
+
+    SNAPSHOT is a snapshot id (or unique prefix), "latest", or a date or
+    time such as 2026-03-01 (the last snapshot taken by then). Files that
+    differ are rewritten and files the snapshot does not have are removed.
+    Restoring over the OSL directory first snapshots its current state.
+    """
+    console: Console = ctx.obj['console']
+    repository = _repository(repo)
+
+    try:
+        snapshot_id = repository.resolve(snapshot)
+    except ValueError as e:
+        console.print(f"[red]{e}[/red]")
+        sys.exit(1)
+
+    if target is not None and target.exists() and any(target.iterdir()) \
+            and not (target / "ai_state").is_dir():
+        console.print(f"[red]{target} is neither empty nor an OSL directory[/red]")
+        sys.exit(1)
+
+    in_place = target is None or target.resolve() == repository.base_path.resolve()
+    if in_place and not yes and not as_json:
+        scope = ", ".join(paths) if paths else "the OSL directory"
+        if not Confirm.ask(f"Restore {scope} to snapshot {snapshot_id}?"):
+            return
+
+    report = repository.restore(snapshot_id, target=target, paths=paths)
+
+    if as_json:
+        console.print_json(json.dumps(report.to_dict()))
+        return
+
+    lines = [
+        f"[cyan]Snapshot:[/cyan] {report.snapshot} -> {report.target}",
+        f"Restored: {len(report.restored)} ({_size(report.bytes)})  "
+        f"Removed: {len(report.removed)}  Unchanged: {report.unchanged}",
+    ]
+    if report.safety_snapshot:
+        lines.append(f"[dim]Previous state saved as snapshot {report.safety_snapshot}[/dim]")
+    lines.append(f"[dim]{report.seconds:.2f}s[/dim]")
+    console.print(Panel("\n".join(lines), title="Restore", style="green"))
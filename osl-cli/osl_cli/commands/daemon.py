@@ -0,0 +1,123 @@
+"""Resident daemon management commands."""
+
+import subprocess
+import sys
+import time
+import click
+from pathlib import Path
+from rich.console import Console
+from rich.panel import Panel
+
+from osl_cli.client import socket_path, request
+
+
+START_TIMEOUT = 10.0
+
+
+def _base_path() -> Path:
+    return Path.cwd() / "osl"
+
+
+@click.group(name="daemon")
+@click.pass_context
+def daemon_group(ctx: click.Context) -> None:
+    """Run a resident OSL server for fast read-only commands.
+    
+    While the daemon is running, `osl` forwards commands such as
+    `state show`, `governance check` and `review due` to it and answers
+    from in-memory state. Set OSL_NO_DAEMON=1 to bypass it.
+    """
+    pass
+
+
+@daemon_group.command(name="start")
+@click.option("--foreground", "-f", is_flag=True, help="Run in this process instead of detaching")
+@click.pass_context
+def start_daemon(ctx: click.Context, foreground: bool) -> None:
+    """Start the daemon for the OSL directory in the current folder."""
+    console: Console = ctx.obj['console']
+    base_path = _base_path()
+    
+    if not (base_path / "ai_state").exists():
+        console.print("[red]No OSL directory here. Run 'osl init' first.[/red]")
+        return
+    
+    path = socket_path(base_path)
+    status = request(path, {"op": "ping"}, timeout=1.0)
+    if status is not None:
+        console.print(f"[yellow]Daemon already running (pid {status['pid']})[/yellow]")
+        return
+    
+    if foreground:
+        from osl_cli.daemon.server import OSLDaemon
+        console.print(f"[green]Serving {base_path} on {path}[/green] [dim](Ctrl+C to stop)[/dim]")
+        try:
+            OSLDaemon(base_path).serve_forever()
+        except KeyboardInterrupt:
+            pass
+        return
+    
+    log_path = base_path / "ai_state" / "daemon.log"
+    with open(log_path, "a") as log:
+        subprocess.Popen(
+            [sys.executable, "-m", "osl_cli.daemon.server", str(base_path)],
+            stdin=subprocess.DEVNULL,
+            stdout=log,
+            stderr=log,
+            start_new_session=True,
+        )
+    
+    deadline = time.monotonic() + START_TIMEOUT
+    while time.monotonic() < deadline:
+        status = request(path, {"op": "ping"}, timeout=1.0)
+        if status is not None:
+            console.print(f"[green]✓ Daemon started (pid {status['pid']})[/green]")
+            return
+        time.sleep(0.05)
+    
+    console.print(f"[red]Daemon did not start; see {log_path}[/red]")
+
+
+@daemon_group.command(name="stop")
+@click.pass_context
+def stop_daemon(ctx: click.Context) -> None:
+    """Stop the running daemon."""
+    console: Console = ctx.obj['console']
+    path = socket_path(_base_path())
+    
+    if request(path, {"op": "shutdown"}, timeout=2.0) is None:
+        console.print("[yellow]No daemon running[/yellow]")
+        return
+    
+    deadline = time.monotonic() + START_TIMEOUT
+    while path.exists() and time.monotonic() < deadline:
+        time.sleep(0.05)
+    console.print("[green]✓ Daemon stopped[/green]")
+
+
+@daemon_group.command(name="status")
+@click.pass_context
+def daemon_status(ctx: click.Context) -> None:
+    """Show daemon status and request latency."""
+    console: Console = ctx.obj['console']
+    status = request(socket_path(_base_path()), {"op": "ping"}, timeout=2.0)
+    
+    if status is None:
+        console.print("[dim]Daemon not running[/dim]")
+        return
+    
+    cache = status.get("cache", {})
+    console.print(
+        Panel(
+            f"[bold cyan]🛰 OSL Daemon[/bold cyan]\n\n"
+            f"[cyan]PID:[/cyan] {status['pid']}\n"
+            f"[cyan]Serving:[/cyan] {status['base_path']}\n"
+            f"[cyan]Uptime:[/cyan] {status['uptime_s']:.0f}s\n"
+            f"[cyan]Requests:[/cyan] {status['requests']} "
+            f"(mean {status['mean_ms']:.1f} ms, last {status['last_ms']:.1f} ms)\n"
+            f"[cyan]State cache:[/cyan] {cache.get('entries', 0)} files, "
+            f"{cache.get('hits', 0)} hits, {cache.get('misses', 0)} misses, "
+            f"{cache.get('reloads', 0)} reloads",
+            style="cyan"
+        )
+    )
@@ -0,0 +1,84 @@
+"""Developer commands."""
+
+import json
+import shutil
+import time
+import click
+from datetime import datetime
+from pathlib import Path
+from typing import Optional
+from rich.console import Console
+from rich.table import Table
+
+from osl_cli.dev.synth import DEFAULT_VIOLATION_RATE, HistoryGenerator, parse_scale
+
+
+@click.group(name="dev")
+@click.pass_context
+def dev_group(ctx: click.Context) -> None:
+    """Developer tooling for load and scale testing."""
+    pass
+
+
+@dev_group.command(name="synth")
+@click.option("--output", "-o", type=click.Path(path_type=Path), required=True,
+              help="Project directory to create (data goes to <output>/osl)")
+@click.option("--scale", default="1x", show_default=True,
+              help="Size relative to production, e.g. 1x, 10x, 100x")
+@click.option("--years", type=click.FloatRange(min=0.01), default=2.0, show_default=True,
+              help="Length of the history")
+@click.option("--seed", type=int, default=42, show_default=True, help="Random seed")
+@click.option("--end-date", type=click.DateTime(formats=["%Y-%m-%d"]),
+              help="Last day of the history (default: today)")
+@click.option("--violation-rate", type=click.FloatRange(0, 1), default=DEFAULT_VIOLATION_RATE,
+              show_default=True, help="Share of sessions with workflow violations")
+@click.option("--no-vault", is_flag=True, help="Skip the Obsidian vault")
+@click.option("--force", is_flag=True, help="Replace an existing <output>/osl")
+@click.option("--json", "as_json", is_flag=True, help="Output summary as JSON")
+@click.pass_context
+def synth(ctx: click.Context, output: Path, scale: str, years: float, seed: int,
+          end_date: Optional[datetime], violation_rate: float, no_vault: bool,
+          force: bool, as_json: bool) -> None:
+    """Generate a deterministic synthetic learner history.
+    
+    Writes archived sessions with realistic micro-loop text, session inputs,
+    hash registries, cards with review history, questions, misconceptions,
+    coach state and an Obsidian vault with wikilinks. The same seed, scale,
+    years and end date always produce the same data.
+    """
+    console: Console = ctx.obj['console']
+    
+    try:
+        factor = parse_scale(scale)
+    except ValueError:
+        raise click.BadParameter(f"invalid scale {scale!r}", param_hint="--scale")
+    
+    target = output / "osl"
+    if target.exists():
+        if not force:
+            console.print(f"[red]{target} already exists. Use --force to replace it.[/red]")
+            raise click.Abort()
+        shutil.rmtree(target)
+    
+    generator = HistoryGenerator(
+        output, scale=factor, years=years, seed=seed, end=end_date,
+        violation_rate=violation_rate, vault=not no_vault,
+    )
+    started = time.perf_counter()
+    with console.status(f"Generating {factor:g}x history..."):
+        summary = generator.generate()
+    summary["seconds"] = round(time.perf_counter() - started, 2)
+    
+    if as_json:
+        click.echo(json.dumps(summary, indent=2))
+        return
+    
+    table = Table(title=f"Synthetic history ({factor:g}x, {years:g} years, seed {seed})")
+    table.add_column("Area")
+    table.add_column("Items", justify="right")
+    table.add_column("Size", justify="right")
+    for area, count in summary["counts"].items():
+        size = summary["bytes"].get(area)
+        table.add_row(area, f"{count:,}", f"{size / 1e6:.1f} MB" if size else "-")
+    console.print(table)
+    console.print(f"Written to {summary['base_path']} in {summary['seconds']}s")
@@ -10,6 +10,9 @@ from rich.prompt import Prompt, Confirm
 
 from osl_cli.state.schemas import FlashcardCreated
 from osl_cli.state.manager import StateManager
+from osl_cli.state.cards import CardStore
+from osl_cli.validation.timers import PhaseTimers
+from osl_cli.validation.workflow import SessionState as WorkflowState, WorkflowEngine
 
 
 @click.command(name="flashcard")
@@ -48,6 +51,13 @@ def flashcard(ctx: click.Context, action: str) -> None:
             )
             return
         
+        # Cards come from gaps found in recall and tutor feedback
+        timers = PhaseTimers(state_manager.base_path)
+        result = WorkflowEngine(timers=timers).advance(session, WorkflowState.CARDS_ACTIVE)
+        if not result.valid:
+            console.print(Panel(f"[red]❌ {result.error}[/red]\n\n[cyan]{result.suggestion}[/cyan]", style="red"))
+            return
+        
         console.print(
             Panel(
                 "🎴 Create Flashcard from YOUR Identified Gap\n\n"
@@ -60,7 +70,11 @@ def flashcard(ctx: click.Context, action: str) -> None:
         
         # Step 1: Identify the gap
         console.print("[cyan]What gap did you identify during recall?[/cyan]")
-        gap = Prompt.ask("Gap identified")
+        gap = Prompt.ask("Gap identified").strip()
+        while not gap:
+            # Cards without a gap count against the from-gaps ratio at CARDS_COMPLETE
+            console.print("[yellow]Describe the gap this card targets.[/yellow]")
+            gap = Prompt.ask("Gap identified").strip()
         
         # Step 2: Decide importance
         important = Confirm.ask("Is this gap important enough to become a flashcard?")
@@ -104,9 +118,13 @@ def flashcard(ctx: click.Context, action: str) -> None:
             current_loop = session.micro_loops[-1]
             current_loop.flashcards_created.append(new_card)
         
+        # Persist to the card store so it can be scheduled after the session
+        CardStore(state_manager.base_path).add(new_card, session.book_id, session.session_id)
+        
         # Update session
         session.flashcards_created += 1
         state_manager.save_current_session(session)
+        timers.save()
         
         console.print(
             Panel(
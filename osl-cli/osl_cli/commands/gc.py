@@ -0,0 +1,70 @@
+"""Garbage collection command - reclaim space in the OSL directory."""
+
+import json
+import click
+from rich.console import Console
+from rich.panel import Panel
+from rich.table import Table
+
+from osl_cli.state.gc import DEFAULT_HISTORY_DAYS, DEFAULT_KEEP_DAYS, collect_garbage
+from osl_cli.state.manager import StateManager
+
+
+def _size(n: int) -> str:
+    for unit in ("B", "KB", "MB"):
+        if abs(n) < 1024:
+            return f"{n:.0f} {unit}" if unit == "B" else f"{n:.1f} {unit}"
+        n /= 1024
+    return f"{n:.1f} GB"
+
+
+@click.command(name="gc")
+@click.option("--keep-days", type=click.IntRange(min=0), default=DEFAULT_KEEP_DAYS,
+              show_default=True, help="Keep .bak/.v*.bak/.last copies younger than this")
+@click.option("--history-days", type=click.IntRange(min=0), default=DEFAULT_HISTORY_DAYS,
+              show_default=True, help="Keep coach state history at full resolution this long")
+@click.option("--keep-blobs", is_flag=True, help="Do not remove unreferenced blobs")
+@click.option("--dry-run", is_flag=True, help="Report what would be reclaimed without removing it")
+@click.option("--json", "as_json", is_flag=True, help="Output report as JSON")
+@click.pass_context
+def gc(ctx: click.Context, keep_days: int, history_days: int, keep_blobs: bool,
+       dry_run: bool, as_json: bool) -> None:
+    """Reclaim space in the OSL directory.
+    
+    Removes stale .bak/.v*.bak/.last copies and abandoned .tmp files,
+    merges archived sessions' hash registries into one file, thins old
+    coach state history to one version per day and removes blobs no
+    session refers to. Lock files are never removed.
+    """
+    console: Console = ctx.obj['console']
+    state_manager = StateManager()
+    
+    if not state_manager.ai_state_path.is_dir():
+        console.print("[red]No OSL directory found. Run 'osl init' first.[/red]")
+        raise click.Abort()
+    
+    report = collect_garbage(state_manager.base_path, keep_days=keep_days,
+                             history_days=history_days, prune_blobs=not keep_blobs,
+                             dry_run=dry_run)
+    
+    if as_json:
+        console.print_json(json.dumps(report.to_dict()))
+        return
+    
+    copies = sum(1 for key in report.removed if not key.endswith(".tmp"))
+    table = Table(title="Garbage Collection (dry run)" if dry_run else "Garbage Collection")
+    table.add_column("Category", style="cyan")
+    table.add_column("Items", justify="right")
+    table.add_column("Reclaimed", justify="right", style="green")
+    table.add_row("Stale copies (.bak/.last)", str(copies), _size(report.reclaimed["copies"]))
+    table.add_row("Temp files", str(len(report.removed) - copies), _size(report.reclaimed["temp"]))
+    table.add_row("Hash registries merged", str(report.registries_merged),
+                  _size(report.reclaimed["registries"]))
+    table.add_row("History versions thinned", str(report.history_versions_dropped),
+                  _size(report.reclaimed["history"]))
+    table.add_row("Unreferenced blobs", str(report.blobs_removed), _size(report.reclaimed["blobs"]))
+    console.print(table)
+    
+    verb = "Would reclaim" if dry_run else "Reclaimed"
+    console.print(Panel(f"{verb} {_size(report.total)} [dim]({report.seconds:.2f}s)[/dim]",
+                        style="green"))
@@ -1,21 +1,40 @@
 """Governance checking and threshold management."""
 
 import click
-from datetime import datetime
+import json
+import time
+from datetime import datetime, timedelta
+from typing import Any, Dict, Optional
 from rich.console import Console
 from rich.panel import Panel
 from rich.table import Table
 from rich.prompt import FloatPrompt, Confirm
 
 from osl_cli.state.manager import StateManager
+from osl_cli.state.schemas import CoachState
+from osl_cli.governance import backtest as bt
+from osl_cli.governance.changepoint import ChangePointMonitor, SIGNALS, describe, raise_remediation
 from osl_cli.governance.gates import GovernanceChecker
+from osl_cli.governance.timeline import GateTimeline
 
 
 @click.command(name="governance")
-@click.argument("action", type=click.Choice(["check", "tune"]))
+@click.argument("action", type=click.Choice(["check", "tune", "timeline", "backtest", "drift"]))
 @click.option("--gate", "-g", help="Specific gate to tune")
+@click.option("--days", type=click.IntRange(1), help="Timeline/backtest: only the last N days")
+@click.option("--limit", "-n", type=click.IntRange(1), default=20,
+              help="Timeline: most recent N changes; backtest: settings shown")
+@click.option("--steps", type=click.IntRange(2), default=bt.DEFAULT_STEPS,
+              help="Backtest: settings per continuous threshold range")
+@click.option("--sort", "sort_by", type=click.Choice(["blocked", "remediation", "normal", "flips"]),
+              default="blocked", help="Backtest: order settings by fewest blocked/remediation/flips or most normal days")
+@click.option("--json", "as_json", is_flag=True, help="Backtest: output every setting as JSON")
+@click.option("--rebuild", is_flag=True, help="Drift: replay all history into fresh detectors")
+@click.option("--clear", "clear_book", is_flag=False, flag_value="*", default=None, metavar="[BOOK]",
+              help="Drift: acknowledge active alarms (all, or one book's)")
 @click.pass_context
-def governance(ctx: click.Context, action: str, gate: str) -> None:
+def governance(ctx: click.Context, action: str, gate: str, days: Optional[int], limit: int,
+               steps: int, sort_by: str, as_json: bool, rebuild: bool, clear_book: Optional[str]) -> None:
     """Check governance gates and manage thresholds.
     
     Gates enforce learning quality:
@@ -23,12 +42,35 @@ def governance(ctx: click.Context, action: str, gate: str) -> None:
     - Card Debt: Review backlog (1.5×-2.5× daily throughput)
     - Transfer: Project completion per book
     - Interleaving: Mixed practice frequency
+    
+    `timeline` lists when the overall state flipped between NORMAL,
+    REMEDIATION and BLOCKED, and which gate inputs caused it.
+    
+    `backtest` replays daily gate inputs from history against a grid of
+    thresholds within each gate's min-max range and reports how often each
+    setting would have blocked or remediated (requires NumPy).
+    
+    `drift` shows the streaming change-point detectors that watch each
+    book's retrieval scores and review recall for sudden drops.
     """
     console: Console = ctx.obj['console']
     state_manager = StateManager()
     
+    if action == "timeline":
+        _show_timeline(console, GateTimeline(state_manager.base_path), days, limit)
+        return
+    
+    if action == "drift":
+        _show_drift(console, state_manager, rebuild, clear_book)
+        return
+    
     coach_state = state_manager.load_coach_state()
-    checker = GovernanceChecker(coach_state)
+    
+    if action == "backtest":
+        _backtest(console, state_manager, coach_state, days, limit, steps, sort_by, as_json)
+        return
+    
+    checker = GovernanceChecker(coach_state, state_manager.base_path, source="governance check")
     
     if action == "check":
         # Check all gates
@@ -195,4 +237,170 @@ def governance(ctx: click.Context, action: str, gate: str) -> None:
                         f"{name}: {new_value}",
                         style="green"
                     )
-                )
\ No newline at end of file
+                )
+
+
+def _show_timeline(console: Console, timeline: GateTimeline, days: Optional[int], limit: int) -> None:
+    """Print governance state changes."""
+    since = datetime.now() - timedelta(days=days) if days else None
+    entries = timeline.entries(since, limit)
+    if not entries:
+        console.print("[yellow]No governance changes recorded yet. Run 'osl governance check'.[/yellow]")
+        return
+    
+    table = Table(title="Governance Timeline")
+    table.add_column("When", style="cyan", no_wrap=True)
+    table.add_column("State", no_wrap=True)
+    table.add_column("Gate", style="yellow", no_wrap=True)
+    table.add_column("Why", style="white")
+    
+    colors = {"NORMAL": "green", "REMEDIATION": "yellow", "BLOCKED": "red"}
+    for entry in entries:
+        state = f"[{colors.get(entry['to'], 'white')}]{entry['to']}[/]"
+        if entry.get("from") and entry["from"] != entry["to"]:
+            state = f"{entry['from']} → {state}"
+        when = entry["ts"][:16].replace("T", " ")
+        
+        flipped = entry.get("flipped") or [None]
+        for i, gate_name in enumerate(flipped):
+            gate_text = ""
+            reason = ""
+            if gate_name:
+                gate_text = f"{'✅' if entry['gates'][gate_name] else '❌'} {gate_name}"
+                reason = entry.get("reasons", {}).get(gate_name, {}).get("message", "")
+            table.add_row(when if i == 0 else "", state if i == 0 else "", gate_text, reason)
+        
+    console.print(table)
+
+
+
+def _backtest(console: Console, state_manager: StateManager, coach_state: CoachState, days: Optional[int],
+              limit: int, steps: int, sort_by: str, as_json: bool) -> None:
+    """Run and print a threshold backtest."""
+    try:
+        bt.require_numpy()
+    except ImportError as e:
+        raise click.ClickException(str(e))
+    
+    with console.status("Reconstructing daily gate inputs..."):
+        history = bt.load_history(state_manager.base_path, days)
+    
+    thresholds = coach_state.governance_thresholds
+    throughput = coach_state.performance_metrics.daily_review_throughput
+    grid = bt.threshold_grid(thresholds, steps)
+    started = time.perf_counter()
+    result = bt.backtest(history, grid["calibration"], grid["card_debt_multiplier"],
+                         grid["interleaving_per_week"], throughput)
+    elapsed = time.perf_counter() - started
+    current = bt.backtest(history, [thresholds.calibration_gate.current],
+                          [thresholds.card_debt_multiplier.current],
+                          [thresholds.interleaving_per_week.current], throughput).rows()[0]
+    
+    rows = result.rows()
+    if sort_by == "normal":
+        rows.sort(key=lambda r: (-r["normal_days"], r["flips"]))
+    else:
+        rows.sort(key=lambda r: (r["flips"] if sort_by == "flips" else r[f"{sort_by}_days"], r["flips"]))
+    
+    if as_json:
+        click.echo(json.dumps({
+            "days": result.n_days,
+            "from": history.days[0].isoformat(),
+            "to": history.days[-1].isoformat(),
+            "throughput": throughput,
+            "current": current,
+            "settings": rows,
+        }, indent=2))
+        return
+    
+    console.print(Panel(
+        f"Replayed {result.n_days} days ({history.days[0]} to {history.days[-1]}) "
+        f"against {result.size:,} settings in {elapsed * 1000:.0f} ms\n"
+        f"Current setting: blocked {current['blocked_rate']:.0%}, "
+        f"remediation {current['remediation_rate']:.0%}, {current['flips']} state changes",
+        title="📈 Governance Backtest",
+        style="bold blue",
+    ))
+    
+    table = Table(title=f"Settings by {sort_by} days")
+    table.add_column("Calibration", justify="right")
+    table.add_column("Debt ×", justify="right")
+    table.add_column("Interleave", justify="right")
+    table.add_column("Blocked", justify="right", style="red")
+    table.add_column("Remediation", justify="right", style="yellow")
+    table.add_column("Normal", justify="right", style="green")
+    table.add_column("Flips", justify="right")
+    
+    def add(row: Dict[str, Any], style: Optional[str] = None) -> None:
+        table.add_row(
+            f"{row['calibration_gate']:g}%",
+            f"{row['card_debt_multiplier']:g}",
+            f"{row['interleaving_per_week']:g}",
+            f"{row['blocked_rate']:.0%}",
+            f"{row['remediation_rate']:.0%}",
+            f"{row['normal_days'] / result.n_days:.0%}",
+            str(row["flips"]),
+            style=style,
+        )
+    
+    add(current, "bold cyan")
+    for row in rows[:limit]:
+        add(row)
+    console.print(table)
+    console.print("[dim]First row (bold) is the current setting.[/dim]")
+
+
+
+def _show_drift(console: Console, state_manager: StateManager, rebuild: bool,
+                clear_book: Optional[str]) -> None:
+    """Print change-point detector state and alarms."""
+    monitor = ChangePointMonitor(state_manager.base_path)
+    if rebuild:
+        with console.status("Replaying history..."):
+            alarms = monitor.rebuild()
+        console.print(f"Replayed history: {len(alarms)} drops detected")
+    else:
+        alarms = monitor.ingest_review_log()
+    
+    if clear_book:
+        cleared = monitor.clear(None if clear_book == "*" else clear_book)
+        console.print(f"[green]Cleared {cleared} alarm(s).[/green]")
+    monitor.save()
+    
+    recent = [a for a in alarms if a in monitor.active_alarms()]
+    if recent:
+        raise_remediation(state_manager.base_path, recent)
+    
+    table = Table(title="Change-Point Detectors")
+    table.add_column("Book", style="cyan")
+    table.add_column("Signal")
+    table.add_column("Samples", justify="right")
+    table.add_column("Baseline", justify="right")
+    table.add_column("Recent", justify="right")
+    table.add_column("Evidence", justify="right")
+    
+    for key, state in sorted(monitor.data["streams"].items()):
+        signal, book_id = key.split(":", 1)
+        fmt = "{:.0%}" if signal == "reviews" else "{:.1f}"
+        evidence = (state["cum"] - state["min_cum"]) / SIGNALS[signal].threshold
+        table.add_row(
+            book_id,
+            signal,
+            str(state["n"]),
+            fmt.format(state["mean"]) if state["n"] else "-",
+            fmt.format(state["recent"]) if state["recent"] is not None else "-",
+            f"{evidence:.0%}",
+        )
+    console.print(table)
+    console.print("[dim]Evidence is the drop statistic as a share of the alarm threshold.[/dim]")
+    
+    active = monitor.active_alarms()
+    if active:
+        console.print(Panel(
+            "\n".join(f"{a['at'][:16].replace('T', ' ')}  {describe(a)}" for a in active)
+            + "\n\nClear with [cyan]osl governance drift --clear[/cyan] once addressed.",
+            title="⚠️ Active Drops",
+            style="yellow",
+        ))
+    else:
+        console.print("[green]No active drops.[/green]")
@@ -14,6 +14,7 @@ from osl_cli.state.schemas import (
     GovernanceThreshold,
     GovernanceStatus,
 )
+from osl_cli.validation.markers import CONFIG_FILE as MARKERS_CONFIG, DEFAULT_MARKERS
 
 
 @click.command(name="init")
@@ -46,7 +47,8 @@ def init_command(ctx: click.Context, path: str, force: bool) -> None:
     │   ├── session_logs/
     │   └── memory/
     └── config/                 # User configuration
-        └── osl_config.yaml
+        ├── osl_config.yaml
+        └── ai_markers.json     # AI-paraphrase markers for audits
     """
     console: Console = ctx.obj['console']
     
@@ -153,6 +155,15 @@ anki:
         config_path.write_text(config_content)
         console.print(f"✅ Created: {config_path.relative_to(base_path)}")
     
+    # Create default AI-paraphrase markers
+    markers_path = osl_path / "config" / MARKERS_CONFIG
+    
+    if not markers_path.exists() or force:
+        markers_path.write_text(json.dumps(
+            {"case_sensitive": True, "markers": list(DEFAULT_MARKERS)}, indent=2
+        ))
+        console.print(f"✅ Created: {markers_path.relative_to(base_path)}")
+    
     # Display structure tree
     tree = Tree("📚 OSL Directory Structure")
     obsidian = tree.add("📝 obsidian/")
@@ -166,6 +177,7 @@ anki:
     ai_state.add("🧠 memory/")
     config = tree.add("⚙️ config/")
     config.add("📄 osl_config.yaml")
+    config.add(f"📄 {MARKERS_CONFIG}")
     
     console.print("\n", tree)
     
@@ -10,6 +10,8 @@ from rich.progress import Progress, BarColumn, TextColumn
 
 from osl_cli.state.schemas import CoachState, SessionState
 from osl_cli.state.manager import StateManager
+from osl_cli.review.calibration import CalibrationTracker
+from osl_cli.review.interleave import InterleavingLog
 
 
 @click.group(name="metrics")
@@ -180,10 +182,15 @@ def calculate_metrics(ctx: click.Context, type: str) -> None:
         console.print(f"✓ Retrieval rate updated: {old_retrieval:.1f}% → {metrics.avg_retrieval_7d:.1f}%")
     
     if type in ["calibration", "all"]:
-        # Update calibration accuracy
+        # Update calibration accuracy from recorded quizzes
         old_cal = metrics.avg_prediction_accuracy_7d
-        metrics.avg_prediction_accuracy_7d = (metrics.avg_prediction_accuracy_7d * 0.9 + 75)
-        console.print(f"✓ Calibration updated: {old_cal:.0f}% → {metrics.avg_prediction_accuracy_7d:.0f}%")
+        accuracy = CalibrationTracker(state_manager.base_path).prediction_accuracy(7)
+        if accuracy is None:
+            # No quiz this week: keep the last known accuracy
+            console.print(f"✓ Calibration: no quizzes in the last 7 days, keeping {old_cal:.0f}%")
+        else:
+            metrics.avg_prediction_accuracy_7d = accuracy
+            console.print(f"✓ Calibration updated: {old_cal:.0f}% → {accuracy:.0f}%")
     
     if type in ["debt", "all"]:
         # Calculate card debt
@@ -191,6 +198,11 @@ def calculate_metrics(ctx: click.Context, type: str) -> None:
             metrics.current_card_debt_ratio = metrics.cards_due / metrics.daily_review_throughput
         console.print(f"✓ Card debt ratio: {metrics.current_card_debt_ratio:.1f}x")
     
+    if type == "all":
+        # Interleaving sessions in the trailing week, from the session log
+        metrics.interleaving_sessions_week = InterleavingLog(state_manager.base_path).sessions_this_week()
+        console.print(f"✓ Interleaving sessions this week: {metrics.interleaving_sessions_week}")
+    
     state_manager.save_coach_state(coach_state)
     console.print("\n[green]✓ Metrics updated successfully![/green]")
 
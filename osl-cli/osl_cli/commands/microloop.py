@@ -9,6 +9,18 @@ from rich.prompt import Prompt, IntPrompt
 
 from osl_cli.state.schemas import MicroLoop, RecallData, FeynmanExplanation
 from osl_cli.state.manager import StateManager
+from osl_cli.governance.changepoint import ChangePointMonitor, describe, raise_remediation
+from osl_cli.validation.timers import PhaseTimers, describe as describe_timeout
+from osl_cli.validation.workflow import (
+    PHASE_LIMITS,
+    SessionState as WorkflowState,
+    ValidationResult,
+    WorkflowEngine,
+)
+
+
+def _refused(console: Console, result: ValidationResult) -> None:
+    console.print(Panel(f"[red]❌ {result.error}[/red]\n\n[cyan]{result.suggestion}[/cyan]", style="red"))
 
 
 @click.command(name="microloop")
@@ -34,6 +46,8 @@ def microloop(ctx: click.Context, action: str, pages: str) -> None:
         return
     
     session = state_manager.load_current_session()
+    timers = PhaseTimers(state_manager.base_path)
+    engine = WorkflowEngine(timers=timers)
     
     if action == "start":
         # Start new micro-loop
@@ -49,9 +63,16 @@ def microloop(ctx: click.Context, action: str, pages: str) -> None:
             start_time=datetime.now(),
         )
         
+        # Closes the previous loop's flashcard step on the way
+        result = engine.advance(session, WorkflowState.READING, {"pages_read": pages},
+                                along=engine.loop_inputs(session))
+        if not result.valid:
+            _refused(console, result)
+            return
+        
         session.micro_loops.append(new_loop)
-        session.state = "READING"
         state_manager.save_current_session(session)
+        timers.save()
         
         console.print(
             Panel(
@@ -77,6 +98,11 @@ def microloop(ctx: click.Context, action: str, pages: str) -> None:
             console.print("[yellow]Current micro-loop already completed![/yellow]")
             return
         
+        result = engine.advance(session, WorkflowState.RECALL_ACTIVE)
+        if not result.valid:
+            _refused(console, result)
+            return
+        
         console.print(Panel("🧠 Free Recall Phase", style="bold blue"))
         console.print(
             "[cyan]Close your book and spend 1-2 minutes recalling what you just read.[/cyan]\n"
@@ -97,6 +123,12 @@ def microloop(ctx: click.Context, action: str, pages: str) -> None:
         # Get verbatim recall
         console.print("\n[cyan]Now write a paragraph summarizing what you remember:[/cyan]")
         verbatim_recall = Prompt.ask("Your recall")
+        check = engine.check_inputs(WorkflowState.RECALL_COMPLETE, {"recall_text": verbatim_recall})
+        while not check.valid:
+            # Keep what was written and ask for more rather than refusing
+            console.print(f"[yellow]{check.error}. {check.suggestion}.[/yellow]")
+            verbatim_recall = f"{verbatim_recall} {Prompt.ask('Continue your recall')}".strip()
+            check = engine.check_inputs(WorkflowState.RECALL_COMPLETE, {"recall_text": verbatim_recall})
         
         # Calculate hash for verbatim storage
         recall_hash = hashlib.sha256(verbatim_recall.encode()).hexdigest()
@@ -108,20 +140,40 @@ def microloop(ctx: click.Context, action: str, pages: str) -> None:
         )
         
         # Create recall data
+        recall_seconds = round(timers.elapsed(session.session_id, current_loop.loop_id, "recall") or 0)
         recall_data = RecallData(
-            duration_seconds=90,  # Would track actual time in full implementation
+            duration_seconds=recall_seconds,
             key_points=key_points,
             confidence_score=int(confidence),
             verbatim_recall=verbatim_recall,
             recall_hash=recall_hash,
         )
         
+        result = engine.advance(session, WorkflowState.RECALL_COMPLETE, {
+            "recall_text": verbatim_recall,
+            "duration_seconds": recall_data.duration_seconds,
+            "text_hash": recall_hash,
+        })
+        if not result.valid:
+            _refused(console, result)
+            return
+        
+        result = engine.advance(session, WorkflowState.FEYNMAN_ACTIVE)
+        if not result.valid:
+            _refused(console, result)
+            return
+        
         console.print(Panel("📝 Feynman Explanation Phase", style="bold blue"))
         console.print(
             "[cyan]Explain what you learned as if teaching a smart 12-year-old.[/cyan]\n"
         )
         
         explanation = Prompt.ask("Your explanation")
+        check = engine.check_inputs(WorkflowState.FEYNMAN_COMPLETE, {"explanation_text": explanation})
+        while not check.valid:
+            console.print(f"[yellow]{check.error}. {check.suggestion}.[/yellow]")
+            explanation = f"{explanation} {Prompt.ask('Continue your explanation')}".strip()
+            check = engine.check_inputs(WorkflowState.FEYNMAN_COMPLETE, {"explanation_text": explanation})
         
         # Ask for analogies and examples
         console.print("\n[cyan]List any analogies you used:[/cyan]")
@@ -148,9 +200,17 @@ def microloop(ctx: click.Context, action: str, pages: str) -> None:
             explanation_hash=explanation_hash,
             analogies_used=analogies,
             examples_created=examples,
-            duration_seconds=120,  # Would track actual time
+            duration_seconds=round(timers.elapsed(session.session_id, current_loop.loop_id, "feynman") or 0),
         )
         
+        result = engine.advance(session, WorkflowState.FEYNMAN_COMPLETE, {
+            "explanation_text": explanation,
+            "text_hash": explanation_hash,
+        })
+        if not result.valid:
+            _refused(console, result)
+            return
+        
         # Calculate retrieval score (simplified)
         # In full implementation, would compare against source material
         retrieval_score = min(100, confidence * 10 + len(key_points) * 5)
@@ -163,16 +223,36 @@ def microloop(ctx: click.Context, action: str, pages: str) -> None:
         
         # Update session
         session.retrieval_scores.append(retrieval_score)
-        session.total_recall_time += 90
-        session.total_explanation_time += 120
-        session.state = "FEEDBACK"
+        session.total_recall_time += recall_data.duration_seconds
+        session.total_explanation_time += feynman_data.duration_seconds
+        engine.advance(session, WorkflowState.TUTOR_QA_PENDING)
         
         state_manager.save_current_session(session)
+        timers.save()
+        
+        for phase in current_loop.timed_out:
+            timeout = {
+                "phase": phase,
+                "loop_id": current_loop.loop_id,
+                "limit_s": PHASE_LIMITS[phase],
+                "elapsed_s": current_loop.phase_durations[phase],
+            }
+            console.print(f"[yellow]⏰ {describe_timeout(timeout)}[/yellow]")
+        
+        # Streaming drop detection on this book's retrieval scores
+        monitor = ChangePointMonitor(state_manager.base_path)
+        alarm = monitor.observe_retrieval(session.book_id, retrieval_score)
+        monitor.save()
+        if alarm:
+            raise_remediation(state_manager.base_path, [alarm])
+            console.print(f"[yellow]⚠️ {describe(alarm)}. Governance moved to REMEDIATION.[/yellow]")
         
         console.print(
             Panel(
                 f"[green]✅ Micro-loop {current_loop.loop_id} completed![/green]\n\n"
                 f"📊 Retrieval Score: {retrieval_score}%\n"
+                f"⏱️ Recall {recall_data.duration_seconds}s, "
+                f"explanation {feynman_data.duration_seconds}s\n"
                 f"🧠 Key Points Recalled: {len(key_points)}\n"
                 f"💡 Analogies Used: {len(analogies)}\n"
                 f"📝 Examples Created: {len(examples)}\n\n"
@@ -9,6 +9,8 @@ from rich.table import Table
 from rich.prompt import Prompt, Confirm
 
 from osl_cli.state.manager import StateManager
+from osl_cli.state.misconceptions import MisconceptionStore
+from osl_cli.state.schemas import MisconceptionRecord
 
 
 @click.group(name="misconception")
@@ -55,19 +57,19 @@ def add_misconception(ctx: click.Context, description: Optional[str], source: Op
     misconception_id = f"misc_{datetime.now().strftime('%Y%m%d_%H%M%S')}"
     
     # Create misconception data
-    misconception = {
-        "misconception_id": misconception_id,
-        "identified_at": datetime.now().isoformat(),
-        "during_loop": len(session.micro_loops),
-        "description": description,
-        "source": source,
-        "resolved": False
-    }
-    
-    # Add to session (we'll store in a list for now)
-    if not hasattr(session, 'misconceptions_identified'):
-        session.misconceptions_identified = []
-    session.misconceptions_identified.append(misconception)
+    misconception = MisconceptionRecord(
+        misconception_id=misconception_id,
+        book_id=session.book_id,
+        session_id=session.session_id,
+        identified_at=datetime.now(),
+        during_loop=len(session.micro_loops),
+        description=description,
+        source=source,
+    )
+    
+    # Persist across sessions and keep a copy in the session log
+    MisconceptionStore(state_manager.base_path).save(misconception)
+    session.misconceptions_identified.append(misconception.model_dump(mode="json"))
     
     # Update metrics
     coach_state = state_manager.load_coach_state()
@@ -108,7 +110,7 @@ def list_misconceptions(ctx: click.Context, all: bool) -> None:
     
     session = state_manager.load_current_session()
     
-    if not hasattr(session, 'misconceptions_identified') or not session.misconceptions_identified:
+    if not session.misconceptions_identified:
         console.print("[green]No misconceptions identified—great work![/green]")
         return
     
@@ -159,55 +161,48 @@ def resolve_misconception(ctx: click.Context, misconception_id: str, correction:
     console: Console = ctx.obj['console']
     state_manager = StateManager()
     
-    if not state_manager.has_active_session():
-        console.print("[red]No active session![/red]")
-        return
+    store = MisconceptionStore(state_manager.base_path)
     
-    session = state_manager.load_current_session()
-    
-    if not hasattr(session, 'misconceptions_identified'):
-        console.print("[yellow]No misconceptions recorded![/yellow]")
-        return
-    
-    # Find misconception
-    misconception = None
-    for m in session.misconceptions_identified:
-        if m['misconception_id'] == misconception_id:
-            misconception = m
-            break
+    # Find misconception (may come from an earlier session)
+    misconception = store.get(misconception_id)
     
     if not misconception:
         console.print(f"[red]Misconception '{misconception_id}' not found![/red]")
         return
     
-    if misconception.get('resolved', False):
+    if misconception.resolved:
         console.print(f"[yellow]Misconception already resolved![/yellow]")
         return
     
     # Get correction if not provided
     if not correction:
-        console.print(f"\n[cyan]Original misconception:[/cyan] {misconception['description']}")
+        console.print(f"\n[cyan]Original misconception:[/cyan] {misconception.description}")
         console.print("\n[cyan]How did you correct this understanding?[/cyan]")
         correction = Prompt.ask("Correction")
     
     # Update misconception
-    misconception['resolved'] = True
-    misconception['resolved_at'] = datetime.now().isoformat()
-    misconception['correction'] = correction
-    misconception['flashcard_created'] = flashcard
+    misconception = store.resolve(misconception_id, correction, flashcard)
+    
+    # Mirror into the active session if it was recorded there
+    if state_manager.has_active_session():
+        session = state_manager.load_current_session()
+        for i, m in enumerate(session.misconceptions_identified):
+            if m['misconception_id'] == misconception_id:
+                session.misconceptions_identified[i] = misconception.model_dump(mode="json")
+                state_manager.save_current_session(session)
+                break
     
     # Update metrics
     coach_state = state_manager.load_coach_state()
     coach_state.performance_metrics.misconceptions_active -= 1
     coach_state.performance_metrics.misconceptions_resolved += 1
     
-    state_manager.save_current_session(session)
     state_manager.save_coach_state(coach_state)
     
     console.print(
         Panel(
             f"[green]✓ Misconception resolved![/green]\n\n"
-            f"[cyan]Original:[/cyan] {misconception['description']}\n"
+            f"[cyan]Original:[/cyan] {misconception.description}\n"
             f"[cyan]Correction:[/cyan] {correction}\n"
             f"[cyan]Flashcard:[/cyan] {'Yes' if flashcard else 'No'}",
             style="green"
@@ -250,7 +245,7 @@ def review_misconceptions(ctx: click.Context) -> None:
     
     session = state_manager.load_current_session()
     
-    if not hasattr(session, 'misconceptions_identified') or not session.misconceptions_identified:
+    if not session.misconceptions_identified:
         console.print("\n[green]No misconceptions in current session—excellent![/green]")
         return
     
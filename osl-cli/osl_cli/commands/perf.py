@@ -0,0 +1,93 @@
+"""Performance tracing and reporting commands."""
+
+import json
+import click
+from pathlib import Path
+from typing import Optional, Tuple
+from rich.console import Console
+from rich.panel import Panel
+from rich.table import Table
+
+from osl_cli.perf.trace import default_trace_dir
+from osl_cli.perf.report import trace_files, load_run, aggregate, phase_totals
+
+
+@click.group(name="perf")
+@click.pass_context
+def perf_group(ctx: click.Context) -> None:
+    """Inspect timing traces recorded with --profile or OSL_TRACE."""
+    pass
+
+
+@perf_group.command(name="report")
+@click.argument("paths", nargs=-1, type=click.Path(exists=True, path_type=Path))
+@click.option("--command", "-c", "command_filter", help="Only runs of this command (prefix match)")
+@click.option("--last", "-n", type=click.IntRange(1), help="Only the most recent N runs")
+@click.option("--top", type=click.IntRange(1), default=20, help="Rows to show")
+@click.option("--json", "as_json", is_flag=True, help="Output as JSON")
+@click.pass_context
+def perf_report(ctx: click.Context, paths: Tuple[Path, ...], command_filter: Optional[str],
+                last: Optional[int], top: int, as_json: bool) -> None:
+    """Aggregate trace files across runs.
+    
+    Reads JSON-lines and Chrome-trace files (default: osl/ai_state/traces)
+    and reports per-span call counts, total and self time, and p50/p95
+    latencies, plus self time per phase (import, state, validation,
+    governance, io).
+    """
+    console: Console = ctx.obj['console']
+    
+    files = trace_files(paths or [default_trace_dir()])
+    runs = [r for r in (load_run(f) for f in files) if r is not None]
+    if command_filter:
+        runs = [r for r in runs if r.get("command", "").startswith(command_filter)]
+    if last:
+        runs = runs[-last:]
+    
+    if not runs:
+        console.print("[yellow]No traces found. Run a command with --profile or OSL_TRACE=1.[/yellow]")
+        return
+    
+    rows = aggregate(runs)
+    phases = phase_totals(rows)
+    
+    if as_json:
+        click.echo(json.dumps({"runs": len(runs), "phases": phases, "spans": rows}, indent=2))
+        return
+    
+    wall = sum(phases.values())
+    console.print(
+        Panel(
+            f"[bold cyan]⏱ Trace Report[/bold cyan]\n\n"
+            f"[cyan]Runs:[/cyan] {len(runs)}\n"
+            f"[cyan]Commands:[/cyan] {', '.join(sorted({r.get('command') or '?' for r in runs}))}\n"
+            f"[cyan]Mean wall time:[/cyan] {wall / len(runs):.1f} ms",
+            style="cyan"
+        )
+    )
+    
+    phase_table = Table(title="Time by Phase (self time)", show_header=True)
+    phase_table.add_column("Phase", style="cyan")
+    phase_table.add_column("Total ms", justify="right")
+    phase_table.add_column("Share", justify="right")
+    for cat, total in phases.items():
+        share = 100 * total / wall if wall else 0
+        phase_table.add_row(cat, f"{total:.1f}", f"{share:.0f}%")
+    console.print(phase_table)
+    
+    table = Table(title="Spans", show_header=True)
+    table.add_column("Span", style="cyan", no_wrap=True)
+    table.add_column("Phase", style="dim", no_wrap=True)
+    table.add_column("Calls", justify="right")
+    table.add_column("Self ms", justify="right", style="yellow")
+    table.add_column("Total ms", justify="right")
+    table.add_column("p50", justify="right")
+    table.add_column("p95", justify="right")
+    table.add_column("Max", justify="right")
+    for row in rows[:top]:
+        table.add_row(
+            row["name"], row["cat"], str(row["calls"]),
+            f"{row['self_ms']:.1f}", f"{row['total_ms']:.1f}",
+            f"{row['p50_ms']:.2f}", f"{row['p95_ms']:.2f}", f"{row['max_ms']:.2f}",
+        )
+    console.print(table)
@@ -1,15 +1,15 @@
 """Curiosity question tracking commands."""
 
 import click
-from datetime import datetime
 from typing import Optional
 from rich.console import Console
 from rich.panel import Panel
 from rich.table import Table
 from rich.prompt import Prompt, IntPrompt
 
-from osl_cli.state.schemas import CuriosityQuestion, SessionState
+from osl_cli.state.schemas import SessionState
 from osl_cli.state.manager import StateManager
+from osl_cli.state.questions import QuestionStore
 
 
 @click.group(name="questions")
@@ -55,11 +55,12 @@ def add_question(ctx: click.Context, question: Optional[str]) -> None:
         console.print("[cyan]What are you curious about?[/cyan]")
         question = Prompt.ask("Question")
     
-    # Create question
-    new_question = CuriosityQuestion(
-        id=len(session.curiosity_questions) + 1,
+    # Create question in the persistent backlog (stable ID)
+    store = QuestionStore(state_manager.base_path)
+    new_question = store.add(
+        book_id=session.book_id,
         question=question,
-        created=datetime.now()
+        session_id=session.session_id,
     )
     
     session.curiosity_questions.append(new_question)
@@ -77,37 +78,37 @@ def add_question(ctx: click.Context, question: Optional[str]) -> None:
 
 @questions_group.command(name="list")
 @click.option("--all", "-a", is_flag=True, help="Show resolved questions too")
+@click.option("--book", "-b", help="Book ID (defaults to the active session's book)")
 @click.pass_context
-def list_questions(ctx: click.Context, all: bool) -> None:
-    """List curiosity questions for current session.
+def list_questions(ctx: click.Context, all: bool, book: Optional[str]) -> None:
+    """List curiosity questions for a book.
     
     Shows:
-    - Active (unresolved) questions by default
+    - Active (unresolved) questions by default, across all sessions
     - All questions with --all flag
     - Resolution status and page found
     """
     console: Console = ctx.obj['console']
     state_manager = StateManager()
     
-    if not state_manager.has_active_session():
-        console.print("[red]No active session![/red]")
-        return
-    
-    session = state_manager.load_current_session()
+    if not book:
+        if not state_manager.has_active_session():
+            console.print("[red]No active session![/red]")
+            console.print("Pass [cyan]--book[/cyan] to list a book's questions")
+            return
+        book = state_manager.load_current_session().book_id
     
-    if not session.curiosity_questions:
-        console.print("[yellow]No curiosity questions yet![/yellow]")
-        console.print("Add questions with: [cyan]osl questions add[/cyan]")
-        return
+    store = QuestionStore(state_manager.base_path)
+    questions = store.list_book(book) if all else store.list_open(book)
     
-    # Filter questions
-    questions = session.curiosity_questions
-    if not all:
-        questions = [q for q in questions if not q.resolved]
-        if not questions:
+    if not questions:
+        if not all and store.list_book(book):
             console.print("[yellow]All questions resolved![/yellow]")
             console.print("Use [cyan]--all[/cyan] to see resolved questions")
-            return
+        else:
+            console.print("[yellow]No curiosity questions yet![/yellow]")
+            console.print("Add questions with: [cyan]osl questions add[/cyan]")
+        return
     
     table = Table(title="❓ Curiosity Questions", show_header=True)
     table.add_column("ID", style="cyan", width=4)
@@ -119,7 +120,7 @@ def list_questions(ctx: click.Context, all: bool) -> None:
     for q in questions:
         status = "[green]✓ Resolved[/green]" if q.resolved else "[yellow]○ Active[/yellow]"
         page = str(q.page_found) if q.page_found else "—"
-        created = q.created.strftime("%H:%M")
+        created = q.created.strftime("%Y-%m-%d")
         
         table.add_row(
             str(q.id),
@@ -147,19 +148,10 @@ def resolve_question(ctx: click.Context, question_id: int, page: Optional[int],
     """
     console: Console = ctx.obj['console']
     state_manager = StateManager()
+    store = QuestionStore(state_manager.base_path)
     
-    if not state_manager.has_active_session():
-        console.print("[red]No active session![/red]")
-        return
-    
-    session = state_manager.load_current_session()
-    
-    # Find question
-    question = None
-    for q in session.curiosity_questions:
-        if q.id == question_id:
-            question = q
-            break
+    # Find question in the backlog (works across sessions)
+    question = store.get(question_id)
     
     if not question:
         console.print(f"[red]Question {question_id} not found![/red]")
@@ -179,12 +171,17 @@ def resolve_question(ctx: click.Context, question_id: int, page: Optional[int],
         answer = Prompt.ask("Answer")
     
     # Update question
-    question.resolved = True
-    question.page_found = page
-    question.answer = answer
-    question.resolved_at = datetime.now()
-    
-    state_manager.save_current_session(session)
+    question = store.resolve(question_id, page, answer)
+    
+    # Mirror into the active session if it was asked there (matching the
+    # creation time too, in case sync renumbered a question)
+    if state_manager.has_active_session():
+        session = state_manager.load_current_session()
+        for i, q in enumerate(session.curiosity_questions):
+            if q.id == question_id and q.created == question.created:
+                session.curiosity_questions[i] = question
+                state_manager.save_current_session(session)
+                break
     
     console.print(
         Panel(
@@ -197,7 +194,7 @@ def resolve_question(ctx: click.Context, question_id: int, page: Optional[int],
     )
     
     # Show remaining questions
-    unresolved = [q for q in session.curiosity_questions if not q.resolved]
+    unresolved = store.list_open(question.book_id) if question.book_id else []
     if unresolved:
         console.print(f"\n[cyan]Remaining questions ({len(unresolved)}):[/cyan]")
         for q in unresolved:
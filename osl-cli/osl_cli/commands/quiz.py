@@ -1,22 +1,138 @@
 """Quiz generation command - weekly calibration only."""
 
+import uuid
 import click
 from datetime import datetime, timedelta
+from typing import Any, Dict, List, Optional
 from rich.console import Console
 from rich.panel import Panel
 from rich.table import Table
+from rich.prompt import Prompt, IntPrompt, Confirm
 
 from osl_cli.state.manager import StateManager
+from osl_cli.state.schemas import CoachState
+from osl_cli.review.quiz import QuizEngine
+from osl_cli.review.calibration import CalibrationTracker
+
+
+def _ask_percent(label: str) -> int:
+    """Prompt for an integer between 0 and 100."""
+    while True:
+        value = IntPrompt.ask(label)
+        if 0 <= value <= 100:
+            return value
+
+
+def run_calibration_quiz(
+    console: Console,
+    state_manager: StateManager,
+    coach_state: CoachState,
+    count: int,
+) -> Optional[Dict[str, Any]]:
+    """Sample, administer and record a calibration quiz.
+    
+    Args:
+        console: Console for output
+        state_manager: State manager (for paths)
+        coach_state: Coach state to update with calibration metrics
+        count: Number of items
+        
+    Returns:
+        Quiz result dictionary, or None if there was nothing to quiz
+    """
+    book_ids = [b.id for b in coach_state.active_books] or None
+    items = QuizEngine(state_manager.base_path).sample(count, book_ids)
+    
+    if not items:
+        console.print(
+            "[yellow]No quiz material yet.[/yellow]\n"
+            "Create flashcards, curiosity questions or misconceptions first."
+        )
+        return None
+    
+    # Show the actual blueprint of this quiz
+    table = Table(title="Quiz Blueprint")
+    table.add_column("Type", style="cyan")
+    table.add_column("Count", style="yellow")
+    for stratum in ("recall", "application", "transfer"):
+        table.add_row(stratum.title(), str(sum(1 for i in items if i.stratum == stratum)))
+    console.print(table)
+    
+    predicted_score = _ask_percent("Predict your overall score (0-100)")
+    
+    answered: List[Dict[str, Any]] = []
+    for n, item in enumerate(items, 1):
+        console.print(
+            Panel(
+                f"[bold]{item.prompt}[/bold]",
+                title=f"{n}/{len(items)} · {item.stratum}",
+                style="cyan"
+            )
+        )
+        confidence = _ask_percent("Confidence you'll get this right (0-100)")
+        Prompt.ask("Your answer")
+        if item.answer:
+            console.print(f"[dim]Your recorded answer:[/dim] {item.answer}")
+        correct = Confirm.ask("Did you get it right?")
+        answered.append({
+            "item_id": item.item_id,
+            "stratum": item.stratum,
+            "confidence": confidence,
+            "correct": correct,
+        })
+    
+    actual_score = round(100 * sum(a["correct"] for a in answered) / len(answered))
+    result = {
+        "quiz_id": str(uuid.uuid4())[:8],
+        "taken_at": datetime.now().isoformat(),
+        "predicted_score": predicted_score,
+        "actual_score": actual_score,
+        "items": answered,
+    }
+    
+    tracker = CalibrationTracker(state_manager.base_path)
+    tracker.record_quiz(result)
+    accuracy = tracker.prediction_accuracy(7)
+    if accuracy is not None:
+        coach_state.performance_metrics.avg_prediction_accuracy_7d = accuracy
+    
+    brier = tracker.brier_score()
+    console.print(
+        Panel(
+            f"[cyan]Predicted:[/cyan] {predicted_score}%\n"
+            f"[cyan]Actual:[/cyan] {actual_score}%\n"
+            f"[cyan]7-day prediction accuracy:[/cyan] "
+            f"{coach_state.performance_metrics.avg_prediction_accuracy_7d:.0f}%\n"
+            f"[cyan]Brier score (all time):[/cyan] {brier:.3f}",
+            title="Calibration Result",
+            style="green"
+        )
+    )
+    
+    curve = Table(title="Calibration Curve")
+    curve.add_column("Confidence", style="cyan")
+    curve.add_column("Items", style="white")
+    curve.add_column("Hit Rate", style="yellow")
+    for point in tracker.calibration_curve():
+        curve.add_row(
+            f"{point['low']:.0%}-{point['high']:.0%}",
+            str(point["n"]),
+            f"{point['hit_rate']:.0%}"
+        )
+    console.print(curve)
+    
+    return result
 
 
 @click.command(name="quiz")
 @click.argument("action", type=click.Choice(["generate", "schedule"]))
+@click.option("--count", "-n", type=click.IntRange(6, 10), default=10, help="Number of quiz items")
 @click.pass_context
-def quiz(ctx: click.Context, action: str) -> None:
+def quiz(ctx: click.Context, action: str, count: int) -> None:
     """Generate calibration quiz (weekly only).
     
     Weekly calibration quiz:
-    - 6-10 AI-generated items
+    - 6-10 items sampled from your cards, questions and misconceptions
     - Tests understanding and retention
     - Provides prediction vs actual performance data
     
@@ -51,51 +167,22 @@ def quiz(ctx: click.Context, action: str) -> None:
             Panel(
                 "📝 Weekly Calibration Quiz\n\n"
                 "[bold]Purpose:[/bold] Measure actual vs predicted performance\n\n"
-                "[cyan]In full implementation, AI would generate:[/cyan]\n"
-                "• 3 recall questions (facts from the week)\n"
-                "• 3-4 application questions (use concepts)\n"
-                "• 2-3 transfer questions (new contexts)\n\n"
-                "You would:\n"
+                "You will:\n"
                 "1. Predict your score\n"
-                "2. Take the quiz\n"
+                "2. Rate your confidence and answer each item\n"
                 "3. Compare actual vs predicted\n"
                 "4. Identify calibration gaps",
                 style="bold blue"
             )
         )
         
-        # Simulate quiz blueprint
-        table = Table(title="Quiz Blueprint")
-        table.add_column("Type", style="cyan")
-        table.add_column("Count", style="yellow")
-        table.add_column("Example", style="white")
-        
-        table.add_row(
-            "Recall",
-            "3",
-            "What is the 4-hour limit for?"
-        )
-        table.add_row(
-            "Application", 
-            "4",
-            "How would you apply deep work to coding?"
-        )
-        table.add_row(
-            "Transfer",
-            "3",
-            "How might deep work principles apply to painting?"
-        )
-        
-        console.print(table)
+        result = run_calibration_quiz(console, state_manager, coach_state, count)
+        if result is None:
+            return
         
         # Update next calibration date
         coach_state.review_schedule.next_calibration = datetime.now() + timedelta(days=7)
         state_manager.save_coach_state(coach_state)
-        
-        console.print(
-            "\n[green]Quiz framework ready![/green]\n"
-            "[dim](In full implementation, AI would generate actual questions)[/dim]"
-        )
     
     elif action == "schedule":
         # Show quiz schedule
@@ -1,8 +1,10 @@
 """Spaced repetition and review scheduling commands."""
 
 import click
+import heapq
+import time
 from datetime import datetime, timedelta
-from typing import Optional, List, Dict
+from typing import Any, Optional, Dict, Iterable
 from rich.console import Console
 from rich.panel import Panel
 from rich.table import Table
@@ -10,6 +12,11 @@ from rich.prompt import Prompt, IntPrompt, Confirm
 
 from osl_cli.state.schemas import ReviewSchedule, CoachState
 from osl_cli.state.manager import StateManager
+from osl_cli.state.cards import CardStore
+from osl_cli.commands.quiz import run_calibration_quiz
+from osl_cli.review.interleave import InterleavingScheduler, InterleavingLog, DEFAULT_MAX_RUN
+from osl_cli.review.runner import ReviewRunner, GRADE_LABELS
+from osl_cli.governance.changepoint import ChangePointMonitor, describe, raise_remediation
 
 
 @click.group(name="review")
@@ -36,6 +43,7 @@ def check_due(ctx: click.Context, deck: Optional[str]) -> None:
     
     coach_state = state_manager.load_coach_state()
     metrics = coach_state.performance_metrics
+    metrics.cards_due = CardStore(state_manager.base_path).due_count()
     
     # Calculate card debt
     card_debt_ratio = metrics.cards_due / metrics.daily_review_throughput if metrics.daily_review_throughput > 0 else 0
@@ -66,6 +74,48 @@ def check_due(ctx: click.Context, deck: Optional[str]) -> None:
         console.print("\n[green]✓ No cards due—all caught up![/green]")
 
 
+def _run_review(console: Console, runner: ReviewRunner, cards: Iterable[Dict[str, Any]], limit: int) -> None:
+    """Interactive review loop over a stream of cards.
+
+    Each answer is logged immediately; schedule changes are written at the
+    runner's checkpoints and once more when the loop ends.
+    """
+    grades = {str(g): label for g, label in GRADE_LABELS.items()}
+    try:
+        for i, card in enumerate(runner.stream(cards), 1):
+            if i > limit:
+                break
+            
+            started = time.monotonic()
+            console.print(f"\n[bold cyan]Card {i}/{limit}[/bold cyan] [dim]({card['book_id']})[/dim]")
+            console.print(Panel(card["front"], style="cyan"))
+            answer = Prompt.ask("[dim]Enter to reveal, q to stop[/dim]", default="", show_default=False)
+            if answer.strip().lower() == "q":
+                break
+            
+            console.print(Panel(card["back"], style="green"))
+            choice = Prompt.ask(
+                "Grade (1=again 2=hard 3=good 4=easy, q to stop)",
+                choices=list(grades) + ["q"],
+                default="3",
+            )
+            if choice == "q":
+                break
+            runner.record(card, int(choice), int((time.monotonic() - started) * 1000))
+    finally:
+        runner.checkpoint()
+    
+    # Streaming drop detection over the answers just logged (and any an
+    # interrupted run left behind)
+    monitor = ChangePointMonitor(runner.base_path)
+    alarms = monitor.ingest_review_log()
+    monitor.save()
+    if alarms:
+        raise_remediation(runner.base_path, alarms)
+        for alarm in alarms:
+            console.print(f"[yellow]⚠️ {describe(alarm)}. Governance moved to REMEDIATION.[/yellow]")
+
+
 @review_group.command(name="start")
 @click.option("--limit", "-l", type=int, help="Maximum cards to review")
 @click.option("--type", "-t", 
@@ -80,15 +130,31 @@ def start_review(ctx: click.Context, limit: Optional[int], type: str) -> None:
     - Card debt limits
     - Quality over quantity
     - Interleaving when scheduled
+    
+    Cards are streamed from the due index; answers are logged as they are
+    given and survive an interrupted session.
     """
     console: Console = ctx.obj['console']
     state_manager = StateManager()
     
+    if type == "calibration":
+        ctx.invoke(calibration_quiz)
+        return
+    
     coach_state = state_manager.load_coach_state()
     metrics = coach_state.performance_metrics
     
+    runner = ReviewRunner(state_manager.base_path)
+    recovered = runner.recover()
+    if recovered:
+        console.print(f"[yellow]Recovered {recovered} answers from an interrupted review[/yellow]")
+    
+    cards = CardStore(state_manager.base_path)
+    metrics.cards_due = cards.due_count()
+    
     if metrics.cards_due == 0:
         console.print("[green]No cards due for review![/green]")
+        state_manager.save_coach_state(coach_state)
         return
     
     # Check card debt gate
@@ -121,26 +187,31 @@ def start_review(ctx: click.Context, limit: Optional[int], type: str) -> None:
         Panel(
             f"[green]🎯 Starting Review Session[/green]\n\n"
             f"[cyan]Type:[/cyan] {type.title()}\n"
-            f"[cyan]Cards:[/cyan] {limit}\n"
-            f"[cyan]Estimated Time:[/cyan] {(limit * 10) / 60:.0f} minutes\n\n"
-            f"[dim]In full implementation, this would:[/dim]\n"
-            f"[dim]• Connect to Anki via AnkiConnect[/dim]\n"
-            f"[dim]• Track performance metrics[/dim]\n"
-            f"[dim]• Update retrieval scores[/dim]",
+            f"[cyan]Cards:[/cyan] {min(limit, metrics.cards_due)}\n"
+            f"[cyan]Estimated Time:[/cyan] {(min(limit, metrics.cards_due) * 10) / 60:.0f} minutes",
             style="green"
         )
     )
     
-    # Update metrics (simplified simulation)
-    metrics.cards_completed_today += limit
-    metrics.cards_due = max(0, metrics.cards_due - limit)
+    book_ids = cards.book_ids()
+    if type == "interleaving":
+        source = InterleavingScheduler(state_manager.base_path).iter_queue(book_ids)
+    else:
+        # Earliest-due first across books, one lazy iterator per book
+        source = heapq.merge(
+            *(cards.iter_due(b) for b in book_ids),
+            key=lambda c: c["schedule"]["due"],
+        )
     
-    # Add to 7-day average (simplified)
-    metrics.avg_retrieval_7d = (metrics.avg_retrieval_7d * 6 + 80) / 7  # Simulated 80% score
+    _run_review(console, runner, source, limit)
     
+    metrics.cards_completed_today += runner.answered
+    metrics.cards_due = CardStore(state_manager.base_path).due_count()
     state_manager.save_coach_state(coach_state)
     
-    console.print(f"\n[green]✓ Completed {limit} cards![/green]")
+    console.print(f"\n[green]✓ Completed {runner.answered} cards![/green]")
+    if runner.answered:
+        console.print(f"[cyan]Retention:[/cyan] {runner.retention:.0f}%")
     console.print(f"[cyan]Remaining due:[/cyan] {metrics.cards_due}")
 
 
@@ -238,16 +309,22 @@ def show_schedule(ctx: click.Context, show_all: bool) -> None:
 
 
 @review_group.command(name="interleave")
-@click.option("--topics", "-t", multiple=True, help="Topics to interleave")
+@click.option("--topics", "-t", multiple=True, help="Books to interleave (ID or title; default: all active)")
+@click.option("--limit", "-l", type=int, default=30, help="Maximum cards in the queue")
+@click.option("--max-run", type=click.IntRange(1, 10), default=DEFAULT_MAX_RUN,
+              help="Maximum consecutive cards from one topic")
 @click.pass_context
-def start_interleaving(ctx: click.Context, topics: tuple) -> None:
+def start_interleaving(ctx: click.Context, topics: tuple, limit: int, max_run: int) -> None:
     """Start an interleaving session.
     
     Interleaving:
-    - Mixes topics from different books/domains
+    - Mixes due cards from different books/domains
     - Improves discrimination between concepts
     - Enhances transfer and flexibility
     - 1-3 sessions per week recommended
+    
+    Harder-to-discriminate books (more lapses, active misconceptions)
+    appear more often, and no topic runs longer than --max-run cards.
     """
     console: Console = ctx.obj['console']
     state_manager = StateManager()
@@ -262,37 +339,60 @@ def start_interleaving(ctx: click.Context, topics: tuple) -> None:
             if not Confirm.ask("Start early?"):
                 return
     
-    # Get topics if not provided
-    if not topics:
-        console.print("[cyan]Select 2-3 topics to interleave:[/cyan]")
-        topic_list = []
-        for i in range(3):
-            topic = Prompt.ask(f"Topic {i+1}", default="")
-            if topic:
-                topic_list.append(topic)
-            elif i < 2:
-                console.print("[yellow]Need at least 2 topics for interleaving[/yellow]")
-        topics = tuple(topic_list)
-    
-    if len(topics) < 2:
-        console.print("[red]Interleaving requires at least 2 topics![/red]")
+    # Resolve which books to mix
+    books = coach_state.active_books
+    if topics:
+        wanted = {t.lower() for t in topics}
+        books = [b for b in books if b.id.lower() in wanted or b.title.lower() in wanted]
+    
+    scheduler = InterleavingScheduler(state_manager.base_path, max_run=max_run)
+    book_ids = scheduler.books_with_due([b.id for b in books])
+    
+    if len(book_ids) < 2:
+        console.print("[red]Interleaving requires due cards from at least 2 books![/red]")
+        console.print(f"[dim]Books with due cards: {len(book_ids)}[/dim]")
         return
     
+    queue = scheduler.build_queue(book_ids, limit)
+    titles = {b.id: b.title for b in books}
+    
+    table = Table(title="🔀 Interleaved Queue", show_header=True)
+    table.add_column("#", style="cyan", width=4)
+    table.add_column("Book", style="yellow")
+    table.add_column("Card", style="white")
+    for i, card in enumerate(queue, 1):
+        front = card["front"]
+        table.add_row(str(i), titles.get(card["book_id"], card["book_id"]),
+                      front[:50] + "..." if len(front) > 50 else front)
+    console.print(table)
+    
     console.print(
         Panel(
-            f"[green]🔀 Starting Interleaving Session[/green]\n\n"
-            f"[cyan]Topics:[/cyan]\n" + "\n".join(f"  • {t}" for t in topics) + "\n\n"
+            "[green]🔀 Interleaving Session Ready[/green]\n\n"
+            "[cyan]Books:[/cyan]\n" + "\n".join(f"  • {titles.get(b, b)}" for b in book_ids) + "\n\n"
+            f"[cyan]Cards:[/cyan] {len(queue)} (max {max_run} in a row per topic)\n\n"
             f"[bold]Benefits:[/bold]\n"
             f"• Improves discrimination between concepts\n"
             f"• Reduces interference\n"
-            f"• Enhances transfer\n\n"
-            f"[dim]Alternate between topics every 10-15 minutes[/dim]",
+            f"• Enhances transfer",
             style="green"
         )
     )
     
-    # Update metrics
-    coach_state.performance_metrics.interleaving_sessions_week += 1
+    if not Confirm.ask("Start this session?", default=True):
+        return
+    
+    runner = ReviewRunner(state_manager.base_path)
+    runner.recover()
+    _run_review(console, runner, queue, len(queue))
+    
+    # Record the session; the weekly count is derived from the log
+    log = InterleavingLog(state_manager.base_path)
+    log.record(book_ids, runner.answered)
+    metrics = coach_state.performance_metrics
+    metrics.interleaving_sessions_week = log.sessions_this_week()
+    metrics.cards_completed_today += runner.answered
+    metrics.cards_due = CardStore(state_manager.base_path).due_count()
     
     # Schedule next interleaving (3-4 days out)
     coach_state.review_schedule.next_interleaving = datetime.now() + timedelta(days=3)
@@ -301,7 +401,7 @@ def start_interleaving(ctx: click.Context, topics: tuple) -> None:
 
 
 @review_group.command(name="calibrate")
-@click.option("--questions", "-q", type=int, default=10, help="Number of questions")
+@click.option("--questions", "-q", type=click.IntRange(1, 50), default=10, help="Number of questions")
 @click.pass_context
 def calibration_quiz(ctx: click.Context, questions: int) -> None:
     """Generate and take a calibration quiz.
@@ -326,23 +426,15 @@ def calibration_quiz(ctx: click.Context, questions: int) -> None:
             f"1. Predict confidence (0-100%)\n"
             f"2. Answer the question\n"
             f"3. Compare prediction to actual\n"
-            f"4. Adjust future predictions\n\n"
-            f"[dim]In full implementation:[/dim]\n"
-            f"[dim]• AI generates questions from your notes[/dim]\n"
-            f"[dim]• Tracks calibration curves[/dim]\n"
-            f"[dim]• Adjusts review priorities[/dim]",
+            f"4. Adjust future predictions",
             style="cyan"
         )
     )
     
-    # Simulate quiz (in full implementation, would generate from notes)
-    console.print("\n[cyan]Taking calibration quiz...[/cyan]")
-    
-    # Update metrics (simulated)
-    new_accuracy = 78  # Simulated result
-    coach_state.performance_metrics.avg_prediction_accuracy_7d = (
-        coach_state.performance_metrics.avg_prediction_accuracy_7d * 6 + new_accuracy
-    ) / 7
+    result = run_calibration_quiz(console, state_manager, coach_state, questions)
+    if result is None:
+        return
+    new_accuracy = result["actual_score"]
     
     # Check calibration gate
     if new_accuracy < coach_state.governance_thresholds.calibration_gate.min:
@@ -364,4 +456,4 @@ def calibration_quiz(ctx: click.Context, questions: int) -> None:
     # Schedule next calibration
     coach_state.review_schedule.next_calibration = datetime.now() + timedelta(days=7)
     
-    state_manager.save_coach_state(coach_state)
\ No newline at end of file
+    state_manager.save_coach_state(coach_state)
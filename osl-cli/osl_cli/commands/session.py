@@ -13,6 +13,9 @@ from rich.prompt import Prompt, Confirm
 from osl_cli.state.schemas import SessionState, CoachState, BookState
 from osl_cli.governance.gates import GovernanceChecker
 from osl_cli.state.manager import StateManager
+from osl_cli.state.questions import QuestionStore
+from osl_cli.validation.timers import PhaseTimers
+from osl_cli.validation.workflow import SessionState as WorkflowState, WorkflowEngine
 
 
 @click.group(name="session")
@@ -55,7 +58,7 @@ def start_session(ctx: click.Context, book: Optional[str], type: str) -> None:
     # Run governance checks
     console.print(Panel("🔍 Running Governance Checks", style="bold blue"))
     
-    checker = GovernanceChecker(coach_state)
+    checker = GovernanceChecker(coach_state, state_manager.base_path, source="session start")
     gates_status = checker.check_all_gates()
     
     # Display governance status
@@ -146,6 +149,8 @@ def start_session(ctx: click.Context, book: Optional[str], type: str) -> None:
         governance_gates_checked=True,
         gates_status={k: v["status"] for k, v in gates_status.items()},
     )
+    engine = WorkflowEngine()
+    engine.begin(session)
     
     # Save session state
     state_manager.save_current_session(session)
@@ -165,13 +170,38 @@ def start_session(ctx: click.Context, book: Optional[str], type: str) -> None:
         )
     )
     
+    # Carry over open questions from earlier sessions on this book
+    question_store = QuestionStore(state_manager.base_path)
+    open_questions = question_store.list_open(selected_book.id)
+    
+    if open_questions:
+        console.print(f"\n[bold]Open questions from earlier sessions ({len(open_questions)}):[/bold]")
+        for q in open_questions:
+            console.print(f"  [cyan]{q.id}.[/cyan] {q.question}")
+        console.print("[dim]Resolve with: osl questions resolve <id>[/dim]")
+    
     # Prompt for curiosity questions
     console.print("\n[bold]Generate 5 curiosity questions:[/bold]")
-    console.print("[dim]What do you want to learn from this reading?[/dim]\n")
+    console.print("[dim]What do you want to learn from this reading? (Enter to skip)[/dim]\n")
     
     for i in range(1, 6):
-        question = Prompt.ask(f"Question {i}")
-        # Note: In full implementation, these would be saved to session state
+        question = Prompt.ask(f"Question {i}", default="")
+        if not question:
+            continue
+        session.curiosity_questions.append(
+            question_store.add(
+                book_id=selected_book.id,
+                question=question,
+                session_id=session_id,
+                page_asked=selected_book.current_page,
+            )
+        )
+    
+    if session.curiosity_questions:
+        engine.advance(session, WorkflowState.PREVIEW, {
+            "curiosity_questions": [q.question for q in session.curiosity_questions],
+        })
+        state_manager.save_current_session(session)
 
 
 @session_group.command(name="end")
@@ -205,7 +235,35 @@ def end_session(ctx: click.Context) -> None:
     # Update session
     session.last_activity = end_time
     session.duration_minutes = int(duration)
-    session.state = "SESSION_END"
+    
+    timers = PhaseTimers(state_manager.base_path)
+    engine = WorkflowEngine(timers=timers)
+    content_hashes = [
+        h for loop in session.micro_loops
+        for h in (loop.recall_data and loop.recall_data.recall_hash,
+                  loop.feynman_explanation and loop.feynman_explanation.explanation_hash)
+        if h
+    ]
+    result = engine.advance(session, WorkflowState.SESSION_END, {
+        "metrics_summary": {
+            "duration_minutes": session.duration_minutes,
+            "micro_loops": len(session.micro_loops),
+            "flashcards_created": session.flashcards_created,
+            "retrieval_scores": session.retrieval_scores,
+        },
+        "content_hashes": content_hashes,
+    }, along=engine.loop_inputs(session))
+    if not result.valid:
+        console.print(
+            Panel(
+                f"[yellow]⚠️ Workflow not complete: {result.error}[/yellow]\n"
+                f"[cyan]{result.suggestion}[/cyan]",
+                style="yellow"
+            )
+        )
+        if not Confirm.ask("End the session anyway?"):
+            return
+        engine.force(session, WorkflowState.SESSION_END, result.error)
     
     # Display session summary
     console.print(Panel("📊 Session Summary", style="bold blue"))
@@ -253,9 +311,10 @@ def end_session(ctx: click.Context) -> None:
     
     # Clear current session
     state_manager.clear_current_session()
+    timers.save()
     
     # Final governance check
-    checker = GovernanceChecker(coach_state)
+    checker = GovernanceChecker(coach_state, state_manager.base_path, source="session end")
     gates_status = checker.check_all_gates()
     
     if any(not status["passing"] for status in gates_status.values()):
@@ -2,7 +2,9 @@
 
 import json
 import click
+from datetime import datetime, time as dt_time
 from pathlib import Path
+from typing import Optional
 from rich.console import Console
 from rich.panel import Panel
 from rich.table import Table
@@ -10,24 +12,52 @@ from rich.tree import Tree
 from rich.json import JSON
 
 from osl_cli.state.manager import StateManager
+from osl_cli.validation.workflow import WorkflowEngine
+
+
+def _parse_as_of(value: str) -> datetime:
+    """Parse --as-of; a bare date means the end of that day."""
+    try:
+        when = datetime.fromisoformat(value)
+    except ValueError:
+        raise click.BadParameter("expected a date or time, e.g. 2026-01-13 or 2026-01-13T09:00",
+                                 param_hint="--as-of")
+    if len(value) == 10:
+        when = datetime.combine(when.date(), dt_time.max)
+    return when
 
 
 @click.command(name="state")
-@click.argument("target", type=click.Choice(["show", "coach", "session", "path"]))
+@click.argument("target", type=click.Choice(["show", "coach", "session", "path"]), default="show")
+@click.option("--as-of", "as_of", metavar="DATE",
+              help="Show the coach state as it was at this date/time")
 @click.option("--json", "as_json", is_flag=True, help="Output as JSON")
 @click.pass_context
-def state(ctx: click.Context, target: str, as_json: bool) -> None:
+def state(ctx: click.Context, target: str, as_of: Optional[str], as_json: bool) -> None:
     """Display current learning state.
     
     Targets:
-    - show: Overview of all state
+    - show: Overview of all state (default)
     - coach: Coach state details
     - session: Current session details
     - path: Show state file paths
+    
+    With --as-of, show and coach display the coach state as it was then,
+    rebuilt from its saved history.
     """
     console: Console = ctx.obj['console']
     state_manager = StateManager()
     
+    past_state = None
+    if as_of is not None:
+        if target not in ("show", "coach"):
+            raise click.BadParameter(f"not available for '{target}'", param_hint="--as-of")
+        when = _parse_as_of(as_of)
+        past_state = state_manager.load_coach_state_as_of(when)
+        if past_state is None:
+            console.print(f"[yellow]No coach state history as of {as_of}[/yellow]")
+            return
+    
     if target == "path":
         # Show file paths
         console.print(Panel("📁 OSL State File Paths", style="bold blue"))
@@ -42,11 +72,12 @@ def state(ctx: click.Context, target: str, as_json: bool) -> None:
     
     if target == "show":
         # Overview of all state
-        console.print(Panel("📊 OSL State Overview", style="bold blue"))
+        title = f"📊 OSL State Overview (as of {as_of})" if past_state else "📊 OSL State Overview"
+        console.print(Panel(title, style="bold blue"))
         
         # Coach state summary
         try:
-            coach_state = state_manager.load_coach_state()
+            coach_state = past_state or state_manager.load_coach_state()
             
             table = Table(title="Coach State Summary")
             table.add_column("Metric", style="cyan")
@@ -65,6 +96,8 @@ def state(ctx: click.Context, target: str, as_json: bool) -> None:
             console.print("[red]No coach state found. Run 'osl init' first.[/red]")
         
         # Session state summary
+        if past_state:
+            return
         console.print()
         if state_manager.has_active_session():
             session = state_manager.load_current_session()
@@ -77,6 +110,7 @@ def state(ctx: click.Context, target: str, as_json: bool) -> None:
             table.add_row("Book", session.book_title)
             table.add_row("Duration", f"{session.duration_minutes} min")
             table.add_row("State", session.state)
+            table.add_row("Next", WorkflowEngine().next_action(session) or "-")
             table.add_row("Micro-loops", str(len(session.micro_loops)))
             table.add_row("Flashcards", f"{session.flashcards_created}/{session.max_flashcards}")
             
@@ -87,12 +121,13 @@ def state(ctx: click.Context, target: str, as_json: bool) -> None:
     elif target == "coach":
         # Detailed coach state
         try:
-            coach_state = state_manager.load_coach_state()
+            coach_state = past_state or state_manager.load_coach_state()
             
             if as_json:
                 console.print(JSON(json.dumps(coach_state.model_dump(mode="json"), default=str)))
             else:
-                console.print(Panel("🤖 Coach State Details", style="bold blue"))
+                title = f"🤖 Coach State Details (as of {as_of})" if past_state else "🤖 Coach State Details"
+                console.print(Panel(title, style="bold blue"))
                 
                 # Active books
                 if coach_state.active_books:
@@ -178,6 +213,7 @@ def state(ctx: click.Context, target: str, as_json: bool) -> None:
             info_table.add_row("Book", f"{session.book_title} ({session.book_id})")
             info_table.add_row("Type", session.session_type)
             info_table.add_row("State", session.state)
+            info_table.add_row("Next", WorkflowEngine().next_action(session) or "-")
             info_table.add_row("Started", session.start_time.strftime("%H:%M:%S"))
             info_table.add_row("Duration", f"{session.duration_minutes} minutes")
             info_table.add_row("Flashcards", f"{session.flashcards_created}/{session.max_flashcards}")
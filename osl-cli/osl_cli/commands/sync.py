@@ -0,0 +1,86 @@
+"""Sync command - keep two OSL directories in step."""
+
+import json
+import sys
+import click
+from pathlib import Path
+from typing import Optional
+from rich.console import Console
+from rich.panel import Panel
+from rich.table import Table
+
+from osl_cli.state.manager import StateManager
+from osl_cli.state.sync import sync_dirs
+
+
+@click.command(name="sync")
+@click.argument("other", type=click.Path(exists=True, file_okay=False, path_type=Path))
+@click.option("--prefer", type=click.Choice(["ours", "theirs"]),
+              help="Resolve conflicts in favour of this side")
+@click.option("--dry-run", is_flag=True, help="Show what would change without writing")
+@click.option("--json", "as_json", is_flag=True, help="Output report as JSON")
+@click.pass_context
+def sync(ctx: click.Context, other: Path, prefer: Optional[str], dry_run: bool,
+         as_json: bool) -> None:
+    """Two-way sync with another OSL directory.
+
+    OTHER is the other OSL directory (e.g. on a mounted drive). Only files
+    changed since the last sync are transferred; append-only logs are
+    merged, coach state and record stores are merged field by field.
+    Fields changed differently on both sides are reported as conflicts
+    and left alone unless --prefer picks a side. Exits with status 1 if
+    conflicts remain.
+    """
+    console: Console = ctx.obj['console']
+    state_manager = StateManager()
+
+    for path in (state_manager.base_path, other):
+        if not (path / "ai_state").is_dir():
+            console.print(f"[red]Not an OSL directory: {path}[/red]")
+            sys.exit(1)
+    if other.resolve() == state_manager.base_path.resolve():
+        console.print("[red]Cannot sync a directory with itself[/red]")
+        sys.exit(1)
+
+    report = sync_dirs(state_manager.base_path, other, prefer=prefer, dry_run=dry_run)
+
+    if as_json:
+        console.print_json(json.dumps(report.to_dict()))
+    elif report.up_to_date:
+        console.print(f"[green]Already in sync ({report.files} files, "
+                      f"{report.seconds * 1000:.0f} ms)[/green]")
+    else:
+        title = "Sync (dry run)" if dry_run else "Sync"
+        console.print(
+            Panel(
+                f"Pulled: {len(report.pulled)}  Pushed: {len(report.pushed)}  "
+                f"Merged: {len(report.merged)}  Deleted: {len(report.deleted)}\n"
+                f"Transferred: {report.bytes_copied:,} bytes\n"
+                f"[dim]{report.files} files, {report.hashed} hashed, "
+                f"{report.seconds:.2f}s[/dim]",
+                title=title,
+                style="yellow" if report.conflicts or report.skipped else "green"
+            )
+        )
+
+        if report.conflicts:
+            table = Table(title="Conflicts")
+            table.add_column("File", style="cyan")
+            table.add_column("Fields", style="red")
+            for key, fields in sorted(report.conflicts.items()):
+                shown = ", ".join(fields[:5]) + (f" (+{len(fields) - 5})" if len(fields) > 5 else "")
+                table.add_row(key, shown)
+            console.print(table)
+            console.print("[dim]Resolve with --prefer ours|theirs[/dim]")
+
+        for entry in report.renumbered:
+            where = "here" if entry["side"] == "ours" else str(other)
+            console.print(f"[yellow]Renumbered {entry['store']} record {entry['from']} "
+                          f"({entry['book_id']}, {where}) to {entry['to']}: "
+                          f"both directories had given it that ID[/yellow]")
+
+        for key in report.skipped:
+            console.print(f"[yellow]Changed during sync, skipped: {key}[/yellow]")
+
+    if report.conflicts or report.skipped:
+        sys.exit(1)
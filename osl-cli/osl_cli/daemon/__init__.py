@@ -0,0 +1 @@
+"""Resident OSL daemon serving CLI commands over a Unix socket."""
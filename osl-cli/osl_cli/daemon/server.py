@@ -0,0 +1,238 @@
+"""OSL daemon process.
+
+Serves one OSL directory. Requests are newline-terminated JSON objects on a
+Unix socket; each connection carries one request and one JSON reply. Only
+the commands listed in :data:`osl_cli.client.FORWARDABLE` are ever sent
+here, and they run sequentially against the in-process CLI with the state
+cache enabled, so repeated calls skip interpreter start-up, imports, JSON
+parsing and model validation.
+
+A watcher thread polls the stat signature of every cached state file and
+reloads it after external edits. The same thread advances the phase timer
+wheel, so phase timeouts fire on time while the daemon runs.
+"""
+
+import io
+import json
+import os
+import signal
+import socket
+import sys
+import threading
+import time
+import traceback
+from contextlib import redirect_stderr, redirect_stdout
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from osl_cli.client import socket_path, request
+from osl_cli.state import cache as state_cache
+from osl_cli.validation.timers import PhaseTimers
+
+
+DEFAULT_POLL_INTERVAL = 0.5
+
+
+class OSLDaemon:
+    """Resident server for one OSL directory."""
+
+    def __init__(self, base_path: Path, poll_interval: float = DEFAULT_POLL_INTERVAL):
+        """Initialize daemon.
+
+        Args:
+            base_path: OSL directory (``<project>/osl``)
+            poll_interval: Seconds between state file checks
+        """
+        self.base_path = base_path.resolve()
+        self.project_root = self.base_path.parent
+        self.socket_path = socket_path(self.base_path)
+        self.poll_interval = poll_interval
+        self.started = time.time()
+        self.requests = 0
+        self.total_ms = 0.0
+        self.last_ms = 0.0
+        self._stop = threading.Event()
+
+    # ------------------------------------------------------------------
+    # Lifecycle
+    # ------------------------------------------------------------------
+
+    def _bind(self) -> socket.socket:
+        self.socket_path.parent.mkdir(mode=0o700, parents=True, exist_ok=True)
+        if self.socket_path.exists():
+            if request(self.socket_path, {"op": "ping"}, timeout=1.0) is not None:
+                raise RuntimeError(f"A daemon is already serving {self.base_path}")
+            self.socket_path.unlink()
+
+        server = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        server.bind(str(self.socket_path))
+        os.chmod(self.socket_path, 0o600)
+        server.listen(16)
+        server.settimeout(self.poll_interval)
+        return server
+
+    def _warm(self) -> None:
+        """Import the CLI and load state once so the first request is fast."""
+        from osl_cli.main import cli  # noqa: F401
+        from osl_cli.state.manager import StateManager
+
+        manager = StateManager(self.base_path)
+        if manager.coach_state_path.exists():
+            manager.load_coach_state()
+        if manager.has_active_session():
+            manager.load_current_session()
+
+    def _watch(self, cache: state_cache.StateCache) -> None:
+        timers = PhaseTimers(self.base_path)
+        while not self._stop.wait(self.poll_interval):
+            cache.refresh_stale()
+            timers.refresh()
+            if timers.expire("daemon"):
+                timers.save()
+
+    def serve_forever(self) -> None:
+        """Serve requests until shut down (blocks)."""
+        os.chdir(self.project_root)
+        cache = state_cache.enable()
+        self._warm()
+
+        server = self._bind()
+        signal.signal(signal.SIGTERM, lambda *_: self._stop.set())
+        threading.Thread(target=self._watch, args=(cache,), daemon=True).start()
+
+        try:
+            while not self._stop.is_set():
+                try:
+                    conn, _ = server.accept()
+                except socket.timeout:
+                    continue
+                except InterruptedError:
+                    continue
+                with conn:
+                    self._serve_connection(conn)
+        finally:
+            server.close()
+            if self.socket_path.exists():
+                self.socket_path.unlink()
+
+    # ------------------------------------------------------------------
+    # Requests
+    # ------------------------------------------------------------------
+
+    def _serve_connection(self, conn: socket.socket) -> None:
+        conn.settimeout(5.0)
+        data = b""
+        try:
+            while not data.endswith(b"\n"):
+                chunk = conn.recv(65536)
+                if not chunk:
+                    break
+                data += chunk
+            payload = json.loads(data)
+        except (OSError, ValueError):
+            return
+
+        started = time.perf_counter()
+        reply = self.handle(payload)
+        elapsed = (time.perf_counter() - started) * 1000
+
+        if payload.get("op") == "run":
+            self.requests += 1
+            self.total_ms += elapsed
+            self.last_ms = elapsed
+        try:
+            conn.sendall(json.dumps(reply).encode())
+        except OSError:
+            pass
+
+    def handle(self, payload: Dict[str, Any]) -> Dict[str, Any]:
+        """Handle one decoded request.
+
+        Args:
+            payload: Request with an ``op`` of run, ping or shutdown
+
+        Returns:
+            JSON-serializable reply
+        """
+        op = payload.get("op")
+        if op == "ping":
+            cache = state_cache.active()
+            return {
+                "pid": os.getpid(),
+                "base_path": str(self.base_path),
+                "uptime_s": round(time.time() - self.started, 1),
+                "requests": self.requests,
+                "mean_ms": round(self.total_ms / self.requests, 3) if self.requests else 0.0,
+                "last_ms": round(self.last_ms, 3),
+                "cache": cache.stats() if cache else {},
+            }
+        if op == "shutdown":
+            self._stop.set()
+            return {"stopping": True}
+        if op == "run":
+            if Path(payload.get("cwd", "")).resolve() != self.project_root:
+                return {"fallback": True}
+            return self.run_command(
+                payload.get("argv", []),
+                int(payload.get("width", 80)),
+                payload.get("color_system"),
+            )
+        return {"error": f"unknown op: {op}"}
+
+    def run_command(self, argv: List[str], width: int, color_system: Optional[str]) -> Dict[str, Any]:
+        """Run a CLI command in-process, capturing its output.
+
+        Any failure (including an attempt to prompt) asks the client to run
+        the command itself, so behaviour and tracebacks match a normal run.
+
+        Args:
+            argv: Command-line arguments
+            width: Client terminal width
+            color_system: Client colour support, or None for plain text
+
+        Returns:
+            Reply with ``output`` and ``exit_code``, or ``fallback``
+        """
+        import click
+        from rich.console import Console
+        from osl_cli.main import cli
+
+        buf = io.StringIO()
+        console = Console(
+            file=buf,
+            width=width,
+            color_system=color_system,
+            force_terminal=color_system is not None,
+        )
+
+        stdin = sys.stdin
+        sys.stdin = io.StringIO()
+        try:
+            with redirect_stdout(buf), redirect_stderr(buf):
+                try:
+                    result = cli.main(args=argv, prog_name="osl",
+                                      obj={"console": console}, standalone_mode=False)
+                    code = result if isinstance(result, int) else 0
+                except click.exceptions.Exit as e:
+                    code = e.exit_code
+                except click.ClickException as e:
+                    e.show(file=buf)
+                    code = e.exit_code
+        except BaseException:
+            traceback.print_exc(file=sys.__stderr__)
+            return {"fallback": True}
+        finally:
+            sys.stdin = stdin
+
+        return {"output": buf.getvalue(), "exit_code": code}
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    """Run a daemon in the foreground: ``python -m osl_cli.daemon.server <osl-dir>``."""
+    args = argv if argv is not None else sys.argv[1:]
+    base_path = Path(args[0]) if args else Path.cwd() / "osl"
+    OSLDaemon(base_path).serve_forever()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1 @@
+"""Developer tooling: synthetic data for load and scale testing."""
@@ -0,0 +1,758 @@
+"""Deterministic synthetic learner histories.
+
+Generates a complete OSL directory shaped like a real one after months or
+years of use: archived sessions with realistic micro-loop text, verbatim
+session inputs and hash registries, the card/question/misconception
+stores, coach state, and an Obsidian vault with wikilinks.
+
+Output is a pure function of (seed, scale, years, end date): the same
+arguments produce identical files (apart from the write timestamps in
+coach_state.json and review_checkpoint.json), so measurements taken at
+1x, 10x and 100x are comparable across machines and runs.
+
+Records are written as plain dictionaries shaped exactly like the pydantic
+models' JSON dumps (tests validate samples against the models); building
+hundreds of thousands of models would dominate generation time.
+"""
+
+import hashlib
+import json
+import math
+import random
+import re
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+from osl_cli.review.interleave import InterleavingLog
+from osl_cli.review.runner import AGAIN, EASY, GOOD, HARD, ReviewLog, apply_grade
+from osl_cli.state.cards import FIRST_INTERVAL_DAYS, CardStore
+from osl_cli.state.manager import StateManager
+from osl_cli.state.misconceptions import MisconceptionStore
+from osl_cli.state.questions import QuestionStore
+from osl_cli.state.schemas import (
+    BookState,
+    CoachState,
+    GovernanceStatus,
+    GovernanceThreshold,
+    GovernanceThresholds,
+    PerformanceMetrics,
+)
+
+
+# Shape of one learner's history at 1x (our production size)
+BASE_PROFILE: Dict[str, Any] = {
+    "books": 8,
+    "sessions_per_day": 1.0,
+    "loops_per_session": (4, 8),
+    "pages_per_loop": (3, 10),
+    "recall_words": (80, 400),
+    "feynman_sentences": (4, 14),
+    "cards_per_loop": (0, 2),
+    "questions_per_session": (1, 4),
+    "misconception_rate": 0.3,
+    "concepts_per_book": 40,
+    "links_per_note": (2, 6),
+}
+
+# Share of sessions whose state history deliberately breaks the workflow
+DEFAULT_VIOLATION_RATE = 0.02
+
+# Review behaviour: mean days a review happens after the card falls due,
+# and share of answers graded "again"
+REVIEW_LATENESS_DAYS = 0.75
+LAPSE_RATE = 0.12
+
+# Mixed-book review sessions per week (interleaving log)
+INTERLEAVING_PER_WEEK = 2.2
+
+WORDS = (
+    "memory retrieval practice spacing interval recall encoding schema chunk "
+    "attention focus transfer analogy example model system feedback error "
+    "concept principle evidence argument claim reason cause effect structure "
+    "process signal pattern habit context cue strength decay review learning "
+    "knowledge skill expert novice problem solution method theory experiment "
+    "result variable measure outcome network node link graph path cost value "
+    "market price demand supply incentive risk return capital labor growth "
+    "energy force mass motion field wave particle state change rate limit "
+    "function input output layer weight bias gradient loss update step"
+).split()
+GLUE = "the a of to and in is that it for as with by on this from which".split()
+ADJECTIVES = (
+    "Deliberate Spaced Active Distributed Elaborative Generative Desirable "
+    "Interleaved Conceptual Structural Causal Marginal Emergent Adaptive "
+    "Latent Recursive Implicit Explicit Bounded Compound"
+).split()
+
+SESSION_FLOW = ["SESSION_INIT", "PREVIEW"]
+LOOP_FLOW = [
+    "READING", "RECALL_PENDING", "RECALL_ACTIVE", "RECALL_COMPLETE",
+    "FEYNMAN_PENDING", "FEYNMAN_ACTIVE", "FEYNMAN_COMPLETE",
+    "TUTOR_QA_PENDING", "TUTOR_QA_ACTIVE", "TUTOR_QA_COMPLETE",
+    "CARDS_PENDING", "CARDS_ACTIVE", "CARDS_COMPLETE",
+]
+END_FLOW = ["NOTES_PENDING", "NOTES_ACTIVE", "NOTES_COMPLETE", "SESSION_END"]
+
+
+def parse_scale(value: str) -> float:
+    """Parse a scale such as ``10``, ``10x`` or ``0.5x``."""
+    scale = float(str(value).lower().rstrip("x"))
+    if scale <= 0:
+        raise ValueError("scale must be positive")
+    return scale
+
+
+def sha256(text: str) -> str:
+    """Hash exactly as ContentHasher.hash_text does."""
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+def slug(text: str) -> str:
+    """File-name-safe slug."""
+    return re.sub(r"[^a-z0-9]+", "-", text.lower()).strip("-")
+
+
+class HistoryGenerator:
+    """Writes a synthetic OSL directory."""
+
+    def __init__(
+        self,
+        output: Path,
+        scale: float = 1.0,
+        years: float = 2.0,
+        seed: int = 42,
+        end: Optional[datetime] = None,
+        violation_rate: float = DEFAULT_VIOLATION_RATE,
+        vault: bool = True,
+    ):
+        """Initialize generator.
+
+        Args:
+            output: Project directory; files go to ``<output>/osl``
+            scale: Multiplier on books and sessions per day
+            years: Length of the history
+            seed: Random seed
+            end: Last day of history (defaults to today, midnight)
+            violation_rate: Share of sessions with workflow violations
+            vault: Also generate the Obsidian vault
+        """
+        self.base_path = output / "osl"
+        self.ai_state = self.base_path / "ai_state"
+        self.scale = scale
+        self.years = years
+        self.seed = seed
+        self.end = (end or datetime.now()).replace(hour=0, minute=0, second=0, microsecond=0)
+        self.start = self.end - timedelta(days=int(365 * years))
+        self.violation_rate = violation_rate
+        self.vault = vault
+        self.rng = random.Random(seed)
+
+        profile = dict(BASE_PROFILE)
+        profile["books"] = max(1, round(profile["books"] * scale))
+        profile["sessions_per_day"] = profile["sessions_per_day"] * scale
+        self.profile = profile
+
+        self.counts: Dict[str, int] = {}
+        self.bytes: Dict[str, int] = {}
+        self.reviews: List[Dict[str, Any]] = []
+
+    # ------------------------------------------------------------------
+    # Text
+    # ------------------------------------------------------------------
+
+    def _sentence(self, lo: int = 8, hi: int = 22) -> str:
+        n = self.rng.randint(lo, hi)
+        words = [
+            self.rng.choice(GLUE) if self.rng.random() < 0.35 else self.rng.choice(WORDS)
+            for _ in range(n)
+        ]
+        return words[0].capitalize() + " " + " ".join(words[1:]) + "."
+
+    def _paragraph(self, words: int) -> str:
+        out: List[str] = []
+        count = 0
+        while count < words:
+            sentence = self._sentence()
+            out.append(sentence)
+            count += sentence.count(" ") + 1
+        return " ".join(out)
+
+    def _sentences(self, n: int) -> str:
+        return " ".join(self._sentence(12, 25) for _ in range(n))
+
+    # ------------------------------------------------------------------
+    # Output helpers
+    # ------------------------------------------------------------------
+
+    def _write_json(self, path: Path, data: Any, area: str, indent: Optional[int] = 2) -> None:
+        text = json.dumps(data, indent=indent, default=str)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(text)
+        self.bytes[area] = self.bytes.get(area, 0) + len(text)
+        self.counts[area] = self.counts.get(area, 0) + 1
+
+    def _write_text(self, path: Path, text: str, area: str) -> None:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(text)
+        self.bytes[area] = self.bytes.get(area, 0) + len(text)
+        self.counts[area] = self.counts.get(area, 0) + 1
+
+    def _count(self, key: str, n: int = 1) -> None:
+        self.counts[key] = self.counts.get(key, 0) + n
+
+    # ------------------------------------------------------------------
+    # Books and concepts
+    # ------------------------------------------------------------------
+
+    def _books(self) -> List[Dict[str, Any]]:
+        books = []
+        span_days = (self.end - self.start).days
+        for i in range(self.profile["books"]):
+            title = f"{self.rng.choice(ADJECTIVES)} {self.rng.choice(WORDS).title()} {i + 1}"
+            # Books start staggered over the first 80% of the history
+            offset = int(span_days * 0.8 * i / max(1, self.profile["books"]))
+            used = set()
+            concepts = []
+            while len(concepts) < self.profile["concepts_per_book"]:
+                name = f"{self.rng.choice(ADJECTIVES)} {self.rng.choice(WORDS).title()}"
+                if name in used:
+                    name = f"{name} {len(concepts)}"
+                used.add(name)
+                concepts.append(name)
+            books.append({
+                "id": f"book_{i + 1:04d}",
+                "title": title,
+                "author": f"Author {i + 1}",
+                "start": self.start + timedelta(days=offset),
+                "total_pages": self.rng.randint(200, 600),
+                "page": 1,
+                "sessions": 0,
+                "minutes": 0,
+                "scores": [],
+                "last_session": None,
+                "concepts": concepts,
+            })
+        return books
+
+    # ------------------------------------------------------------------
+    # Sessions
+    # ------------------------------------------------------------------
+
+    def _transition(self, history: List[Dict[str, Any]], frm: str, to: str,
+                    when: datetime, context: Optional[Dict[str, Any]] = None) -> None:
+        history.append({
+            "from": frm,
+            "to": to,
+            "timestamp": when.isoformat(),
+            "context": context,
+        })
+
+    def _session(self, book: Dict[str, Any], when: datetime, card_seq: List[int],
+                 question_ids: QuestionStore) -> Tuple[Dict[str, Any], Dict[str, Any], Dict[str, Any], List[Dict], List[Dict], List[Dict]]:
+        rng = self.rng
+        p = self.profile
+        session_id = when.strftime("%Y%m%d_%H%M%S")
+        book_id = book["id"]
+        clock = when
+        history: List[Dict[str, Any]] = []
+        inputs: Dict[str, Dict[str, Any]] = {}
+        hashes: Dict[str, Dict[str, Any]] = {}
+        cards: List[Dict[str, Any]] = []
+        questions: List[Dict[str, Any]] = []
+        misconceptions: List[Dict[str, Any]] = []
+
+        def register(content_id: str, text: str, kind: str, state: str) -> str:
+            digest = sha256(text)
+            hashes[content_id] = {
+                "hash": digest,
+                "content_type": kind,
+                "registered_at": clock.isoformat(),
+                "verified": False,
+                "verification_count": 0,
+            }
+            if kind in ("recall", "feynman"):
+                inputs[content_id] = {
+                    "timestamp": clock.isoformat(),
+                    "raw_text": text,
+                    "hash": digest,
+                    "preserved": True,
+                    "state": state,
+                    "modified": False,
+                }
+            return digest
+
+        self._transition(history, "NONE", "SESSION_INIT", clock,
+                         {"book_id": book_id, "book_title": book["title"]})
+
+        # Curiosity questions asked during preview
+        for question_id in question_ids.allocate_ids(rng.randint(*p["questions_per_session"])):
+            text = self._sentence(6, 14).rstrip(".") + "?"
+            resolved = rng.random() < 0.4
+            questions.append({
+                "id": question_id,
+                "question": text,
+                "created": clock.isoformat(),
+                "book_id": book_id,
+                "session_id": session_id,
+                "page_asked": book["page"],
+                "resolved": resolved,
+                "answer": self._sentence() if resolved else None,
+                "page_found": book["page"] + rng.randint(1, 40) if resolved else None,
+                "resolved_at": (clock + timedelta(days=rng.randint(0, 30))).isoformat() if resolved else None,
+            })
+        self._transition(history, "SESSION_INIT", "PREVIEW", clock,
+                         {"curiosity_questions": [q["question"] for q in questions]})
+        prev = "PREVIEW"
+
+        loops = []
+        scores = []
+        total_recall = total_explain = 0
+        for loop_id in range(1, rng.randint(*p["loops_per_session"]) + 1):
+            start_page = book["page"]
+            pages = rng.randint(*p["pages_per_loop"])
+            book["page"] = min(book["total_pages"], start_page + pages)
+            loop_start = clock
+
+            recall_text = self._paragraph(rng.randint(*p["recall_words"]))
+            recall_secs = rng.randint(60, 300)
+            clock += timedelta(seconds=pages * 120)
+            recall_hash = register(f"recall_{loop_id}", recall_text, "recall", "RECALL_ACTIVE")
+            clock += timedelta(seconds=recall_secs)
+            sentences = [s for s in recall_text.split(". ") if s]
+            key_points = [s.strip().rstrip(".") for s in rng.sample(sentences, min(3, len(sentences)))]
+
+            explanation = self._sentences(rng.randint(*p["feynman_sentences"]))
+            explain_secs = rng.randint(90, 360)
+            explanation_hash = register(f"feynman_{loop_id}", explanation, "feynman", "FEYNMAN_ACTIVE")
+            clock += timedelta(seconds=explain_secs)
+
+            tutor_questions = [self._sentence(6, 12).rstrip(".") + "?" for _ in range(3)]
+            responses = [self._sentence() for _ in tutor_questions]
+            confidences = [rng.randint(20, 95) for _ in tutor_questions]
+            clock += timedelta(seconds=rng.randint(120, 480))
+
+            loop_misconceptions = []
+            if rng.random() < p["misconception_rate"] / p["loops_per_session"][1] * 2:
+                description = self._sentence()
+                loop_misconceptions.append(description)
+                resolved = rng.random() < 0.6
+                misconceptions.append({
+                    "misconception_id": f"misc_{session_id}_{loop_id}",
+                    "book_id": book_id,
+                    "session_id": session_id,
+                    "identified_at": clock.isoformat(),
+                    "during_loop": loop_id,
+                    "description": description,
+                    "source": f"p. {start_page}",
+                    "resolved": resolved,
+                    "resolved_at": (clock + timedelta(days=rng.randint(1, 20))).isoformat() if resolved else None,
+                    "correction": self._sentence() if resolved else None,
+                    "flashcard_created": resolved and rng.random() < 0.5,
+                })
+
+            loop_cards = []
+            for _ in range(rng.randint(*p["cards_per_loop"])):
+                seq = card_seq[0]
+                card_seq[0] += 1
+                front = self._sentence(6, 14).rstrip(".") + "?"
+                back = self._sentence(4, 16)
+                card = {
+                    "card_id": f"{(seq * 2654435761 + self.seed) % 2 ** 32:08x}",
+                    "front": front,
+                    "back": back,
+                    "source_page": rng.randint(start_page, max(start_page, book["page"])),
+                    "created_from_gap": rng.choice(key_points) if key_points else "gap",
+                    "learner_authored": True,
+                    "verbatim_hash": sha256(front + back),
+                    "ai_assisted_formatting": False,
+                }
+                register(f"card_{card['card_id']}", front + back, "flashcard", "CARDS_ACTIVE")
+                loop_cards.append(card)
+                cards.append(self._card_record(card, book_id, session_id, clock))
+            clock += timedelta(seconds=60 * len(loop_cards) + 30)
+
+            score = round(min(100.0, max(20.0, rng.gauss(78, 12))), 1)
+            scores.append(score)
+            total_recall += recall_secs
+            total_explain += explain_secs
+
+            contexts = {
+                "READING": {"pages_read": pages},
+                "RECALL_COMPLETE": {"recall_text": recall_text, "duration_seconds": recall_secs,
+                                    "text_hash": recall_hash},
+                "FEYNMAN_COMPLETE": {"explanation_text": explanation, "text_hash": explanation_hash},
+                "TUTOR_QA_COMPLETE": {"answers": responses, "confidence_ratings": confidences},
+                "CARDS_COMPLETE": {"cards_created": len(loop_cards),
+                                   "from_misses": math.ceil(len(loop_cards) * 0.7)},
+            }
+            for state in LOOP_FLOW:
+                self._transition(history, prev, state, loop_start, contexts.get(state))
+                prev = state
+
+            loops.append({
+                "loop_id": loop_id,
+                "pages": f"{start_page}-{book['page']}",
+                "chunk_type": rng.choice(["standard", "standard", "standard", "difficult", "review"]),
+                "start_time": loop_start.isoformat(),
+                "end_time": clock.isoformat(),
+                "recall_data": {
+                    "duration_seconds": recall_secs,
+                    "key_points": key_points,
+                    "confidence_score": rng.randint(1, 5),
+                    "verbatim_recall": recall_text,
+                    "recall_hash": recall_hash,
+                },
+                "feynman_explanation": {
+                    "explanation_text": explanation,
+                    "explanation_hash": explanation_hash,
+                    "analogies_used": [self._sentence(4, 8) for _ in range(rng.randint(0, 2))],
+                    "examples_created": [self._sentence(4, 10) for _ in range(rng.randint(0, 3))],
+                    "duration_seconds": explain_secs,
+                },
+                "tutor_interaction": {
+                    "questions_asked": [{"question": q, "type": rng.choice(["why", "how", "transfer"])}
+                                        for q in tutor_questions],
+                    "learner_responses": responses,
+                    "feedback_given": [self._sentence() for _ in tutor_questions],
+                    "misconceptions_identified": loop_misconceptions,
+                },
+                "flashcards_created": loop_cards,
+                "retrieval_score": score,
+                "notes": None,
+            })
+
+        notes = [f"[[{c}]]" for c in rng.sample(book["concepts"], min(2, len(book["concepts"])))]
+        end_contexts = {
+            "NOTES_COMPLETE": {"permanent_notes": notes},
+            "SESSION_END": {"metrics_summary": {"avg_retrieval": round(sum(scores) / len(scores), 1)},
+                            "content_hashes": sorted(h["hash"] for h in hashes.values())},
+        }
+        for state in END_FLOW:
+            self._transition(history, prev, state, clock, end_contexts.get(state))
+            prev = state
+
+        if rng.random() < self.violation_rate:
+            self._inject_violation(history)
+            self._count("workflow_violations")
+
+        minutes = max(1, int((clock - when).total_seconds() // 60))
+        session = {
+            "version": "3.0",
+            "revision": 1,
+            "session_id": session_id,
+            "book_id": book_id,
+            "book_title": book["title"],
+            "start_time": when.isoformat(),
+            "last_activity": clock.isoformat(),
+            "duration_minutes": minutes,
+            "state": "SESSION_END",
+            "state_history": history,
+            "curiosity_questions": questions,
+            "misconceptions_identified": misconceptions,
+            "micro_loops": loops,
+            "flashcards_created": len(cards),
+            "max_flashcards": 8,
+            "session_type": "standard",
+            "governance_gates_checked": True,
+            "gates_status": {"calibration": "passing", "card_debt": "passing"},
+            "ai_interactions_count": 3 * len(loops),
+            "total_recall_time": total_recall,
+            "total_explanation_time": total_explain,
+            "retrieval_scores": scores,
+        }
+        registry = {
+            "session_id": session_id,
+            "created_at": when.isoformat(),
+            "hashes": hashes,
+            "verification_count": 0,
+            "modification_attempts": 0,
+        }
+        session_inputs = {"session_id": session_id, "inputs": inputs}
+
+        book["sessions"] += 1
+        book["minutes"] += minutes
+        book["scores"].append(sum(scores) / len(scores))
+        book["last_session"] = clock
+        return session, registry, session_inputs, cards, questions, misconceptions
+
+    def _inject_violation(self, history: List[Dict[str, Any]]) -> None:
+        """Break the workflow the way real violations look."""
+        kind = self.rng.choice(["skip", "short_recall", "missing_input"])
+        if kind == "skip":
+            # READING straight to CARDS_PENDING
+            for i, entry in enumerate(history):
+                if entry["to"] == "RECALL_PENDING":
+                    later = next(j for j in range(i, len(history)) if history[j]["to"] == "CARDS_PENDING")
+                    history[i] = dict(history[later], **{"from": entry["from"]})
+                    del history[i + 1:later + 1]
+                    return
+        for entry in history:
+            if entry["to"] == "RECALL_COMPLETE":
+                if kind == "short_recall":
+                    entry["context"] = dict(entry["context"], recall_text="too short")
+                else:
+                    entry["context"] = {k: v for k, v in entry["context"].items() if k != "text_hash"}
+                return
+
+    def _card_record(self, card: Dict[str, Any], book_id: str, session_id: str,
+                     created: datetime) -> Dict[str, Any]:
+        """Card with a schedule produced by replaying reviews through the scheduler.
+
+        The learner reviews each card some time after it falls due (lateness
+        is exponential, mean ``REVIEW_LATENESS_DAYS``), so the review log,
+        stored schedules and due counts are consistent with each other.
+        """
+        rng = self.rng
+        schedule: Dict[str, Any] = {
+            "due": (created + timedelta(days=FIRST_INTERVAL_DAYS)).isoformat(),
+            "interval_days": 0.0,
+            "ease": 2.5,
+            "reps": 0,
+            "lapses": 0,
+            "last_review": None,
+        }
+        while True:
+            when = datetime.fromisoformat(schedule["due"]) + timedelta(
+                days=rng.expovariate(1 / REVIEW_LATENESS_DAYS))
+            if when >= self.end:
+                break
+            grade = AGAIN if rng.random() < LAPSE_RATE else rng.choice((HARD, GOOD, GOOD, GOOD, EASY))
+            schedule = apply_grade(schedule, grade, when)
+            self.reviews.append({
+                "type": "answer",
+                "run_id": "synth",
+                "ts": when.isoformat(),
+                "card_id": card["card_id"],
+                "book_id": book_id,
+                "grade": grade,
+                "elapsed_ms": rng.randint(2000, 20000),
+            })
+        return dict(
+            card,
+            book_id=book_id,
+            session_id=session_id,
+            created=created.isoformat(),
+            topic=None,
+            schedule=schedule,
+        )
+
+    # ------------------------------------------------------------------
+    # Vault
+    # ------------------------------------------------------------------
+
+    def _vault(self, books: List[Dict[str, Any]], sessions_by_book: Dict[str, List[Tuple[str, str, str]]]) -> None:
+        rng = self.rng
+        vault = self.base_path / "obsidian"
+        all_concepts = [(b, c) for b in books for c in b["concepts"]]
+
+        for book in books:
+            book_dir = vault / "10_books" / slug(book["title"])
+            for concept in book["concepts"]:
+                links = rng.sample(book["concepts"], min(rng.randint(*self.profile["links_per_note"]),
+                                                         len(book["concepts"])))
+                if rng.random() < 0.3:
+                    links.append(rng.choice(all_concepts)[1])
+                body = (
+                    f"---\nbook: {book['id']}\ntags: [concept]\n---\n# {concept}\n\n"
+                    f"{self._paragraph(rng.randint(80, 250))}\n\n"
+                    "Related: " + ", ".join(f"[[{link}]]" for link in links if link != concept) + "\n"
+                )
+                self._write_text(book_dir / "concepts" / f"{concept}.md", body, "vault_notes")
+
+            for session_id, day, excerpt in sessions_by_book.get(book["id"], []):
+                links = rng.sample(book["concepts"], min(rng.randint(*self.profile["links_per_note"]),
+                                                         len(book["concepts"])))
+                body = (
+                    f"---\nsession: {session_id}\nbook: {book['id']}\n---\n# {day} {book['title']}\n\n"
+                    f"{excerpt}\n\nConcepts: " + ", ".join(f"[[{link}]]" for link in links) + "\n"
+                )
+                self._write_text(book_dir / "sessions" / f"{day} {session_id}.md", body, "vault_notes")
+
+            index = f"# {book['title']}\n\n" + "\n".join(f"- [[{c}]]" for c in book["concepts"]) + "\n"
+            self._write_text(book_dir / "00 Index.md", index, "vault_notes")
+            self._write_text(
+                vault / "30_projects" / f"{slug(book['title'])}-project.md",
+                f"# Transfer project: {book['title']}\n\n{self._paragraph(300)}\n\n"
+                + ", ".join(f"[[{c}]]" for c in rng.sample(book["concepts"], 3)) + "\n",
+                "vault_notes",
+            )
+
+        week = self.start
+        while week < self.end:
+            links = [c for _, c in rng.sample(all_concepts, min(8, len(all_concepts)))]
+            body = (
+                f"# Weekly synthesis {week.strftime('%G-W%V')}\n\n{self._paragraph(rng.randint(300, 800))}\n\n"
+                + "\n".join(f"- [[{link}]]" for link in links) + "\n"
+            )
+            self._write_text(vault / "20_synthesis" / f"{week.strftime('%G-W%V')}.md", body, "vault_notes")
+            week += timedelta(days=7)
+
+    # ------------------------------------------------------------------
+    # Driver
+    # ------------------------------------------------------------------
+
+    def generate(self) -> Dict[str, Any]:
+        """Write the synthetic directory.
+
+        Returns:
+            Summary with per-area file counts and bytes
+        """
+        for directory in ("obsidian/10_books", "obsidian/20_synthesis", "obsidian/30_projects",
+                          "anki", "ai_state/session_logs", "ai_state/memory", "config"):
+            (self.base_path / directory).mkdir(parents=True, exist_ok=True)
+
+        books = self._books()
+        questions_store = QuestionStore(self.base_path)
+        cards_by_book: Dict[str, Dict[str, Dict]] = {}
+        questions_by_book: Dict[str, Dict[str, Dict]] = {}
+        misconceptions_by_book: Dict[str, Dict[str, Dict]] = {}
+        sessions_by_book: Dict[str, List[Tuple[str, str, str]]] = {}
+        card_seq = [1]
+        used_ids = set()
+
+        day = self.start
+        carry = 0.0
+        while day < self.end:
+            carry += self.profile["sessions_per_day"]
+            n_today = int(carry)
+            carry -= n_today
+            active = [b for b in books if b["start"] <= day and b["page"] < b["total_pages"]]
+            if not active:
+                active = [b for b in books if b["start"] <= day] or books[:1]
+
+            for k in range(n_today):
+                when = day + timedelta(hours=6, minutes=12 * k, seconds=self.rng.randint(0, 59))
+                while when.strftime("%Y%m%d_%H%M%S") in used_ids:
+                    when += timedelta(seconds=1)
+                used_ids.add(when.strftime("%Y%m%d_%H%M%S"))
+
+                book = self.rng.choice(active)
+                session, registry, inputs, cards, questions, misconceptions = self._session(
+                    book, when, card_seq, questions_store)
+                sid = session["session_id"]
+                self._write_json(self.ai_state / "session_logs" / f"{sid}.json", session, "session_logs")
+                self._write_json(self.ai_state / "hash_registry" / f"{sid}.json", registry, "hash_registry")
+                self._write_json(self.ai_state / "session_inputs" / f"{sid}.json", inputs, "session_inputs")
+
+                cards_by_book.setdefault(book["id"], {}).update({c["card_id"]: c for c in cards})
+                questions_by_book.setdefault(book["id"], {}).update({str(q["id"]): q for q in questions})
+                misconceptions_by_book.setdefault(book["id"], {}).update(
+                    {m["misconception_id"]: m for m in misconceptions})
+                excerpt = session["micro_loops"][0]["recall_data"]["verbatim_recall"][:400]
+                sessions_by_book.setdefault(book["id"], []).append((sid, day.strftime("%Y-%m-%d"), excerpt))
+            day += timedelta(days=1)
+
+        cards_store = CardStore(self.base_path)
+        misconception_store = MisconceptionStore(self.base_path)
+        for book_id, records in cards_by_book.items():
+            if records:
+                cards_store.put_records(book_id, records)
+        for book_id, records in questions_by_book.items():
+            if records:
+                questions_store.put_records(book_id, records)
+        for book_id, records in misconceptions_by_book.items():
+            if records:
+                misconception_store.put_records(book_id, records)
+
+        self._count("cards", sum(len(r) for r in cards_by_book.values()))
+        self._count("questions", sum(len(r) for r in questions_by_book.values()))
+        self._count("misconceptions", sum(len(r) for r in misconceptions_by_book.values()))
+
+        self._review_log()
+        interleaving_week = self._interleaving_log(books)
+        self._coach_state(books, cards_store, interleaving_week)
+        if self.vault:
+            self._vault(books, sessions_by_book)
+
+        return {
+            "base_path": str(self.base_path),
+            "seed": self.seed,
+            "scale": self.scale,
+            "years": self.years,
+            "books": len(books),
+            "counts": dict(sorted(self.counts.items())),
+            "bytes": dict(sorted(self.bytes.items())),
+        }
+
+    def _review_log(self) -> None:
+        log = ReviewLog(self.base_path)
+        log.log_path.parent.mkdir(parents=True, exist_ok=True)
+        self.reviews.sort(key=lambda e: e["ts"])
+        text = "".join(json.dumps(e) + "\n" for e in self.reviews)
+        log.log_path.write_text(text)
+        # Every synthetic answer is already reflected in the schedules
+        log.mark_applied()
+        self.bytes["reviews"] = len(text)
+        self._count("reviews", len(self.reviews))
+
+    def _interleaving_log(self, books: List[Dict[str, Any]]) -> int:
+        """Write interleaving sessions; returns the count in the final week."""
+        log = InterleavingLog(self.base_path)
+        log.log_path.parent.mkdir(parents=True, exist_ok=True)
+        lines = []
+        last_week = 0
+        day = self.start
+        while day < self.end:
+            active = [b["id"] for b in books if b["start"] <= day]
+            if len(active) >= 2 and self.rng.random() < INTERLEAVING_PER_WEEK / 7:
+                when = day + timedelta(hours=19, minutes=self.rng.randint(0, 59))
+                mixed = self.rng.sample(active, min(len(active), self.rng.randint(2, 4)))
+                lines.append(json.dumps({"timestamp": when.isoformat(), "books": mixed,
+                                         "cards": self.rng.randint(10, 40)}) + "\n")
+                last_week += int((self.end - day).days <= 7)
+            day += timedelta(days=1)
+        text = "".join(lines)
+        log.log_path.write_text(text)
+        self.bytes["interleaving"] = len(text)
+        self._count("interleaving", len(lines))
+        return last_week
+
+    def _coach_state(self, books: List[Dict[str, Any]], cards: CardStore, interleaving_week: int) -> None:
+        now = self.end
+        recent = [s for b in books for s in b["scores"][-7:]]
+        misconceptions = MisconceptionStore(self.base_path)
+        active_misc = sum(misconceptions.active_count(b["id"]) for b in books)
+
+        state = CoachState(
+            last_updated=now,
+            active_books=[
+                BookState(
+                    id=b["id"],
+                    title=b["title"],
+                    author=b["author"],
+                    start_date=b["start"],
+                    current_page=b["page"],
+                    total_pages=b["total_pages"],
+                    sessions_completed=b["sessions"],
+                    total_hours=round(b["minutes"] / 60, 1),
+                    avg_retrieval_score=round(sum(b["scores"]) / len(b["scores"]), 1) if b["scores"] else 0.0,
+                    last_session=b["last_session"],
+                )
+                for b in books
+            ],
+            governance_thresholds=GovernanceThresholds(
+                calibration_gate=GovernanceThreshold(min=75, current=80, max=85, last_adjusted=now),
+                card_debt_multiplier=GovernanceThreshold(min=1.5, current=2.0, max=2.5, last_adjusted=now),
+                max_new_cards=GovernanceThreshold(min=4, current=8, max=10, last_adjusted=now),
+                interleaving_per_week=GovernanceThreshold(min=1, current=2, max=3, last_adjusted=now),
+            ),
+            governance_status=GovernanceStatus(
+                calibration_gate="passing",
+                card_debt_gate="passing",
+                transfer_gate="passing",
+                overall_state="NORMAL",
+            ),
+            performance_metrics=PerformanceMetrics(
+                avg_retrieval_7d=round(sum(recent) / len(recent), 1) if recent else 0.0,
+                avg_prediction_accuracy_7d=80.0,
+                cards_due=cards.due_count(now),
+                interleaving_sessions_week=interleaving_week,
+                last_transfer_project=now - timedelta(days=self.rng.randint(1, 20)),
+                total_permanent_notes=len(books) * self.profile["concepts_per_book"] if self.vault else 0,
+                total_flashcards=cards.count(),
+                misconceptions_active=active_misc,
+                misconceptions_resolved=self.counts.get("misconceptions", 0) - active_misc,
+            ),
+        )
+        StateManager(self.base_path).save_coach_state(state)
+        self._count("coach_state")
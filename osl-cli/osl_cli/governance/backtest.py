@@ -0,0 +1,265 @@
+"""Governance threshold backtesting.
+
+Replays daily gate inputs reconstructed from history against a grid of
+threshold settings. Every gate outcome for every (setting, day) pair is
+computed at once as NumPy boolean arrays, so grids of thousands of
+settings over years of history evaluate in well under a second.
+
+Reconstructed daily inputs:
+
+- ``avg_retrieval_7d``: mean of archived sessions' retrieval scores over
+  the trailing 7 days (carried forward across gaps; days before the first
+  score pass, as the gate has no data yet)
+- ``cards_due``: replaying the review log through the scheduler from each
+  card's creation
+- ``interleaving_week``: interleaving sessions (archive and interleaving
+  log) in the trailing 7 days
+
+The transfer gate has no tunable threshold and its input (project dates)
+is not historical, so it is treated as passing; so is the drift gate,
+whose alarms come from the change-point detectors rather than thresholds.
+
+NumPy is optional (``pip install 'osl-cli[analysis]'``).
+"""
+
+import json
+from collections import defaultdict
+from dataclasses import dataclass
+from datetime import date, datetime, timedelta
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - exercised without the extra
+    np = None
+
+from osl_cli.review.interleave import InterleavingLog
+from osl_cli.review.runner import ReviewLog, apply_grade
+from osl_cli.state.cards import FIRST_INTERVAL_DAYS, CardStore
+from osl_cli.state.schemas import GovernanceThresholds
+
+
+WINDOW_DAYS = 7
+DEFAULT_STEPS = 11
+
+
+def require_numpy() -> None:
+    """Raise a helpful error when NumPy is missing."""
+    if np is None:
+        raise ImportError(
+            "governance backtest requires NumPy: pip install 'osl-cli[analysis]'"
+        )
+
+
+@dataclass
+class DailyHistory:
+    """Gate inputs per day."""
+    days: List[date]
+    avg_retrieval_7d: Any  # float array, NaN before the first score
+    cards_due: Any  # int array
+    interleaving_week: Any  # int array
+
+
+def _archive_sessions(base_path: Path) -> Iterator[Dict[str, Any]]:
+    for path in sorted((base_path / "ai_state" / "session_logs").glob("*.json")):
+        try:
+            with open(path) as f:
+                yield json.load(f)
+        except (OSError, json.JSONDecodeError):
+            continue
+
+
+def _trailing_sum(values: "np.ndarray", window: int) -> "np.ndarray":
+    cumulative = np.concatenate([[0], np.cumsum(values)])
+    start = np.maximum(np.arange(len(values)) + 1 - window, 0)
+    return cumulative[1:] - cumulative[start]
+
+
+def _cards_due(base_path: Path, first: date, n_days: int) -> "np.ndarray":
+    """Due-card count per day from card creation dates and the review log.
+
+    Each card contributes +1 from the day it falls due until the day it is
+    next reviewed; a difference array keeps this linear in reviews.
+    """
+    cards = CardStore(base_path)
+    created = {c["card_id"]: datetime.fromisoformat(c["created"]) for c in cards.iter_raw()}
+    reviews: Dict[str, List[Tuple[datetime, int]]] = defaultdict(list)
+    for entry in ReviewLog(base_path).iter_since(datetime.min):
+        if entry.get("type") == "answer" and entry["card_id"] in created:
+            reviews[entry["card_id"]].append((datetime.fromisoformat(entry["ts"]), entry["grade"]))
+
+    delta = np.zeros(n_days + 1, dtype=np.int64)
+
+    def add(due: datetime, until: Optional[datetime]) -> None:
+        start = max(0, (due.date() - first).days)
+        end = n_days if until is None else min(n_days, (until.date() - first).days)
+        if start < end:
+            delta[start] += 1
+            delta[end] -= 1
+
+    for card_id, made in created.items():
+        schedule: Dict[str, Any] = {"due": (made + timedelta(days=FIRST_INTERVAL_DAYS)).isoformat()}
+        for when, grade in sorted(reviews.get(card_id, [])):
+            add(datetime.fromisoformat(schedule["due"]), when)
+            schedule = apply_grade(schedule, grade, when)
+        add(datetime.fromisoformat(schedule["due"]), None)
+
+    return np.cumsum(delta[:-1])
+
+
+def load_history(base_path: Path, days: Optional[int] = None,
+                 end: Optional[date] = None) -> DailyHistory:
+    """Reconstruct daily gate inputs.
+
+    Args:
+        base_path: Base OSL directory
+        days: Only the last N days (default: since the first session)
+        end: Last day (default: today)
+
+    Returns:
+        DailyHistory
+    """
+    require_numpy()
+    end = end or date.today()
+
+    score_sum: Dict[date, float] = defaultdict(float)
+    score_n: Dict[date, int] = defaultdict(int)
+    interleaved: Dict[date, int] = defaultdict(int)
+    for session in _archive_sessions(base_path):
+        day = datetime.fromisoformat(session["start_time"]).date()
+        scores = session.get("retrieval_scores") or []
+        score_sum[day] += sum(scores)
+        score_n[day] += len(scores)
+        if session.get("session_type") == "interleaving":
+            interleaved[day] += 1
+
+    log = InterleavingLog(base_path)
+    if log.log_path.exists():
+        with open(log.log_path) as f:
+            for line in f:
+                try:
+                    interleaved[datetime.fromisoformat(json.loads(line)["timestamp"]).date()] += 1
+                except (ValueError, KeyError):
+                    continue
+
+    known = list(score_n) + list(interleaved)
+    first = min(known) if known else end
+    if days is not None:
+        first = max(first, end - timedelta(days=days - 1))
+    n_days = max(1, (end - first).days + 1)
+    calendar = [first + timedelta(days=i) for i in range(n_days)]
+
+    sums = np.array([score_sum.get(d, 0.0) for d in calendar])
+    counts = np.array([score_n.get(d, 0) for d in calendar], dtype=np.int64)
+    window_sum = _trailing_sum(sums, WINDOW_DAYS)
+    window_n = _trailing_sum(counts, WINDOW_DAYS)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        avg = np.where(window_n > 0, window_sum / np.maximum(window_n, 1), np.nan)
+    # Carry the last known average across days with no sessions in window
+    valid = ~np.isnan(avg)
+    last = np.maximum.accumulate(np.where(valid, np.arange(n_days), -1))
+    avg = np.where(last >= 0, avg[np.maximum(last, 0)], np.nan)
+
+    inter = _trailing_sum(np.array([interleaved.get(d, 0) for d in calendar], dtype=np.int64),
+                          WINDOW_DAYS)
+
+    return DailyHistory(calendar, avg, _cards_due(base_path, first, n_days), inter)
+
+
+@dataclass
+class BacktestResult:
+    """Per-setting outcome counts, shaped (calibration, debt, interleaving)."""
+    calibration: Any
+    card_debt_multiplier: Any
+    interleaving_per_week: Any
+    blocked_days: Any
+    remediation_days: Any
+    flips: Any
+    n_days: int
+
+    @property
+    def size(self) -> int:
+        """Number of settings evaluated."""
+        return int(self.blocked_days.size)
+
+    def rows(self) -> List[Dict[str, Any]]:
+        """One dictionary per setting."""
+        c, d, i = np.meshgrid(self.calibration, self.card_debt_multiplier,
+                              self.interleaving_per_week, indexing="ij")
+        blocked = self.blocked_days.ravel()
+        remediation = self.remediation_days.ravel()
+        return [
+            {
+                "calibration_gate": round(float(cv), 2),
+                "card_debt_multiplier": round(float(dv), 2),
+                "interleaving_per_week": round(float(iv), 2),
+                "blocked_days": int(b),
+                "remediation_days": int(r),
+                "normal_days": self.n_days - int(b) - int(r),
+                "blocked_rate": round(float(b) / self.n_days, 4),
+                "remediation_rate": round(float(r) / self.n_days, 4),
+                "flips": int(f),
+            }
+            for cv, dv, iv, b, r, f in zip(c.ravel(), d.ravel(), i.ravel(),
+                                           blocked, remediation, self.flips.ravel())
+        ]
+
+
+def threshold_grid(thresholds: GovernanceThresholds, steps: int = DEFAULT_STEPS) -> Dict[str, Any]:
+    """Evenly spaced settings across each gate's min..max range.
+
+    Interleaving targets are whole sessions, so they step by one.
+    """
+    require_numpy()
+    cal = thresholds.calibration_gate
+    debt = thresholds.card_debt_multiplier
+    inter = thresholds.interleaving_per_week
+    return {
+        "calibration": np.linspace(cal.min, cal.max, steps),
+        "card_debt_multiplier": np.linspace(debt.min, debt.max, steps),
+        "interleaving_per_week": np.arange(int(inter.min), int(inter.max) + 1, dtype=float),
+    }
+
+
+def backtest(history: DailyHistory, calibration: Any, card_debt_multiplier: Any,
+             interleaving_per_week: Any, throughput: float) -> BacktestResult:
+    """Evaluate every threshold combination on every day.
+
+    Mirrors GovernanceChecker.check_all_gates: a failing calibration or
+    card-debt gate blocks, any other failing gate remediates.
+
+    Args:
+        history: Daily gate inputs
+        calibration: Calibration thresholds to try (%)
+        card_debt_multiplier: Card debt multipliers to try
+        interleaving_per_week: Interleaving targets to try
+        throughput: Daily review throughput
+
+    Returns:
+        BacktestResult
+    """
+    require_numpy()
+    cal = np.asarray(calibration, dtype=float)
+    debt = np.asarray(card_debt_multiplier, dtype=float)
+    inter = np.asarray(interleaving_per_week, dtype=float)
+
+    # (n_cal, days), (n_debt, days), (n_inter, days); NaN averages pass
+    cal_fail = history.avg_retrieval_7d[None, :] < cal[:, None]
+    debt_fail = history.cards_due[None, :] > throughput * debt[:, None]
+    inter_fail = history.interleaving_week[None, :] < inter[:, None]
+
+    shape = (len(cal), len(debt), len(inter))
+    blocked = cal_fail[:, None, None, :] | debt_fail[None, :, None, :]
+    remediation = ~blocked & inter_fail[None, None, :, :]
+    state = blocked.astype(np.int8) * 2 + remediation
+
+    return BacktestResult(
+        calibration=cal,
+        card_debt_multiplier=debt,
+        interleaving_per_week=inter,
+        blocked_days=np.broadcast_to(blocked.sum(axis=-1), shape),
+        remediation_days=remediation.sum(axis=-1),
+        flips=(np.diff(state, axis=-1) != 0).sum(axis=-1),
+        n_days=len(history.days),
+    )
@@ -1,23 +1,80 @@
 """Governance gate checking implementation."""
 
-from typing import Dict, Any
+from pathlib import Path
+from typing import Callable, Dict, Any, Optional
 from datetime import datetime, timedelta
 
+from osl_cli.governance.changepoint import ChangePointMonitor, describe
+from osl_cli.governance.memo import GateMemo
+from osl_cli.governance.timeline import GateTimeline
+from osl_cli.perf import trace
 from osl_cli.state.schemas import CoachState
 
 
 class GovernanceChecker:
-    """Checks governance gates and enforces thresholds."""
+    """Checks governance gates and enforces thresholds.
     
-    def __init__(self, coach_state: CoachState):
+    With a ``base_path``, gate results are memoized on disk keyed by a
+    fingerprint of each gate's inputs (see ``gate_inputs``), changes of
+    state are appended to the governance timeline, and active change-point
+    alarms are checked as the non-critical ``drift`` gate.
+    """
+    
+    def __init__(self, coach_state: CoachState, base_path: Optional[Path] = None,
+                 source: Optional[str] = None):
         """Initialize governance checker.
         
         Args:
             coach_state: Current coach state
+            base_path: Base OSL directory for the gate cache and timeline
+                (None evaluates every gate and records nothing)
+            source: Command triggering the check, recorded in the timeline
         """
         self.coach_state = coach_state
         self.thresholds = coach_state.governance_thresholds
         self.metrics = coach_state.performance_metrics
+        self.memo = GateMemo(base_path) if base_path is not None else None
+        self.timeline = GateTimeline(base_path) if base_path is not None else None
+        self.drift = ChangePointMonitor(base_path) if base_path is not None else None
+        self.source = source
+    
+    def gate_inputs(self) -> Dict[str, Dict[str, Any]]:
+        """Every value each gate reads, by gate.
+        
+        A gate must read nothing outside its entry here, otherwise its
+        memoized result could go stale. Derived time inputs (such as the
+        age of the last transfer project) are included at the granularity
+        the gate uses.
+        
+        Returns:
+            Gate name -> inputs
+        """
+        t = self.thresholds
+        m = self.metrics
+        last_project = m.last_transfer_project
+        return {
+            "calibration": {
+                "threshold": t.calibration_gate.current,
+                "avg_retrieval_7d": m.avg_retrieval_7d,
+            },
+            "card_debt": {
+                "multiplier": t.card_debt_multiplier.current,
+                "throughput": m.daily_review_throughput,
+                "cards_due": m.cards_due,
+            },
+            "transfer": {
+                "books": [[b.title, b.current_page, b.total_pages]
+                          for b in self.coach_state.active_books],
+                "project_age_days": (datetime.now() - last_project).days if last_project else None,
+            },
+            "interleaving": {
+                "target": t.interleaving_per_week.current,
+                "sessions_week": m.interleaving_sessions_week,
+            },
+            "drift": {
+                "alarms": self.drift.active_alarms() if self.drift is not None else [],
+            },
+        }
     
     def check_calibration_gate(self) -> Dict[str, Any]:
         """Check if retrieval accuracy meets threshold.
@@ -125,18 +182,49 @@ class GovernanceChecker:
             "action": None if passing else "Schedule interleaving session"
         }
     
+    def check_drift_gate(self) -> Dict[str, Any]:
+        """Check for sudden drops flagged by the change-point detectors.
+        
+        Returns:
+            Gate status dictionary
+        """
+        alarms = self.drift.active_alarms() if self.drift is not None else []
+        passing = not alarms
+        
+        return {
+            "passing": passing,
+            "status": "Stable" if passing else "Drop Detected",
+            "current_value": f"{len(alarms)} alarms",
+            "threshold": "0 alarms",
+            "message": (
+                "No sudden performance drops" if passing
+                else "; ".join(describe(a) for a in alarms)
+            ),
+            "action": None if passing else "Slow down: review recent material before new content"
+        }
+    
+    @trace.traced("governance.check_all", "governance")
     def check_all_gates(self) -> Dict[str, Dict[str, Any]]:
         """Check all governance gates.
         
         Returns:
             Dictionary of gate statuses
         """
-        gates = {
-            "calibration": self.check_calibration_gate(),
-            "card_debt": self.check_card_debt_gate(),
-            "transfer": self.check_transfer_gate(),
-            "interleaving": self.check_interleaving_frequency(),
+        checks = {
+            "calibration": self.check_calibration_gate,
+            "card_debt": self.check_card_debt_gate,
+            "transfer": self.check_transfer_gate,
+            "interleaving": self.check_interleaving_frequency,
         }
+        if self.drift is not None:
+            checks["drift"] = self.check_drift_gate
+        inputs = self.gate_inputs() if self.memo is not None else {}
+        gates = {}
+        for name, check in checks.items():
+            if self.memo is not None:
+                gates[name] = self.memo.evaluate(name, inputs[name], self._traced(name, check))
+            else:
+                gates[name] = self._traced(name, check)()
         
         # Update overall governance status
         any_failing = any(not g["passing"] for g in gates.values() if g)
@@ -167,4 +255,27 @@ class GovernanceChecker:
             "passing" if gates["transfer"]["passing"] else "failing"
         )
         
-        return gates
\ No newline at end of file
+        if self.memo is not None:
+            self._record(gates, inputs)
+        
+        return gates
+    
+    def _traced(self, name: str, check: Callable[[], Dict[str, Any]]) -> Callable[[], Dict[str, Any]]:
+        def run() -> Dict[str, Any]:
+            with trace.span(f"governance.gate.{name}", "governance"):
+                return check()
+        return run
+    
+    def _record(self, gates: Dict[str, Dict[str, Any]], inputs: Dict[str, Dict[str, Any]]) -> None:
+        """Append state changes to the timeline and persist the gate cache."""
+        current = {
+            "overall": self.coach_state.governance_status.overall_state,
+            "gates": {name: gate["passing"] for name, gate in gates.items()},
+        }
+        reasons = {
+            name: {"message": gates[name]["message"], "inputs": inputs[name]}
+            for name in gates
+        }
+        self.timeline.record(self.memo.last, current, reasons, self.source)
+        self.memo.last = current
+        self.memo.save()
\ No newline at end of file
@@ -0,0 +1,110 @@
+"""Memoized gate results keyed by input fingerprints.
+
+Each gate declares exactly which values it reads. A gate whose inputs
+hash to the fingerprint stored with its last result is not re-evaluated;
+the cached result is returned instead. Saving re-reads the file under a
+lock and only replaces the entries this process re-evaluated.
+"""
+
+import hashlib
+import json
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Callable, Dict, Optional, Set
+
+from osl_cli.state.locking import FileLock
+from osl_cli.state.store import write_json_atomic
+
+
+def fingerprint(inputs: Dict[str, Any]) -> str:
+    """Stable digest of a gate's inputs."""
+    encoded = json.dumps(inputs, sort_keys=True, default=str).encode("utf-8")
+    return hashlib.sha1(encoded).hexdigest()[:16]
+
+
+class GateMemo:
+    """Persisted gate results, one entry per gate."""
+
+    def __init__(self, base_path: Optional[Path] = None):
+        """Initialize gate memo.
+
+        Args:
+            base_path: Base OSL directory path. Defaults to ./osl
+        """
+        self.base_path = base_path or Path.cwd() / "osl"
+        self.path = self.base_path / "ai_state" / "governance_cache.json"
+        self.data: Dict[str, Any] = self._load()
+        self.hits = 0
+        self.misses = 0
+        self._changed: Set[str] = set()
+        self._last_changed = False
+
+    def _load(self) -> Dict[str, Any]:
+        try:
+            with open(self.path) as f:
+                data = json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            data = {}
+        data.setdefault("gates", {})
+        data.setdefault("last", None)
+        return data
+
+    def evaluate(self, gate: str, inputs: Dict[str, Any],
+                 check: Callable[[], Dict[str, Any]]) -> Dict[str, Any]:
+        """Return a gate's result, re-running ``check`` only if inputs changed.
+
+        Args:
+            gate: Gate name
+            inputs: Every value the gate reads
+            check: Gate evaluation
+
+        Returns:
+            Gate status dictionary
+        """
+        digest = fingerprint(inputs)
+        entry = self.data["gates"].get(gate)
+        if entry and entry.get("fingerprint") == digest:
+            self.hits += 1
+            return dict(entry["result"])
+
+        self.misses += 1
+        result = check()
+        self.data["gates"][gate] = {
+            "fingerprint": digest,
+            "inputs": json.loads(json.dumps(inputs, default=str)),
+            "result": result,
+            "evaluated_at": datetime.now().isoformat(),
+        }
+        self._changed.add(gate)
+        return result
+
+    def inputs(self, gate: str) -> Optional[Dict[str, Any]]:
+        """Inputs of a gate's last evaluation."""
+        entry = self.data["gates"].get(gate)
+        return entry["inputs"] if entry else None
+
+    @property
+    def last(self) -> Optional[Dict[str, Any]]:
+        """Overall state and gate outcomes from the previous check."""
+        return self.data["last"]
+
+    @last.setter
+    def last(self, value: Dict[str, Any]) -> None:
+        if value != self.data["last"]:
+            self.data["last"] = value
+            self._last_changed = True
+
+    def save(self) -> None:
+        """Persist changed results, merged with concurrent writers' results."""
+        if not self._changed and not self._last_changed:
+            return
+        with FileLock(self.path):
+            on_disk = self._load()
+            for gate in self._changed:
+                on_disk["gates"][gate] = self.data["gates"][gate]
+            if self._last_changed:
+                on_disk["last"] = self.data["last"]
+            write_json_atomic(self.path, on_disk)
+        self.data = on_disk
+        self._changed.clear()
+        self._last_changed = False
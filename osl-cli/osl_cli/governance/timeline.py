@@ -0,0 +1,91 @@
+"""Append-only timeline of governance state changes.
+
+An entry is written whenever the overall state (NORMAL, REMEDIATION,
+BLOCKED) or any gate's pass/fail outcome changes, recording which gates
+flipped and the inputs that made them flip.
+"""
+
+import json
+import os
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional
+
+
+class GateTimeline:
+    """Governance timeline stored as JSON lines."""
+
+    def __init__(self, base_path: Optional[Path] = None):
+        """Initialize timeline.
+
+        Args:
+            base_path: Base OSL directory path. Defaults to ./osl
+        """
+        self.base_path = base_path or Path.cwd() / "osl"
+        self.path = self.base_path / "ai_state" / "governance_timeline.jsonl"
+
+    def append(self, entry: Dict[str, Any]) -> None:
+        """Durably append one entry."""
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with open(self.path, "a") as f:
+            f.write(json.dumps(entry, default=str) + "\n")
+            f.flush()
+            os.fsync(f.fileno())
+
+    def record(
+        self,
+        previous: Optional[Dict[str, Any]],
+        current: Dict[str, Any],
+        reasons: Dict[str, Dict[str, Any]],
+        source: Optional[str] = None,
+    ) -> Optional[Dict[str, Any]]:
+        """Append an entry if the state or any gate outcome changed.
+
+        Args:
+            previous: ``{"overall": ..., "gates": {name: passing}}`` before
+            current: Same shape, after this evaluation
+            reasons: Per gate ``{"message": ..., "inputs": ...}``
+            source: Command that triggered the evaluation
+
+        Returns:
+            The entry written, or None if nothing changed
+        """
+        before_gates = previous["gates"] if previous else {}
+        flipped = sorted(g for g, passing in current["gates"].items()
+                         if before_gates.get(g) != passing)
+        before_overall = previous["overall"] if previous else None
+        if not flipped and before_overall == current["overall"]:
+            return None
+
+        entry = {
+            "ts": datetime.now().isoformat(),
+            "from": before_overall,
+            "to": current["overall"],
+            "gates": current["gates"],
+            "flipped": flipped,
+            "reasons": {g: reasons[g] for g in flipped if g in reasons},
+            "source": source,
+        }
+        self.append(entry)
+        return entry
+
+    def __iter__(self) -> Iterator[Dict[str, Any]]:
+        if not self.path.exists():
+            return
+        with open(self.path) as f:
+            for line in f:
+                try:
+                    yield json.loads(line)
+                except json.JSONDecodeError:
+                    continue
+
+    def entries(self, since: Optional[datetime] = None, limit: Optional[int] = None) -> List[Dict[str, Any]]:
+        """Timeline entries, oldest first.
+
+        Args:
+            since: Only entries at or after this time
+            limit: Only the most recent N entries
+        """
+        cutoff = since.isoformat() if since else ""
+        rows = [e for e in self if e.get("ts", "") >= cutoff]
+        return rows[-limit:] if limit else rows
@@ -1,6 +1,10 @@
 #!/usr/bin/env python3
 """OSL CLI - Main entry point."""
 
+# Imported first so --profile can attribute CLI import time
+from osl_cli.perf import trace
+
+import sys
 import click
 from pathlib import Path
 from rich.console import Console
@@ -20,14 +24,38 @@ from osl_cli.commands.misconception import misconception_group
 from osl_cli.commands.review import review_group
 from osl_cli.commands.synthesis import synthesis_group
 from osl_cli.commands.metrics import metrics_group
+from osl_cli.commands.perf import perf_group
+from osl_cli.commands.daemon import daemon_group
+from osl_cli.commands.dev import dev_group
+from osl_cli.commands.audit import audit_group
+from osl_cli.commands.sync import sync
+from osl_cli.commands.backup import backup_group
+from osl_cli.commands.gc import gc
+from osl_cli.validation import timers as phase_timers
 
 console = Console()
 
 
+def _command_path(group: click.Group, argv: list) -> str:
+    """Resolve the (sub)command named on the command line, e.g. 'review start'."""
+    names = []
+    command: click.Command = group
+    for token in argv:
+        if not isinstance(command, click.Group):
+            break
+        if token in command.commands:
+            names.append(token)
+            command = command.commands[token]
+    return " ".join(names)
+
+
 @click.group()
 @click.version_option(version="3.4.0", prog_name="osl")
+@click.option("--profile", is_flag=True, help="Record span timings to osl/ai_state/traces")
+@click.option("--trace-format", type=click.Choice(trace.FORMATS), default="jsonl",
+              envvar=trace.ENV_FORMAT, show_default=True, help="Trace file format")
 @click.pass_context
-def cli(ctx: click.Context) -> None:
+def cli(ctx: click.Context, profile: bool, trace_format: str) -> None:
     """Optimized System for Learning - Command Line Interface.
     
     OSL enforces research-backed learning practices through:
@@ -41,7 +69,27 @@ def cli(ctx: click.Context) -> None:
     - Curiosity-driven questioning (learner-generated questions)
     """
     ctx.ensure_object(dict)
-    ctx.obj['console'] = console
+    # The daemon passes a console that captures output for its client
+    ctx.obj.setdefault('console', console)
+    
+    output = trace.env_output()
+    if profile or output is not None:
+        tracer = trace.enable(output, trace_format)
+        tracer.command = _command_path(cli, sys.argv[1:])
+        command_span = trace.span("command", "command", path=tracer.command)
+        command_span.__enter__()
+        
+        def _write_trace() -> None:
+            command_span.__exit__(None, None, None)
+            path = trace.finish()
+            if profile and path is not None:
+                console.print(f"[dim]Trace written to {path}[/dim]", highlight=False)
+        
+        ctx.call_on_close(_write_trace)
+    
+    # Phase timeouts that fired while no daemon was watching
+    for notice in phase_timers.enforce(Path.cwd() / "osl"):
+        ctx.obj['console'].print(f"[yellow]⏰ {phase_timers.describe(notice)}[/yellow]")
 
 
 cli.add_command(init_command)
@@ -57,6 +105,13 @@ cli.add_command(misconception_group)
 cli.add_command(review_group)
 cli.add_command(synthesis_group)
 cli.add_command(metrics_group)
+cli.add_command(perf_group)
+cli.add_command(daemon_group)
+cli.add_command(dev_group)
+cli.add_command(audit_group)
+cli.add_command(sync)
+cli.add_command(backup_group)
+cli.add_command(gc)
 
 
 if __name__ == "__main__":
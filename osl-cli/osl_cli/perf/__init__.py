@@ -0,0 +1 @@
+"""Timing instrumentation and performance reporting for OSL."""
@@ -0,0 +1,145 @@
+"""Aggregation of trace files written by :mod:`osl_cli.perf.trace`."""
+
+import json
+import math
+from collections import defaultdict
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional
+
+
+def trace_files(paths: Iterable[Path]) -> List[Path]:
+    """Expand files and directories into trace files, oldest first."""
+    files: List[Path] = []
+    for path in paths:
+        if path.is_dir():
+            files.extend(p for p in path.iterdir() if p.name.endswith((".jsonl", ".trace.json")))
+        elif path.exists():
+            files.append(path)
+    return sorted(files, key=lambda p: p.stat().st_mtime)
+
+
+def load_run(path: Path) -> Optional[Dict[str, Any]]:
+    """Load one trace file in either format.
+
+    Args:
+        path: Trace file
+
+    Returns:
+        Run dictionary with header fields and ``spans``, or None if the
+        file is not a trace
+    """
+    try:
+        if path.suffix == ".jsonl":
+            run: Dict[str, Any] = {"spans": []}
+            with open(path) as f:
+                for line in f:
+                    if not line.strip():
+                        continue
+                    entry = json.loads(line)
+                    if entry.pop("type", None) == "run":
+                        run.update(entry)
+                    else:
+                        run["spans"].append(entry)
+            return run
+
+        with open(path) as f:
+            data = json.load(f)
+        run = dict(data.get("otherData", {}))
+        run["spans"] = [
+            {
+                "name": e["name"],
+                "cat": e.get("cat", "osl"),
+                "start_ms": e["ts"] / 1000,
+                "dur_ms": e.get("dur", 0) / 1000,
+                "tid": e.get("tid", 0),
+                "args": e.get("args", {}),
+            }
+            for e in data.get("traceEvents", []) if e.get("ph") == "X"
+        ]
+        return run
+    except (OSError, ValueError, KeyError, TypeError, AttributeError):
+        return None
+
+
+def with_self_time(spans: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """Annotate spans with ``self_ms`` (duration minus direct children).
+
+    Nesting is recovered from time containment per thread, so it works for
+    both trace formats.
+    """
+    by_thread: Dict[Any, List[Dict[str, Any]]] = defaultdict(list)
+    for s in spans:
+        s["self_ms"] = s["dur_ms"]
+        by_thread[s.get("tid", 0)].append(s)
+
+    for thread_spans in by_thread.values():
+        thread_spans.sort(key=lambda s: (s["start_ms"], -s["dur_ms"]))
+        stack: List[Dict[str, Any]] = []
+        for s in thread_spans:
+            # Allow for the 1µs rounding of stored timestamps
+            end = s["start_ms"] + s["dur_ms"] - 0.002
+            while stack and stack[-1]["start_ms"] + stack[-1]["dur_ms"] < end:
+                stack.pop()
+            if stack:
+                stack[-1]["self_ms"] -= s["dur_ms"]
+            stack.append(s)
+    return spans
+
+
+def percentile(values: List[float], pct: float) -> float:
+    """Nearest-rank percentile of a non-empty list."""
+    ordered = sorted(values)
+    rank = max(1, math.ceil(pct / 100 * len(ordered)))
+    return ordered[rank - 1]
+
+
+def aggregate(runs: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """Aggregate spans by name across runs.
+
+    Args:
+        runs: Runs from :func:`load_run`
+
+    Returns:
+        One row per span name, largest total self time first
+    """
+    durations: Dict[str, List[float]] = defaultdict(list)
+    self_totals: Dict[str, float] = defaultdict(float)
+    cats: Dict[str, str] = {}
+    run_counts: Dict[str, int] = defaultdict(int)
+
+    for run in runs:
+        seen = set()
+        for s in with_self_time(run["spans"]):
+            name = s["name"]
+            durations[name].append(s["dur_ms"])
+            self_totals[name] += s["self_ms"]
+            cats[name] = s.get("cat", "osl")
+            seen.add(name)
+        for name in seen:
+            run_counts[name] += 1
+
+    rows = [
+        {
+            "name": name,
+            "cat": cats[name],
+            "calls": len(values),
+            "runs": run_counts[name],
+            "total_ms": round(sum(values), 3),
+            "self_ms": round(self_totals[name], 3),
+            "mean_ms": round(sum(values) / len(values), 3),
+            "p50_ms": round(percentile(values, 50), 3),
+            "p95_ms": round(percentile(values, 95), 3),
+            "max_ms": round(max(values), 3),
+        }
+        for name, values in durations.items()
+    ]
+    rows.sort(key=lambda r: r["self_ms"], reverse=True)
+    return rows
+
+
+def phase_totals(rows: List[Dict[str, Any]]) -> Dict[str, float]:
+    """Self time per category; categories partition total wall time."""
+    totals: Dict[str, float] = defaultdict(float)
+    for row in rows:
+        totals[row["cat"]] += row["self_ms"]
+    return dict(sorted(totals.items(), key=lambda kv: kv[1], reverse=True))
@@ -0,0 +1,257 @@
+"""Span-based timing instrumentation.
+
+Tracing is off by default and costs one global lookup per span when off.
+It is switched on by the global ``--profile`` flag or the ``OSL_TRACE``
+environment variable (``1`` for the default location, otherwise a file or
+directory path). Each traced run writes one file:
+
+- ``jsonl``: one JSON object per span (plus a leading run header)
+- ``chrome``: Chrome trace-event JSON, loadable in chrome://tracing or
+  Perfetto
+
+Span names are dotted (``state.load``, ``io.read``, ``governance.gate``);
+the category groups them into phases for ``osl perf report``.
+"""
+
+import json
+import os
+import threading
+import time
+import uuid
+from datetime import datetime
+from functools import wraps
+from pathlib import Path
+from types import TracebackType
+from typing import Any, Callable, ContextManager, Dict, List, Optional, Type
+
+
+FORMATS = ("jsonl", "chrome")
+ENV_TRACE = "OSL_TRACE"
+ENV_FORMAT = "OSL_TRACE_FORMAT"
+
+# Earliest timestamp we can observe; main imports this module first
+IMPORT_START = time.perf_counter()
+
+
+def default_trace_dir(base_path: Optional[Path] = None) -> Path:
+    """Default directory for trace files."""
+    return (base_path or Path.cwd() / "osl") / "ai_state" / "traces"
+
+
+class Tracer:
+    """Collects spans for a single CLI invocation."""
+
+    def __init__(self, output: Path, fmt: str = "jsonl"):
+        """Initialize tracer.
+
+        Args:
+            output: Trace file path, or a directory to create one in
+            fmt: ``jsonl`` or ``chrome``
+        """
+        if fmt not in FORMATS:
+            raise ValueError(f"Unknown trace format: {fmt}")
+        self.fmt = fmt
+        self.run_id = str(uuid.uuid4())[:8]
+        self.started_at = datetime.now()
+        self.origin = IMPORT_START
+        self.command = ""
+        self.spans: List[Dict[str, Any]] = []
+        self._local = threading.local()
+
+        if output.suffix in (".json", ".jsonl"):
+            self.output = output
+        else:
+            stamp = self.started_at.strftime("%Y%m%d-%H%M%S")
+            ext = "trace.json" if fmt == "chrome" else "jsonl"
+            self.output = output / f"{stamp}-{self.run_id}.{ext}"
+
+    def _depth(self) -> int:
+        return getattr(self._local, "depth", 0)
+
+    def record(self, name: str, cat: str, start: float, end: float,
+               args: Optional[Dict[str, Any]] = None, depth: Optional[int] = None) -> None:
+        """Record a completed span.
+
+        Args:
+            name: Span name
+            cat: Phase category
+            start: perf_counter() at span start
+            end: perf_counter() at span end
+            args: Extra attributes
+            depth: Nesting depth (defaults to the current depth)
+        """
+        self.spans.append({
+            "name": name,
+            "cat": cat,
+            "start_ms": round((start - self.origin) * 1000, 3),
+            "dur_ms": round((end - start) * 1000, 3),
+            "depth": self._depth() if depth is None else depth,
+            "tid": threading.get_ident(),
+            "args": args or {},
+        })
+
+    def write(self) -> Path:
+        """Write collected spans to the output file.
+
+        Returns:
+            Path written
+        """
+        self.output.parent.mkdir(parents=True, exist_ok=True)
+        header = {
+            "run_id": self.run_id,
+            "command": self.command,
+            "started_at": self.started_at.isoformat(),
+            "pid": os.getpid(),
+        }
+
+        if self.fmt == "chrome":
+            events = [
+                {
+                    "name": s["name"],
+                    "cat": s["cat"],
+                    "ph": "X",
+                    "ts": s["start_ms"] * 1000,
+                    "dur": s["dur_ms"] * 1000,
+                    "pid": header["pid"],
+                    "tid": s["tid"],
+                    "args": s["args"],
+                }
+                for s in self.spans
+            ]
+            with open(self.output, "w") as f:
+                json.dump({"traceEvents": events, "otherData": header}, f)
+        else:
+            with open(self.output, "w") as f:
+                f.write(json.dumps({"type": "run", **header}) + "\n")
+                for s in self.spans:
+                    f.write(json.dumps({"type": "span", **s}) + "\n")
+        return self.output
+
+
+class _Span:
+    """Context manager timing one span on the active tracer."""
+
+    __slots__ = ("tracer", "name", "cat", "args", "start")
+
+    def __init__(self, tracer: Tracer, name: str, cat: str, args: Dict[str, Any]):
+        self.tracer = tracer
+        self.name = name
+        self.cat = cat
+        self.args = args
+
+    def __enter__(self) -> "_Span":
+        local = self.tracer._local
+        local.depth = getattr(local, "depth", 0) + 1
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type: Optional[Type[BaseException]], exc: Optional[BaseException],
+                 tb: Optional[TracebackType]) -> None:
+        end = time.perf_counter()
+        local = self.tracer._local
+        local.depth -= 1
+        if exc_type is not None:
+            self.args["error"] = exc_type.__name__
+        self.tracer.record(self.name, self.cat, self.start, end, self.args, local.depth)
+
+
+class _NullSpan:
+    """Shared no-op span used while tracing is off."""
+
+    __slots__ = ()
+
+    def __enter__(self) -> "_NullSpan":
+        return self
+
+    def __exit__(self, exc_type: Optional[Type[BaseException]], exc: Optional[BaseException],
+                 tb: Optional[TracebackType]) -> None:
+        return None
+
+
+_NULL_SPAN = _NullSpan()
+_tracer: Optional[Tracer] = None
+
+
+def span(name: str, cat: str = "osl", **args: Any) -> ContextManager[Any]:
+    """Time a block of code.
+
+    Usage::
+
+        with trace.span("state.load", "state", file="coach_state"):
+            ...
+
+    Args:
+        name: Span name
+        cat: Phase category
+        **args: Extra attributes stored with the span
+
+    Returns:
+        Context manager (a shared no-op when tracing is off)
+    """
+    if _tracer is None:
+        return _NULL_SPAN
+    return _Span(_tracer, name, cat, args)
+
+
+def traced(name: str, cat: str = "osl") -> Callable:
+    """Decorator form of :func:`span`."""
+    def decorator(func: Callable) -> Callable:
+        @wraps(func)
+        def wrapper(*a: Any, **kw: Any) -> Any:
+            if _tracer is None:
+                return func(*a, **kw)
+            with _Span(_tracer, name, cat, {}):
+                return func(*a, **kw)
+        return wrapper
+    return decorator
+
+
+def active() -> Optional[Tracer]:
+    """Return the active tracer, if any."""
+    return _tracer
+
+
+def enable(output: Optional[Path] = None, fmt: str = "jsonl") -> Tracer:
+    """Start tracing this process.
+
+    Time spent importing the CLI up to this call is recorded as a
+    ``cli.import`` span.
+
+    Args:
+        output: Trace file or directory (defaults to ai_state/traces)
+        fmt: ``jsonl`` or ``chrome``
+
+    Returns:
+        Active tracer
+    """
+    global _tracer
+    _tracer = Tracer(output or default_trace_dir(), fmt)
+    _tracer.record("cli.import", "import", _tracer.origin, time.perf_counter(), depth=0)
+    return _tracer
+
+
+def finish() -> Optional[Path]:
+    """Stop tracing and write the trace file.
+
+    Returns:
+        Path written, or None if tracing was off
+    """
+    global _tracer
+    tracer, _tracer = _tracer, None
+    if tracer is None:
+        return None
+    return tracer.write()
+
+
+def env_output() -> Optional[Path]:
+    """Trace output requested through ``OSL_TRACE``, if any.
+
+    Returns:
+        Output path, the default directory for ``1``/``true``, or None
+    """
+    value = os.environ.get(ENV_TRACE, "").strip()
+    if not value or value.lower() in ("0", "false", "no", "off"):
+        return None
+    if value.lower() in ("1", "true", "yes", "on"):
+        return default_trace_dir()
+    return Path(value)
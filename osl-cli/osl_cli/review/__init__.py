@@ -0,0 +1 @@
+"""Review scheduling, quizzing and calibration for OSL."""
\ No newline at end of file
@@ -0,0 +1,190 @@
+"""Incremental calibration metrics.
+
+Every quiz item records the learner's predicted probability of answering
+correctly and whether they did. Aggregates (Brier score, a binned
+calibration curve, per-stratum hit rates and a small per-day rollup for
+rolling windows) are updated in O(1) per item, so metrics never require
+re-reading the quiz log.
+"""
+
+import copy
+import json
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from osl_cli.state.locking import FileLock, merge_counters
+from osl_cli.state.store import write_json_atomic
+
+
+CURVE_BINS = 10
+DAILY_RETENTION_DAYS = 35
+
+
+class CalibrationTracker:
+    """Maintains calibration aggregates and an append-only quiz log."""
+
+    def __init__(self, base_path: Optional[Path] = None):
+        """Initialize calibration tracker.
+
+        Args:
+            base_path: Base OSL directory path. Defaults to ./osl
+        """
+        self.base_path = base_path or Path.cwd() / "osl"
+        self.state_path = self.base_path / "ai_state" / "calibration.json"
+        self.log_path = self.base_path / "ai_state" / "quiz_log.jsonl"
+        self.state: Dict[str, Any] = self._load()
+        # Aggregates as loaded; concurrent writers' increments are merged
+        self._base = copy.deepcopy(self.state)
+
+    def _load(self) -> Dict[str, Any]:
+        if self.state_path.exists():
+            with open(self.state_path) as f:
+                return json.load(f)
+
+        return {
+            "items": 0,
+            "hits": 0,
+            "sum_brier": 0.0,
+            "quizzes": 0,
+            "bins": [{"n": 0, "sum_pred": 0.0, "hits": 0} for _ in range(CURVE_BINS)],
+            "by_stratum": {},
+            "daily": {},
+        }
+
+    def save(self) -> None:
+        """Persist aggregates, adding increments saved by other writers."""
+        with FileLock(self.state_path):
+            on_disk = self._load()
+            if on_disk != self._base:
+                self.state = merge_counters(self._base, self.state, on_disk)
+            write_json_atomic(self.state_path, self.state)
+        self._base = copy.deepcopy(self.state)
+
+    def _day(self, when: datetime) -> Dict[str, Any]:
+        key = when.strftime("%Y-%m-%d")
+        return self.state["daily"].setdefault(key, {
+            "items": 0,
+            "sum_brier": 0.0,
+            "quizzes": 0,
+            "sum_prediction_accuracy": 0.0,
+        })
+
+    def record_item(
+        self,
+        predicted: float,
+        correct: bool,
+        stratum: str = "recall",
+        when: Optional[datetime] = None,
+    ) -> None:
+        """Fold a single item outcome into the aggregates.
+
+        Args:
+            predicted: Predicted probability of being correct (0-1)
+            correct: Whether the answer was correct
+            stratum: Item stratum (recall/application/transfer)
+            when: Time of the answer (defaults to now)
+        """
+        predicted = min(1.0, max(0.0, predicted))
+        outcome = 1.0 if correct else 0.0
+        brier = (predicted - outcome) ** 2
+
+        s = self.state
+        s["items"] += 1
+        s["hits"] += int(correct)
+        s["sum_brier"] += brier
+
+        bin_index = min(CURVE_BINS - 1, int(predicted * CURVE_BINS))
+        bucket = s["bins"][bin_index]
+        bucket["n"] += 1
+        bucket["sum_pred"] += predicted
+        bucket["hits"] += int(correct)
+
+        strat = s["by_stratum"].setdefault(stratum, {"n": 0, "hits": 0, "sum_pred": 0.0})
+        strat["n"] += 1
+        strat["hits"] += int(correct)
+        strat["sum_pred"] += predicted
+
+        day = self._day(when or datetime.now())
+        day["items"] += 1
+        day["sum_brier"] += brier
+
+    def record_quiz(self, result: Dict[str, Any]) -> None:
+        """Record a completed quiz: log it and update all aggregates.
+
+        Args:
+            result: Quiz result with ``taken_at``, ``predicted_score``,
+                ``actual_score`` and ``items`` (each with ``confidence``
+                0-100, ``correct`` and ``stratum``)
+        """
+        when = datetime.fromisoformat(result["taken_at"])
+
+        for item in result["items"]:
+            self.record_item(item["confidence"] / 100, item["correct"], item["stratum"], when)
+
+        accuracy = max(0.0, 100.0 - abs(result["predicted_score"] - result["actual_score"]))
+        self.state["quizzes"] += 1
+        day = self._day(when)
+        day["quizzes"] += 1
+        day["sum_prediction_accuracy"] += accuracy
+
+        self._prune(when)
+
+        self.log_path.parent.mkdir(parents=True, exist_ok=True)
+        with open(self.log_path, "a") as f:
+            f.write(json.dumps(result, default=str) + "\n")
+
+        self.save()
+
+    def _prune(self, now: datetime) -> None:
+        cutoff = (now - timedelta(days=DAILY_RETENTION_DAYS)).strftime("%Y-%m-%d")
+        for key in [k for k in self.state["daily"] if k < cutoff]:
+            del self.state["daily"][key]
+
+    def brier_score(self) -> Optional[float]:
+        """Mean Brier score over all items (lower is better)."""
+        if not self.state["items"]:
+            return None
+        return self.state["sum_brier"] / self.state["items"]
+
+    def calibration_curve(self) -> List[Dict[str, Any]]:
+        """Binned calibration curve.
+
+        Returns:
+            One entry per non-empty bin with the bin range, item count,
+            mean predicted probability and observed hit rate
+        """
+        curve = []
+        for i, bucket in enumerate(self.state["bins"]):
+            if not bucket["n"]:
+                continue
+            curve.append({
+                "low": i / CURVE_BINS,
+                "high": (i + 1) / CURVE_BINS,
+                "n": bucket["n"],
+                "mean_predicted": bucket["sum_pred"] / bucket["n"],
+                "hit_rate": bucket["hits"] / bucket["n"],
+            })
+        return curve
+
+    def prediction_accuracy(self, days: int = 7, now: Optional[datetime] = None) -> Optional[float]:
+        """Average quiz prediction accuracy over a rolling window.
+
+        Prediction accuracy for one quiz is ``100 - |predicted - actual|``.
+
+        Args:
+            days: Window size in days
+            now: Window end (defaults to now)
+
+        Returns:
+            Mean accuracy in percent, or None when no quizzes in window
+        """
+        now = now or datetime.now()
+        cutoff = (now - timedelta(days=days - 1)).strftime("%Y-%m-%d")
+        quizzes = 0
+        total = 0.0
+        for key, day in self.state["daily"].items():
+            if key >= cutoff:
+                quizzes += day["quizzes"]
+                total += day["sum_prediction_accuracy"]
+        return total / quizzes if quizzes else None
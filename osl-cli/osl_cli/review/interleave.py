@@ -0,0 +1,244 @@
+"""Interleaved review queue construction.
+
+Each active book contributes a lazily-evaluated iterator of its due cards
+(earliest due first). The iterators are merged through a heap keyed by a
+per-book virtual clock, weighted-fair-queuing style: emitting a card from
+book ``b`` advances its clock by ``1 / weight_b``, so harder-to-discriminate
+books surface proportionally more often. A run-length constraint prevents
+more than ``max_run`` consecutive cards from the same topic while any other
+topic still has cards.
+
+Building a queue of k cards across b books costs O(k log b) heap operations
+plus the cost of the cards actually pulled from each iterator.
+"""
+
+import heapq
+import json
+import os
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from osl_cli.state.cards import CardStore
+from osl_cli.state.misconceptions import MisconceptionStore
+
+
+DEFAULT_MAX_RUN = 2
+
+# How strongly discrimination difficulty skews the mix
+DIFFICULTY_GAIN = 2.0
+MISCONCEPTION_WEIGHT = 0.1
+
+# Bytes read at a time when reading a log backwards
+READ_BLOCK = 8192
+
+
+def reversed_lines(path: Path, block_size: int = READ_BLOCK) -> Iterator[str]:
+    """Lines of a text file, last first, reading blocks back from the end."""
+    with open(path, "rb") as f:
+        position = f.seek(0, os.SEEK_END)
+        tail = b""
+        while position > 0:
+            step = min(block_size, position)
+            position -= step
+            f.seek(position)
+            lines = (f.read(step) + tail).split(b"\n")
+            # The first piece may continue in the previous block
+            tail = lines.pop(0)
+            for line in reversed(lines):
+                yield line.decode("utf-8")
+        yield tail.decode("utf-8")
+
+
+def card_topic(card: Dict[str, Any]) -> str:
+    """Topic used for the run-length constraint (explicit topic or book)."""
+    return card.get("topic") or card["book_id"]
+
+
+class InterleavingScheduler:
+    """Builds mixed review queues from per-book due iterators."""
+
+    def __init__(self, base_path: Optional[Path] = None, max_run: int = DEFAULT_MAX_RUN):
+        """Initialize scheduler.
+
+        Args:
+            base_path: Base OSL directory path. Defaults to ./osl
+            max_run: Maximum consecutive cards from one topic
+        """
+        self.base_path = base_path or Path.cwd() / "osl"
+        self.cards = CardStore(self.base_path)
+        self.misconceptions = MisconceptionStore(self.base_path)
+        self.max_run = max(1, max_run)
+
+    def difficulty(self, book_id: str) -> float:
+        """Discrimination-difficulty signal for a book (0 = easy).
+
+        Combines the Laplace-smoothed lapse rate of the book's cards (kept
+        in the card index, no shard load) with a small bump per active
+        misconception.
+
+        Args:
+            book_id: Book identifier
+
+        Returns:
+            Non-negative difficulty score
+        """
+        summary = self.cards.index["books"].get(book_id, {})
+        lapse_rate = (summary.get("lapses", 0) + 1) / (summary.get("reps", 0) + 2)
+
+        active = self.misconceptions.active_count(book_id)
+        return lapse_rate + MISCONCEPTION_WEIGHT * active
+
+    def weights(self, book_ids: List[str]) -> Dict[str, float]:
+        """Mixing weight per book."""
+        return {b: 1.0 + DIFFICULTY_GAIN * self.difficulty(b) for b in book_ids}
+
+    def iter_queue(
+        self,
+        book_ids: List[str],
+        until: Optional[datetime] = None,
+    ) -> Iterator[Dict[str, Any]]:
+        """Stream an interleaved queue of due cards.
+
+        Args:
+            book_ids: Books to interleave
+            until: Due cutoff (defaults to now)
+
+        Yields:
+            Raw card dictionaries in review order
+        """
+        weights = self.weights(book_ids)
+        clocks = {b: 0.0 for b in book_ids}
+        sources: Dict[str, Iterator[Dict[str, Any]]] = {
+            b: self.cards.iter_due(b, until) for b in book_ids
+        }
+
+        # Heap entries: (virtual_clock, due, seq, book_id, card)
+        heap: List[Tuple[float, str, int, str, Dict[str, Any]]] = []
+        seq = 0
+
+        def push_next(book_id: str) -> None:
+            nonlocal seq
+            card = next(sources[book_id], None)
+            if card is not None:
+                heapq.heappush(heap, (clocks[book_id], card["schedule"]["due"], seq, book_id, card))
+                seq += 1
+
+        for book_id in book_ids:
+            push_next(book_id)
+
+        last_topic: Optional[str] = None
+        run = 0
+
+        while heap:
+            entry = heapq.heappop(heap)
+
+            if run >= self.max_run and card_topic(entry[4]) == last_topic:
+                # Hold back same-topic heads until a different topic is found
+                held = [entry]
+                while heap and card_topic(heap[0][4]) == last_topic:
+                    held.append(heapq.heappop(heap))
+                if heap:
+                    entry = heapq.heappop(heap)
+                    for h in held:
+                        heapq.heappush(heap, h)
+                else:
+                    # Only one topic left; the constraint cannot be met
+                    entry = held[0]
+                    for h in held[1:]:
+                        heapq.heappush(heap, h)
+
+            _, _, _, book_id, card = entry
+            topic = card_topic(card)
+            run = run + 1 if topic == last_topic else 1
+            last_topic = topic
+
+            clocks[book_id] += 1.0 / weights[book_id]
+            push_next(book_id)
+
+            yield card
+
+    def build_queue(
+        self,
+        book_ids: List[str],
+        limit: int,
+        until: Optional[datetime] = None,
+    ) -> List[Dict[str, Any]]:
+        """Build an interleaved queue of at most ``limit`` cards.
+
+        Args:
+            book_ids: Books to interleave
+            limit: Maximum cards
+            until: Due cutoff (defaults to now)
+
+        Returns:
+            Raw card dictionaries in review order
+        """
+        queue = []
+        for card in self.iter_queue(book_ids, until):
+            if len(queue) >= limit:
+                break
+            queue.append(card)
+        return queue
+
+    def books_with_due(self, book_ids: List[str], until: Optional[datetime] = None) -> List[str]:
+        """Books that have at least one card due (index-only check)."""
+        cutoff = (until or datetime.now()).strftime("%Y-%m-%d")
+        books = self.cards.index["books"]
+        return [
+            b for b in book_ids
+            if books.get(b, {}).get("next_due") and books[b]["next_due"] <= cutoff
+        ]
+
+
+class InterleavingLog:
+    """Append-only log of interleaving sessions actually run."""
+
+    def __init__(self, base_path: Optional[Path] = None):
+        """Initialize interleaving log.
+
+        Args:
+            base_path: Base OSL directory path. Defaults to ./osl
+        """
+        self.base_path = base_path or Path.cwd() / "osl"
+        self.log_path = self.base_path / "ai_state" / "interleaving_log.jsonl"
+
+    def record(self, book_ids: List[str], cards: int, when: Optional[datetime] = None) -> None:
+        """Append an interleaving session.
+
+        Args:
+            book_ids: Books that were mixed
+            cards: Number of cards in the session
+            when: Session time (defaults to now)
+        """
+        self.log_path.parent.mkdir(parents=True, exist_ok=True)
+        entry = {
+            "timestamp": (when or datetime.now()).isoformat(),
+            "books": book_ids,
+            "cards": cards,
+        }
+        with open(self.log_path, "a") as f:
+            f.write(json.dumps(entry) + "\n")
+
+    def sessions_since(self, since: datetime) -> int:
+        """Count sessions at or after ``since``.
+
+        The log is append-only and time-ordered, so it is read from the
+        end and stops at the first older entry.
+        """
+        if not self.log_path.exists():
+            return 0
+
+        cutoff = since.isoformat()
+        count = 0
+        for line in reversed_lines(self.log_path):
+            if not line.strip():
+                continue
+            if json.loads(line)["timestamp"] < cutoff:
+                break
+            count += 1
+        return count
+
+    def sessions_this_week(self, now: Optional[datetime] = None) -> int:
+        """Sessions in the trailing 7 days."""
+        return self.sessions_since((now or datetime.now()) - timedelta(days=7))
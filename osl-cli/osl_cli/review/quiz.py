@@ -0,0 +1,228 @@
+"""Calibration quiz engine.
+
+Items are drawn from the learner's own material:
+
+- recall: stored flashcards (front/back)
+- application: misconceptions (explain the corrected understanding) and
+  resolved curiosity questions
+- transfer: open curiosity questions (reason toward an answer not yet
+  found in the text)
+
+Sampling is stratified by the weekly blueprint and weighted within each
+stratum (recent and previously-lapsed material is favoured). Weighted
+sampling uses the Efraimidis-Spirakis reservoir method, so drawing k items
+from n candidates costs O(n log k) with no sorting or model validation of
+the full candidate set.
+"""
+
+import heapq
+import random
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Dict, Iterable, List, Literal, Optional, Tuple
+
+from pydantic import BaseModel
+
+from osl_cli.state.cards import CardStore
+from osl_cli.state.misconceptions import MisconceptionStore
+from osl_cli.state.questions import QuestionStore
+from osl_cli.state.store import BookShardedStore
+
+
+Stratum = Literal["recall", "application", "transfer"]
+
+# Weekly blueprint: 3 recall, 3-4 application, 2-3 transfer
+BLUEPRINT: Dict[str, float] = {
+    "recall": 0.3,
+    "application": 0.4,
+    "transfer": 0.3,
+}
+
+RECENT_DAYS = 7
+
+
+class QuizItem(BaseModel):
+    """A single calibration quiz item."""
+    item_id: str
+    source: Literal["card", "misconception", "question"]
+    stratum: Stratum
+    book_id: str
+    prompt: str
+    answer: Optional[str] = None
+
+
+# (weight, source, book_id, raw record)
+Candidate = Tuple[float, str, str, dict]
+
+
+def weighted_sample(
+    candidates: Iterable[Candidate],
+    k: int,
+    rng: random.Random,
+) -> List[Candidate]:
+    """Draw k candidates without replacement, proportional to weight.
+
+    Args:
+        candidates: Iterable of candidates (weight first)
+        k: Number to draw
+        rng: Random source
+
+    Returns:
+        Up to k candidates
+    """
+    if k <= 0:
+        return []
+    keyed = (
+        (rng.random() ** (1.0 / c[0]), i, c)
+        for i, c in enumerate(candidates) if c[0] > 0
+    )
+    return [c for _, _, c in heapq.nlargest(k, keyed)]
+
+
+def allocate(count: int, available: Dict[str, int]) -> Dict[str, int]:
+    """Split a quiz size across strata by the blueprint.
+
+    Uses largest-remainder rounding, then hands any shortfall from a thin
+    stratum to the others.
+
+    Args:
+        count: Total items wanted
+        available: Candidates available per stratum
+
+    Returns:
+        Items to draw per stratum
+    """
+    raw = {s: count * share for s, share in BLUEPRINT.items()}
+    plan = {s: int(v) for s, v in raw.items()}
+    remainder = count - sum(plan.values())
+    for s in sorted(raw, key=lambda s: raw[s] - plan[s], reverse=True)[:remainder]:
+        plan[s] += 1
+
+    # Cap by availability and redistribute the deficit
+    deficit = 0
+    for s in plan:
+        cap = available.get(s, 0)
+        if plan[s] > cap:
+            deficit += plan[s] - cap
+            plan[s] = cap
+
+    for s in sorted(plan, key=lambda s: BLUEPRINT[s], reverse=True):
+        if not deficit:
+            break
+        extra = min(deficit, available.get(s, 0) - plan[s])
+        plan[s] += extra
+        deficit -= extra
+
+    return plan
+
+
+class QuizEngine:
+    """Builds stratified calibration quizzes from stored learner material."""
+
+    def __init__(self, base_path: Optional[Path] = None, seed: Optional[int] = None):
+        """Initialize quiz engine.
+
+        Args:
+            base_path: Base OSL directory path. Defaults to ./osl
+            seed: Optional seed for reproducible sampling
+        """
+        self.base_path = base_path or Path.cwd() / "osl"
+        self.cards = CardStore(self.base_path)
+        self.misconceptions = MisconceptionStore(self.base_path)
+        self.questions = QuestionStore(self.base_path)
+        self.rng = random.Random(seed)
+
+    def candidates(
+        self,
+        book_ids: Optional[List[str]] = None,
+        now: Optional[datetime] = None,
+    ) -> Dict[str, List[Candidate]]:
+        """Collect weighted candidates per stratum.
+
+        Records are kept as raw dictionaries; dates are compared as ISO
+        strings to keep this pass cheap for large decks.
+
+        Args:
+            book_ids: Books to draw from (defaults to all)
+            now: Reference time for recency weighting
+
+        Returns:
+            Mapping of stratum to candidate list
+        """
+        now = now or datetime.now()
+        recent = (now - timedelta(days=RECENT_DAYS)).isoformat()
+        strata: Dict[str, List[Candidate]] = {s: [] for s in BLUEPRINT}
+
+        def books(store: BookShardedStore) -> List[str]:
+            return store.book_ids() if book_ids is None else book_ids
+
+        for book_id in books(self.cards):
+            for card in self.cards.iter_book(book_id):
+                weight = 1.0 + (2.0 if card["created"] >= recent else 0.0)
+                weight += card["schedule"].get("lapses", 0)
+                strata["recall"].append((weight, "card", book_id, card))
+
+        for book_id in books(self.misconceptions):
+            for m in self.misconceptions.iter_book(book_id):
+                weight = 3.0 if not m.get("resolved") else 1.0
+                strata["application"].append((weight, "misconception", book_id, m))
+
+        for book_id in books(self.questions):
+            for q in self.questions.iter_book(book_id):
+                weight = 1.0 + (1.0 if q["created"] >= recent else 0.0)
+                stratum = "application" if q.get("resolved") else "transfer"
+                strata[stratum].append((weight, "question", book_id, q))
+
+        return strata
+
+    def sample(
+        self,
+        count: int = 10,
+        book_ids: Optional[List[str]] = None,
+    ) -> List[QuizItem]:
+        """Draw a stratified quiz.
+
+        Args:
+            count: Number of items
+            book_ids: Books to draw from (defaults to all)
+
+        Returns:
+            Quiz items, grouped recall -> application -> transfer
+        """
+        strata = self.candidates(book_ids)
+        plan = allocate(count, {s: len(c) for s, c in strata.items()})
+
+        items: List[QuizItem] = []
+        for stratum in BLUEPRINT:
+            for _, source, book_id, record in weighted_sample(strata[stratum], plan[stratum], self.rng):
+                items.append(self._to_item(stratum, source, book_id, record))
+        return items
+
+    @staticmethod
+    def _to_item(stratum: str, source: str, book_id: str, record: dict) -> QuizItem:
+        if source == "card":
+            return QuizItem(
+                item_id=f"card:{record['card_id']}",
+                source="card",
+                stratum=stratum,
+                book_id=book_id,
+                prompt=record["front"],
+                answer=record["back"],
+            )
+        if source == "misconception":
+            return QuizItem(
+                item_id=f"misconception:{record['misconception_id']}",
+                source="misconception",
+                stratum=stratum,
+                book_id=book_id,
+                prompt=f"Explain the correct understanding: {record['description']}",
+                answer=record.get("correction"),
+            )
+        return QuizItem(
+            item_id=f"question:{record['id']}",
+            source="question",
+            stratum=stratum,
+            book_id=book_id,
+            prompt=record["question"],
+            answer=record.get("answer"),
+        )
@@ -0,0 +1,324 @@
+"""Spaced repetition review runner.
+
+Answers are streamed into an append-only review log (one fsync'd JSON line
+per answer) while schedule changes are staged in memory and written to the
+card store in batches at checkpoints. A review of hundreds of cards never
+rewrites a card shard per answer, and answers logged after the last
+checkpoint are replayed on the next run if the process dies mid-review.
+"""
+
+import json
+import os
+import queue
+import threading
+import uuid
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, Optional
+
+from osl_cli.state.cards import CardStore
+from osl_cli.state.store import write_json_atomic
+
+
+# Grades (Anki-style)
+AGAIN, HARD, GOOD, EASY = 1, 2, 3, 4
+GRADE_LABELS = {AGAIN: "again", HARD: "hard", GOOD: "good", EASY: "easy"}
+
+MIN_EASE = 1.3
+RELEARN_MINUTES = 10
+DEFAULT_CHECKPOINT_EVERY = 25
+DEFAULT_PREFETCH = 32
+
+
+def apply_grade(schedule: Dict[str, Any], grade: int, now: datetime) -> Dict[str, Any]:
+    """Compute the next schedule for a card (SM-2 variant).
+
+    Args:
+        schedule: Current schedule dictionary (as stored)
+        grade: 1=again, 2=hard, 3=good, 4=easy
+        now: Review time
+
+    Returns:
+        New schedule dictionary
+    """
+    interval = float(schedule.get("interval_days", 0.0))
+    ease = float(schedule.get("ease", 2.5))
+    reps = int(schedule.get("reps", 0)) + 1
+    lapses = int(schedule.get("lapses", 0))
+
+    if grade == AGAIN:
+        lapses += 1
+        ease = max(MIN_EASE, ease - 0.2)
+        interval = 0.0
+        due = now + timedelta(minutes=RELEARN_MINUTES)
+    else:
+        if grade == HARD:
+            ease = max(MIN_EASE, ease - 0.15)
+            interval = max(1.0, interval * 1.2)
+        elif interval < 1.0:
+            interval = 1.0 if grade == GOOD else 3.0
+        else:
+            interval = interval * ease * (1.3 if grade == EASY else 1.0)
+            if grade == EASY:
+                ease += 0.15
+        due = now + timedelta(days=interval)
+
+    return {
+        "due": due.isoformat(),
+        "interval_days": round(interval, 3),
+        "ease": round(ease, 3),
+        "reps": reps,
+        "lapses": lapses,
+        "last_review": now.isoformat(),
+    }
+
+
+class Prefetcher:
+    """Reads ahead from an iterator on a background thread.
+
+    Card shards for later books are loaded while the learner is still
+    answering earlier cards.
+    """
+
+    _DONE = object()
+
+    def __init__(self, source: Iterable[Any], depth: int = DEFAULT_PREFETCH):
+        """Start prefetching.
+
+        Args:
+            source: Iterable to read ahead from
+            depth: Maximum items buffered
+        """
+        self._queue: "queue.Queue[Any]" = queue.Queue(maxsize=max(1, depth))
+        self._error: Optional[BaseException] = None
+        self._stopped = threading.Event()
+        self._thread = threading.Thread(target=self._fill, args=(iter(source),), daemon=True)
+        self._thread.start()
+
+    def _fill(self, source: Iterator[Any]) -> None:
+        try:
+            for item in source:
+                while not self._stopped.is_set():
+                    try:
+                        self._queue.put(item, timeout=0.1)
+                        break
+                    except queue.Full:
+                        continue
+                if self._stopped.is_set():
+                    return
+        except BaseException as e:  # surfaced to the consumer
+            self._error = e
+        finally:
+            while not self._stopped.is_set():
+                try:
+                    self._queue.put(self._DONE, timeout=0.1)
+                    break
+                except queue.Full:
+                    continue
+
+    def __iter__(self) -> "Prefetcher":
+        return self
+
+    def __next__(self) -> Any:
+        item = self._queue.get()
+        if item is self._DONE:
+            if self._error is not None:
+                raise self._error
+            raise StopIteration
+        return item
+
+    def close(self) -> None:
+        """Stop the background reader."""
+        self._stopped.set()
+
+
+class ReviewLog:
+    """Append-only review log with an applied-offset checkpoint."""
+
+    def __init__(self, base_path: Optional[Path] = None):
+        """Initialize review log.
+
+        Args:
+            base_path: Base OSL directory path. Defaults to ./osl
+        """
+        self.base_path = base_path or Path.cwd() / "osl"
+        self.log_path = self.base_path / "ai_state" / "review_log.jsonl"
+        self.checkpoint_path = self.base_path / "ai_state" / "review_checkpoint.json"
+
+    def append(self, entry: Dict[str, Any]) -> None:
+        """Durably append one entry.
+
+        Args:
+            entry: JSON-serializable log entry
+        """
+        self.log_path.parent.mkdir(parents=True, exist_ok=True)
+        with open(self.log_path, "a") as f:
+            f.write(json.dumps(entry) + "\n")
+            f.flush()
+            os.fsync(f.fileno())
+
+    def applied_offset(self) -> int:
+        """Byte offset up to which answers are reflected in the card store."""
+        if not self.checkpoint_path.exists():
+            return 0
+        with open(self.checkpoint_path) as f:
+            return json.load(f).get("offset", 0)
+
+    def mark_applied(self) -> None:
+        """Record that every logged answer is now in the card store."""
+        offset = self.log_path.stat().st_size if self.log_path.exists() else 0
+        write_json_atomic(self.checkpoint_path, {
+            "offset": offset,
+            "updated_at": datetime.now().isoformat(),
+        })
+
+    def pending(self) -> Iterator[Dict[str, Any]]:
+        """Answers logged after the last checkpoint."""
+        if not self.log_path.exists():
+            return
+        with open(self.log_path) as f:
+            f.seek(self.applied_offset())
+            for line in f:
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    yield json.loads(line)
+                except json.JSONDecodeError:
+                    # Torn final line from a crash mid-write
+                    continue
+
+    def iter_since(self, since: datetime) -> Iterator[Dict[str, Any]]:
+        """All answers at or after ``since`` (scans the log)."""
+        if not self.log_path.exists():
+            return
+        cutoff = since.isoformat()
+        with open(self.log_path) as f:
+            for line in f:
+                try:
+                    entry = json.loads(line)
+                except json.JSONDecodeError:
+                    continue
+                if entry.get("ts", "") >= cutoff:
+                    yield entry
+
+
+class ReviewRunner:
+    """Runs a review over a stream of due cards."""
+
+    def __init__(
+        self,
+        base_path: Optional[Path] = None,
+        checkpoint_every: int = DEFAULT_CHECKPOINT_EVERY,
+    ):
+        """Initialize review runner.
+
+        Args:
+            base_path: Base OSL directory path. Defaults to ./osl
+            checkpoint_every: Answers between batched schedule writes
+        """
+        self.base_path = base_path or Path.cwd() / "osl"
+        self.checkpoint_every = max(1, checkpoint_every)
+        self.log = ReviewLog(self.base_path)
+        # Separate instance for writes so the prefetch thread's read-side
+        # shards are never mutated underneath it
+        self.cards = CardStore(self.base_path)
+        self.run_id = str(uuid.uuid4())[:8]
+        self._pending: Dict[str, Dict[str, Dict[str, Any]]] = {}
+        self._since_checkpoint = 0
+        self._seen: set = set()
+        self.answered = 0
+        self.correct = 0
+
+    def recover(self) -> int:
+        """Replay answers logged after the last checkpoint.
+
+        Replay is idempotent: an answer is skipped when the stored card was
+        already reviewed at or after the answer's timestamp.
+
+        Returns:
+            Number of answers applied
+        """
+        applied = 0
+        for entry in self.log.pending():
+            if entry.get("type") != "answer":
+                continue
+            if self._stage(entry["card_id"], entry["grade"], datetime.fromisoformat(entry["ts"])):
+                applied += 1
+        self.checkpoint()
+        return applied
+
+    def _stage(self, card_id: str, grade: int, when: datetime) -> bool:
+        book_id = self.cards.book_of(card_id)
+        if book_id is None:
+            return False
+
+        staged = self._pending.get(book_id, {}).get(card_id)
+        record = staged or self.cards.get_record(card_id)
+        last = record["schedule"].get("last_review")
+        if last and last >= when.isoformat():
+            return False
+
+        updated = dict(record)
+        updated["schedule"] = apply_grade(record["schedule"], grade, when)
+        self._pending.setdefault(book_id, {})[card_id] = updated
+        return True
+
+    def stream(self, source: Iterable[Dict[str, Any]], prefetch: int = DEFAULT_PREFETCH) -> Iterator[Dict[str, Any]]:
+        """Stream cards to review, prefetched and de-duplicated.
+
+        Args:
+            source: Iterable of raw card dictionaries
+            prefetch: Read-ahead depth
+
+        Yields:
+            Cards not yet seen in this run
+        """
+        prefetcher = Prefetcher(source, prefetch)
+        try:
+            for card in prefetcher:
+                if card["card_id"] in self._seen:
+                    continue
+                self._seen.add(card["card_id"])
+                yield card
+        finally:
+            prefetcher.close()
+
+    def record(self, card: Dict[str, Any], grade: int, elapsed_ms: int = 0) -> None:
+        """Log an answer and stage its schedule update.
+
+        Args:
+            card: Raw card dictionary
+            grade: 1=again, 2=hard, 3=good, 4=easy
+            elapsed_ms: Time spent on the card
+        """
+        now = datetime.now()
+        self.log.append({
+            "type": "answer",
+            "run_id": self.run_id,
+            "ts": now.isoformat(),
+            "card_id": card["card_id"],
+            "book_id": card["book_id"],
+            "grade": grade,
+            "elapsed_ms": elapsed_ms,
+        })
+        self._stage(card["card_id"], grade, now)
+
+        self.answered += 1
+        self.correct += int(grade != AGAIN)
+        self._since_checkpoint += 1
+        if self._since_checkpoint >= self.checkpoint_every:
+            self.checkpoint()
+
+    def checkpoint(self) -> None:
+        """Write staged schedule updates, one shard write per book."""
+        for book_id, updates in self._pending.items():
+            self.cards.put_records(book_id, updates)
+        self._pending = {}
+        self._since_checkpoint = 0
+        self.log.mark_applied()
+
+    @property
+    def retention(self) -> float:
+        """Share of answers not graded 'again', in percent."""
+        return 100.0 * self.correct / self.answered if self.answered else 0.0
@@ -0,0 +1,408 @@
+"""Deduplicating snapshots of an OSL directory.
+
+``osl backup`` keeps point-in-time copies of the whole OSL directory in
+a repository (``<osl>/backups`` unless another path is given)::
+
+    backups/index.json               # snapshot ids, times and sizes
+    backups/snapshots/<id>.json      # file -> [size, mtime_ns, mode, chunks]
+    backups/chunks/3f/3fa9...e1[.z]  # chunk bytes by SHA-256 (blob layout)
+
+Files are cut into chunks at content-defined boundaries: a Gear rolling
+hash runs over the bytes and a chunk ends wherever the hash's top
+``AVG_BITS`` bits are zero. A boundary depends only on the bytes just
+before it, so an edit or an append only moves the boundaries next to it
+and every other chunk keeps its hash. Chunks are stored once (zlib
+compressed where that helps), so a snapshot only adds the chunks no
+earlier snapshot had. Files whose size and mtime match the previous
+snapshot are not read at all.
+
+Restore rewrites only files whose size or mtime differ from the
+snapshot and gives each file its recorded mtime back, so restoring to a
+nearby point in time touches only what differs. This replaces the
+single ``.bak`` per file and the full ``.v*.bak`` copies, which are not
+included in snapshots.
+"""
+
+import hashlib
+import json
+import os
+import time
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence
+
+from osl_cli.perf import trace
+from osl_cli.state.blobs import BlobStore
+from osl_cli.state.locking import FileLock
+from osl_cli.state.merkle import FileIndex
+from osl_cli.state.store import write_json_atomic
+
+
+BACKUP_DIR = "backups"
+
+# Chunk sizes: no cut before MIN_CHUNK, a forced cut at MAX_CHUNK, and on
+# average a cut every 2 ** AVG_BITS bytes in between
+MIN_CHUNK = 2 * 1024
+MAX_CHUNK = 64 * 1024
+AVG_BITS = 13
+
+# The 32-bit Gear hash only depends on the last 32 bytes
+WINDOW = 32
+CUT_MASK = ((1 << AVG_BITS) - 1) << (32 - AVG_BITS)
+
+# Fixed per-byte values, so boundaries are stable across versions
+GEAR = [int.from_bytes(hashlib.sha256(bytes([b])).digest()[:4], "big") for b in range(256)]
+
+# Per-file backups that snapshots replace
+SKIP_SUFFIXES = (".bak", ".tmp")
+
+
+def chunk_ends(data: bytes) -> List[int]:
+    """Offsets at which content-defined chunks of ``data`` end."""
+    ends: List[int] = []
+    gear, mask, size = GEAR, CUT_MASK, len(data)
+    start = 0
+    while start < size:
+        end = min(start + MAX_CHUNK, size)
+        if end - start <= MIN_CHUNK:
+            ends.append(end)
+            break
+        # Warm the hash up on the window before the first allowed cut
+        h = 0
+        for b in data[start + MIN_CHUNK - WINDOW:start + MIN_CHUNK]:
+            h = ((h << 1) + gear[b]) & 0xFFFFFFFF
+        cut = end
+        pos = start + MIN_CHUNK
+        for b in data[pos:end]:
+            h = ((h << 1) + gear[b]) & 0xFFFFFFFF
+            pos += 1
+            if not h & mask:
+                cut = pos
+                break
+        ends.append(cut)
+        start = cut
+    return ends
+
+
+@dataclass
+class BackupReport:
+    """What ``BackupRepository.create`` stored."""
+    snapshot: str
+    unchanged: bool = False  # identical to the previous snapshot; nothing written
+    files: int = 0
+    bytes: int = 0
+    reused_files: int = 0  # size and mtime unchanged, not read
+    chunks: int = 0
+    new_chunks: int = 0
+    new_bytes: int = 0  # before compression
+    stored_bytes: int = 0  # on disk
+    seconds: float = 0.0
+
+    def to_dict(self) -> Dict[str, Any]:
+        """JSON-friendly representation."""
+        return {
+            "snapshot": self.snapshot,
+            "unchanged": self.unchanged,
+            "files": self.files,
+            "bytes": self.bytes,
+            "reused_files": self.reused_files,
+            "chunks": self.chunks,
+            "new_chunks": self.new_chunks,
+            "new_bytes": self.new_bytes,
+            "stored_bytes": self.stored_bytes,
+            "seconds": round(self.seconds, 3),
+        }
+
+
+@dataclass
+class RestoreReport:
+    """What ``BackupRepository.restore`` changed."""
+    snapshot: str
+    target: str
+    restored: List[str] = field(default_factory=list)
+    removed: List[str] = field(default_factory=list)
+    unchanged: int = 0
+    bytes: int = 0
+    safety_snapshot: Optional[str] = None  # state before an in-place restore
+    seconds: float = 0.0
+
+    def to_dict(self) -> Dict[str, Any]:
+        """JSON-friendly representation."""
+        return {
+            "snapshot": self.snapshot,
+            "target": self.target,
+            "restored": self.restored,
+            "removed": self.removed,
+            "unchanged": self.unchanged,
+            "bytes": self.bytes,
+            "safety_snapshot": self.safety_snapshot,
+            "seconds": round(self.seconds, 3),
+        }
+
+
+class BackupRepository:
+    """Snapshots of one OSL directory in a chunk store."""
+
+    def __init__(self, base_path: Optional[Path] = None, repo_path: Optional[Path] = None):
+        """Initialize the repository.
+
+        Args:
+            base_path: Base OSL directory path. Defaults to ./osl
+            repo_path: Repository directory. Defaults to <osl>/backups
+        """
+        self.base_path = base_path or Path.cwd() / "osl"
+        self.repo_path = repo_path or self.base_path / BACKUP_DIR
+        self.index_path = self.repo_path / "index.json"
+        self.snapshots_path = self.repo_path / "snapshots"
+        self.chunks = BlobStore(self.repo_path, compress_min_bytes=0,
+                                blobs_path=self.repo_path / "chunks")
+
+    def _files(self, root: Path) -> FileIndex:
+        """Walker over the files a snapshot of ``root`` covers."""
+        try:
+            inside = self.repo_path.resolve().relative_to(root.resolve()).as_posix() + "/"
+        except ValueError:
+            inside = None
+
+        def exclude(key: str) -> bool:
+            return key == inside or key.endswith(SKIP_SUFFIXES)
+
+        return FileIndex(root, ("",), self.index_path, exclude=exclude)
+
+    def snapshots(self) -> List[Dict[str, Any]]:
+        """Summaries of every snapshot, oldest first."""
+        try:
+            with open(self.index_path) as f:
+                return json.load(f).get("snapshots", [])
+        except FileNotFoundError:
+            return []
+
+    def resolve(self, ref: str) -> str:
+        """Snapshot id for an id, unique id prefix, ``latest`` or a time.
+
+        A date or time selects the last snapshot taken at or before it
+        (a bare date means the end of that day).
+
+        Raises:
+            ValueError: If no single snapshot matches
+        """
+        snapshots = self.snapshots()
+        ids = [s["id"] for s in snapshots]
+        if not ids:
+            raise ValueError("No snapshots yet")
+        if ref == "latest":
+            return ids[-1]
+        if ref in ids:
+            return ref
+        matches = [i for i in ids if i.startswith(ref)]
+        if len(matches) == 1:
+            return matches[0]
+        if len(matches) > 1:
+            raise ValueError(f"Snapshot {ref!r} is ambiguous ({len(matches)} match)")
+        try:
+            when = datetime.fromisoformat(ref)
+        except ValueError:
+            raise ValueError(f"No snapshot matches {ref!r}") from None
+        if len(ref) == 10:
+            when += timedelta(days=1)
+            earlier = [s["id"] for s in snapshots if s["created_at"] < when.isoformat()]
+        else:
+            earlier = [s["id"] for s in snapshots if s["created_at"] <= when.isoformat()]
+        if not earlier:
+            raise ValueError(f"No snapshot taken by {ref}")
+        return earlier[-1]
+
+    def load(self, snapshot_id: str) -> Dict[str, Any]:
+        """A snapshot's manifest."""
+        with open(self.snapshots_path / f"{snapshot_id}.json") as f:
+            return json.load(f)
+
+    def _new_id(self, now: datetime) -> str:
+        snapshot_id = now.strftime("%Y%m%d-%H%M%S")
+        ids = {s["id"] for s in self.snapshots()}
+        suffix = 1
+        candidate = snapshot_id
+        while candidate in ids:
+            suffix += 1
+            candidate = f"{snapshot_id}-{suffix}"
+        return candidate
+
+    def _stored_size(self, digest: str) -> int:
+        try:
+            return self.chunks.path(digest).stat().st_size
+        except FileNotFoundError:
+            return self.chunks.path(digest, True).stat().st_size
+
+    def create(self, note: str = "", rehash: bool = False) -> BackupReport:
+        """Snapshot the OSL directory.
+
+        Args:
+            note: Free-text label shown by ``osl backup list``
+            rehash: Read every file, even ones whose size and mtime match
+                the previous snapshot
+
+        Returns:
+            What was stored; if nothing changed since the previous
+            snapshot, no new one is written and its id is returned
+        """
+        started = time.perf_counter()
+        with trace.span("backup.create", "state"):
+            with FileLock(self.index_path):
+                snapshots = self.snapshots()
+                parent = self.load(snapshots[-1]["id"]) if snapshots else None
+                previous = parent["files"] if parent and not rehash else {}
+                report = BackupReport(snapshot="")
+                files: Dict[str, List[Any]] = {}
+                seen = set()
+
+                for key, path, stat in self._files(self.base_path).iter_files():
+                    mode = stat.st_mode & 0o7777
+                    entry = previous.get(key)
+                    if entry is not None and entry[0] == stat.st_size and entry[1] == stat.st_mtime_ns:
+                        files[key] = [entry[0], entry[1], mode, entry[3]]
+                        report.reused_files += 1
+                    else:
+                        files[key] = [stat.st_size, stat.st_mtime_ns, mode,
+                                      self._put_file(path, seen, report)]
+                    report.files += 1
+                    report.bytes += files[key][0]
+                    report.chunks += len(files[key][3])
+
+                if parent is not None and files == parent["files"]:
+                    report.snapshot, report.unchanged = parent["id"], True
+                    report.seconds = time.perf_counter() - started
+                    return report
+
+                now = datetime.now()
+                report.snapshot = self._new_id(now)
+                write_json_atomic(self.snapshots_path / f"{report.snapshot}.json", {
+                    "version": 1,
+                    "id": report.snapshot,
+                    "created_at": now.isoformat(),
+                    "parent": parent["id"] if parent else None,
+                    "note": note,
+                    "files": files,
+                })
+                snapshots.append({
+                    "id": report.snapshot,
+                    "created_at": now.isoformat(),
+                    "note": note,
+                    "files": report.files,
+                    "bytes": report.bytes,
+                    "new_chunks": report.new_chunks,
+                    "stored_bytes": report.stored_bytes,
+                })
+                write_json_atomic(self.index_path, {"version": 1, "snapshots": snapshots})
+        report.seconds = time.perf_counter() - started
+        return report
+
+    def _put_file(self, path: str, seen: set, report: BackupReport) -> List[str]:
+        """Chunk a file into the store; returns its chunk digests."""
+        with open(path, "rb") as f:
+            data = f.read()
+        digests: List[str] = []
+        start = 0
+        for end in chunk_ends(data):
+            piece = data[start:end]
+            digest = hashlib.sha256(piece).hexdigest()
+            if digest not in seen:
+                seen.add(digest)
+                if not self.chunks.has(digest):
+                    self.chunks.put_bytes(piece)
+                    report.new_chunks += 1
+                    report.new_bytes += len(piece)
+                    report.stored_bytes += self._stored_size(digest)
+            digests.append(digest)
+            start = end
+        return digests
+
+    def restore(self, ref: str, target: Optional[Path] = None,
+                paths: Sequence[str] = ()) -> RestoreReport:
+        """Bring a directory back to a snapshot.
+
+        Files that differ from the snapshot are rewritten and files the
+        snapshot does not have are removed (within ``paths``, if given).
+        Restoring over the OSL directory itself first snapshots its
+        current state, so the restore can be undone.
+
+        Args:
+            ref: Snapshot id, prefix, ``latest`` or a date/time
+            target: Directory to restore into. Defaults to the OSL directory
+            paths: Only restore files under these relative paths
+
+        Raises:
+            ValueError: If ``ref`` matches no snapshot
+        """
+        started = time.perf_counter()
+        snapshot_id = self.resolve(ref)
+        target = target or self.base_path
+        in_place = target.resolve() == self.base_path.resolve()
+        report = RestoreReport(snapshot=snapshot_id, target=str(target))
+
+        prefixes = tuple(p.strip("/") for p in paths)
+
+        def selected(key: str) -> bool:
+            return not prefixes or any(key == p or key.startswith(p + "/") for p in prefixes)
+
+        def is_state(key: str) -> bool:
+            # State files are written under their lock; notes and decks are not
+            return key.startswith("ai_state/")
+
+        with trace.span("backup.restore", "state", snapshot=snapshot_id):
+            if in_place:
+                report.safety_snapshot = self.create(note=f"before restore of {snapshot_id}").snapshot
+            files = self.load(snapshot_id)["files"]
+
+            for key in sorted(files):
+                if not selected(key):
+                    continue
+                size, mtime_ns, mode, digests = files[key]
+                dest = target / key
+                try:
+                    stat = dest.stat()
+                    if stat.st_size == size and stat.st_mtime_ns == mtime_ns:
+                        report.unchanged += 1
+                        continue
+                except FileNotFoundError:
+                    pass
+                self._restore_file(dest, mode, mtime_ns, digests, lock=in_place and is_state(key))
+                report.restored.append(key)
+                report.bytes += size
+
+            for key, path, _ in self._files(target).iter_files():
+                if key not in files and selected(key):
+                    self._remove_file(Path(path), lock=in_place and is_state(key))
+                    report.removed.append(key)
+
+        report.seconds = time.perf_counter() - started
+        return report
+
+    def _restore_file(self, dest: Path, mode: int, mtime_ns: int, digests: List[str],
+                      lock: bool) -> None:
+        dest.parent.mkdir(parents=True, exist_ok=True)
+        temp_path = dest.with_name(f".{dest.name}.{os.getpid()}.tmp")
+        with open(temp_path, "wb") as f:
+            for digest in digests:
+                f.write(self.chunks.get_bytes(digest))
+        os.chmod(temp_path, mode)
+        os.utime(temp_path, ns=(mtime_ns, mtime_ns))
+        if lock:
+            with FileLock(dest):
+                temp_path.replace(dest)
+        else:
+            temp_path.replace(dest)
+
+    def _remove_file(self, path: Path, lock: bool) -> None:
+        if lock:
+            with FileLock(path):
+                path.unlink()
+        else:
+            path.unlink()
+
+    def stats(self) -> Dict[str, Any]:
+        """Snapshot count, chunk count and bytes on disk."""
+        chunks = self.chunks.stats()
+        return {"snapshots": len(self.snapshots()), "chunks": chunks["blobs"],
+                "bytes": chunks["bytes"]}
+
@@ -0,0 +1,241 @@
+"""Content-addressed storage for verbatim learner text.
+
+Recalls, explanations and card text are written once to
+``ai_state/blobs/`` under the SHA-256 of their UTF-8 bytes (the same
+hash as ``recall_hash``/``explanation_hash``), sharded by the first two
+hex digits::
+
+    blobs/3f/3fa9...e1      # raw UTF-8
+    blobs/c0/c04b...7d.z    # zlib, for texts of COMPRESS_MIN_BYTES or more
+
+Session files refer to a blob as ``{"blob": "<sha256>"}`` in place of
+the text. Identical text is stored once, session JSON stays small, and
+every read is checked against its hash. Texts under ``INLINE_MAX_BYTES``
+stay inline, where a reference would be no smaller.
+
+The session file is thus the hot part of a session (state, counters,
+ids) and the blobs its cold part. Loading a session leaves references
+unread as :class:`BlobRef` values; the text is fetched on first access
+(see ``schemas.ColdTextModel``), so status commands never touch it.
+"""
+
+import copy
+import hashlib
+import os
+import zlib
+from pathlib import Path
+from typing import Any, Dict, Iterator, Optional, Tuple
+
+from osl_cli.perf import trace
+
+
+# Shorter texts are kept inline in the session JSON
+INLINE_MAX_BYTES = 128
+
+# Texts at least this long are stored compressed (None: never)
+COMPRESS_MIN_BYTES = 1024
+
+# Text fields of the session JSON stored as blobs
+LOOP_FIELDS = {
+    "recall_data": ("verbatim_recall",),
+    "feynman_explanation": ("explanation_text",),
+}
+CARD_FIELDS = ("front", "back")
+CONTEXT_FIELDS = ("recall_text", "explanation_text")
+
+
+class BlobIntegrityError(ValueError):
+    """A blob's content no longer matches its hash."""
+
+
+def is_ref(value: Any) -> bool:
+    """Whether a JSON value is a blob reference."""
+    return isinstance(value, dict) and len(value) == 1 and "blob" in value
+
+
+class BlobRef:
+    """A referenced blob that has not been read yet."""
+
+    __slots__ = ("digest", "blobs")
+
+    def __init__(self, digest: str, blobs: "BlobStore"):
+        self.digest = digest
+        self.blobs = blobs
+
+    def load(self) -> str:
+        """The blob's (verified) text."""
+        return self.blobs.get(self.digest)
+
+    def __repr__(self) -> str:
+        return f"BlobRef({self.digest[:12]})"
+
+
+class BlobStore:
+    """SHA-256 keyed text store under ``ai_state/blobs``."""
+
+    def __init__(self, base_path: Optional[Path] = None,
+                 compress_min_bytes: Optional[int] = COMPRESS_MIN_BYTES,
+                 blobs_path: Optional[Path] = None):
+        """Initialize the blob store.
+
+        Args:
+            base_path: Base OSL directory path. Defaults to ./osl
+            compress_min_bytes: Compress texts of at least this many bytes
+                (None disables compression)
+            blobs_path: Store directory. Defaults to ai_state/blobs
+        """
+        self.base_path = base_path or Path.cwd() / "osl"
+        self.blobs_path = blobs_path or self.base_path / "ai_state" / "blobs"
+        self.compress_min_bytes = compress_min_bytes
+
+    def path(self, digest: str, compressed: bool = False) -> Path:
+        """Location of a blob."""
+        return self.blobs_path / digest[:2] / (digest + (".z" if compressed else ""))
+
+    def has(self, digest: str) -> bool:
+        """Whether a blob is stored (in either form)."""
+        return self.path(digest).exists() or self.path(digest, True).exists()
+
+    def put(self, text: str) -> str:
+        """Store a text (once) and return its SHA-256."""
+        return self.put_bytes(text.encode("utf-8"))
+
+    def put_bytes(self, data: bytes) -> str:
+        """Store raw bytes (once) and return their SHA-256."""
+        digest = hashlib.sha256(data).hexdigest()
+        if self.has(digest):
+            return digest
+
+        compressed = self.compress_min_bytes is not None and len(data) >= self.compress_min_bytes
+        if compressed:
+            packed = zlib.compress(data, 6)
+            if len(packed) < len(data):
+                data = packed
+            else:
+                compressed = False
+
+        path = self.path(digest, compressed)
+        with trace.span("io.write", "io", file="blob"):
+            path.parent.mkdir(parents=True, exist_ok=True)
+            # Unique temp name: concurrent writers of the same blob both succeed
+            temp_path = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+            with open(temp_path, "wb") as f:
+                f.write(data)
+            temp_path.replace(path)
+        return digest
+
+    def get(self, digest: str) -> str:
+        """Read a text, verifying it against its hash.
+
+        Raises:
+            FileNotFoundError: If the blob is missing
+            BlobIntegrityError: If the stored bytes do not hash to ``digest``
+        """
+        return self.get_bytes(digest).decode("utf-8")
+
+    def get_bytes(self, digest: str) -> bytes:
+        """Read raw bytes, verifying them against their hash.
+
+        Raises:
+            FileNotFoundError: If the blob is missing
+            BlobIntegrityError: If the stored bytes do not hash to ``digest``
+        """
+        with trace.span("io.read", "io", file="blob"):
+            try:
+                with open(self.path(digest), "rb") as f:
+                    data = f.read()
+            except FileNotFoundError:
+                with open(self.path(digest, True), "rb") as f:
+                    try:
+                        data = zlib.decompress(f.read())
+                    except zlib.error as e:
+                        raise BlobIntegrityError(f"Blob {digest} is corrupt: {e}") from e
+        if hashlib.sha256(data).hexdigest() != digest:
+            raise BlobIntegrityError(f"Blob {digest} does not match its hash")
+        return data
+
+    def iter_digests(self) -> Iterator[str]:
+        """Hashes of every stored blob."""
+        if not self.blobs_path.is_dir():
+            return
+        with os.scandir(self.blobs_path) as shards:
+            for shard in shards:
+                if not shard.is_dir():
+                    continue
+                with os.scandir(shard.path) as entries:
+                    for entry in entries:
+                        if not entry.name.startswith("."):
+                            yield entry.name[:-2] if entry.name.endswith(".z") else entry.name
+
+    def stats(self) -> Dict[str, int]:
+        """Blob count and bytes on disk."""
+        count = size = compressed = 0
+        for digest in self.iter_digests():
+            count += 1
+            path = self.path(digest)
+            if not path.exists():
+                path = self.path(digest, True)
+                compressed += 1
+            size += path.stat().st_size
+        return {"blobs": count, "bytes": size, "compressed": compressed}
+
+    def store(self, text: Any) -> Any:
+        """Reference for a text worth storing as a blob, else the text."""
+        if isinstance(text, str) and len(text.encode("utf-8")) >= INLINE_MAX_BYTES:
+            return {"blob": self.put(text)}
+        return text
+
+    def load(self, value: Any) -> Any:
+        """Text for a blob reference; other values are returned as is."""
+        return self.get(value["blob"]) if is_ref(value) else value
+
+
+def _session_texts(data: Dict[str, Any]) -> Iterator[Tuple[Dict[str, Any], str]]:
+    """(container, key) of every blob-able text field in session JSON."""
+    for loop in data.get("micro_loops") or []:
+        for section, keys in LOOP_FIELDS.items():
+            container = loop.get(section)
+            if container:
+                for key in keys:
+                    if key in container:
+                        yield container, key
+        for card in loop.get("flashcards_created") or []:
+            for key in CARD_FIELDS:
+                if key in card:
+                    yield card, key
+    for entry in data.get("state_history") or []:
+        context = entry.get("context")
+        if context:
+            for key in CONTEXT_FIELDS:
+                if key in context:
+                    yield context, key
+
+
+def session_refs(data: Dict[str, Any]) -> Iterator[str]:
+    """Hashes of the blobs a session's JSON refers to."""
+    for container, key in _session_texts(data):
+        if is_ref(container[key]):
+            yield container[key]["blob"]
+
+
+def externalize_session(data: Dict[str, Any], blobs: BlobStore) -> Dict[str, Any]:
+    """Move a session's verbatim text into blobs (modifies ``data``)."""
+    with trace.span("blobs.externalize", "state"):
+        for container, key in _session_texts(data):
+            container[key] = blobs.store(container[key])
+    return data
+
+
+def resolve_session(data: Dict[str, Any], blobs: BlobStore) -> Dict[str, Any]:
+    """Session JSON with blob references replaced by their text.
+
+    ``data`` itself is left untouched: it is kept as the merge snapshot,
+    which must match the file on disk.
+    """
+    if not any(is_ref(c[k]) for c, k in _session_texts(data)):
+        return data
+    resolved = copy.deepcopy(data)
+    with trace.span("blobs.resolve", "state"):
+        for container, key in _session_texts(resolved):
+            container[key] = blobs.load(container[key])
+    return resolved
@@ -0,0 +1,142 @@
+"""In-memory cache of validated state models.
+
+Only the resident daemon enables the cache; a normal one-shot ``osl``
+process always reads from disk. Entries are keyed by path and checked
+against the file's stat signature on every lookup, so edits made by other
+processes (or by hand) are picked up on the next load. Callers always
+receive a deep copy and may mutate it freely.
+"""
+
+import threading
+from pathlib import Path
+from typing import Callable, Dict, Optional, Tuple, TypeVar
+
+from pydantic import BaseModel
+
+
+M = TypeVar("M", bound=BaseModel)
+Signature = Tuple[int, int, int]
+
+
+def signature(path: Path) -> Optional[Signature]:
+    """Stat signature used to detect file changes (None if missing)."""
+    try:
+        st = path.stat()
+    except FileNotFoundError:
+        return None
+    return (st.st_mtime_ns, st.st_size, st.st_ino)
+
+
+class StateCache:
+    """Path-keyed cache of validated models."""
+
+    def __init__(self) -> None:
+        """Initialize an empty cache."""
+        self._entries: Dict[Path, Tuple[Signature, BaseModel]] = {}
+        self._loaders: Dict[Path, Callable[[], BaseModel]] = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.reloads = 0
+
+    def load(self, path: Path, loader: Callable[[], M]) -> M:
+        """Return a copy of the cached model, loading it if stale.
+
+        Args:
+            path: State file the model is read from
+            loader: Reads and validates the file
+
+        Returns:
+            Deep copy of the model
+        """
+        sig = signature(path)
+        with self._lock:
+            self._loaders[path] = loader
+            entry = self._entries.get(path)
+            if entry is not None and entry[0] == sig:
+                self.hits += 1
+                return entry[1].model_copy(deep=True)  # type: ignore[return-value]
+
+        model = loader()
+        with self._lock:
+            self.misses += 1
+            if sig is not None:
+                self._entries[path] = (sig, model)
+        return model.model_copy(deep=True)
+
+    def invalidate(self, path: Path) -> None:
+        """Drop the cached model for a path."""
+        with self._lock:
+            self._entries.pop(path, None)
+
+    def refresh_stale(self) -> int:
+        """Reload every known file whose signature changed.
+
+        Called periodically by the daemon's watcher so the next request
+        finds a warm cache after an external edit.
+
+        Returns:
+            Number of files reloaded
+        """
+        with self._lock:
+            known = list(self._loaders.items())
+
+        reloaded = 0
+        for path, loader in known:
+            sig = signature(path)
+            with self._lock:
+                entry = self._entries.get(path)
+            if entry is not None and entry[0] == sig:
+                continue
+            if sig is None:
+                self.invalidate(path)
+                continue
+            try:
+                model = loader()
+            except Exception:
+                # Half-written or invalid file; retry on the next pass
+                self.invalidate(path)
+                continue
+            with self._lock:
+                self._entries[path] = (sig, model)
+                self.reloads += 1
+            reloaded += 1
+        return reloaded
+
+    def stats(self) -> Dict[str, int]:
+        """Hit/miss counters."""
+        return {
+            "entries": len(self._entries),
+            "hits": self.hits,
+            "misses": self.misses,
+            "reloads": self.reloads,
+        }
+
+
+_cache: Optional[StateCache] = None
+
+
+def enable() -> StateCache:
+    """Turn on caching for this process."""
+    global _cache
+    if _cache is None:
+        _cache = StateCache()
+    return _cache
+
+
+def active() -> Optional[StateCache]:
+    """Return the process cache, if enabled."""
+    return _cache
+
+
+def load(path: Path, loader: Callable[[], M]) -> M:
+    """Load through the cache when enabled, otherwise call ``loader``."""
+    if _cache is None:
+        return loader()
+    return _cache.load(path, loader)
+
+
+def invalidate(path: Path) -> None:
+    """Drop a cached entry after this process writes the file."""
+    if _cache is not None:
+        _cache.invalidate(path)
@@ -0,0 +1,188 @@
+"""Persistent flashcard store.
+
+Cards authored during a session are copied here so they survive the
+session and can be scheduled, reviewed and quizzed later. Each book shard
+indexes cards by due date so due queues never scan the whole deck.
+"""
+
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional
+
+from osl_cli.state.schemas import CardRecord, CardSchedule, FlashcardCreated
+from osl_cli.state.store import BookShardedStore
+
+
+# First review interval for a new card, in days (see spacing.intervals)
+FIRST_INTERVAL_DAYS = 1
+
+
+def due_key(due: datetime) -> str:
+    """Index key for a due date (lexicographically sortable)."""
+    return due.strftime("%Y-%m-%d")
+
+
+class CardStore(BookShardedStore):
+    """Cross-session store of learner-authored cards."""
+
+    store_name = "cards"
+
+    def __init__(self, base_path: Optional[Path] = None):
+        """Initialize card store.
+
+        Args:
+            base_path: Base OSL directory path. Defaults to ./osl
+        """
+        super().__init__(base_path)
+
+    def _index_names(self) -> List[str]:
+        return ["due"]
+
+    def _index_keys(self, record: Dict) -> Dict[str, List[str]]:
+        # Stored due dates are ISO strings; the date prefix is the day key
+        return {"due": [record["schedule"]["due"][:10]]}
+
+    def _book_summary(self, shard: Dict) -> Dict:
+        schedules = [r["schedule"] for r in shard["records"].values()]
+        due_days = shard["indexes"].get("due", {})
+        return {
+            "total": len(schedules),
+            "reps": sum(s.get("reps", 0) for s in schedules),
+            "lapses": sum(s.get("lapses", 0) for s in schedules),
+            "next_due": min(due_days) if due_days else None,
+        }
+
+    def _update_summary(self, summary: Dict, shard: Dict, previous: Optional[Dict],
+                        record: Dict) -> None:
+        summary["total"] = len(shard["records"])
+        for sign, changed in ((-1, previous), (1, record)):
+            if changed is not None:
+                schedule = changed["schedule"]
+                summary["reps"] = summary.get("reps", 0) + sign * schedule.get("reps", 0)
+                summary["lapses"] = summary.get("lapses", 0) + sign * schedule.get("lapses", 0)
+
+        # The earliest due day only needs a rescan of the (small) day keys
+        # if the card left it and the day emptied
+        day = record["schedule"]["due"][:10]
+        due_days = shard["indexes"].get("due", {})
+        next_due = summary.get("next_due")
+        emptied = previous is not None and previous["schedule"]["due"][:10] not in due_days
+        if emptied and previous["schedule"]["due"][:10] == next_due:
+            summary["next_due"] = min(due_days) if due_days else None
+        elif next_due is None or day < next_due:
+            summary["next_due"] = day
+
+    def add(
+        self,
+        card: FlashcardCreated,
+        book_id: str,
+        session_id: Optional[str] = None,
+        topic: Optional[str] = None,
+    ) -> CardRecord:
+        """Persist a newly authored card with an initial schedule.
+
+        Args:
+            card: Card as created in the session
+            book_id: Book the card belongs to
+            session_id: Session in which the card was authored
+            topic: Optional topic label (defaults to the book)
+
+        Returns:
+            Stored CardRecord
+        """
+        now = datetime.now()
+        record = CardRecord(
+            **card.model_dump(),
+            book_id=book_id,
+            session_id=session_id,
+            created=now,
+            topic=topic,
+            schedule=CardSchedule(due=now + timedelta(days=FIRST_INTERVAL_DAYS)),
+        )
+        self.put_record(book_id, record.card_id, record.model_dump(mode="json"))
+        return record
+
+    def get(self, card_id: str) -> Optional[CardRecord]:
+        """Fetch a card by ID.
+
+        Args:
+            card_id: Card identifier
+
+        Returns:
+            CardRecord or None if unknown
+        """
+        record = self.get_record(card_id)
+        return CardRecord.model_validate(record) if record else None
+
+    def iter_raw(self, book_ids: Optional[List[str]] = None) -> Iterator[Dict]:
+        """Iterate raw card dictionaries without model validation.
+
+        Args:
+            book_ids: Books to include (defaults to all)
+
+        Yields:
+            Card dictionaries as stored
+        """
+        for book_id in book_ids if book_ids is not None else self.book_ids():
+            yield from self.iter_book(book_id)
+
+    def iter_due(self, book_id: str, until: Optional[datetime] = None) -> Iterator[Dict]:
+        """Iterate a book's due cards in due-date order.
+
+        Books whose earliest due day is after ``until`` are skipped using
+        the global index alone, without loading their shard. Cards due
+        later on the cutoff day itself are not yet due.
+
+        Args:
+            book_id: Book identifier
+            until: Cutoff time (defaults to now)
+
+        Yields:
+            Raw card dictionaries, earliest due first
+        """
+        until = until or datetime.now()
+        cutoff = due_key(until)
+        summary = self.index["books"].get(book_id)
+        if not summary or not summary.get("next_due") or summary["next_due"] > cutoff:
+            return
+
+        shard = self._load_shard(book_id)
+        records = shard["records"]
+        due_index = shard["indexes"].get("due", {})
+        for day in sorted(d for d in due_index if d <= cutoff):
+            # Snapshot the bucket; reviews may re-file cards while iterating
+            day_cards = [records[card_id] for card_id in list(due_index.get(day, []))]
+            day_cards.sort(key=lambda c: c["schedule"]["due"])
+            if day == cutoff:
+                day_cards = [c for c in day_cards
+                             if datetime.fromisoformat(c["schedule"]["due"]) <= until]
+            yield from day_cards
+
+    def due_count(self, until: Optional[datetime] = None) -> int:
+        """Number of cards due across all books.
+
+        Only shards whose earliest due day has passed are loaded. This is
+        the day's workload, so unlike :meth:`iter_due` it counts every
+        card due on the cutoff day, whatever the time.
+
+        Args:
+            until: Cutoff time (defaults to now)
+
+        Returns:
+            Count of due cards
+        """
+        cutoff = due_key(until or datetime.now())
+        total = 0
+        for book_id, summary in self.index["books"].items():
+            if not summary.get("next_due") or summary["next_due"] > cutoff:
+                continue
+            due_index = self._load_shard(book_id)["indexes"].get("due", {})
+            total += sum(len(ids) for day, ids in due_index.items() if day <= cutoff)
+        return total
+
+    def count(self, book_id: Optional[str] = None) -> int:
+        """Number of stored cards, for one book or all books."""
+        books = self.index["books"]
+        if book_id is not None:
+            return books.get(book_id, {}).get("total", 0)
+        return sum(b.get("total", 0) for b in books.values())
@@ -0,0 +1,241 @@
+"""Storage garbage collection for an OSL directory.
+
+``osl gc`` reclaims space the rest of the CLI never gives back:
+
+- Stale copies: ``.bak`` (one per state file), ``.v*.bak`` (migrations)
+  and ``.last`` (the previous session) files older than the retention
+  period, and ``.tmp`` files left behind by interrupted writes. Lock
+  files (``.<name>.lock``) are kept: unlinking one while it is held
+  would let two processes lock different files for the same state.
+- Hash registries of archived sessions are merged into
+  ``hash_registry/consolidated.json``, one file instead of one per
+  session (see ``HashRegistry``).
+- Coach state history older than the history retention is thinned to
+  the last version of each day.
+- Blobs nothing refers to are removed. Live blobs are those referred to
+  by archived sessions (recalls, explanations, cards and state history
+  contexts), the active and last sessions, and the merge bases of the
+  last sync with each peer. Blobs younger than ``GRACE`` are kept as
+  well: a save writes its blobs before the session that refers to them.
+"""
+
+import json
+import os
+import time
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Set
+
+from osl_cli.perf import trace
+from osl_cli.state.backup import BACKUP_DIR
+from osl_cli.state.blobs import BlobStore, session_refs
+from osl_cli.state.locking import FileLock
+from osl_cli.state.manager import StateManager
+from osl_cli.state.merkle import archive_index
+from osl_cli.state.store import write_json_atomic
+from osl_cli.state.sync import merge_base_digests
+from osl_cli.validation.hash import CONSOLIDATED_REGISTRY, load_consolidated
+
+
+# Days stale copies (.bak, .v*.bak, .last) are kept
+DEFAULT_KEEP_DAYS = 7
+
+# Days of coach state history kept at full resolution
+DEFAULT_HISTORY_DAYS = 30
+
+# Temp files and blobs younger than this may belong to a write in progress
+GRACE = timedelta(hours=1)
+
+COPY_SUFFIXES = (".bak", ".last")
+
+
+@dataclass
+class GcReport:
+    """What ``collect_garbage`` removed (or, for a dry run, would remove)."""
+    dry_run: bool = False
+    removed: List[str] = field(default_factory=list)  # stale copies and temp files
+    registries_merged: int = 0
+    history_versions_dropped: int = 0
+    blobs_removed: int = 0
+    reclaimed: Dict[str, int] = field(default_factory=lambda: {
+        "copies": 0, "temp": 0, "registries": 0, "history": 0, "blobs": 0,
+    })
+    seconds: float = 0.0
+
+    @property
+    def total(self) -> int:
+        """Bytes reclaimed in all."""
+        return sum(self.reclaimed.values())
+
+    def to_dict(self) -> Dict[str, Any]:
+        """JSON-friendly representation."""
+        return {
+            "dry_run": self.dry_run,
+            "removed": self.removed,
+            "registries_merged": self.registries_merged,
+            "history_versions_dropped": self.history_versions_dropped,
+            "blobs_removed": self.blobs_removed,
+            "reclaimed": self.reclaimed,
+            "total": self.total,
+            "seconds": round(self.seconds, 3),
+        }
+
+
+def _prune_files(base_path: Path, keep_days: int, now: datetime, dry_run: bool,
+                 report: GcReport) -> None:
+    """Remove stale copies and abandoned temp files."""
+    copy_cutoff = (now - timedelta(days=keep_days)).timestamp()
+    temp_cutoff = (now - GRACE).timestamp()
+    for top in ("ai_state", BACKUP_DIR):
+        for directory, _, names in os.walk(base_path / top):
+            for name in names:
+                if name.endswith(".tmp"):
+                    kind, cutoff = "temp", temp_cutoff
+                elif name.endswith(COPY_SUFFIXES):
+                    kind, cutoff = "copies", copy_cutoff
+                else:
+                    continue
+                path = os.path.join(directory, name)
+                try:
+                    stat = os.stat(path)
+                    if stat.st_mtime >= cutoff:
+                        continue
+                    if not dry_run:
+                        os.unlink(path)
+                except FileNotFoundError:
+                    # Renamed into place or removed meanwhile
+                    continue
+                report.removed.append(Path(path).relative_to(base_path).as_posix())
+                report.reclaimed[kind] += stat.st_size
+
+
+def _current_session_id(manager: StateManager) -> Optional[str]:
+    with FileLock(manager.current_session_path, shared=True):
+        data = manager._read_json(manager.current_session_path)
+    return data.get("session_id") if data else None
+
+
+def _merge_registries(manager: StateManager, dry_run: bool, report: GcReport) -> None:
+    """Merge archived sessions' hash registries into the consolidated store."""
+    registry_dir = manager.ai_state_path / "hash_registry"
+    consolidated_path = registry_dir / CONSOLIDATED_REGISTRY
+    active = _current_session_id(manager)
+    try:
+        names = sorted(os.listdir(registry_dir))
+    except FileNotFoundError:
+        return
+
+    with FileLock(consolidated_path):
+        sessions = load_consolidated(manager.ai_state_path)
+        merged: List[Path] = []
+        freed = 0
+        for name in names:
+            session_id, ext = os.path.splitext(name)
+            path = registry_dir / name
+            if (ext != ".json" or name.startswith(".") or name == CONSOLIDATED_REGISTRY
+                    or session_id == active
+                    or not (manager.session_logs_path / name).exists()):
+                continue
+            with open(path) as f:
+                sessions[session_id] = json.load(f)
+            freed += path.stat().st_size
+            merged.append(path)
+        if not merged:
+            return
+
+        data = {"version": 1, "sessions": sessions}
+        old_size = consolidated_path.stat().st_size if consolidated_path.exists() else 0
+        new_size = len(json.dumps(data, default=str).encode("utf-8"))
+        report.registries_merged = len(merged)
+        report.reclaimed["registries"] = freed + old_size - new_size
+        if dry_run:
+            return
+        write_json_atomic(consolidated_path, data, indent=None)
+        for path in merged:
+            path.unlink()
+    archive_index(manager.base_path).update([consolidated_path] + merged)
+
+
+def _live_blobs(manager: StateManager, removed: Set[Path]) -> Set[str]:
+    """Blobs referred to by sessions or kept as sync merge bases.
+
+    Args:
+        manager: State manager of the directory
+        removed: Files pruned by this run (still present in a dry run)
+    """
+    live = merge_base_digests(manager.base_path)
+    paths = [p for p in (manager.current_session_path, manager.current_session_path.with_suffix(".last"))
+             if p not in removed]
+    try:
+        paths.extend(manager.session_logs_path / n for n in os.listdir(manager.session_logs_path)
+                     if n.endswith(".json") and not n.startswith("."))
+    except FileNotFoundError:
+        pass
+    for path in paths:
+        try:
+            with open(path) as f:
+                data = json.load(f)
+        except FileNotFoundError:
+            continue
+        live.update(session_refs(data))
+    return live
+
+
+def _prune_blobs(manager: StateManager, now: datetime, dry_run: bool, report: GcReport) -> None:
+    """Remove blobs no session or sync merge base refers to."""
+    live = _live_blobs(manager, {manager.base_path / key for key in report.removed})
+    blobs: BlobStore = manager.blobs
+    cutoff = (now - GRACE).timestamp()
+    for digest in list(blobs.iter_digests()):
+        if digest in live:
+            continue
+        path = blobs.path(digest)
+        if not path.exists():
+            path = blobs.path(digest, True)
+        stat = path.stat()
+        if stat.st_mtime >= cutoff:
+            continue
+        if not dry_run:
+            path.unlink()
+        report.blobs_removed += 1
+        report.reclaimed["blobs"] += stat.st_size
+
+
+def collect_garbage(base_path: Path, keep_days: int = DEFAULT_KEEP_DAYS,
+                    history_days: int = DEFAULT_HISTORY_DAYS, prune_blobs: bool = True,
+                    dry_run: bool = False, now: Optional[datetime] = None) -> GcReport:
+    """Reclaim space in an OSL directory.
+
+    Args:
+        base_path: Base OSL directory path
+        keep_days: Keep .bak/.v*.bak/.last copies younger than this
+        history_days: Keep coach state history at full resolution for
+            this many days
+        prune_blobs: Remove unreferenced blobs
+        dry_run: Only report what would be reclaimed
+        now: Reference time. Defaults to now
+
+    Returns:
+        What was (or would be) reclaimed
+    """
+    started = time.perf_counter()
+    now = now or datetime.now()
+    report = GcReport(dry_run=dry_run)
+    manager = StateManager(base_path)
+
+    with trace.span("gc.files", "state"):
+        _prune_files(base_path, keep_days, now, dry_run, report)
+    with trace.span("gc.registries", "state"):
+        _merge_registries(manager, dry_run, report)
+    with trace.span("gc.history", "state"):
+        with FileLock(manager.coach_state_path):
+            dropped, reclaimed = manager.coach_history.compact(now - timedelta(days=history_days), dry_run)
+        report.history_versions_dropped = dropped
+        report.reclaimed["history"] = reclaimed
+    if prune_blobs:
+        with trace.span("gc.blobs", "state"):
+            _prune_blobs(manager, now, dry_run, report)
+
+    report.seconds = time.perf_counter() - started
+    return report
@@ -0,0 +1,406 @@
+"""Versioned state history as JSON-patch deltas.
+
+Every save of a history-tracked state file (``coach_state.json``)
+appends an RFC 6902 patch from the previous version to the new one.
+The history is split into segments that each start with a full
+checkpoint::
+
+    ai_state/history/coach_state/20260113T091502123456.jsonl
+        {"ts": ..., "rev": 41, "n": 0, "sha": ..., "state": {...}}
+        {"ts": ..., "rev": 42, "n": 1, "sha": ..., "patch": [...]}
+        ...
+
+A segment holds at most ``CHECKPOINT_EVERY`` versions and is named after
+its checkpoint's time, so any past version is rebuilt from one
+checkpoint plus at most ``CHECKPOINT_EVERY - 1`` patches. Each entry
+carries a hash of the version it produces; if the file on disk was
+changed outside the state manager (a sync, a restore) its previous
+version no longer matches the last entry and a new checkpoint starts.
+"""
+
+import copy
+import hashlib
+import json
+import os
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from osl_cli.perf import trace
+
+
+HISTORY_DIR = "history"
+
+# Versions per segment (one checkpoint, then patches)
+CHECKPOINT_EVERY = 100
+
+SEGMENT_FORMAT = "%Y%m%dT%H%M%S%f"
+
+
+class JsonPatchError(ValueError):
+    """A patch operation does not apply to the document."""
+
+
+class HistoryIntegrityError(ValueError):
+    """A rebuilt version does not match its recorded hash."""
+
+
+def _escape(key: str) -> str:
+    return key.replace("~", "~0").replace("/", "~1")
+
+
+def _tokens(pointer: str) -> List[str]:
+    if pointer == "":
+        return []
+    if not pointer.startswith("/"):
+        raise JsonPatchError(f"Invalid JSON pointer: {pointer!r}")
+    return [t.replace("~1", "/").replace("~0", "~") for t in pointer[1:].split("/")]
+
+
+def _same(a: Any, b: Any) -> bool:
+    # 1 == 1.0 == True in Python, but not in JSON
+    return type(a) is type(b) and a == b
+
+
+def make_patch(old: Any, new: Any, path: str = "") -> List[Dict[str, Any]]:
+    """RFC 6902 operations turning ``old`` into ``new``.
+
+    Objects are diffed key by key and arrays index by index (trailing
+    elements added or removed), so an unchanged subtree costs nothing.
+    """
+    if isinstance(old, dict) and isinstance(new, dict):
+        ops: List[Dict[str, Any]] = []
+        for key in old:
+            if key not in new:
+                ops.append({"op": "remove", "path": f"{path}/{_escape(key)}"})
+        for key, value in new.items():
+            child = f"{path}/{_escape(key)}"
+            if key in old:
+                ops.extend(make_patch(old[key], value, child))
+            else:
+                ops.append({"op": "add", "path": child, "value": value})
+        return ops
+    if isinstance(old, list) and isinstance(new, list):
+        ops = []
+        common = min(len(old), len(new))
+        for i in range(common):
+            ops.extend(make_patch(old[i], new[i], f"{path}/{i}"))
+        for i in range(len(old) - 1, common - 1, -1):
+            ops.append({"op": "remove", "path": f"{path}/{i}"})
+        for i in range(common, len(new)):
+            ops.append({"op": "add", "path": f"{path}/-", "value": new[i]})
+        return ops
+    if _same(old, new):
+        return []
+    return [{"op": "replace", "path": path, "value": new}]
+
+
+def _parent(doc: Any, pointer: str) -> Tuple[Any, str]:
+    tokens = _tokens(pointer)
+    if not tokens:
+        raise JsonPatchError("The document root has no parent")
+    target = doc
+    for token in tokens[:-1]:
+        target = _child(target, token, pointer)
+    return target, tokens[-1]
+
+
+def _index(container: List[Any], token: str, pointer: str, insert: bool = False) -> int:
+    if token == "-" and insert:
+        return len(container)
+    if not token.isdigit() or (token != "0" and token.startswith("0")):
+        raise JsonPatchError(f"Invalid array index in {pointer!r}")
+    index = int(token)
+    if index > len(container) or (index == len(container) and not insert):
+        raise JsonPatchError(f"Array index out of range in {pointer!r}")
+    return index
+
+
+def _child(container: Any, token: str, pointer: str) -> Any:
+    if isinstance(container, dict):
+        if token not in container:
+            raise JsonPatchError(f"Path not found: {pointer!r}")
+        return container[token]
+    if isinstance(container, list):
+        return container[_index(container, token, pointer)]
+    raise JsonPatchError(f"Path not found: {pointer!r}")
+
+
+def resolve_pointer(doc: Any, pointer: str) -> Any:
+    """Value at a JSON pointer."""
+    for token in _tokens(pointer):
+        doc = _child(doc, token, pointer)
+    return doc
+
+
+def _add(doc: Any, pointer: str, value: Any) -> Any:
+    if pointer == "":
+        return value
+    parent, token = _parent(doc, pointer)
+    if isinstance(parent, dict):
+        parent[token] = value
+    elif isinstance(parent, list):
+        parent.insert(_index(parent, token, pointer, insert=True), value)
+    else:
+        raise JsonPatchError(f"Path not found: {pointer!r}")
+    return doc
+
+
+def _remove(doc: Any, pointer: str) -> Tuple[Any, Any]:
+    parent, token = _parent(doc, pointer)
+    if isinstance(parent, dict):
+        if token not in parent:
+            raise JsonPatchError(f"Path not found: {pointer!r}")
+        return doc, parent.pop(token)
+    if isinstance(parent, list):
+        return doc, parent.pop(_index(parent, token, pointer))
+    raise JsonPatchError(f"Path not found: {pointer!r}")
+
+
+def apply_patch(doc: Any, patch: List[Dict[str, Any]]) -> Any:
+    """Apply RFC 6902 operations to a JSON document.
+
+    ``doc`` is modified in place; the result is returned as well, since
+    an operation on the root (path ``""``) replaces the document.
+
+    Raises:
+        JsonPatchError: If an operation does not apply
+    """
+    for op in patch:
+        kind, pointer = op.get("op"), op.get("path")
+        if not isinstance(pointer, str):
+            raise JsonPatchError(f"Operation without a path: {op!r}")
+        if kind == "add":
+            doc = _add(doc, pointer, op["value"])
+        elif kind == "remove":
+            doc, _ = _remove(doc, pointer)
+        elif kind == "replace":
+            if pointer == "":
+                doc = op["value"]
+                continue
+            parent, token = _parent(doc, pointer)
+            _child(parent, token, pointer)
+            if isinstance(parent, list):
+                parent[_index(parent, token, pointer)] = op["value"]
+            else:
+                parent[token] = op["value"]
+        elif kind == "move":
+            source = op["from"]
+            if pointer.startswith(source + "/"):
+                raise JsonPatchError(f"Cannot move {source!r} into itself")
+            doc, value = _remove(doc, source)
+            doc = _add(doc, pointer, value)
+        elif kind == "copy":
+            doc = _add(doc, pointer, copy.deepcopy(resolve_pointer(doc, op["from"])))
+        elif kind == "test":
+            if resolve_pointer(doc, pointer) != op["value"]:
+                raise JsonPatchError(f"Test failed at {pointer!r}")
+        else:
+            raise JsonPatchError(f"Unknown operation: {kind!r}")
+    return doc
+
+
+def state_digest(doc: Any) -> str:
+    """Hash of a JSON document, independent of key order."""
+    canonical = json.dumps(doc, sort_keys=True, separators=(",", ":"), default=str)
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()[:16]
+
+
+class StateHistory:
+    """Checkpoint + patch journal of one state file."""
+
+    def __init__(self, path: Path, checkpoint_every: int = CHECKPOINT_EVERY):
+        """Initialize the history.
+
+        Args:
+            path: Directory of the file's segments
+            checkpoint_every: Versions per segment
+        """
+        self.path = path
+        self.checkpoint_every = checkpoint_every
+
+    def segments(self) -> List[Path]:
+        """Segment files, oldest first."""
+        try:
+            names = [n for n in os.listdir(self.path) if n.endswith(".jsonl") and not n.startswith(".")]
+        except FileNotFoundError:
+            return []
+        return [self.path / n for n in sorted(names)]
+
+    @staticmethod
+    def _entries(segment: Path) -> Iterator[Dict[str, Any]]:
+        with open(segment) as f:
+            for line in f:
+                try:
+                    yield json.loads(line)
+                except json.JSONDecodeError:
+                    # Torn final line from a crash mid-append
+                    continue
+
+    def _last_entry(self, segment: Path) -> Optional[Dict[str, Any]]:
+        with open(segment, "rb") as f:
+            lines = f.read().rstrip(b"\n").rsplit(b"\n", 1)
+        try:
+            return json.loads(lines[-1])
+        except json.JSONDecodeError:
+            return None
+
+    def record(self, previous: Optional[Dict[str, Any]], current: Dict[str, Any],
+               now: Optional[datetime] = None) -> None:
+        """Append a new version.
+
+        Callers must hold the state file's exclusive lock.
+
+        Args:
+            previous: Version being replaced (None if the file is new)
+            current: Version being written
+            now: Time of the save. Defaults to now
+        """
+        now = now or datetime.now()
+        # Normalize to what the file holds on disk
+        current = json.loads(json.dumps(current, default=str))
+        entry: Dict[str, Any] = {
+            "ts": now.isoformat(timespec="microseconds"),
+            "rev": current.get("revision"),
+            "sha": state_digest(current),
+        }
+
+        with trace.span("history.record", "state", file=self.path.name):
+            segments = self.segments()
+            last = self._last_entry(segments[-1]) if segments else None
+            if (last is not None and previous is not None
+                    and last.get("n", 0) + 1 < self.checkpoint_every
+                    and last.get("sha") == state_digest(previous)):
+                entry["n"] = last["n"] + 1
+                entry["patch"] = make_patch(previous, current)
+                segment = segments[-1]
+            else:
+                entry["n"] = 0
+                entry["state"] = current
+                self.path.mkdir(parents=True, exist_ok=True)
+                segment = self.path / f"{now.strftime(SEGMENT_FORMAT)}.jsonl"
+                if segments and segment <= segments[-1]:
+                    # Clock went backwards or two checkpoints in one tick
+                    segment = segments[-1].with_name(segments[-1].stem + "_.jsonl")
+
+            with open(segment, "a") as f:
+                f.write(json.dumps(entry, separators=(",", ":")) + "\n")
+
+    def as_of(self, when: datetime) -> Optional[Dict[str, Any]]:
+        """The version current at ``when`` (None if it predates the history).
+
+        Reads one checkpoint and the patches after it.
+
+        Raises:
+            HistoryIntegrityError: If the rebuilt version does not match
+                its recorded hash
+        """
+        stamp = when.strftime(SEGMENT_FORMAT)
+        candidates = [s for s in self.segments() if s.stem[:len(stamp)] <= stamp]
+        if not candidates:
+            return None
+
+        with trace.span("history.as_of", "state", file=self.path.name):
+            cutoff = when.isoformat(timespec="microseconds")
+            state: Optional[Dict[str, Any]] = None
+            expected = None
+            for entry in self._entries(candidates[-1]):
+                if entry["ts"] > cutoff:
+                    break
+                if "state" in entry:
+                    state = entry["state"]
+                elif state is not None:
+                    try:
+                        state = apply_patch(state, entry["patch"])
+                    except JsonPatchError as e:
+                        raise HistoryIntegrityError(f"Cannot apply revision {entry.get('rev')}: {e}") from e
+                expected = entry.get("sha")
+            if state is None:
+                return None
+            if expected is not None and state_digest(state) != expected:
+                raise HistoryIntegrityError(f"History of {self.path.name} does not match its hashes")
+            return state
+
+    def _versions(self, segment: Path) -> Iterator[Tuple[Dict[str, Any], Dict[str, Any]]]:
+        """``(entry, version)`` of every entry of a segment (versions are copies)."""
+        state: Any = None
+        for entry in self._entries(segment):
+            state = entry["state"] if "state" in entry else apply_patch(state, entry["patch"])
+            yield entry, copy.deepcopy(state)
+
+    def compact(self, before: datetime, dry_run: bool = False) -> Tuple[int, int]:
+        """Thin out versions older than ``before`` to the last one of each day.
+
+        Segments whose versions all predate ``before`` are rewritten as
+        daily snapshots (a checkpoint and patches between consecutive
+        days), so ``as_of`` keeps day granularity there. Callers must
+        hold the state file's exclusive lock.
+
+        Returns:
+            ``(versions_dropped, bytes_reclaimed)``
+        """
+        cutoff = before.isoformat(timespec="microseconds")
+        old: List[Path] = []
+        for segment in self.segments()[:-1]:
+            last = self._last_entry(segment)
+            if last is None or last["ts"] >= cutoff:
+                break
+            old.append(segment)
+        if not old:
+            return 0, 0
+
+        with trace.span("history.compact", "state", file=self.path.name):
+            daily: Dict[str, Tuple[Dict[str, Any], Dict[str, Any]]] = {}
+            total = 0
+            for segment in old:
+                for entry, version in self._versions(segment):
+                    daily[entry["ts"][:10]] = (entry, version)
+                    total += 1
+            kept = [daily[day] for day in sorted(daily)]
+            if len(kept) == total:
+                return 0, 0
+
+            files: Dict[str, List[str]] = {}
+            lines: List[str] = []
+            previous: Any = None
+            for i, (entry, version) in enumerate(kept):
+                n = i % self.checkpoint_every
+                if n == 0:
+                    name = datetime.fromisoformat(entry["ts"]).strftime(SEGMENT_FORMAT) + ".jsonl"
+                    lines = files[name] = []
+                record = {"ts": entry["ts"], "rev": entry.get("rev"), "n": n, "sha": state_digest(version)}
+                if n == 0:
+                    record["state"] = version
+                else:
+                    record["patch"] = make_patch(previous, version)
+                lines.append(json.dumps(record, separators=(",", ":")) + "\n")
+                previous = version
+
+            reclaimed = sum(s.stat().st_size for s in old) - sum(
+                len("".join(content).encode("utf-8")) for content in files.values())
+            if dry_run:
+                return total - len(kept), reclaimed
+
+            # New segments go in before old ones go: a crash leaves
+            # overlapping versions at worst, never a gap
+            for name, content in files.items():
+                temp_path = self.path / f".{name}.{os.getpid()}.tmp"
+                with open(temp_path, "w") as f:
+                    f.write("".join(content))
+                temp_path.replace(self.path / name)
+            for segment in old:
+                if segment.name not in files:
+                    segment.unlink()
+        return total - len(kept), reclaimed
+
+    def stats(self) -> Dict[str, int]:
+        """Segments, versions and bytes on disk, and the bytes the same
+        versions would take as full copies."""
+        segments = versions = size = full = 0
+        for segment in self.segments():
+            segments += 1
+            size += segment.stat().st_size
+            for _, version in self._versions(segment):
+                versions += 1
+                full += len(json.dumps(version, indent=2))
+        return {"segments": segments, "versions": versions, "bytes": size, "full_copy_bytes": full}
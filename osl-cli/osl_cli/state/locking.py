@@ -0,0 +1,200 @@
+"""Advisory file locks and three-way merging for state files.
+
+State files are replaced by atomic rename, so locks are taken on a
+sidecar ``.<name>.lock`` file that is never replaced. Readers take shared
+locks and never block each other; writers take an exclusive lock for the
+short read-compare-write window. On platforms without ``fcntl`` the locks
+are no-ops and only the revision check protects writers.
+
+Files without a revision are merged with what is on disk under the lock:
+documents with ``three_way_merge``, counters with ``merge_counters``.
+"""
+
+import os
+import time
+from pathlib import Path
+from types import TracebackType
+from typing import Any, Dict, List, Optional, Type
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - Windows
+    fcntl = None  # type: ignore[assignment]
+
+
+DEFAULT_LOCK_TIMEOUT = 10.0
+
+
+class StateLockTimeoutError(TimeoutError):
+    """Raised when a state file lock cannot be acquired in time."""
+
+
+def lock_path(path: Path) -> Path:
+    """Sidecar lock file for a state file."""
+    return path.with_name(f".{path.name}.lock")
+
+
+class FileLock:
+    """Advisory lock on a state file (shared or exclusive).
+
+    Not re-entrant: a process must not take a second lock on the same file
+    while holding one.
+    """
+
+    def __init__(self, path: Path, shared: bool = False, timeout: float = DEFAULT_LOCK_TIMEOUT):
+        """Initialize lock.
+
+        Args:
+            path: State file to lock
+            shared: Take a shared (read) lock instead of an exclusive one
+            timeout: Seconds to wait before raising StateLockTimeoutError
+        """
+        self.path = lock_path(path)
+        self.shared = shared
+        self.timeout = timeout
+        self._fd: Optional[int] = None
+
+    def __enter__(self) -> "FileLock":
+        if fcntl is None:
+            return self
+
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._fd = os.open(self.path, os.O_RDWR | os.O_CREAT, 0o644)
+        mode = (fcntl.LOCK_SH if self.shared else fcntl.LOCK_EX) | fcntl.LOCK_NB
+
+        deadline = time.monotonic() + self.timeout
+        delay = 0.001
+        while True:
+            try:
+                fcntl.flock(self._fd, mode)
+                return self
+            except BlockingIOError:
+                if time.monotonic() >= deadline:
+                    os.close(self._fd)
+                    self._fd = None
+                    raise StateLockTimeoutError(f"Timed out waiting for lock on {self.path}")
+                time.sleep(delay)
+                delay = min(delay * 2, 0.05)
+
+    def __exit__(self, exc_type: Optional[Type[BaseException]], exc: Optional[BaseException],
+                 tb: Optional[TracebackType]) -> None:
+        if self._fd is not None:
+            fcntl.flock(self._fd, fcntl.LOCK_UN)
+            os.close(self._fd)
+            self._fd = None
+
+
+_MISSING = object()
+
+
+def three_way_merge(base: Any, ours: Any, theirs: Any) -> Any:
+    """Merge two divergent versions of a JSON document.
+
+    - A value changed on one side only takes that side's value.
+    - Objects changed on both sides are merged key by key.
+    - Lists that both sides only appended to keep both sides' additions.
+    - Any other value changed on both sides takes ``ours`` (the writer
+      saving now), so the result is always a complete, valid document.
+
+    Args:
+        base: Version both sides started from
+        ours: Version being saved
+        theirs: Version currently on disk
+
+    Returns:
+        Merged document
+    """
+    if ours == theirs:
+        return ours
+    if ours == base:
+        return theirs
+    if theirs == base:
+        return ours
+
+    if isinstance(ours, dict) and isinstance(theirs, dict):
+        base_dict = base if isinstance(base, dict) else {}
+        merged: Dict[str, Any] = {}
+        for key in list(theirs) + [k for k in ours if k not in theirs]:
+            b = base_dict.get(key, _MISSING)
+            o = ours.get(key, _MISSING)
+            t = theirs.get(key, _MISSING)
+            if o is _MISSING:
+                # Deleted by us (keep deleted) or added by them (keep theirs)
+                if b is _MISSING:
+                    merged[key] = t
+                continue
+            if t is _MISSING:
+                if b is _MISSING:
+                    merged[key] = o
+                continue
+            merged[key] = three_way_merge(None if b is _MISSING else b, o, t)
+        return merged
+
+    if (isinstance(ours, list) and isinstance(theirs, list) and isinstance(base, list)
+            and ours[:len(base)] == base and theirs[:len(base)] == base):
+        extra = [item for item in ours[len(base):] if item not in theirs[len(base):]]
+        return theirs + extra
+
+    return ours
+
+
+def _is_number(value: Any) -> bool:
+    return isinstance(value, (int, float)) and not isinstance(value, bool)
+
+
+def merge_counters(base: Any, ours: Any, theirs: Any) -> Any:
+    """Three-way merge where numbers changed on both sides add their deltas."""
+    if _is_number(ours) and _is_number(theirs):
+        b = base if _is_number(base) else 0
+        return ours + theirs - b
+    if isinstance(ours, dict) and isinstance(theirs, dict):
+        base_dict = base if isinstance(base, dict) else {}
+        merged = dict(theirs)
+        for key, value in ours.items():
+            merged[key] = merge_counters(base_dict.get(key), value, theirs[key]) if key in theirs else value
+        return merged
+    if (isinstance(ours, list) and isinstance(theirs, list) and isinstance(base, list)
+            and len(ours) == len(theirs) == len(base)):
+        return [merge_counters(b, o, t) for b, o, t in zip(base, ours, theirs)]
+    return three_way_merge(base, ours, theirs)
+
+
+def find_conflicts(base: Any, ours: Any, theirs: Any, path: str = "") -> List[str]:
+    """Places where ``three_way_merge`` would have to pick a side.
+
+    These are values changed differently on both sides, and values
+    deleted on one side but changed on the other.
+
+    Args:
+        base: Version both sides started from
+        ours: One version
+        theirs: The other version
+        path: JSON pointer of the values compared
+
+    Returns:
+        JSON pointers (``/key/subkey``) of the conflicting values
+    """
+    if ours == theirs or ours == base or theirs == base:
+        return []
+
+    if isinstance(ours, dict) and isinstance(theirs, dict):
+        base_dict = base if isinstance(base, dict) else {}
+        conflicts: List[str] = []
+        for key in list(theirs) + [k for k in ours if k not in theirs]:
+            b = base_dict.get(key, _MISSING)
+            o = ours.get(key, _MISSING)
+            t = theirs.get(key, _MISSING)
+            child = f"{path}/{key}"
+            if o is _MISSING or t is _MISSING:
+                kept = t if o is _MISSING else o
+                if b is not _MISSING and kept != b:
+                    conflicts.append(child)
+                continue
+            conflicts.extend(find_conflicts(None if b is _MISSING else b, o, t, child))
+        return conflicts
+
+    if (isinstance(ours, list) and isinstance(theirs, list) and isinstance(base, list)
+            and ours[:len(base)] == base and theirs[:len(base)] == base):
+        return []
+
+    return [path or "/"]
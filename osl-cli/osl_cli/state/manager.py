@@ -1,16 +1,55 @@
 """State management for OSL."""
 
 import json
+import os
+import random
 import shutil
+import stat
+import tempfile
+import time
 from pathlib import Path
 from datetime import datetime
-from typing import Optional
+from typing import Any, Callable, Dict, Optional, Type, TypeVar, Union
 
+from osl_cli.perf import trace
+from osl_cli.state import cache as state_cache
+from osl_cli.state.blobs import BlobStore, externalize_session, resolve_session
+from osl_cli.state.history import HISTORY_DIR, StateHistory
+from osl_cli.state.locking import FileLock, three_way_merge
+from osl_cli.state.merkle import archive_index
 from osl_cli.state.schemas import CoachState, SessionState
 
 
+# Optimistic compare-and-swap attempts before falling back to the lock
+MAX_CAS_RETRIES = 5
+
+M = TypeVar("M", bound=Union[CoachState, SessionState])
+
+
+def _file_mode(path: Path) -> int:
+    """Permission bits of an existing file, or those ``open`` would give a new one."""
+    try:
+        return stat.S_IMODE(path.stat().st_mode)
+    except FileNotFoundError:
+        umask = os.umask(0)
+        os.umask(umask)
+        return 0o666 & ~umask
+
+
 class StateManager:
-    """Manages OSL state files with atomic writes and versioning."""
+    """Manages OSL state files with atomic writes and versioning.
+    
+    Concurrency: reads take a shared lock on the file, writes an exclusive
+    one. Every state file carries a ``revision`` counter. Saving a model
+    whose revision no longer matches the file merges its changes into the
+    newer file (three-way, against the JSON it was loaded from) instead of
+    overwriting it; ``update_*`` helpers instead re-run a mutation against
+    the latest state (compare-and-swap with bounded retries).
+    
+    Session files keep verbatim text in the blob store and refer to it by
+    hash (see :mod:`osl_cli.state.blobs`); merges work on those references.
+    A loaded session reads each text from the store only when accessed.
+    """
     
     def __init__(self, base_path: Optional[Path] = None):
         """Initialize state manager.
@@ -23,27 +62,152 @@ class StateManager:
         self.coach_state_path = self.ai_state_path / "coach_state.json"
         self.current_session_path = self.ai_state_path / "current_session.json"
         self.session_logs_path = self.ai_state_path / "session_logs"
+        self.blobs = BlobStore(self.base_path)
+        self.coach_history = StateHistory(self.ai_state_path / HISTORY_DIR / "coach_state")
         
     def _atomic_write(self, path: Path, data: dict) -> None:
         """Write data atomically to prevent corruption.
         
+        Callers must hold the file's exclusive lock. Coach state saves are
+        also recorded in its history (see :mod:`osl_cli.state.history`).
+        
         Args:
             path: File path to write
             data: Data to write as JSON
         """
-        # Write to temp file first
-        temp_path = path.with_suffix(".tmp")
+        previous = self._read_json(path) if path == self.coach_state_path else None
+        with trace.span("io.write", "io", file=path.name):
+            # Write to a unique temp file first
+            fd, temp_name = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.", suffix=".tmp")
+            try:
+                # mkstemp creates 0600; keep the mode the file had (or would have)
+                os.fchmod(fd, _file_mode(path))
+                with os.fdopen(fd, "w") as f:
+                    json.dump(data, f, indent=2, default=str)
+                
+                # Create backup if file exists
+                if path.exists():
+                    backup_path = path.with_suffix(".bak")
+                    shutil.copy2(path, backup_path)
+                
+                # Atomic rename
+                os.replace(temp_name, path)
+            except BaseException:
+                if os.path.exists(temp_name):
+                    os.unlink(temp_name)
+                raise
+        if path == self.coach_state_path:
+            self.coach_history.record(previous, data)
+        state_cache.invalidate(path)
+    
+    def _read_json(self, path: Path) -> Optional[Dict[str, Any]]:
+        """Read a state file's JSON (caller holds a lock), None if missing."""
+        try:
+            with trace.span("io.read", "io", file=path.name):
+                with open(path) as f:
+                    return json.load(f)
+        except FileNotFoundError:
+            return None
+    
+    def _read_model(self, path: Path, model_cls: Type[M], locked: bool = False) -> M:
+        """Read and validate a state file.
+        
+        Args:
+            path: State file
+            model_cls: Model to validate into
+            locked: Caller already holds a lock on the file
+        
+        Returns:
+            Validated model with its on-disk JSON kept as merge base
+        """
+        if locked:
+            data = self._read_json(path)
+        else:
+            with FileLock(path, shared=True):
+                data = self._read_json(path)
+        if data is None:
+            raise FileNotFoundError(f"State file not found: {path}")
+        
+        with trace.span(f"validate.{path.stem}", "validation"):
+            model = model_cls.model_validate(data, context=self._context)
+        model._snapshot = data
+        return model
+    
+    @property
+    def _context(self) -> Dict[str, Any]:
+        """Validation context: blob references are loaded lazily."""
+        return {"blobs": self.blobs}
+    
+    def _save_model(self, path: Path, model: M, data: Dict[str, Any]) -> bool:
+        """Write a model, merging with concurrent changes if needed.
+        
+        Args:
+            path: State file
+            model: Model being saved (updated in place)
+            data: Model JSON
+        
+        Returns:
+            True if concurrent changes were merged in
+        """
+        merged = False
+        with FileLock(path):
+            current = self._read_json(path)
+            disk_revision = current.get("revision", 0) if current else 0
+            
+            if current is not None and disk_revision != model.revision:
+                with trace.span("state.merge", "state", file=path.stem):
+                    data = three_way_merge(model._snapshot or {}, data, current)
+                merged = True
+            
+            data["revision"] = disk_revision + 1
+            self._atomic_write(path, data)
         
-        with open(temp_path, "w") as f:
-            json.dump(data, f, indent=2, default=str)
+        if merged:
+            refreshed = type(model).model_validate(data, context=self._context)
+            for name in type(model).model_fields:
+                setattr(model, name, getattr(refreshed, name))
+        model.revision = data["revision"]
+        model._snapshot = data
+        return merged
+    
+    def _compare_and_save(self, path: Path, model: M, data: Dict[str, Any]) -> bool:
+        """Write only if the file is still at the model's revision."""
+        with FileLock(path):
+            current = self._read_json(path)
+            disk_revision = current.get("revision", 0) if current else 0
+            if current is not None and disk_revision != model.revision:
+                return False
+            data["revision"] = disk_revision + 1
+            self._atomic_write(path, data)
+        model.revision = data["revision"]
+        model._snapshot = data
+        return True
+    
+    def _update(self, path: Path, model_cls: Type[M], mutate: Callable[[M], None],
+                prepare: Callable[[M], Dict[str, Any]], retries: int) -> M:
+        """Optimistic read-modify-write with bounded retries.
         
-        # Create backup if file exists
-        if path.exists():
-            backup_path = path.with_suffix(".bak")
-            shutil.copy2(path, backup_path)
+        After ``retries`` lost races the mutation runs once more while
+        holding the exclusive lock, so the update always lands.
+        """
+        delay = 0.001
+        for _ in range(retries):
+            model = self._read_model(path, model_cls)
+            mutate(model)
+            if self._compare_and_save(path, model, prepare(model)):
+                return model
+            time.sleep(delay * (1 + random.random()))
+            delay = min(delay * 2, 0.05)
         
-        # Atomic rename
-        temp_path.replace(path)
+        with FileLock(path):
+            model = self._read_model(path, model_cls, locked=True)
+            mutate(model)
+            data = prepare(model)
+            data["revision"] = model.revision + 1
+            self._atomic_write(path, data)
+        model.revision = data["revision"]
+        model._snapshot = data
+        return model
     
     def load_coach_state(self) -> CoachState:
         """Load coach state from disk.
@@ -60,20 +224,61 @@ class StateManager:
                 "Run 'osl init' first."
             )
         
-        with open(self.coach_state_path) as f:
-            data = json.load(f)
-        
+        with trace.span("state.load", "state", file="coach_state"):
+            return state_cache.load(self.coach_state_path, self._read_coach_state)
+    
+    def _read_coach_state(self) -> CoachState:
         # Parse datetime strings back to datetime objects
-        return CoachState.model_validate(data)
+        return self._read_model(self.coach_state_path, CoachState)
+    
+    def _coach_json(self, state: CoachState) -> Dict[str, Any]:
+        state.last_updated = datetime.now()
+        with trace.span("serialize.coach_state", "validation"):
+            return state.model_dump(mode="json")
     
     def save_coach_state(self, state: CoachState) -> None:
         """Save coach state to disk atomically.
         
+        Changes made by other processes since ``state`` was loaded are
+        merged in rather than overwritten.
+        
         Args:
             state: CoachState to save
         """
-        state.last_updated = datetime.now()
-        self._atomic_write(self.coach_state_path, state.model_dump(mode="json"))
+        with trace.span("state.save", "state", file="coach_state"):
+            self._save_model(self.coach_state_path, state, self._coach_json(state))
+    
+    def update_coach_state(self, mutate: Callable[[CoachState], None],
+                           retries: int = MAX_CAS_RETRIES) -> CoachState:
+        """Apply a mutation to the latest coach state (compare-and-swap).
+        
+        Use for short, non-interactive updates such as counters, where a
+        field-level merge could drop a concurrent increment.
+        
+        Args:
+            mutate: Function modifying the state in place
+            retries: Optimistic attempts before locking
+        
+        Returns:
+            The saved state
+        """
+        with trace.span("state.update", "state", file="coach_state"):
+            return self._update(self.coach_state_path, CoachState, mutate, self._coach_json, retries)
+    
+    def load_coach_state_as_of(self, when: datetime) -> Optional[CoachState]:
+        """Coach state as it was at a past time, rebuilt from its history.
+        
+        Args:
+            when: Point in time
+        
+        Returns:
+            CoachState, or None if the history starts after ``when``
+        """
+        with trace.span("state.load", "state", file="coach_state", as_of=when.isoformat()):
+            data = self.coach_history.as_of(when)
+            if data is None:
+                return None
+            return CoachState.model_validate(data, context=self._context)
     
     def has_active_session(self) -> bool:
         """Check if there's an active session.
@@ -95,10 +300,16 @@ class StateManager:
         if not self.has_active_session():
             raise FileNotFoundError("No active session found")
         
-        with open(self.current_session_path) as f:
-            data = json.load(f)
-        
-        return SessionState.model_validate(data)
+        with trace.span("state.load", "state", file="current_session"):
+            return state_cache.load(self.current_session_path, self._read_current_session)
+    
+    def _read_current_session(self) -> SessionState:
+        return self._read_model(self.current_session_path, SessionState)
+    
+    def _session_json(self, session: SessionState) -> Dict[str, Any]:
+        session.last_activity = datetime.now()
+        with trace.span("serialize.session_state", "validation"):
+            return externalize_session(session.model_dump(mode="json"), self.blobs)
     
     def save_current_session(self, session: SessionState) -> None:
         """Save current session state atomically.
@@ -106,19 +317,40 @@ class StateManager:
         Args:
             session: SessionState to save
         """
-        session.last_activity = datetime.now()
-        self._atomic_write(self.current_session_path, session.model_dump(mode="json"))
+        with trace.span("state.save", "state", file="current_session"):
+            self._save_model(self.current_session_path, session, self._session_json(session))
+    
+    def update_current_session(self, mutate: Callable[[SessionState], None],
+                               retries: int = MAX_CAS_RETRIES) -> SessionState:
+        """Apply a mutation to the latest session state (compare-and-swap).
+        
+        Args:
+            mutate: Function modifying the session in place
+            retries: Optimistic attempts before locking
+        
+        Returns:
+            The saved session
+        """
+        with trace.span("state.update", "state", file="current_session"):
+            return self._update(self.current_session_path, SessionState, mutate,
+                                self._session_json, retries)
     
     def clear_current_session(self) -> None:
         """Remove current session file."""
-        if self.current_session_path.exists():
-            # Back it up first
-            backup_path = self.current_session_path.with_suffix(".last")
-            shutil.move(self.current_session_path, backup_path)
+        with FileLock(self.current_session_path):
+            if self.current_session_path.exists():
+                # Back it up first
+                backup_path = self.current_session_path.with_suffix(".last")
+                shutil.move(self.current_session_path, backup_path)
+        state_cache.invalidate(self.current_session_path)
     
     def archive_session(self, session: SessionState) -> None:
         """Archive session to session_logs.
         
+        Verbatim text is stored by blob reference; see ``load_archived_session``.
+        The archive's Merkle index is updated with the session and its hash
+        registry.
+        
         Args:
             session: Session to archive
         """
@@ -128,9 +360,27 @@ class StateManager:
         # Create archive path with session ID
         archive_path = self.session_logs_path / f"{session.session_id}.json"
         
-        # Write session data
-        with open(archive_path, "w") as f:
-            json.dump(session.model_dump(mode="json"), f, indent=2, default=str)
+        # Write session data, verbatim text by blob reference
+        data = externalize_session(session.model_dump(mode="json"), self.blobs)
+        with trace.span("io.write", "io", file="session_logs"):
+            with open(archive_path, "w") as f:
+                json.dump(data, f, indent=2, default=str)
+        registry_path = self.ai_state_path / "hash_registry" / f"{session.session_id}.json"
+        archive_index(self.base_path).update([archive_path, registry_path])
+    
+    def load_archived_session(self, session_id: str) -> SessionState:
+        """Load an archived session with all of its verbatim text.
+        
+        Raises:
+            FileNotFoundError: If the session (or one of its blobs) is missing
+        """
+        data = self._read_json(self.session_logs_path / f"{session_id}.json")
+        if data is None:
+            raise FileNotFoundError(f"Archived session not found: {session_id}")
+        return self._read_archived(data)
+    
+    def _read_archived(self, data: Dict[str, Any]) -> SessionState:
+        return SessionState.model_validate(resolve_session(data, self.blobs))
     
     def migrate_state_if_needed(self) -> None:
         """Check and migrate state files if version mismatch.
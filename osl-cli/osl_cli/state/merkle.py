@@ -0,0 +1,421 @@
+"""Merkle trees over state files.
+
+Leaves are files keyed by their relative path and hashed with SHA-256.
+A leaf's place in the tree is the first ``depth`` hex digits of the
+SHA-256 of its key. The depth follows the leaf count (see
+``depth_for``), so buckets hold about ``BUCKET_SIZE`` leaves at any
+size and the shape depends only on the leaves: changing a leaf rehashes
+one bucket and its ``depth`` ancestors, and two trees are diffed by
+descending only into children whose hashes differ. Finding a changed
+leaf takes ``depth`` levels of 16 node comparisons plus the leaves of
+its bucket, O(log n) in all.
+
+:class:`FileIndex` persists a tree together with each file's size and
+mtime, so a re-scan only rehashes files whose stat changed. The archive
+index (``ai_state/archive_index.json``) covers ``session_logs`` and
+the archived sessions' ``hash_registry`` files; it is updated as sessions
+are archived and checked by ``osl audit --quick``.
+"""
+
+import hashlib
+import json
+import os
+from collections import defaultdict
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import (
+    Any, Callable, Dict, Iterable, Iterator, List, Optional, Sequence, Set, Tuple, Union,
+)
+
+from osl_cli.perf import trace
+from osl_cli.state.locking import FileLock
+from osl_cli.state.store import write_json_atomic
+
+
+# Leaves per bucket the depth is chosen for
+BUCKET_SIZE = 16
+
+HEX = "0123456789abcdef"
+
+# Index file format; version 1 roots were computed with a fixed depth of 2
+INDEX_VERSION = 2
+
+ARCHIVE_INDEX = "archive_index.json"
+ARCHIVE_DIRS = ("session_logs", "hash_registry")
+
+# Bytes read at a time when hashing a file
+CHUNK_SIZE = 1 << 20
+
+
+def depth_for(leaves: int) -> int:
+    """Tree depth for a leaf count: the fewest hex digits (at least one)
+    giving ``BUCKET_SIZE`` leaves or fewer per bucket."""
+    depth = 1
+    while leaves > BUCKET_SIZE * 16 ** depth:
+        depth += 1
+    return depth
+
+
+def key_hash(key: str) -> str:
+    """SHA-256 of a leaf key; its leading digits place the leaf."""
+    return hashlib.sha256(key.encode("utf-8")).hexdigest()
+
+
+def hash_file(path: Union[str, Path]) -> str:
+    """SHA-256 of a file's bytes."""
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(CHUNK_SIZE), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+class MerkleTree:
+    """Merkle tree over ``key -> sha256`` leaves.
+
+    Node hashes are computed on demand and cached; changing a leaf drops
+    only the cached hashes on its path to the root. When the leaf count
+    crosses a ``depth_for`` boundary the leaves are re-bucketed and every
+    cached hash is dropped; that happens once per 16-fold change in size.
+    """
+
+    def __init__(self, leaves: Optional[Dict[str, str]] = None, depth: Optional[int] = None):
+        """Initialize the tree.
+
+        Args:
+            leaves: Initial ``key -> sha256`` leaves
+            depth: Fixed depth. Defaults to following the leaf count
+        """
+        self.leaves: Dict[str, str] = dict(leaves or {})
+        self._fixed = depth
+        self._key_hashes: Dict[str, str] = {key: key_hash(key) for key in self.leaves}
+        self._rebucket(depth or depth_for(len(self.leaves)))
+
+    def __len__(self) -> int:
+        return len(self.leaves)
+
+    def _rebucket(self, depth: int) -> None:
+        self.depth = depth
+        self._buckets: Dict[str, Set[str]] = defaultdict(set)
+        self._nodes: Dict[str, str] = {}
+        for key, h in self._key_hashes.items():
+            self._buckets[h[:depth]].add(key)
+
+    def _resize(self) -> None:
+        if self._fixed is None and depth_for(len(self.leaves)) != self.depth:
+            self._rebucket(depth_for(len(self.leaves)))
+
+    def set(self, key: str, digest: str) -> None:
+        """Add or change a leaf."""
+        if self.leaves.get(key) == digest:
+            return
+        h = self._key_hashes.get(key) or key_hash(key)
+        self.leaves[key] = digest
+        self._key_hashes[key] = h
+        self._buckets[h[:self.depth]].add(key)
+        self._invalidate(h)
+        self._resize()
+
+    def remove(self, key: str) -> None:
+        """Drop a leaf (no-op if absent)."""
+        if self.leaves.pop(key, None) is None:
+            return
+        h = self._key_hashes.pop(key)
+        self._buckets[h[:self.depth]].discard(key)
+        self._invalidate(h)
+        self._resize()
+
+    def _invalidate(self, h: str) -> None:
+        for depth in range(self.depth + 1):
+            self._nodes.pop(h[:depth], None)
+
+    def node(self, prefix: str = "") -> str:
+        """Hash of the subtree at a hex prefix ("" is the root)."""
+        cached = self._nodes.get(prefix)
+        if cached is not None:
+            return cached
+        h = hashlib.sha256()
+        if len(prefix) == self.depth:
+            for key in sorted(self._buckets.get(prefix, ())):
+                h.update(f"{key}\0{self.leaves[key]}\n".encode("utf-8"))
+        else:
+            for digit in HEX:
+                h.update(self.node(prefix + digit).encode("ascii"))
+        digest = self._nodes[prefix] = h.hexdigest()
+        return digest
+
+    @property
+    def root(self) -> str:
+        """Root hash: equal roots mean identical leaves."""
+        return self.node("")
+
+    def diff(self, other: "MerkleTree") -> Tuple[List[str], int]:
+        """Leaves that differ between two trees.
+
+        Trees of different depths are compared at the deeper one; the
+        shallower tree is re-bucketed for that, in O(n).
+
+        Returns:
+            ``(keys, comparisons)``: keys changed, added or removed, and
+            the number of node hashes and leaves compared to find them
+        """
+        ours, theirs = self, other
+        if ours.depth < theirs.depth:
+            ours = MerkleTree(ours.leaves, theirs.depth)
+        elif theirs.depth < ours.depth:
+            theirs = MerkleTree(theirs.leaves, ours.depth)
+        depth = ours.depth
+
+        changed: List[str] = []
+        comparisons = 0
+        pending = [""]
+        while pending:
+            prefix = pending.pop()
+            comparisons += 1
+            if ours.node(prefix) == theirs.node(prefix):
+                continue
+            if len(prefix) < depth:
+                pending.extend(prefix + digit for digit in HEX)
+                continue
+            keys = ours._buckets.get(prefix, set()) | theirs._buckets.get(prefix, set())
+            comparisons += len(keys)
+            changed.extend(k for k in keys if ours.leaves.get(k) != theirs.leaves.get(k))
+        return sorted(changed), comparisons
+
+
+class FileIndex:
+    """Persisted Merkle tree over the files under some directories.
+
+    Entries are ``key -> [sha256, size, mtime_ns]`` with keys relative to
+    ``root``; dot-files (temp files, locks) are never indexed.
+    """
+
+    def __init__(self, root: Path, dirs: Sequence[str], path: Path,
+                 exclude: Optional[Callable[[str], bool]] = None):
+        """Initialize the index.
+
+        Args:
+            root: Directory keys are relative to
+            dirs: Subdirectories of ``root`` covered by the index
+                (``""`` for all of ``root``)
+            path: Index file
+            exclude: Keys to leave out (directories are passed with a
+                trailing ``/``)
+        """
+        self.root = root
+        self.dirs = tuple(dirs)
+        self.path = path
+        self.exclude = exclude
+
+    def load(self) -> Dict[str, List[Any]]:
+        """Stored entries (empty if the index was never written)."""
+        try:
+            with open(self.path) as f:
+                return json.load(f).get("files", {})
+        except FileNotFoundError:
+            return {}
+
+    def exists(self) -> bool:
+        """Whether the index has been written."""
+        return self.path.exists()
+
+    def stored_root(self) -> Optional[str]:
+        """Root recorded with the index.
+
+        Roots recorded by an older index version used another tree shape;
+        for those the root of the stored entries stands in until the index
+        is next written.
+        """
+        try:
+            with open(self.path) as f:
+                data = json.load(f)
+        except FileNotFoundError:
+            return None
+        if data.get("version", 1) < INDEX_VERSION:
+            return self.tree(data.get("files", {})).root
+        return data.get("root")
+
+    def tree(self, entries: Optional[Dict[str, List[Any]]] = None) -> MerkleTree:
+        """Merkle tree of stored (or given) entries."""
+        entries = self.load() if entries is None else entries
+        return MerkleTree({key: entry[0] for key, entry in entries.items()})
+
+    def save(self, entries: Dict[str, List[Any]]) -> str:
+        """Record entries (e.g. from ``scan``); returns their root."""
+        root = self.tree(entries).root
+        write_json_atomic(self.path, {"version": INDEX_VERSION, "root": root, "files": entries})
+        return root
+
+    def key(self, path: Path) -> str:
+        """Index key of a file."""
+        return path.relative_to(self.root).as_posix()
+
+    def _entry(self, path: Union[str, Path], stat: os.stat_result) -> List[Any]:
+        return [hash_file(path), stat.st_size, stat.st_mtime_ns]
+
+    def iter_files(self) -> Iterator[Tuple[str, str, os.stat_result]]:
+        """``(key, path, stat)`` of every covered file."""
+        for name in self.dirs:
+            yield from self._walk(os.path.join(self.root, name), name + "/" if name else "")
+
+    def _walk(self, directory: str, prefix: str) -> Iterator[Tuple[str, str, os.stat_result]]:
+        # Plain strings: this runs for every file on every scan
+        try:
+            entries = os.scandir(directory)
+        except (FileNotFoundError, NotADirectoryError):
+            return
+        with entries:
+            for entry in entries:
+                if entry.name.startswith("."):
+                    continue
+                key = prefix + entry.name
+                if entry.is_dir():
+                    if not (self.exclude and self.exclude(key + "/")):
+                        yield from self._walk(entry.path, key + "/")
+                elif entry.is_file() and not (self.exclude and self.exclude(key)):
+                    yield key, entry.path, entry.stat()
+
+    def scan(self, rehash: bool = False) -> Tuple[Dict[str, List[Any]], int]:
+        """Current entries of the covered files.
+
+        Files whose size and mtime match the stored entry keep its hash
+        unless ``rehash`` is set.
+
+        Returns:
+            ``(entries, files_hashed)``
+        """
+        stored = {} if rehash else self.load()
+        entries: Dict[str, List[Any]] = {}
+        hashed = 0
+        with trace.span("merkle.scan", "state", file=self.path.name):
+            for key, path, stat in self.iter_files():
+                entry = stored.get(key)
+                if entry is None or entry[1] != stat.st_size or entry[2] != stat.st_mtime_ns:
+                    entry = self._entry(path, stat)
+                    hashed += 1
+                entries[key] = entry
+        return entries, hashed
+
+    def rebuild(self, rehash: bool = False) -> str:
+        """Re-scan the files and record them; returns the new root."""
+        with FileLock(self.path):
+            entries, _ = self.scan(rehash)
+            return self.save(entries)
+
+    def update(self, paths: Iterable[Path]) -> str:
+        """Record changed (or deleted) files; returns the new root.
+
+        The first update of a directory without an index scans every
+        covered file, so the index never starts out partial.
+        """
+        with trace.span("merkle.update", "state", file=self.path.name):
+            with FileLock(self.path):
+                if not self.exists():
+                    return self.save(self.scan()[0])
+                entries = self.load()
+                for path in paths:
+                    key = self.key(path)
+                    try:
+                        stat = path.stat()
+                    except FileNotFoundError:
+                        entries.pop(key, None)
+                        continue
+                    if self.exclude and self.exclude(key):
+                        entries.pop(key, None)
+                        continue
+                    entries[key] = self._entry(path, stat)
+                return self.save(entries)
+
+
+@dataclass
+class TreeDiff:
+    """Leaves that differ between a recorded tree and another one."""
+    root: str
+    other_root: str
+    files: int = 0
+    hashed: int = 0
+    comparisons: int = 0
+    changed: List[str] = field(default_factory=list)
+    added: List[str] = field(default_factory=list)
+    removed: List[str] = field(default_factory=list)
+
+    @property
+    def match(self) -> bool:
+        return self.root == self.other_root
+
+    def to_dict(self) -> Dict[str, Any]:
+        """JSON-friendly representation."""
+        return {
+            "match": self.match,
+            "root": self.root,
+            "other_root": self.other_root,
+            "files": self.files,
+            "hashed": self.hashed,
+            "comparisons": self.comparisons,
+            "changed": self.changed,
+            "added": self.added,
+            "removed": self.removed,
+        }
+
+
+def diff_trees(ours: MerkleTree, theirs: MerkleTree) -> TreeDiff:
+    """Classify the leaves that differ between two trees."""
+    keys, comparisons = ours.diff(theirs)
+    result = TreeDiff(root=ours.root, other_root=theirs.root, comparisons=comparisons)
+    for key in keys:
+        if key not in theirs.leaves:
+            result.removed.append(key)
+        elif key not in ours.leaves:
+            result.added.append(key)
+        else:
+            result.changed.append(key)
+    return result
+
+
+def check_index(index: FileIndex, rehash: bool = False) -> TreeDiff:
+    """Compare the files with what the index recorded.
+
+    ``added``/``removed`` are files created or deleted since they were
+    recorded. The index itself is checked too: if its stored root does
+    not match its entries, ``root`` is the stored one and nothing matches.
+    """
+    stored = index.load()
+    recorded = index.tree(stored)
+    entries, hashed = index.scan(rehash)
+    result = diff_trees(recorded, index.tree(entries))
+    result.root = index.stored_root() or result.root
+    result.files, result.hashed = len(entries), hashed
+    return result
+
+
+def compare_indexes(ours: FileIndex, theirs: FileIndex, rehash: bool = False) -> TreeDiff:
+    """Compare the current files of two indexed directories.
+
+    ``added`` are files only ``theirs`` has, ``removed`` files only
+    ``ours`` has.
+    """
+    our_entries, our_hashed = ours.scan(rehash)
+    their_entries, their_hashed = theirs.scan(rehash)
+    result = diff_trees(ours.tree(our_entries), theirs.tree(their_entries))
+    result.files = len(our_entries)
+    result.hashed = our_hashed + their_hashed
+    return result
+
+
+def archive_index(base_path: Path) -> FileIndex:
+    """Index of archived sessions and hash registries of an OSL directory.
+
+    Hash registries of sessions not yet archived are left out: they
+    change on every registration and are recorded by ``archive_session``.
+    """
+    from osl_cli.validation.hash import CONSOLIDATED_REGISTRY
+
+    ai_state = base_path / "ai_state"
+
+    def unarchived(key: str) -> bool:
+        directory, _, name = key.partition("/")
+        return (directory == "hash_registry" and name.endswith(".json")
+                and name != CONSOLIDATED_REGISTRY
+                and not (ai_state / "session_logs" / name).exists())
+
+    return FileIndex(ai_state, ARCHIVE_DIRS, ai_state / ARCHIVE_INDEX, exclude=unarchived)
@@ -0,0 +1,98 @@
+"""Persistent misconception store.
+
+Misconceptions are recorded during a session but frequently resolved in a
+later one, so they are kept per book outside the session file.
+"""
+
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from osl_cli.state.schemas import MisconceptionRecord
+from osl_cli.state.store import BookShardedStore
+
+
+class MisconceptionStore(BookShardedStore):
+    """Cross-session store of learner misconceptions."""
+
+    store_name = "misconceptions"
+
+    def __init__(self, base_path: Optional[Path] = None):
+        """Initialize misconception store.
+
+        Args:
+            base_path: Base OSL directory path. Defaults to ./osl
+        """
+        super().__init__(base_path)
+
+    def _index_names(self) -> List[str]:
+        return ["status"]
+
+    def _index_keys(self, record: Dict) -> Dict[str, List[str]]:
+        return {"status": ["resolved" if record.get("resolved") else "active"]}
+
+    def save(self, misconception: MisconceptionRecord) -> None:
+        """Insert or update a misconception.
+
+        Args:
+            misconception: Misconception to persist
+        """
+        self.put_record(
+            misconception.book_id,
+            misconception.misconception_id,
+            misconception.model_dump(mode="json"),
+        )
+
+    def get(self, misconception_id: str) -> Optional[MisconceptionRecord]:
+        """Fetch a misconception by ID."""
+        record = self.get_record(misconception_id)
+        return MisconceptionRecord.model_validate(record) if record else None
+
+    def resolve(
+        self,
+        misconception_id: str,
+        correction: str,
+        flashcard_created: bool = False,
+    ) -> Optional[MisconceptionRecord]:
+        """Mark a misconception resolved.
+
+        Args:
+            misconception_id: Misconception identifier
+            correction: How the learner corrected their understanding
+            flashcard_created: Whether a card was made for it
+
+        Returns:
+            Updated record, or None if unknown
+        """
+        misconception = self.get(misconception_id)
+        if misconception is None:
+            return None
+
+        misconception.resolved = True
+        misconception.resolved_at = datetime.now()
+        misconception.correction = correction
+        misconception.flashcard_created = flashcard_created
+        self.save(misconception)
+        return misconception
+
+    def list_book(self, book_id: str, include_resolved: bool = False) -> List[MisconceptionRecord]:
+        """Misconceptions for a book, active only unless requested.
+
+        Args:
+            book_id: Book identifier
+            include_resolved: Include resolved misconceptions
+
+        Returns:
+            Misconception records
+        """
+        records = (
+            self.iter_book(book_id) if include_resolved
+            else self.iter_indexed(book_id, "status", "active")
+        )
+        return [MisconceptionRecord.model_validate(r) for r in records]
+
+    def active_count(self, book_id: str) -> int:
+        """Number of unresolved misconceptions for a book."""
+        if book_id not in self.index["books"]:
+            return 0
+        return len(self._load_shard(book_id)["indexes"]["status"].get("active", []))
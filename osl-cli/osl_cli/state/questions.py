@@ -0,0 +1,147 @@
+"""Persistent curiosity-question backlog.
+
+Questions are stored once, outside any session, with globally stable IDs.
+Each book shard keeps indexes by resolution state and by page, so a book's
+open questions are read without loading archived sessions.
+"""
+
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from osl_cli.state.schemas import CuriosityQuestion
+from osl_cli.state.store import BookShardedStore
+
+
+class QuestionStore(BookShardedStore):
+    """Cross-session store of curiosity questions."""
+
+    store_name = "questions"
+    id_field = "id"
+
+    def __init__(self, base_path: Optional[Path] = None):
+        """Initialize question store.
+
+        Args:
+            base_path: Base OSL directory path. Defaults to ./osl
+        """
+        super().__init__(base_path)
+
+    def _index_names(self) -> List[str]:
+        return ["status", "page"]
+
+    def _index_keys(self, record: Dict) -> Dict[str, List[str]]:
+        pages = {
+            str(p) for p in (record.get("page_asked"), record.get("page_found"))
+            if p is not None
+        }
+        return {
+            "status": ["resolved" if record.get("resolved") else "open"],
+            "page": sorted(pages),
+        }
+
+    def record_identity(self, record: Dict) -> Tuple[str, ...]:
+        return (str(record.get("created")), record.get("question", ""))
+
+    def add(
+        self,
+        book_id: str,
+        question: str,
+        session_id: Optional[str] = None,
+        page_asked: Optional[int] = None,
+    ) -> CuriosityQuestion:
+        """Add a new question to the backlog.
+
+        Args:
+            book_id: Book the question is about
+            question: Question text (verbatim)
+            session_id: Session in which it was asked
+            page_asked: Page the learner was on when asking
+
+        Returns:
+            Stored CuriosityQuestion with a stable ID
+        """
+        record = self.insert_record(book_id, lambda question_id: CuriosityQuestion(
+            id=question_id,
+            question=question,
+            created=datetime.now(),
+            book_id=book_id,
+            session_id=session_id,
+            page_asked=page_asked,
+        ).model_dump(mode="json"))
+        return CuriosityQuestion.model_validate(record)
+
+    def get(self, question_id: int) -> Optional[CuriosityQuestion]:
+        """Fetch a question by ID.
+
+        Args:
+            question_id: Stable question ID
+
+        Returns:
+            CuriosityQuestion or None if unknown
+        """
+        record = self.get_record(str(question_id))
+        return CuriosityQuestion.model_validate(record) if record else None
+
+    def resolve(
+        self,
+        question_id: int,
+        page: Optional[int],
+        answer: Optional[str],
+    ) -> Optional[CuriosityQuestion]:
+        """Mark a question resolved and move it between indexes.
+
+        Args:
+            question_id: Stable question ID
+            page: Page where the answer was found
+            answer: Brief answer summary
+
+        Returns:
+            Updated question, or None if unknown
+        """
+        question = self.get(question_id)
+        if question is None:
+            return None
+
+        question.resolved = True
+        question.page_found = page
+        question.answer = answer
+        question.resolved_at = datetime.now()
+
+        self.put_record(question.book_id or self.book_of(str(question_id)),
+                        str(question_id), question.model_dump(mode="json"))
+        return question
+
+    def list_open(self, book_id: str) -> List[CuriosityQuestion]:
+        """Open questions for a book, oldest first.
+
+        Args:
+            book_id: Book identifier
+
+        Returns:
+            Unresolved questions
+        """
+        return [
+            CuriosityQuestion.model_validate(r)
+            for r in self.iter_indexed(book_id, "status", "open")
+        ]
+
+    def list_book(self, book_id: str) -> List[CuriosityQuestion]:
+        """All questions for a book, oldest first."""
+        return sorted(
+            (CuriosityQuestion.model_validate(r) for r in self.iter_book(book_id)),
+            key=lambda q: q.id,
+        )
+
+    def list_page(self, book_id: str, page: int) -> List[CuriosityQuestion]:
+        """Questions asked or answered on a given page."""
+        return [
+            CuriosityQuestion.model_validate(r)
+            for r in self.iter_indexed(book_id, "page", str(page))
+        ]
+
+    def open_count(self, book_id: str) -> int:
+        """Number of unresolved questions for a book."""
+        if book_id not in self.index["books"]:
+            return 0
+        return len(self._load_shard(book_id)["indexes"]["status"].get("open", []))
@@ -1,8 +1,13 @@
 """State schemas for OSL - Version 3.0."""
 
 from datetime import datetime
-from typing import List, Optional, Dict, Any, Literal
-from pydantic import BaseModel, Field
+from typing import List, Optional, Dict, Any, Literal, ClassVar, Tuple
+from pydantic import (
+    BaseModel, Field, PrivateAttr, SerializationInfo, ValidationInfo,
+    field_serializer, field_validator,
+)
+
+from osl_cli.state.blobs import CARD_FIELDS, LOOP_FIELDS, BlobRef, is_ref
 
 
 class BookState(BaseModel):
@@ -76,12 +81,16 @@ class ReviewSchedule(BaseModel):
 class CoachState(BaseModel):
     """Central coach state - authoritative state management."""
     version: str = "3.0"
+    revision: int = 0  # Incremented on every save (optimistic concurrency)
     last_updated: datetime = Field(default_factory=datetime.now)
     active_books: List[BookState] = []
     governance_thresholds: GovernanceThresholds
     governance_status: GovernanceStatus
     performance_metrics: PerformanceMetrics = Field(default_factory=PerformanceMetrics)
     review_schedule: ReviewSchedule = Field(default_factory=ReviewSchedule)
+    
+    # JSON as last read from or written to disk; base for concurrent merges
+    _snapshot: Optional[Dict[str, Any]] = PrivateAttr(default=None)
 
 
 class CuriosityQuestion(BaseModel):
@@ -89,14 +98,53 @@ class CuriosityQuestion(BaseModel):
     id: int
     question: str
     created: datetime
+    book_id: Optional[str] = None
+    session_id: Optional[str] = None
+    page_asked: Optional[int] = None
     resolved: bool = False
     answer: Optional[str] = None
     page_found: Optional[int] = None
     resolved_at: Optional[datetime] = None
 
 
-class RecallData(BaseModel):
+class ColdTextModel(BaseModel):
+    """Model whose long text fields are read from the blob store on demand.
+    
+    Validated with ``context={"blobs": BlobStore}``, ``{"blob": hash}``
+    references in ``_cold_fields`` are kept as :class:`BlobRef` and only
+    fetched (and verified) when the attribute is first read. JSON dumps
+    write unread references back unchanged.
+    """
+    _cold_fields: ClassVar[Tuple[str, ...]] = ()
+    
+    @field_validator("*", mode="wrap")
+    @classmethod
+    def _defer_blob(cls, value: Any, handler: Any, info: ValidationInfo) -> Any:
+        if info.field_name in cls._cold_fields and is_ref(value) and info.context:
+            blobs = info.context.get("blobs")
+            if blobs is not None:
+                return BlobRef(value["blob"], blobs)
+        return handler(value)
+    
+    @field_serializer("*", mode="wrap")
+    def _dump_blob(self, value: Any, handler: Any, info: SerializationInfo) -> Any:
+        if type(value) is BlobRef:
+            if info.mode == "json":
+                return {"blob": value.digest}
+            value = value.load()
+        return handler(value)
+    
+    def __getattribute__(self, name: str) -> Any:
+        value = super().__getattribute__(name)
+        if type(value) is BlobRef:
+            value = value.load()
+            self.__dict__[name] = value
+        return value
+
+
+class RecallData(ColdTextModel):
     """Free recall attempt data."""
+    _cold_fields = LOOP_FIELDS["recall_data"]
     duration_seconds: int
     key_points: List[str]
     confidence_score: int
@@ -104,8 +152,9 @@ class RecallData(BaseModel):
     recall_hash: str
 
 
-class FeynmanExplanation(BaseModel):
+class FeynmanExplanation(ColdTextModel):
     """Self-explanation data."""
+    _cold_fields = LOOP_FIELDS["feynman_explanation"]
     explanation_text: str
     explanation_hash: str
     analogies_used: List[str]
@@ -121,8 +170,9 @@ class TutorInteraction(BaseModel):
     misconceptions_identified: List[str]
 
 
-class FlashcardCreated(BaseModel):
+class FlashcardCreated(ColdTextModel):
     """Learner-authored flashcard."""
+    _cold_fields = CARD_FIELDS
     card_id: str
     front: str
     back: str
@@ -133,6 +183,40 @@ class FlashcardCreated(BaseModel):
     ai_assisted_formatting: bool = False
 
 
+class CardSchedule(BaseModel):
+    """Spaced repetition schedule for a stored card."""
+    due: datetime
+    interval_days: float = 0.0
+    ease: float = 2.5
+    reps: int = 0
+    lapses: int = 0
+    last_review: Optional[datetime] = None
+
+
+class CardRecord(FlashcardCreated):
+    """Flashcard persisted in the card store, outside any session."""
+    book_id: str
+    session_id: Optional[str] = None
+    created: datetime
+    topic: Optional[str] = None
+    schedule: CardSchedule
+
+
+class MisconceptionRecord(BaseModel):
+    """Misconception persisted in the misconception store."""
+    misconception_id: str
+    book_id: str
+    session_id: Optional[str] = None
+    identified_at: datetime
+    during_loop: int = 0
+    description: str
+    source: str
+    resolved: bool = False
+    resolved_at: Optional[datetime] = None
+    correction: Optional[str] = None
+    flashcard_created: bool = False
+
+
 class MicroLoop(BaseModel):
     """Single micro-loop cycle."""
     loop_id: int
@@ -146,20 +230,33 @@ class MicroLoop(BaseModel):
     flashcards_created: List[FlashcardCreated] = []
     retrieval_score: Optional[float] = None
     notes: Optional[str] = None
+    phase_durations: Dict[str, float] = {}  # Measured seconds per timed phase
+    timed_out: List[str] = []  # Phases that ran past their limit
 
 
 class SessionState(BaseModel):
     """Current active session state."""
     version: str = "3.0"
+    revision: int = 0  # Incremented on every save (optimistic concurrency)
     session_id: str
     book_id: str
     book_title: str
     start_time: datetime
     last_activity: datetime
     duration_minutes: int = 0
-    state: Literal["SESSION_INIT", "PREVIEW", "READING", "RECALL", "EXPLAIN", "FEEDBACK", "FLASHCARD", "SESSION_END"]
+    state: Literal[
+        "SESSION_INIT", "PREVIEW", "READING",
+        "RECALL_PENDING", "RECALL_ACTIVE", "RECALL_COMPLETE",
+        "FEYNMAN_PENDING", "FEYNMAN_ACTIVE", "FEYNMAN_COMPLETE",
+        "TUTOR_QA_PENDING", "TUTOR_QA_ACTIVE", "TUTOR_QA_COMPLETE",
+        "CARDS_PENDING", "CARDS_ACTIVE", "CARDS_COMPLETE",
+        "NOTES_PENDING", "NOTES_ACTIVE", "NOTES_COMPLETE", "SESSION_END",
+        # Coarse states written by older versions
+        "RECALL", "EXPLAIN", "FEEDBACK", "FLASHCARD",
+    ] = "SESSION_INIT"
     state_history: List[Dict[str, Any]] = []
     curiosity_questions: List[CuriosityQuestion] = []
+    misconceptions_identified: List[Dict[str, Any]] = []
     micro_loops: List[MicroLoop] = []
     flashcards_created: int = 0
     max_flashcards: int = 8
@@ -169,4 +266,7 @@ class SessionState(BaseModel):
     ai_interactions_count: int = 0
     total_recall_time: int = 0
     total_explanation_time: int = 0
-    retrieval_scores: List[float] = []
\ No newline at end of file
+    retrieval_scores: List[float] = []
+    
+    # JSON as last read from or written to disk; base for concurrent merges
+    _snapshot: Optional[Dict[str, Any]] = PrivateAttr(default=None)
@@ -0,0 +1,520 @@
+"""Book-sharded JSON record stores.
+
+Long-lived learner records (questions, cards, misconceptions) outlive the
+session that created them. They are kept in one JSON shard per book plus a
+small index mapping record IDs to their shard, so a book's records can be
+read without touching other books or archived sessions.
+
+Writers hold an exclusive lock on ``index.json`` for the whole
+read-modify-write of the index and a shard, re-reading whatever another
+process changed since it was cached, so concurrent writers never lose
+records or hand out the same ID.
+"""
+
+import hashlib
+import json
+import os
+import re
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+from osl_cli.perf import trace
+from osl_cli.state.locking import FileLock
+
+
+def legacy_shard_name(book_id: str) -> str:
+    """Shard file name stem used before ``shard_name`` added a hash.
+
+    Distinct IDs such as ``a/b`` and ``a_b`` map to the same name.
+    """
+    return re.sub(r"[^A-Za-z0-9_.-]", "_", book_id) or "_"
+
+
+def shard_name(book_id: str) -> str:
+    """Convert a book ID into a safe shard file name.
+
+    Args:
+        book_id: Book identifier
+
+    Returns:
+        File name stem safe for any filesystem: the ID with unsafe
+        characters replaced, plus a short hash of the ID so distinct IDs
+        never share a shard
+    """
+    digest = hashlib.sha256(book_id.encode("utf-8")).hexdigest()[:8]
+    return f"{legacy_shard_name(book_id)}-{digest}"
+
+
+def write_json_atomic(path: Path, data: Dict[str, Any], indent: Optional[int] = 2) -> None:
+    """Write JSON to a unique temp file and rename it into place.
+
+    Args:
+        path: Destination path
+        data: JSON-serializable data
+        indent: JSON indent (None for compact output)
+    """
+    with trace.span("io.write", "io", file=path.name):
+        path.parent.mkdir(parents=True, exist_ok=True)
+        temp_path = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+
+        with open(temp_path, "w") as f:
+            json.dump(data, f, indent=indent, default=str)
+
+        temp_path.replace(path)
+
+
+def file_stamp(path: Path) -> Optional[Tuple[int, int, int]]:
+    """Identity of a file's current version (None if missing).
+
+    Atomic writes replace the inode, so any rewrite changes the stamp.
+    """
+    try:
+        stat = path.stat()
+    except FileNotFoundError:
+        return None
+    return (stat.st_ino, stat.st_mtime_ns, stat.st_size)
+
+
+class BookShardedStore:
+    """Base class for records stored in per-book JSON shards.
+
+    Layout under ``ai_state/<store_name>/``::
+
+        index.json        # next_id, record_id -> book_id, per-book counts
+        <book_id>.json    # {"book_id", "records": {...}, "indexes": {...}}
+
+    Subclasses define which secondary indexes each shard maintains by
+    overriding ``_index_keys``. Every write and ID allocation happens under
+    an exclusive lock on ``index.json``.
+    """
+
+    store_name = "records"
+
+    # Record field holding the ID, for stores whose IDs come from
+    # ``allocate_id`` (None if records bring their own IDs)
+    id_field: Optional[str] = None
+
+    def __init__(self, base_path: Optional[Path] = None):
+        """Initialize the store.
+
+        Args:
+            base_path: Base OSL directory path. Defaults to ./osl
+        """
+        self.base_path = base_path or Path.cwd() / "osl"
+        self.store_path = self.base_path / "ai_state" / self.store_name
+        self.index_path = self.store_path / "index.json"
+        self._index: Optional[Dict[str, Any]] = None
+        self._shards: Dict[str, Dict[str, Any]] = {}
+        # Books whose shard was read from its legacy file name
+        self._legacy: Dict[str, Path] = {}
+        # File name -> stamp of the version cached in memory
+        self._stamps: Dict[str, Optional[Tuple[int, int, int]]] = {}
+
+    # ------------------------------------------------------------------
+    # Index and shard I/O
+    # ------------------------------------------------------------------
+
+    @property
+    def index(self) -> Dict[str, Any]:
+        """Global index, loaded lazily."""
+        if self._index is None:
+            self._index = self._read_index()
+        return self._index
+
+    def _read_index(self) -> Dict[str, Any]:
+        self._stamps[self.index_path.name] = file_stamp(self.index_path)
+        if self._stamps[self.index_path.name] is None:
+            return {"next_id": 1, "locations": {}, "books": {}}
+        with trace.span("io.read", "io", file=f"{self.store_name}/index.json"):
+            with open(self.index_path) as f:
+                return json.load(f)
+
+    def _write(self, path: Path, data: Dict[str, Any]) -> None:
+        write_json_atomic(path, data)
+        self._stamps[path.name] = file_stamp(path)
+
+    def _refresh(self, book_id: Optional[str] = None) -> None:
+        """Re-read the index and a cached shard if another process changed them.
+
+        Called with the index lock held. Cached dictionaries are updated in
+        place so iterators over them (such as due queues) see the new data.
+
+        Args:
+            book_id: Book whose cached shard to check
+        """
+        if self._index is not None and file_stamp(self.index_path) != self._stamps.get(self.index_path.name):
+            fresh = self._read_index()
+            self._index.clear()
+            self._index.update(fresh)
+
+        shard = self._shards.get(book_id) if book_id is not None else None
+        if shard is None:
+            return
+        path = self._shard_path(book_id)
+        stamp = file_stamp(path)
+        if stamp == self._stamps.get(path.name):
+            return
+        fresh = self._read_shard(path)
+        self._stamps[path.name] = stamp
+        if fresh is None:
+            return
+        shard["records"].clear()
+        shard["records"].update(fresh["records"])
+        for name, buckets in fresh["indexes"].items():
+            bucket_map = shard["indexes"].setdefault(name, {})
+            bucket_map.clear()
+            bucket_map.update(buckets)
+
+    def _shard_path(self, book_id: str) -> Path:
+        return self.store_path / f"{shard_name(book_id)}.json"
+
+    def _load_shard(self, book_id: str) -> Dict[str, Any]:
+        """Load a book shard, creating an empty one if missing.
+
+        Args:
+            book_id: Book identifier
+
+        Returns:
+            Shard dictionary
+        """
+        if book_id not in self._shards:
+            path = self._shard_path(book_id)
+            self._stamps[path.name] = file_stamp(path)
+            shard = self._read_shard(path)
+            if shard is None:
+                # Written before shard names carried a hash; moved on save
+                legacy_path = self.store_path / f"{legacy_shard_name(book_id)}.json"
+                shard = self._read_shard(legacy_path)
+                if shard is not None and shard.get("book_id") == book_id:
+                    self._legacy[book_id] = legacy_path
+                else:
+                    shard = None
+            if shard is not None:
+                self._shards[book_id] = shard
+            else:
+                self._shards[book_id] = {
+                    "book_id": book_id,
+                    "records": {},
+                    "indexes": {name: {} for name in self._index_names()},
+                }
+        return self._shards[book_id]
+
+    def _read_shard(self, path: Path) -> Optional[Dict[str, Any]]:
+        try:
+            with trace.span("io.read", "io", file=f"{self.store_name}/{path.name}"):
+                with open(path) as f:
+                    return json.load(f)
+        except FileNotFoundError:
+            return None
+
+    def _save(self, book_id: str) -> None:
+        """Persist a book shard and the global index (index lock held)."""
+        shard = self._load_shard(book_id)
+        self._write(self._shard_path(book_id), shard)
+        legacy_path = self._legacy.pop(book_id, None)
+        if legacy_path is not None:
+            legacy_path.unlink()
+
+        if book_id not in self.index["books"]:
+            self.index["books"][book_id] = self._book_summary(shard)
+        self._write(self.index_path, self.index)
+
+    def _book_summary(self, shard: Dict[str, Any]) -> Dict[str, Any]:
+        """Per-book summary kept in the global index.
+
+        Args:
+            shard: Book shard
+
+        Returns:
+            Summary dictionary (at least ``total``)
+        """
+        return {"total": len(shard["records"])}
+
+    def _update_summary(self, summary: Dict[str, Any], shard: Dict[str, Any],
+                        previous: Optional[Dict[str, Any]], record: Dict[str, Any]) -> None:
+        """Apply one record change to a book's summary in place.
+
+        Called after the record and its indexes are stored, so a save
+        costs the same however large the book is. Must agree with
+        ``_book_summary``.
+
+        Args:
+            summary: Summary to update
+            shard: Book shard
+            previous: Record replaced (None for a new record)
+            record: Record stored
+        """
+        summary["total"] = len(shard["records"])
+
+    def allocate_id(self) -> int:
+        """Allocate the next stable record ID.
+
+        Returns:
+            Monotonic integer ID, never reused
+        """
+        return self.allocate_ids(1)[0]
+
+    def allocate_ids(self, count: int) -> List[int]:
+        """Reserve a block of record IDs with a single index write.
+
+        Args:
+            count: Number of IDs to reserve
+
+        Returns:
+            Consecutive integer IDs, never handed out again
+        """
+        with FileLock(self.index_path):
+            self._refresh()
+            first = self.index["next_id"]
+            self.index["next_id"] = first + count
+            self._write(self.index_path, self.index)
+        return list(range(first, first + count))
+
+    def record_identity(self, record: Dict[str, Any]) -> Tuple[str, ...]:
+        """Fields that tell records apart independently of their ID.
+
+        Two directories allocate IDs independently, so ``osl sync`` uses
+        this to recognise different records given the same ID.
+
+        Args:
+            record: Stored record
+
+        Returns:
+            Sortable identity, fixed when the record is created
+        """
+        return (json.dumps(record, sort_keys=True, default=str),)
+
+    def renumber(self, book_id: str, record_id: str, new_id: int) -> Dict[str, Any]:
+        """Move a record to a new ID.
+
+        Args:
+            book_id: Book the record belongs to
+            record_id: Current record identifier
+            new_id: Unused ID to move it to (``next_id`` moves past it)
+
+        Returns:
+            Moved record
+        """
+        record_id = str(record_id)
+        with FileLock(self.index_path):
+            self._refresh(book_id)
+            shard = self._load_shard(book_id)
+
+            record = shard["records"].pop(record_id)
+            self._remove_from_indexes(shard, record_id, record)
+            if self.index["locations"].get(record_id) == book_id:
+                del self.index["locations"][record_id]
+            if self.id_field is not None:
+                record[self.id_field] = new_id
+
+            shard["records"][str(new_id)] = record
+            self._add_to_indexes(shard, str(new_id), record)
+            self.index["locations"][str(new_id)] = book_id
+            self.index["next_id"] = max(self.index["next_id"], new_id + 1)
+            self.index["books"][book_id] = self._book_summary(shard)
+            self._save(book_id)
+        return record
+
+    # ------------------------------------------------------------------
+    # Secondary indexes
+    # ------------------------------------------------------------------
+
+    def _index_names(self) -> List[str]:
+        """Names of secondary indexes kept in every shard."""
+        return []
+
+    def _index_keys(self, record: Dict[str, Any]) -> Dict[str, List[str]]:
+        """Return index name -> keys this record should be filed under.
+
+        Args:
+            record: Stored record
+
+        Returns:
+            Mapping of index name to list of string keys
+        """
+        return {}
+
+    def _add_to_indexes(self, shard: Dict[str, Any], record_id: str,
+                        record: Dict[str, Any]) -> None:
+        for name, keys in self._index_keys(record).items():
+            bucket_map = shard["indexes"].setdefault(name, {})
+            for key in keys:
+                bucket = bucket_map.setdefault(key, [])
+                if record_id not in bucket:
+                    bucket.append(record_id)
+
+    def _remove_from_indexes(self, shard: Dict[str, Any], record_id: str,
+                             record: Dict[str, Any]) -> None:
+        for name, keys in self._index_keys(record).items():
+            bucket_map = shard["indexes"].get(name, {})
+            for key in keys:
+                bucket = bucket_map.get(key)
+                if bucket and record_id in bucket:
+                    bucket.remove(record_id)
+                    if not bucket:
+                        del bucket_map[key]
+
+    # ------------------------------------------------------------------
+    # Record access
+    # ------------------------------------------------------------------
+
+    def put_record(self, book_id: str, record_id: str, record: Dict[str, Any]) -> None:
+        """Insert or replace a record and update its indexes.
+
+        Args:
+            book_id: Book the record belongs to
+            record_id: Record identifier
+            record: JSON-serializable record
+        """
+        self.put_records(book_id, {str(record_id): record})
+
+    def put_records(self, book_id: str, records: Dict[str, Dict[str, Any]]) -> None:
+        """Insert or replace several records with a single shard write.
+
+        Args:
+            book_id: Book the records belong to
+            records: Mapping of record ID to record
+        """
+        with FileLock(self.index_path):
+            self._refresh(book_id)
+            self._put_locked(book_id, records)
+
+    def insert_record(self, book_id: str,
+                      build: Callable[[int], Dict[str, Any]]) -> Dict[str, Any]:
+        """Allocate an ID and store the record built for it in one write.
+
+        Args:
+            book_id: Book the record belongs to
+            build: Called with the new ID, returns the record to store
+
+        Returns:
+            Stored record
+        """
+        with FileLock(self.index_path):
+            self._refresh(book_id)
+            record_id = self.index["next_id"]
+            self.index["next_id"] = record_id + 1
+            record = build(record_id)
+            self._put_locked(book_id, {str(record_id): record})
+        return record
+
+    def _put_locked(self, book_id: str, records: Dict[str, Dict[str, Any]]) -> None:
+        shard = self._load_shard(book_id)
+        summary = self.index["books"].get(book_id)
+
+        for record_id, record in records.items():
+            record_id = str(record_id)
+            previous = shard["records"].get(record_id)
+            if previous is not None:
+                self._remove_from_indexes(shard, record_id, previous)
+
+            shard["records"][record_id] = record
+            self._add_to_indexes(shard, record_id, record)
+            self.index["locations"][record_id] = book_id
+            if summary is not None:
+                self._update_summary(summary, shard, previous, record)
+
+        self._save(book_id)
+
+    def get_record(self, record_id: str) -> Optional[Dict[str, Any]]:
+        """Look up a record by ID, loading only its book shard.
+
+        Args:
+            record_id: Record identifier
+
+        Returns:
+            Record dictionary or None
+        """
+        book_id = self.index["locations"].get(str(record_id))
+        if book_id is None:
+            return None
+        return self._load_shard(book_id)["records"].get(str(record_id))
+
+    def book_of(self, record_id: str) -> Optional[str]:
+        """Return the book a record belongs to."""
+        return self.index["locations"].get(str(record_id))
+
+    def iter_book(self, book_id: str) -> Iterator[Dict[str, Any]]:
+        """Iterate all records for a book.
+
+        Args:
+            book_id: Book identifier
+
+        Yields:
+            Record dictionaries
+        """
+        if book_id not in self.index["books"]:
+            return
+        yield from self._load_shard(book_id)["records"].values()
+
+    def iter_indexed(self, book_id: str, index_name: str, key: str) -> Iterator[Dict[str, Any]]:
+        """Iterate records filed under an index key.
+
+        Cost is proportional to the number of matching records.
+
+        Args:
+            book_id: Book identifier
+            index_name: Secondary index name
+            key: Index key
+
+        Yields:
+            Record dictionaries
+        """
+        if book_id not in self.index["books"]:
+            return
+        shard = self._load_shard(book_id)
+        records = shard["records"]
+        for record_id in shard["indexes"].get(index_name, {}).get(key, []):
+            yield records[record_id]
+
+    def rebuild_index(self, next_id: int = 1) -> List[str]:
+        """Recompute secondary indexes and the global index from the shards.
+
+        Used after shards were merged from another OSL directory
+        (``osl sync``). Shards are only rewritten if their indexes change.
+
+        Args:
+            next_id: Lowest acceptable next ID (IDs are never reused)
+
+        Returns:
+            IDs found in more than one shard (located in the first)
+        """
+        with FileLock(self.index_path):
+            self._refresh()
+            return self._rebuild_locked(next_id)
+
+    def _rebuild_locked(self, next_id: int) -> List[str]:
+        duplicates: List[str] = []
+        index: Dict[str, Any] = {
+            "next_id": max(next_id, self.index["next_id"]),
+            "locations": {},
+            "books": {},
+        }
+        for path in sorted(self.store_path.glob("*.json")):
+            if path == self.index_path:
+                continue
+            with open(path) as f:
+                shard = json.load(f)
+            book_id = shard["book_id"]
+            indexes = shard.get("indexes")
+            shard["indexes"] = {name: {} for name in self._index_names()}
+            for record_id, record in shard["records"].items():
+                self._add_to_indexes(shard, record_id, record)
+                if record_id in index["locations"]:
+                    duplicates.append(record_id)
+                    continue
+                index["locations"][record_id] = book_id
+                if record_id.isdigit():
+                    index["next_id"] = max(index["next_id"], int(record_id) + 1)
+            if shard["indexes"] != indexes:
+                write_json_atomic(path, shard)
+            index["books"][book_id] = self._book_summary(shard)
+
+        self._index = index
+        self._shards = {}
+        self._write(self.index_path, index)
+        return duplicates
+
+    def book_ids(self) -> List[str]:
+        """Return all books that have records in this store."""
+        return list(self.index["books"].keys())
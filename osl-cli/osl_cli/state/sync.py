@@ -0,0 +1,594 @@
+"""Two-way sync between OSL directories.
+
+Both directories keep a Merkle index (``ai_state/sync/index.json``) of
+``ai_state``, ``anki`` and ``obsidian``, so a scan only rehashes files
+whose size or mtime changed. After each sync both sides record the
+trees they ended with under ``ai_state/sync/peers/<peer id>.json``; the
+next sync compares the current roots with the recorded ones (nothing to
+do if both match) and otherwise diffs each side's tree against its
+record to find the files changed since.
+
+A file changed on one side only is copied to the other. Files changed
+on both sides are merged according to their kind:
+
+- ``*.jsonl`` logs are append-only: each side gets the other's new lines
+  appended.
+- ``coach_state.json``, the consolidated hash registry and the
+  record-store shards (cards, questions, misconceptions) are three-way
+  merged against the last synced version,
+  kept in the blob store. Fields changed differently on both sides are
+  conflicts; the file is left alone unless a side is preferred.
+- ``calibration.json`` holds counters, so both sides' increments add up.
+- Anything else changed on both sides is a conflict.
+
+Record IDs that each side allocated independently (question IDs are
+per-directory counters) can name different records on the two sides.
+Before merging, such a record is renumbered to an ID unused on both
+sides; the record created first keeps the contested ID. A renumbered
+question is also renumbered in that side's active session, which is not
+synced; archived sessions keep the ID a question had when they were
+archived.
+
+Record-store ``index.json`` files are rebuilt from the merged shards; IDs
+still found in two shards are reported as conflicts.
+Session-local files (the active session, timers, caches, checkpoints,
+backups, state history) are never synced.
+"""
+
+import json
+import os
+import time
+import uuid
+from dataclasses import dataclass, field
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+from osl_cli.perf import trace
+from osl_cli.review.runner import ReviewLog
+from osl_cli.state.blobs import BlobStore
+from osl_cli.state.cards import CardStore
+from osl_cli.state.locking import FileLock, find_conflicts, merge_counters, three_way_merge
+from osl_cli.state.manager import StateManager
+from osl_cli.state.merkle import FileIndex, MerkleTree, hash_file
+from osl_cli.state.misconceptions import MisconceptionStore
+from osl_cli.state.questions import QuestionStore
+from osl_cli.state.schemas import CuriosityQuestion, SessionState
+from osl_cli.state.store import BookShardedStore, write_json_atomic
+
+
+SYNC_DIRS = ("ai_state", "anki", "obsidian")
+
+# Bookkeeping of this directory's syncs (never synced itself)
+SYNC_STATE = "ai_state/sync"
+
+# Per-machine directories: sync bookkeeping and state history journals
+LOCAL_DIRS = (SYNC_STATE + "/", "ai_state/history/")
+
+# Per-machine files: the active session, timers, caches and checkpoints
+LOCAL_FILES = frozenset({
+    "ai_state/current_session.json",
+    "ai_state/phase_timers.json",
+    "ai_state/review_checkpoint.json",
+    "ai_state/governance_cache.json",
+    "ai_state/changepoint_state.json",
+    "ai_state/archive_index.json",
+    "ai_state/migration_log.json",
+    "ai_state/daemon.log",
+})
+LOCAL_SUFFIXES = (".bak", ".last", ".tmp", ".lock")
+
+RECORD_STORES = {
+    CardStore.store_name: CardStore,
+    QuestionStore.store_name: QuestionStore,
+    MisconceptionStore.store_name: MisconceptionStore,
+}
+JSON_FILES = frozenset({"ai_state/coach_state.json", "ai_state/hash_registry/consolidated.json"})
+COUNTER_FILES = frozenset({"ai_state/calibration.json"})
+
+# Top-level fields every save changes; merged rather than conflicting
+VOLATILE_FIELDS = ("revision", "last_updated")
+
+REVIEW_LOG = "ai_state/review_log.jsonl"
+
+
+def is_local(key: str) -> bool:
+    """Whether a file (or ``dir/``) stays out of sync."""
+    return (key.startswith(LOCAL_DIRS) or key in LOCAL_FILES
+            or key.endswith(LOCAL_SUFFIXES))
+
+
+def file_kind(key: str) -> str:
+    """How a file changed on both sides is merged.
+
+    Returns:
+        ``log``, ``json``, ``counters``, ``index`` or ``file``
+    """
+    if key.endswith(".jsonl"):
+        return "log"
+    if key in JSON_FILES:
+        return "json"
+    if key in COUNTER_FILES:
+        return "counters"
+    parts = key.split("/")
+    if len(parts) == 3 and parts[0] == "ai_state" and parts[1] in RECORD_STORES:
+        if parts[2] == "index.json":
+            return "index"
+        if parts[2].endswith(".json"):
+            return "json"
+    return "file"
+
+
+def merge_base_digests(base_path: Path) -> Set[str]:
+    """Blobs kept as merge bases by the last sync with each peer."""
+    digests: Set[str] = set()
+    try:
+        names = os.listdir(base_path / SYNC_STATE / "peers")
+    except FileNotFoundError:
+        return digests
+    for name in names:
+        if not name.endswith(".json") or name.startswith("."):
+            continue
+        with open(base_path / SYNC_STATE / "peers" / name) as f:
+            record = json.load(f)
+        for side in ("ours", "theirs"):
+            for key, digest in record.get(side, {}).items():
+                if file_kind(key) in ("json", "counters"):
+                    digests.add(digest)
+    return digests
+
+
+def merge_logs(ours: bytes, theirs: bytes) -> Tuple[bytes, bytes]:
+    """Append each side's missing lines to the other.
+
+    Returns:
+        New ``(ours, theirs)``; each keeps its own lines, in order, first
+    """
+    if theirs.startswith(ours):
+        return theirs, theirs
+    if ours.startswith(theirs):
+        return ours, ours
+    our_lines = ours.splitlines(keepends=True)
+    their_lines = theirs.splitlines(keepends=True)
+    our_set, their_set = set(our_lines), set(their_lines)
+
+    def extend(base: bytes, lines: List[bytes], seen: Set[bytes]) -> bytes:
+        extra = b"".join(line if line.endswith(b"\n") else line + b"\n"
+                         for line in lines if line not in seen)
+        if extra and base and not base.endswith(b"\n"):
+            base += b"\n"
+        return base + extra
+
+    return extend(ours, their_lines, our_set), extend(theirs, our_lines, their_set)
+
+
+@dataclass
+class SyncReport:
+    """What a sync did (or, for a dry run, would do)."""
+    peer: str = ""
+    up_to_date: bool = False
+    pulled: List[str] = field(default_factory=list)  # written here from the peer
+    pushed: List[str] = field(default_factory=list)  # written to the peer
+    merged: List[str] = field(default_factory=list)  # merged from both sides
+    deleted: List[str] = field(default_factory=list)
+    conflicts: Dict[str, List[str]] = field(default_factory=dict)  # key -> JSON pointers
+    renumbered: List[Dict[str, str]] = field(default_factory=list)  # records given new IDs
+    skipped: List[str] = field(default_factory=list)  # changed while syncing
+    files: int = 0
+    hashed: int = 0
+    bytes_copied: int = 0
+    seconds: float = 0.0
+
+    def to_dict(self) -> Dict[str, Any]:
+        """JSON-friendly representation."""
+        return {
+            "peer": self.peer,
+            "up_to_date": self.up_to_date,
+            "pulled": self.pulled,
+            "pushed": self.pushed,
+            "merged": self.merged,
+            "deleted": self.deleted,
+            "conflicts": self.conflicts,
+            "renumbered": self.renumbered,
+            "skipped": self.skipped,
+            "files": self.files,
+            "hashed": self.hashed,
+            "bytes_copied": self.bytes_copied,
+            "seconds": round(self.seconds, 3),
+        }
+
+
+class SyncSide:
+    """One of the two OSL directories taking part in a sync."""
+
+    def __init__(self, base_path: Path):
+        self.base_path = base_path
+        self.state_path = base_path / SYNC_STATE
+        self.index = FileIndex(base_path, SYNC_DIRS, self.state_path / "index.json",
+                               exclude=is_local)
+        self.blobs = BlobStore(base_path)
+
+    @property
+    def sync_id(self) -> str:
+        """Stable identifier of this directory, created on first use."""
+        path = self.state_path / "id"
+        try:
+            return path.read_text().strip()
+        except FileNotFoundError:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            path.write_text(uuid.uuid4().hex)
+            return path.read_text().strip()
+
+    def _peer_path(self, peer_id: str) -> Path:
+        return self.state_path / "peers" / f"{peer_id}.json"
+
+    def peer_record(self, peer_id: str) -> Dict[str, Any]:
+        """Trees both sides had after the last sync with a peer (or {})."""
+        try:
+            with open(self._peer_path(peer_id)) as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return {}
+
+    def save_peer_record(self, peer_id: str, peer_path: Path,
+                         ours: Dict[str, str], theirs: Dict[str, str]) -> None:
+        write_json_atomic(self._peer_path(peer_id), {
+            "peer_id": peer_id,
+            "peer_path": str(peer_path),
+            "synced_at": datetime.now().isoformat(),
+            "roots": [MerkleTree(ours).root, MerkleTree(theirs).root],
+            "ours": ours,
+            "theirs": theirs,
+        })
+
+    def read(self, key: str) -> Optional[bytes]:
+        try:
+            with open(self.base_path / key, "rb") as f:
+                return f.read()
+        except FileNotFoundError:
+            return None
+
+    def write(self, key: str, content: Optional[bytes], expected: Optional[str],
+              append: bool = False) -> bool:
+        """Replace, append to or delete a file if it still has the expected hash.
+
+        Returns:
+            False if the file changed since it was planned against
+        """
+        path = self.base_path / key
+        with FileLock(path):
+            current = hash_file(path) if path.exists() else None
+            if current != expected:
+                return False
+            if content is None:
+                path.unlink()
+                return True
+            if append:
+                with open(path, "ab") as f:
+                    f.write(content)
+                return True
+            path.parent.mkdir(parents=True, exist_ok=True)
+            temp_path = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+            with open(temp_path, "wb") as f:
+                f.write(content)
+            temp_path.replace(path)
+        return True
+
+    def base_json(self, digest: Optional[str]) -> Any:
+        """Last synced version of a mergeable file (None if unknown)."""
+        if digest is None or not self.blobs.has(digest):
+            return None
+        return json.loads(self.blobs.get(digest))
+
+
+def _dump(data: Any) -> bytes:
+    return (json.dumps(data, indent=2, default=str) + "\n").encode("utf-8")
+
+
+def _merge_json(kind: str, base: Any, ours: Any, theirs: Any,
+                prefer: Optional[str]) -> Tuple[Any, List[str]]:
+    """Merged document and its unresolved conflicts."""
+    if kind == "counters":
+        # Without a common base the counters cannot be told apart
+        if base is None and not prefer:
+            return None, ["/"]
+        if base is None:
+            return (ours if prefer == "ours" else theirs), []
+        return merge_counters(base, ours, theirs), []
+
+    volatile = {f"/{name}" for name in VOLATILE_FIELDS}
+    if isinstance(ours, dict) and "indexes" in ours and "records" in ours:
+        # Record-store shard: indexes are rebuilt from the merged records
+        base, ours, theirs = (
+            {k: v for k, v in doc.items() if k != "indexes"} if isinstance(doc, dict) else doc
+            for doc in (base, ours, theirs)
+        )
+    conflicts = [p for p in find_conflicts(base, ours, theirs) if p not in volatile]
+    if conflicts and not prefer:
+        return None, conflicts
+    if prefer == "theirs":
+        merged = three_way_merge(base, theirs, ours)
+    else:
+        merged = three_way_merge(base, ours, theirs)
+    if isinstance(merged, dict):
+        if "revision" in merged:
+            merged["revision"] = max(ours.get("revision", 0), theirs.get("revision", 0)) + 1
+        if "last_updated" in merged:
+            merged["last_updated"] = max(str(ours.get("last_updated", "")),
+                                         str(theirs.get("last_updated", "")))
+    return merged, []
+
+
+def _renumber_session_question(side: SyncSide, store: BookShardedStore,
+                               record: Dict[str, Any], old_id: str, new_id: int) -> None:
+    """Follow a renumbered question in the side's active session."""
+    manager = StateManager(side.base_path)
+    if not manager.has_active_session():
+        return
+    identity = store.record_identity(record)
+
+    def matches(question: CuriosityQuestion) -> bool:
+        return (str(question.id) == old_id
+                and store.record_identity(question.model_dump(mode="json")) == identity)
+
+    if not any(matches(q) for q in manager.load_current_session().curiosity_questions):
+        return
+
+    def mutate(session: SessionState) -> None:
+        for question in session.curiosity_questions:
+            if matches(question):
+                question.id = new_id
+
+    manager.update_current_session(mutate)
+
+
+def resolve_id_collisions(a: SyncSide, b: SyncSide, tree_a: MerkleTree, tree_b: MerkleTree,
+                          dry_run: bool = False) -> List[Dict[str, str]]:
+    """Renumber records the two sides gave the same ID independently.
+
+    Only shards that differ between the sides can hold such a pair. Of
+    each pair, the record with the lower identity (created first) keeps
+    the ID and the other moves to an ID unused on both sides.
+
+    Args:
+        a: Our side
+        b: Their side
+        tree_a: Our current tree
+        tree_b: Their current tree
+        dry_run: Report the renumbering without writing
+
+    Returns:
+        One entry per renumbered record: ``store``, ``book_id``, ``side``
+        (``ours`` or ``theirs``), ``from`` and ``to``
+    """
+    renumbered: List[Dict[str, str]] = []
+    sides = {"ours": a, "theirs": b}
+    for name, store_class in sorted(RECORD_STORES.items()):
+        if store_class.id_field is None:
+            continue
+        prefix = f"ai_state/{name}/"
+        keys = sorted(
+            key for key in set(tree_a.leaves) | set(tree_b.leaves)
+            if key.startswith(prefix) and key != prefix + "index.json"
+            and tree_a.leaves.get(key) != tree_b.leaves.get(key)
+        )
+        if not keys:
+            continue
+
+        stores = {"ours": store_class(a.base_path), "theirs": store_class(b.base_path)}
+        # side -> record ID -> (identity, book ID)
+        found: Dict[str, Dict[str, Tuple[Tuple[str, ...], str]]] = {}
+        for side_name, side in sides.items():
+            found[side_name] = {}
+            for key in keys:
+                content = side.read(key)
+                if content is None:
+                    continue
+                shard = json.loads(content)
+                for record_id, record in shard["records"].items():
+                    identity = stores[side_name].record_identity(record)
+                    found[side_name][record_id] = (identity, shard["book_id"])
+
+        next_id = max(store.index["next_id"] for store in stores.values())
+        shared = set(found["ours"]) & set(found["theirs"])
+        for record_id in sorted(shared, key=lambda i: (len(i), i)):
+            ours, theirs = found["ours"][record_id], found["theirs"][record_id]
+            if ours[0] == theirs[0]:
+                continue
+            side_name = "theirs" if ours[0] <= theirs[0] else "ours"
+            book_id = found[side_name][record_id][1]
+            if not dry_run:
+                moved = stores[side_name].renumber(book_id, record_id, next_id)
+                if store_class is QuestionStore:
+                    _renumber_session_question(sides[side_name], stores[side_name], moved,
+                                               record_id, next_id)
+            renumbered.append({"store": name, "book_id": book_id, "side": side_name,
+                               "from": record_id, "to": str(next_id)})
+            next_id += 1
+    return renumbered
+
+
+def sync_dirs(ours: Path, theirs: Path, prefer: Optional[str] = None,
+              dry_run: bool = False) -> SyncReport:
+    """Sync two OSL directories in both directions.
+
+    Args:
+        ours: This OSL directory
+        theirs: The other OSL directory
+        prefer: ``ours`` or ``theirs`` resolves conflicts in that side's
+            favour; None leaves conflicting files untouched
+        dry_run: Report what would change without writing
+
+    Returns:
+        Report of copied, merged and conflicting files
+    """
+    started = time.perf_counter()
+    a, b = SyncSide(ours), SyncSide(theirs)
+    report = SyncReport(peer=str(theirs))
+    a_id, b_id = a.sync_id, b.sync_id
+    record = a.peer_record(b_id)
+
+    with trace.span("sync.scan", "state"):
+        entries_a, hashed_a = a.index.scan()
+        entries_b, hashed_b = b.index.scan()
+    tree_a, tree_b = a.index.tree(entries_a), b.index.tree(entries_b)
+    report.files = len(tree_a)
+    report.hashed = hashed_a + hashed_b
+
+    if record and [tree_a.root, tree_b.root] == record.get("roots"):
+        report.up_to_date = True
+        if not dry_run and report.hashed:
+            a.index.rebuild()
+            b.index.rebuild()
+        report.seconds = time.perf_counter() - started
+        return report
+
+    with trace.span("sync.ids", "state"):
+        report.renumbered = resolve_id_collisions(a, b, tree_a, tree_b, dry_run)
+    if report.renumbered and not dry_run:
+        entries_a, hashed_a = a.index.scan()
+        entries_b, hashed_b = b.index.scan()
+        tree_a, tree_b = a.index.tree(entries_a), b.index.tree(entries_b)
+        report.hashed += hashed_a + hashed_b
+
+    last_a = MerkleTree(record.get("ours", {}))
+    last_b = MerkleTree(record.get("theirs", {}))
+
+    # Only files changed on either side since the last sync need a look
+    if record:
+        keys = set(tree_a.diff(last_a)[0]) | set(tree_b.diff(last_b)[0])
+    else:
+        keys = set(tree_a.diff(tree_b)[0])
+
+    # (side, key, content or None to delete, expected hash, report list, append)
+    writes: List[Tuple[SyncSide, str, Optional[bytes], Optional[str],
+                       Optional[List[str]], bool]] = []
+    touched_stores: Set[str] = set()
+    unresolved: Set[str] = set()
+
+    with trace.span("sync.plan", "state", files=len(keys)):
+        for key in sorted(keys):
+            ha, hb = tree_a.leaves.get(key), tree_b.leaves.get(key)
+            if ha == hb:
+                continue
+            kind = file_kind(key)
+            if kind == "index":
+                touched_stores.add(key.split("/")[1])
+                continue
+            if kind == "json" and key.split("/")[1] in RECORD_STORES:
+                touched_stores.add(key.split("/")[1])
+
+            changed_a = not record or ha != last_a.leaves.get(key)
+            changed_b = not record or hb != last_b.leaves.get(key)
+
+            if kind == "log" and ha and hb:
+                old_a, old_b = a.read(key) or b"", b.read(key) or b""
+                new_a, new_b = merge_logs(old_a, old_b)
+                # Each side keeps its own lines first: only the tail is new
+                if new_a != old_a:
+                    writes.append((a, key, new_a[len(old_a):], ha, None, True))
+                if new_b != old_b:
+                    writes.append((b, key, new_b[len(old_b):], hb, None, True))
+                report.merged.append(key)
+                continue
+
+            if not changed_a or (changed_b and ha is None):
+                # Only theirs changed (or we deleted what they modified)
+                listed = report.deleted if hb is None else report.pulled
+                writes.append((a, key, b.read(key), ha, listed, False))
+                continue
+            if not changed_b or hb is None:
+                listed = report.deleted if ha is None else report.pushed
+                writes.append((b, key, a.read(key), hb, listed, False))
+                continue
+
+            if kind in ("json", "counters"):
+                synced = last_a.leaves.get(key)
+                base_digest = synced if synced == last_b.leaves.get(key) else None
+                base = a.base_json(base_digest)
+                if base is None:
+                    base = b.base_json(base_digest)
+                merged, conflicts = _merge_json(kind, base, json.loads(a.read(key)),
+                                                json.loads(b.read(key)), prefer)
+                if conflicts:
+                    report.conflicts[key] = conflicts
+                    unresolved.add(key)
+                    continue
+                content = _dump(merged)
+                writes.append((a, key, content, ha, None, False))
+                writes.append((b, key, content, hb, None, False))
+                report.merged.append(key)
+                continue
+
+            if not prefer:
+                report.conflicts[key] = ["/"]
+                unresolved.add(key)
+            elif prefer == "ours":
+                writes.append((b, key, a.read(key), hb, report.pushed, False))
+            else:
+                writes.append((a, key, b.read(key), ha, report.pulled, False))
+
+    for side, key, content, expected, listed, _ in writes:
+        if listed is not None and key not in listed:
+            listed.append(key)
+        report.bytes_copied += len(content or b"")
+
+    if dry_run:
+        report.seconds = time.perf_counter() - started
+        return report
+
+    with trace.span("sync.apply", "state", writes=len(writes)):
+        for side, key, content, expected, _, append in writes:
+            applied_at = None
+            if key == REVIEW_LOG:
+                applied_at = (side.base_path / key).stat().st_size if expected else 0
+            if not side.write(key, content, expected, append):
+                report.skipped.append(key)
+                unresolved.add(key)
+                continue
+            if applied_at is not None:
+                # Answers from the other side arrive with their card updates
+                log = ReviewLog(side.base_path)
+                if log.applied_offset() == applied_at:
+                    log.mark_applied()
+
+        if touched_stores:
+            for name in sorted(touched_stores):
+                stores = [RECORD_STORES[name](side.base_path) for side in (a, b)]
+                next_id = max(store.index["next_id"] for store in stores)
+                duplicates: Set[str] = set()
+                for store in stores:
+                    duplicates.update(store.rebuild_index(next_id))
+                if duplicates:
+                    key = f"ai_state/{name}/index.json"
+                    report.conflicts[key] = [f"/locations/{record_id}"
+                                             for record_id in sorted(duplicates)]
+                    unresolved.add(key)
+
+    # Keep the synced version of mergeable files as the next merge base
+    for key in set(tree_a.leaves) | set(tree_b.leaves):
+        if file_kind(key) in ("json", "counters") and key not in unresolved:
+            content = a.read(key)
+            if content is not None and content == b.read(key):
+                for side in (a, b):
+                    side.blobs.put(content.decode("utf-8"))
+
+    with trace.span("sync.record", "state"):
+        entries_a, _ = a.index.scan()
+        entries_b, _ = b.index.scan()
+        final_a = {key: entry[0] for key, entry in entries_a.items()}
+        final_b = {key: entry[0] for key, entry in entries_b.items()}
+        for key in unresolved:
+            # Conflicts stay "changed" until resolved
+            for final, last in ((final_a, last_a), (final_b, last_b)):
+                if key in last.leaves:
+                    final[key] = last.leaves[key]
+                else:
+                    final.pop(key, None)
+        a.index.save(entries_a)
+        b.index.save(entries_b)
+        a.save_peer_record(b_id, theirs, final_a, final_b)
+        b.save_peer_record(a_id, ours, final_b, final_a)
+
+    report.seconds = time.perf_counter() - started
+    return report
@@ -0,0 +1,276 @@
+"""Bulk workflow conformance checking for archived sessions.
+
+Streams ``ai_state/session_logs`` and replays each session's
+``state_history`` through :class:`OSLStateMachine`: every recorded
+transition must be allowed by the transition table, carry the
+``REQUIRED_INPUTS`` of the state it enters and meet the
+``MINIMUM_REQUIREMENTS``. Sessions are checked in batches across a
+process pool; each worker returns a partial :class:`ConformanceReport`
+and the partials are merged.
+
+Violations are counted per rule and state, e.g.
+``required_inputs:RECALL_COMPLETE`` or ``transition:CARDS_PENDING``.
+Besides the state machine's own rules, whole-session rules are:
+
+- ``sequence``: an entry does not start where the previous one ended
+- ``incomplete``: the history does not reach ``SESSION_END``
+- ``forced``: the session was ended with the workflow cut short
+- ``unknown_state``: a state name the workflow does not define
+
+Sessions archived before histories were recorded (empty
+``state_history``) are counted as unrecorded, not as violations.
+"""
+
+import json
+import os
+import time
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from itertools import islice
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from osl_cli.perf import trace
+from osl_cli.state.blobs import CONTEXT_FIELDS, BlobStore
+from osl_cli.validation.workflow import OSLStateMachine, SessionState
+
+
+# Session files handed to a worker at a time
+BATCH_SIZE = 256
+
+# Session ids kept per rule as examples
+MAX_EXAMPLES = 5
+
+_DECODER = json.JSONDecoder()
+_WHITESPACE = " \t\r\n"
+
+END_STATES = frozenset({SessionState.SESSION_END.value, SessionState.ARCHIVED.value})
+
+
+@dataclass
+class ConformanceReport:
+    """Per-rule violation counts over a set of archived sessions."""
+    sessions: int = 0
+    conforming: int = 0
+    unrecorded: int = 0
+    unreadable: List[str] = field(default_factory=list)
+    violations: Counter = field(default_factory=Counter)  # "rule:STATE" -> transitions
+    sessions_by_rule: Counter = field(default_factory=Counter)  # "rule:STATE" -> sessions
+    examples: Dict[str, List[str]] = field(default_factory=dict)
+    seconds: float = 0.0
+
+    @property
+    def checked(self) -> int:
+        """Sessions with a recorded history."""
+        return self.sessions - self.unrecorded
+
+    @property
+    def conformance_rate(self) -> float:
+        """Share of checked sessions without any violation."""
+        return self.conforming / self.checked if self.checked else 1.0
+
+    def merge(self, other: "ConformanceReport") -> None:
+        """Add another (partial) report into this one."""
+        self.sessions += other.sessions
+        self.conforming += other.conforming
+        self.unrecorded += other.unrecorded
+        self.unreadable.extend(other.unreadable)
+        self.violations.update(other.violations)
+        self.sessions_by_rule.update(other.sessions_by_rule)
+        for key, ids in other.examples.items():
+            kept = self.examples.setdefault(key, [])
+            kept.extend(ids[:MAX_EXAMPLES - len(kept)])
+
+    def rows(self) -> List[Dict[str, Any]]:
+        """One row per rule and state, most violated first."""
+        rows = []
+        for key, count in self.violations.most_common():
+            rule, _, state = key.partition(":")
+            rows.append({
+                "rule": rule,
+                "state": state or None,
+                "violations": count,
+                "sessions": self.sessions_by_rule[key],
+                "examples": sorted(self.examples.get(key, [])),
+            })
+        return rows
+
+    def to_dict(self) -> Dict[str, Any]:
+        """JSON-friendly representation."""
+        return {
+            "sessions": self.sessions,
+            "checked": self.checked,
+            "conforming": self.conforming,
+            "unrecorded": self.unrecorded,
+            "unreadable": sorted(self.unreadable),
+            "conformance_rate": round(self.conformance_rate, 4),
+            "seconds": round(self.seconds, 3),
+            "rules": self.rows(),
+        }
+
+
+def session_violations(history: List[Dict[str, Any]],
+                       machine: Optional[OSLStateMachine] = None) -> Counter:
+    """Replay one session's ``state_history``.
+
+    Args:
+        history: Recorded transitions (``from``, ``to``, ``context``)
+        machine: State machine to check against
+
+    Returns:
+        Violation counts keyed ``rule:STATE`` (``rule`` for session rules)
+    """
+    machine = machine or _MACHINE
+    by_name = machine.TABLE.by_name
+    successors = machine.TABLE.successors
+    input_mask = machine.INPUT_MASK
+    found: Counter = Counter()
+    previous: Optional[str] = None
+
+    for entry in history:
+        src, dst = entry.get("from"), entry.get("to")
+        context = entry.get("context")
+        if previous is not None and src != previous:
+            found["sequence"] += 1
+        previous = dst
+        src_code, dst_code = by_name.get(src), by_name.get(dst)
+        if src_code is None or dst_code is None:
+            found["unknown_state"] += 1
+            continue
+        # Fast path: allowed hop into a state without inputs to check
+        if (successors[src_code] >> dst_code) & 1 and not (input_mask >> dst_code) & 1:
+            continue
+        if context and context.get("forced"):
+            found["forced"] += 1
+            continue
+        for failure in machine.violations(src_code, dst_code, context):
+            found[f"{failure.rule}:{dst}"] += 1
+
+    if history and previous not in END_STATES:
+        found["incomplete"] += 1
+    return found
+
+
+def _field(text: str, key: str) -> Any:
+    """Decode one top-level field without parsing the whole session.
+
+    A quoted key followed by a colon cannot occur inside a JSON string
+    (its quotes would be escaped), and the fields before
+    ``state_history`` are scalars, so the first match is the field.
+
+    Raises:
+        KeyError: If the key is not present
+    """
+    start = text.find(f'"{key}":')
+    if start < 0:
+        raise KeyError(key)
+    start += len(key) + 3
+    while text[start] in _WHITESPACE:
+        start += 1
+    value, _ = _DECODER.raw_decode(text, start)
+    return value
+
+
+def _read_history(path: str) -> Tuple[str, List[Dict[str, Any]]]:
+    with open(path, encoding="utf-8") as f:
+        text = f.read()
+    try:
+        return _field(text, "session_id"), _field(text, "state_history")
+    except (KeyError, IndexError, ValueError):
+        session = json.loads(text)
+        return session.get("session_id") or Path(path).stem, session.get("state_history") or []
+
+
+def _resolve_contexts(history: List[Dict[str, Any]], blobs: BlobStore) -> None:
+    """Replace blob references in transition contexts with their text."""
+    for entry in history:
+        context = entry.get("context")
+        if context:
+            for key in CONTEXT_FIELDS:
+                if key in context:
+                    context[key] = blobs.load(context[key])
+
+
+def check_files(paths: List[str]) -> ConformanceReport:
+    """Check a batch of archived session files (runs in a worker)."""
+    report = ConformanceReport()
+    blobs = None
+    for path in paths:
+        report.sessions += 1
+        # ai_state/session_logs/<id>.json -> OSL directory
+        blobs = blobs or BlobStore(Path(path).parent.parent.parent)
+        try:
+            session_id, history = _read_history(path)
+            _resolve_contexts(history, blobs)
+        except (OSError, ValueError, AttributeError):
+            report.unreadable.append(path)
+            continue
+
+        if not history:
+            report.unrecorded += 1
+            continue
+        found = session_violations(history)
+        if not found:
+            report.conforming += 1
+            continue
+        report.violations.update(found)
+        for key in found:
+            report.sessions_by_rule[key] += 1
+            examples = report.examples.setdefault(key, [])
+            if len(examples) < MAX_EXAMPLES:
+                examples.append(session_id)
+    return report
+
+
+def iter_session_files(base_path: Path) -> Iterator[str]:
+    """Archived session files, streamed from the directory listing."""
+    logs = base_path / "ai_state" / "session_logs"
+    if not logs.is_dir():
+        return
+    with os.scandir(logs) as entries:
+        for entry in entries:
+            if entry.name.endswith(".json") and entry.is_file():
+                yield entry.path
+
+
+def _batches(paths: Iterable[str], size: int) -> Iterator[List[str]]:
+    it = iter(paths)
+    while True:
+        batch = list(islice(it, size))
+        if not batch:
+            return
+        yield batch
+
+
+def check_archive(base_path: Path, workers: Optional[int] = None,
+                  batch_size: int = BATCH_SIZE) -> ConformanceReport:
+    """Check every archived session under an OSL directory.
+
+    Args:
+        base_path: OSL directory
+        workers: Worker processes (default: CPU count; 1 checks inline)
+        batch_size: Session files per worker task
+
+    Returns:
+        Merged report
+    """
+    started = time.perf_counter()
+    workers = workers or os.cpu_count() or 1
+    report = ConformanceReport()
+    batches = _batches(iter_session_files(base_path), batch_size)
+
+    with trace.span("audit.conformance", "validation", workers=workers):
+        if workers == 1:
+            for batch in batches:
+                report.merge(check_files(batch))
+        else:
+            with ProcessPoolExecutor(max_workers=workers) as pool:
+                for partial in pool.map(check_files, batches):
+                    report.merge(partial)
+
+    report.seconds = time.perf_counter() - started
+    return report
+
+
+_MACHINE = OSLStateMachine()
@@ -0,0 +1,389 @@
+"""Quantifying modifications of verbatim content.
+
+``diff_texts`` tells how much of a text changed and where:
+
+1. The common prefix and suffix are stripped (they never change the
+   edit distance).
+2. The rest is split into word, whitespace and punctuation tokens and
+   diffed with Myers' O(ND) algorithm, so a few edits in a long essay
+   cost time proportional to the text times the number of edits.
+3. Each changed span is measured in characters with the bit-parallel
+   Levenshtein algorithm of Myers and Hyyrö, which processes a whole
+   column of the edit-distance matrix per character using integers as
+   bit vectors.
+
+The reported edit distance is the sum over changed spans. It equals the
+character edit distance when the changes form a single span and is an
+upper bound otherwise.
+"""
+
+import json
+import os
+import re
+import time
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from itertools import accumulate
+from pathlib import Path
+from typing import Any, Dict, Hashable, Iterator, List, Optional, Sequence, Tuple
+
+from osl_cli.perf import trace
+from osl_cli.state.blobs import BlobStore
+
+
+# Token edits the Myers diff explores before treating the rest as one span
+MAX_EDITS = 1000
+
+# Longest span measured exactly when the diff gave up; longer ones are
+# bounded by their length
+MAX_SPAN_CHARS = 8192
+
+# Session logs handed to a worker at a time
+BATCH_SIZE = 128
+
+# Modified texts kept as examples
+MAX_EXAMPLES = 5
+
+_TOKEN = re.compile(r"\w+|\s+|[^\w\s]")
+
+
+def levenshtein(a: str, b: str, limit: Optional[int] = None) -> Optional[int]:
+    """Character edit distance (Myers/Hyyrö bit-parallel).
+
+    Bit ``i`` of ``pv``/``mv`` says whether the distance goes up/down by
+    one from row ``i`` to row ``i + 1`` of the current column; each
+    character of ``b`` updates all rows with a handful of integer
+    operations.
+
+    Args:
+        a: First text
+        b: Second text
+        limit: Give up once the distance must exceed this
+
+    Returns:
+        The distance, or None if it is more than ``limit``
+    """
+    if len(a) > len(b):
+        a, b = b, a
+    m, n = len(a), len(b)
+    if limit is not None and n - m > limit:
+        return None
+    if not m:
+        return n
+
+    peq: Dict[str, int] = {}
+    for i, ch in enumerate(a):
+        peq[ch] = peq.get(ch, 0) | (1 << i)
+    full = (1 << m) - 1
+    top = 1 << (m - 1)
+    pv, mv, score = full, 0, m
+
+    for j, ch in enumerate(b):
+        eq = peq.get(ch, 0)
+        xv = eq | mv
+        xh = (((eq & pv) + pv) ^ pv) | eq
+        ph = mv | (~(xh | pv) & full)
+        mh = pv & xh
+        if ph & top:
+            score += 1
+        elif mh & top:
+            score -= 1
+        ph = ((ph << 1) | 1) & full
+        mh = (mh << 1) & full
+        pv = mh | (~(xv | ph) & full)
+        mv = ph & xv
+        # Each remaining character lowers the distance by at most one
+        if limit is not None and score - (n - 1 - j) > limit:
+            return None
+    return score
+
+
+def myers_blocks(a: Sequence[Hashable], b: Sequence[Hashable],
+                 max_edits: int = MAX_EDITS) -> Optional[List[Tuple[int, int, int]]]:
+    """Matching blocks of a shortest edit script (Myers' O(ND) diff).
+
+    Args:
+        a: Original sequence
+        b: Changed sequence
+        max_edits: Give up beyond this many insertions and deletions
+
+    Returns:
+        ``(i, j, size)`` runs with ``a[i:i + size] == b[j:j + size]``,
+        in order, or None if more than ``max_edits`` edits are needed
+    """
+    n, m = len(a), len(b)
+    limit = min(max_edits, n + m)
+    offset = limit + 1
+    v = [0] * (2 * limit + 3)
+    history: List[List[int]] = []
+    for d in range(limit + 1):
+        history.append(v[offset - d - 1:offset + d + 2])
+        for k in range(-d, d + 1, 2):
+            if k == -d or (k != d and v[offset + k - 1] < v[offset + k + 1]):
+                x = v[offset + k + 1]
+            else:
+                x = v[offset + k - 1] + 1
+            y = x - k
+            while x < n and y < m and a[x] == b[y]:
+                x += 1
+                y += 1
+            v[offset + k] = x
+            if x >= n and y >= m:
+                return _backtrack(history, n, m, d)
+    return None
+
+
+def _backtrack(history: List[List[int]], n: int, m: int, edits: int) -> List[Tuple[int, int, int]]:
+    blocks = []
+    x, y = n, m
+    for d in range(edits, 0, -1):
+        # history[d] holds V before step d, for k in [-d - 1, d + 1]
+        before = history[d]
+        k = x - y
+        down = k == -d or (k != d and before[k + d] < before[k + d + 2])
+        prev_k = k + 1 if down else k - 1
+        prev_x = before[prev_k + d + 1]
+        # One insertion (down) or deletion (right), then the snake to (x, y)
+        snake_x = prev_x if down else prev_x + 1
+        if x > snake_x:
+            blocks.append((snake_x, snake_x - k, x - snake_x))
+        x, y = prev_x, prev_x - prev_k
+    if x:
+        blocks.append((0, 0, x))
+    blocks.reverse()
+    return blocks
+
+
+def tokenize(text: str) -> List[str]:
+    """Word, whitespace and punctuation tokens (concatenate back to ``text``)."""
+    return _TOKEN.findall(text)
+
+
+@dataclass
+class TextDiff:
+    """How much of a text changed, and where."""
+    edit_distance: int
+    percent_preserved: float
+    changed_spans: List[Dict[str, Any]]
+    exact: bool = True  # False when the Myers diff gave up (one span, distance bounded)
+
+    def to_dict(self) -> Dict[str, Any]:
+        """JSON-friendly representation."""
+        return {
+            "edit_distance": self.edit_distance,
+            "percent_preserved": self.percent_preserved,
+            "changed_spans": self.changed_spans,
+            "exact": self.exact,
+        }
+
+
+def diff_texts(original: str, current: str, max_edits: int = MAX_EDITS) -> TextDiff:
+    """Edit distance, changed spans and share of the original preserved.
+
+    Spans are character offsets: ``original`` ``[start, end)`` became
+    ``current`` ``[start, end)``; ``op`` is ``replace``, ``delete`` or
+    ``insert``.
+    """
+    # Common prefix and suffix, compared in C
+    lo, hi = 0, min(len(original), len(current))
+    while lo < hi:
+        mid = (lo + hi + 1) // 2
+        if original[:mid] == current[:mid]:
+            lo = mid
+        else:
+            hi = mid - 1
+    prefix = lo
+    lo, hi = 0, min(len(original), len(current)) - prefix
+    while lo < hi:
+        mid = (lo + hi + 1) // 2
+        if original[len(original) - mid:] == current[len(current) - mid:]:
+            lo = mid
+        else:
+            hi = mid - 1
+    suffix = lo
+    a_text = original[prefix:len(original) - suffix]
+    b_text = current[prefix:len(current) - suffix]
+
+    a_tokens, b_tokens = tokenize(a_text), tokenize(b_text)
+    ids: Dict[str, int] = {}
+    a_ids = [ids.setdefault(t, len(ids)) for t in a_tokens]
+    b_ids = [ids.setdefault(t, len(ids)) for t in b_tokens]
+    blocks = myers_blocks(a_ids, b_ids, max_edits)
+    exact = blocks is not None
+    if blocks is None:
+        blocks = []
+    blocks.append((len(a_tokens), len(b_tokens), 0))
+
+    a_at = [0, *accumulate(len(t) for t in a_tokens)]
+    b_at = [0, *accumulate(len(t) for t in b_tokens)]
+    spans = []
+    distance = 0
+    preserved = prefix + suffix
+    i = j = 0
+    for bi, bj, size in blocks:
+        if bi > i or bj > j:
+            a_start, a_end = a_at[i], a_at[bi]
+            b_start, b_end = b_at[j], b_at[bj]
+            op = "replace" if a_end > a_start and b_end > b_start else (
+                "delete" if a_end > a_start else "insert")
+            spans.append({
+                "op": op,
+                "original": [prefix + a_start, prefix + a_end],
+                "current": [prefix + b_start, prefix + b_end],
+            })
+            if exact or max(a_end - a_start, b_end - b_start) <= MAX_SPAN_CHARS:
+                distance += levenshtein(a_text[a_start:a_end], b_text[b_start:b_end])
+            else:
+                distance += max(a_end - a_start, b_end - b_start)
+        preserved += a_at[bi + size] - a_at[bi]
+        i, j = bi + size, bj + size
+
+    percent = 100.0 if not original else round(100.0 * preserved / len(original), 1)
+    return TextDiff(distance, percent, spans, exact)
+
+
+@dataclass
+class ModificationReport:
+    """Drift between stored raw inputs and the archived texts."""
+    compared: int = 0
+    modified: int = 0
+    missing: int = 0
+    edit_distance: int = 0
+    characters: int = 0
+    preserved: float = 0.0  # characters of the originals preserved
+    by_kind: Counter = field(default_factory=Counter)  # kind -> modified texts
+    examples: List[Dict[str, Any]] = field(default_factory=list)
+    unreadable: List[str] = field(default_factory=list)
+    seconds: float = 0.0
+
+    @property
+    def percent_preserved(self) -> float:
+        """Share of all original characters preserved."""
+        return 100.0 if not self.characters else 100.0 * self.preserved / self.characters
+
+    def merge(self, other: "ModificationReport") -> None:
+        """Add another (partial) report into this one."""
+        self.compared += other.compared
+        self.modified += other.modified
+        self.missing += other.missing
+        self.edit_distance += other.edit_distance
+        self.characters += other.characters
+        self.preserved += other.preserved
+        self.by_kind.update(other.by_kind)
+        self.examples.extend(other.examples[:MAX_EXAMPLES - len(self.examples)])
+        self.unreadable.extend(other.unreadable)
+
+    def to_dict(self) -> Dict[str, Any]:
+        """JSON-friendly representation."""
+        return {
+            "compared": self.compared,
+            "modified": self.modified,
+            "missing": self.missing,
+            "edit_distance": self.edit_distance,
+            "percent_preserved": round(self.percent_preserved, 2),
+            "modified_by_kind": dict(self.by_kind),
+            "examples": self.examples,
+            "unreadable": sorted(self.unreadable),
+            "seconds": round(self.seconds, 3),
+        }
+
+
+# Archived text compared against each stored raw input, by input id prefix
+_ARCHIVED = {
+    "recall": ("recall_data", "verbatim_recall"),
+    "feynman": ("feynman_explanation", "explanation_text"),
+}
+
+
+def compare_sessions(args: Tuple[str, List[str]]) -> ModificationReport:
+    """Compare a batch of sessions' archived texts with their raw inputs."""
+    base, session_ids = args
+    ai_state = Path(base) / "ai_state"
+    blobs = BlobStore(Path(base))
+    report = ModificationReport()
+    for session_id in session_ids:
+        try:
+            with open(ai_state / "session_inputs" / f"{session_id}.json", encoding="utf-8") as f:
+                inputs = json.load(f).get("inputs", {})
+            with open(ai_state / "session_logs" / f"{session_id}.json", encoding="utf-8") as f:
+                loops = {loop.get("loop_id"): loop for loop in json.load(f).get("micro_loops") or []}
+        except FileNotFoundError:
+            continue
+        except (OSError, ValueError, AttributeError):
+            report.unreadable.append(session_id)
+            continue
+
+        for input_id, entry in inputs.items():
+            kind, _, loop_id = input_id.rpartition("_")
+            if kind not in _ARCHIVED or not loop_id.isdigit():
+                continue
+            section, key = _ARCHIVED[kind]
+            archived = ((loops.get(int(loop_id)) or {}).get(section) or {}).get(key)
+            try:
+                archived = blobs.load(archived)
+            except (OSError, ValueError):
+                report.unreadable.append(session_id)
+                continue
+            original = entry.get("raw_text") or ""
+            report.compared += 1
+            report.characters += len(original)
+            if archived is None:
+                report.missing += 1
+                continue
+            if archived == original:
+                report.preserved += len(original)
+                continue
+            diff = diff_texts(original, archived)
+            report.modified += 1
+            report.by_kind[kind] += 1
+            report.edit_distance += diff.edit_distance
+            report.preserved += len(original) * diff.percent_preserved / 100
+            if len(report.examples) < MAX_EXAMPLES:
+                report.examples.append({"session_id": session_id, "input": input_id,
+                                        "edit_distance": diff.edit_distance,
+                                        "percent_preserved": diff.percent_preserved,
+                                        "spans": len(diff.changed_spans)})
+    return report
+
+
+def _input_sessions(base_path: Path) -> Iterator[str]:
+    inputs_dir = base_path / "ai_state" / "session_inputs"
+    if not inputs_dir.is_dir():
+        return
+    with os.scandir(inputs_dir) as entries:
+        for entry in entries:
+            if entry.name.endswith(".json") and not entry.name.endswith("_parsed.json"):
+                yield entry.name[:-len(".json")]
+
+
+def compare_archive(base_path: Path, workers: Optional[int] = None,
+                    batch_size: int = BATCH_SIZE) -> ModificationReport:
+    """Quantify drift between every stored raw input and its archived text.
+
+    Args:
+        base_path: OSL directory
+        workers: Worker processes (default: CPU count; 1 compares inline)
+        batch_size: Sessions per worker task
+
+    Returns:
+        Merged report
+    """
+    started = time.perf_counter()
+    workers = workers or os.cpu_count() or 1
+    session_ids = sorted(_input_sessions(base_path))
+    tasks = [(str(base_path), session_ids[i:i + batch_size])
+             for i in range(0, len(session_ids), batch_size)]
+    report = ModificationReport()
+
+    with trace.span("audit.modifications", "validation", workers=workers):
+        if workers == 1:
+            for task in tasks:
+                report.merge(compare_sessions(task))
+        else:
+            with ProcessPoolExecutor(max_workers=workers) as pool:
+                for partial in pool.map(compare_sessions, tasks):
+                    report.merge(partial)
+
+    report.seconds = time.perf_counter() - started
+    return report
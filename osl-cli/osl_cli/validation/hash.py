@@ -7,16 +7,31 @@ content is preserved exactly as entered, with no AI modification.
 import hashlib
 import json
 from pathlib import Path
-from typing import Dict, Optional, Any
+from typing import Dict, Optional, Any, Sequence
 from datetime import datetime
 
+from osl_cli.state.merkle import archive_index
+from osl_cli.validation.diff import diff_texts
+from osl_cli.validation.markers import DEFAULT_MARKERS, compile_markers, load_markers
+
+
+# Registries of archived sessions, merged by ``osl gc``
+CONSOLIDATED_REGISTRY = "consolidated.json"
+
 
 class ContentHasher:
     """Handles SHA256 hashing and verification of content."""
     
-    def __init__(self):
-        """Initialize the content hasher."""
+    def __init__(self, markers: Optional[Sequence[str]] = None, case_sensitive: bool = True):
+        """Initialize the content hasher.
+        
+        Args:
+            markers: AI-paraphrase markers (see ``load_markers``); defaults
+                to ``DEFAULT_MARKERS``
+            case_sensitive: Whether markers match case-sensitively
+        """
         self.hash_algorithm = "sha256"
+        self.markers = compile_markers(tuple(markers or DEFAULT_MARKERS), case_sensitive)
         
     def hash_text(self, text: str) -> str:
         """Generate SHA256 hash of text content.
@@ -121,7 +136,9 @@ class ContentHasher:
             current: Current content to check
             
         Returns:
-            Dictionary with modification detection results
+            Dictionary with modification detection results; for modified
+            content also the edit distance, the changed character spans
+            and the percent of the original preserved
         """
         original_hash = self.hash_text(original)
         current_hash = self.hash_text(current)
@@ -134,8 +151,9 @@ class ContentHasher:
                 "current_hash": current_hash
             }
         
-        # Detect type of modification
+        # Detect type of modification, and measure it
         modification_analysis = self._analyze_modification(original, current)
+        diff = diff_texts(original, current)
         
         return {
             "modified": True,
@@ -143,7 +161,11 @@ class ContentHasher:
             "original_hash": original_hash,
             "current_hash": current_hash,
             "modification_type": modification_analysis["type"],
-            "details": modification_analysis["details"]
+            "details": modification_analysis["details"],
+            "markers": modification_analysis.get("markers", {}),
+            "edit_distance": diff.edit_distance,
+            "percent_preserved": diff.percent_preserved,
+            "changed_spans": diff.changed_spans
         }
     
     def _analyze_modification(self, original: str, current: str) -> Dict[str, Any]:
@@ -156,23 +178,21 @@ class ContentHasher:
         Returns:
             Analysis of modification type
         """
-        # Check for AI modification patterns
-        ai_patterns = [
-            "The user said:",
-            "They mentioned:",
-            "According to:",
-            "In summary,",
-            "To summarize,",
-            "paraphrased:",
-            "In other words:",
-        ]
-        
-        for pattern in ai_patterns:
-            if pattern in current and pattern not in original:
-                return {
-                    "type": "ai_paraphrase",
-                    "details": f"AI pattern detected: '{pattern}'"
-                }
+        # Check for AI markers added by the modification (one pass per text)
+        before = self.markers.counts(original)
+        after = self.markers.counts(current)
+        added = {
+            pattern: count
+            for pattern, count, was in zip(self.markers.patterns, after, before)
+            if count and not was
+        }
+        if added:
+            pattern = next(iter(added))
+            return {
+                "type": "ai_paraphrase",
+                "details": f"AI pattern detected: '{pattern}'",
+                "markers": added
+            }
         
         # Check for whitespace changes
         if original.strip() == current.strip():
@@ -202,6 +222,19 @@ class ContentHasher:
         }
 
 
+def load_consolidated(base_path: Path) -> Dict[str, Dict[str, Any]]:
+    """Merged registries by session ID (empty if none were merged).
+    
+    Args:
+        base_path: ai_state directory
+    """
+    try:
+        with open(base_path / "hash_registry" / CONSOLIDATED_REGISTRY) as f:
+            return json.load(f).get("sessions", {})
+    except FileNotFoundError:
+        return {}
+
+
 class HashRegistry:
     """Registry for tracking content hashes across a session."""
     
@@ -215,12 +248,15 @@ class HashRegistry:
         self.session_id = session_id
         self.base_path = base_path or Path.cwd() / "osl" / "ai_state"
         self.registry_path = self.base_path / "hash_registry" / f"{session_id}.json"
-        self.hasher = ContentHasher()
+        self.hasher = ContentHasher(*load_markers(self.base_path.parent))
         self.registry: Dict[str, Any] = self._load_registry()
     
     def _load_registry(self) -> Dict[str, Any]:
         """Load existing registry or create new one.
         
+        Registries of archived sessions may have been merged into the
+        consolidated store by ``osl gc``.
+        
         Returns:
             Registry dictionary
         """
@@ -228,6 +264,11 @@ class HashRegistry:
             with open(self.registry_path, 'r') as f:
                 return json.load(f)
         
+        if (self.base_path / "session_logs" / f"{self.session_id}.json").exists():
+            merged = load_consolidated(self.base_path).get(self.session_id)
+            if merged is not None:
+                return merged
+        
         return {
             "session_id": self.session_id,
             "created_at": datetime.now().isoformat(),
@@ -237,11 +278,19 @@ class HashRegistry:
         }
     
     def _save_registry(self) -> None:
-        """Save registry to disk."""
+        """Save registry to disk.
+        
+        ``archive_session`` records the registry in the archive index; a
+        registry saved again after that (e.g. by a verification) updates
+        the index itself.
+        """
         self.registry_path.parent.mkdir(parents=True, exist_ok=True)
         
         with open(self.registry_path, 'w') as f:
             json.dump(self.registry, f, indent=2)
+        if (self.base_path.name == "ai_state"
+                and (self.base_path / "session_logs" / f"{self.session_id}.json").exists()):
+            archive_index(self.base_path.parent).update([self.registry_path])
     
     def register_content(
         self, 
@@ -256,18 +305,26 @@ class HashRegistry:
             content: Content to register
             content_type: Type of content
             
+        Content containing AI-paraphrase markers (the directory's configured
+        set, see ``load_markers``) has the hits recorded under ``ai_markers``.
+        
         Returns:
             Hash of registered content
         """
         content_hash = self.hasher.hash_text(content)
         
-        self.registry["hashes"][content_id] = {
+        entry = {
             "hash": content_hash,
             "content_type": content_type,
             "registered_at": datetime.now().isoformat(),
             "verified": False,
             "verification_count": 0
         }
+        markers = self.hasher.markers
+        hits = {p: n for p, n in zip(markers.patterns, markers.counts(content)) if n}
+        if hits:
+            entry["ai_markers"] = hits
+        self.registry["hashes"][content_id] = entry
         
         self._save_registry()
         return content_hash
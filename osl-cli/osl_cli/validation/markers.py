@@ -0,0 +1,285 @@
+"""AI-paraphrase marker scanning.
+
+Learner content must be verbatim; phrases such as "In summary," or
+"The user said:" showing up in a recall, explanation, card or note are
+a sign an AI rewrote it. The marker set is configurable in
+``config/ai_markers.json``::
+
+    {"case_sensitive": true, "markers": ["The user said:", "In summary,"]}
+
+Markers are compiled into an Aho-Corasick automaton, so a text is
+scanned in one pass that counts hits for every marker at once, and the
+cost of scanning does not grow with the number of markers.
+"""
+
+import json
+import os
+import time
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from functools import lru_cache
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Tuple
+
+from osl_cli.perf import trace
+from osl_cli.state.blobs import BlobStore
+from osl_cli.state.cards import CardStore
+
+
+DEFAULT_MARKERS = (
+    "The user said:",
+    "They mentioned:",
+    "According to:",
+    "In summary,",
+    "To summarize,",
+    "paraphrased:",
+    "In other words:",
+)
+
+CONFIG_FILE = "ai_markers.json"
+
+# Session logs or notes handed to a worker at a time
+BATCH_SIZE = 256
+
+# Texts kept per marker as examples
+MAX_EXAMPLES = 5
+
+KINDS = ("recall", "explanation", "card", "note")
+
+
+class AhoCorasick:
+    """Aho-Corasick automaton over a set of patterns.
+
+    The trie's failure links are folded into the transitions, so scanning
+    a text is one dictionary lookup per character; a state's outputs
+    include the patterns ending at its failure states.
+    """
+
+    def __init__(self, patterns: Sequence[str], case_sensitive: bool = True):
+        self.patterns = list(dict.fromkeys(p for p in patterns if p))
+        self.case_sensitive = case_sensitive
+        trie: List[Dict[str, int]] = [{}]
+        self.outputs: List[List[int]] = [[]]
+        for index, pattern in enumerate(self.patterns):
+            state = 0
+            for ch in (pattern if case_sensitive else pattern.lower()):
+                nxt = trie[state].get(ch)
+                if nxt is None:
+                    nxt = len(trie)
+                    trie[state][ch] = nxt
+                    trie.append({})
+                    self.outputs.append([])
+                state = nxt
+            self.outputs[state].append(index)
+
+        # Breadth-first, so a state's failure target is complete before it
+        self.delta: List[Dict[str, int]] = [dict() for _ in trie]
+        self.delta[0] = dict(trie[0])
+        fail = [0] * len(trie)
+        queue = list(trie[0].values())
+        for state in queue:
+            self.delta[state] = dict(self.delta[fail[state]])
+            self.delta[state].update(trie[state])
+            for ch, child in trie[state].items():
+                fail[child] = self.delta[fail[state]].get(ch, 0) if state else 0
+                queue.append(child)
+            if state:
+                self.outputs[state] = self.outputs[state] + self.outputs[fail[state]]
+
+    def __len__(self) -> int:
+        return len(self.delta)
+
+    def counts(self, text: str) -> List[int]:
+        """Hits per pattern (in pattern order), overlapping hits included."""
+        hits = [0] * len(self.patterns)
+        if not self.patterns:
+            return hits
+        delta, outputs = self.delta, self.outputs
+        state = 0
+        for ch in (text if self.case_sensitive else text.lower()):
+            state = delta[state].get(ch, 0)
+            if outputs[state]:
+                for index in outputs[state]:
+                    hits[index] += 1
+        return hits
+
+    def scan(self, text: str) -> Dict[str, int]:
+        """Patterns found in ``text`` with their hit counts."""
+        return {self.patterns[i]: n for i, n in enumerate(self.counts(text)) if n}
+
+
+@lru_cache(maxsize=8)
+def compile_markers(markers: Tuple[str, ...] = DEFAULT_MARKERS,
+                    case_sensitive: bool = True) -> AhoCorasick:
+    """Compiled automaton for a marker set (cached per set)."""
+    return AhoCorasick(markers, case_sensitive)
+
+
+def load_markers(base_path: Path) -> Tuple[Tuple[str, ...], bool]:
+    """Marker set configured for an OSL directory.
+
+    Returns:
+        ``(markers, case_sensitive)``; the defaults if no config exists
+    """
+    try:
+        with open(base_path / "config" / CONFIG_FILE) as f:
+            config = json.load(f)
+    except FileNotFoundError:
+        return DEFAULT_MARKERS, True
+    return tuple(config.get("markers", DEFAULT_MARKERS)), bool(config.get("case_sensitive", True))
+
+
+@dataclass
+class MarkerReport:
+    """Marker hits over the learner content of an archive."""
+    markers: List[str] = field(default_factory=list)
+    scanned: Counter = field(default_factory=Counter)  # kind -> texts
+    flagged: Counter = field(default_factory=Counter)  # kind -> texts with any hit
+    hits: Counter = field(default_factory=Counter)  # marker -> hits
+    texts: Counter = field(default_factory=Counter)  # marker -> texts with a hit
+    examples: Dict[str, List[str]] = field(default_factory=dict)  # marker -> sources
+    characters: int = 0
+    unreadable: List[str] = field(default_factory=list)
+    seconds: float = 0.0
+
+    def add(self, kind: str, source: str, text: str, automaton: AhoCorasick) -> None:
+        """Scan one text."""
+        self.scanned[kind] += 1
+        self.characters += len(text)
+        found = False
+        for marker, count in zip(automaton.patterns, automaton.counts(text)):
+            if not count:
+                continue
+            found = True
+            self.hits[marker] += count
+            self.texts[marker] += 1
+            examples = self.examples.setdefault(marker, [])
+            if len(examples) < MAX_EXAMPLES:
+                examples.append(f"{kind}: {source}")
+        if found:
+            self.flagged[kind] += 1
+
+    def merge(self, other: "MarkerReport") -> None:
+        """Add another (partial) report into this one."""
+        self.scanned.update(other.scanned)
+        self.flagged.update(other.flagged)
+        self.hits.update(other.hits)
+        self.texts.update(other.texts)
+        self.characters += other.characters
+        self.unreadable.extend(other.unreadable)
+        for marker, sources in other.examples.items():
+            kept = self.examples.setdefault(marker, [])
+            kept.extend(sources[:MAX_EXAMPLES - len(kept)])
+
+    def rows(self) -> List[Dict[str, Any]]:
+        """One row per configured marker, most hits first."""
+        rows = [{
+            "marker": marker,
+            "hits": self.hits[marker],
+            "texts": self.texts[marker],
+            "examples": self.examples.get(marker, []),
+        } for marker in self.markers]
+        return sorted(rows, key=lambda row: -row["hits"])
+
+    def to_dict(self) -> Dict[str, Any]:
+        """JSON-friendly representation."""
+        return {
+            "scanned": {kind: self.scanned[kind] for kind in KINDS},
+            "flagged": {kind: self.flagged[kind] for kind in KINDS},
+            "characters": self.characters,
+            "markers": self.rows(),
+            "unreadable": sorted(self.unreadable),
+            "seconds": round(self.seconds, 3),
+        }
+
+
+def scan_files(args: Tuple[str, List[str], Tuple[str, ...], bool]) -> MarkerReport:
+    """Scan a batch of session logs or notes (runs in a worker)."""
+    kind, paths, markers, case_sensitive = args
+    automaton = compile_markers(markers, case_sensitive)
+    report = MarkerReport()
+    blobs = None
+    for path in paths:
+        try:
+            with open(path, encoding="utf-8") as f:
+                if kind == "note":
+                    report.add("note", Path(path).name, f.read(), automaton)
+                    continue
+                session = json.load(f)
+        except (OSError, ValueError):
+            report.unreadable.append(path)
+            continue
+        session_id = session.get("session_id") or Path(path).stem
+        # ai_state/session_logs/<id>.json -> OSL directory
+        blobs = blobs or BlobStore(Path(path).parent.parent.parent)
+        try:
+            for loop in session.get("micro_loops") or []:
+                source = f"{session_id} loop {loop.get('loop_id')}"
+                recall = blobs.load((loop.get("recall_data") or {}).get("verbatim_recall"))
+                if recall:
+                    report.add("recall", source, recall, automaton)
+                explanation = blobs.load((loop.get("feynman_explanation") or {}).get("explanation_text"))
+                if explanation:
+                    report.add("explanation", source, explanation, automaton)
+        except (OSError, ValueError):
+            report.unreadable.append(path)
+    return report
+
+
+def _scandir(directory: Path, suffix: str, recursive: bool = False) -> Iterator[str]:
+    if not directory.is_dir():
+        return
+    with os.scandir(directory) as entries:
+        for entry in entries:
+            if recursive and entry.is_dir():
+                yield from _scandir(Path(entry.path), suffix, recursive)
+            elif entry.name.endswith(suffix) and entry.is_file():
+                yield entry.path
+
+
+def scan_archive(base_path: Path, workers: Optional[int] = None,
+                 batch_size: int = BATCH_SIZE,
+                 markers: Optional[Sequence[str]] = None,
+                 case_sensitive: Optional[bool] = None) -> MarkerReport:
+    """Scan every recall, explanation, card and note for AI markers.
+
+    Args:
+        base_path: OSL directory
+        workers: Worker processes (default: CPU count; 1 scans inline)
+        batch_size: Files per worker task
+        markers: Marker set (default: the directory's configured set)
+        case_sensitive: Override the configured case sensitivity
+
+    Returns:
+        Merged report
+    """
+    started = time.perf_counter()
+    workers = workers or os.cpu_count() or 1
+    configured, configured_case = load_markers(base_path)
+    markers = tuple(markers) if markers is not None else configured
+    case_sensitive = configured_case if case_sensitive is None else case_sensitive
+    automaton = compile_markers(markers, case_sensitive)
+    report = MarkerReport(markers=list(automaton.patterns))
+
+    sessions = sorted(_scandir(base_path / "ai_state" / "session_logs", ".json"))
+    notes = sorted(_scandir(base_path / "obsidian", ".md", recursive=True))
+    tasks = [(kind, paths[i:i + batch_size], markers, case_sensitive)
+             for kind, paths in (("session", sessions), ("note", notes))
+             for i in range(0, len(paths), batch_size)]
+
+    with trace.span("audit.markers", "validation", workers=workers, markers=len(markers)):
+        if workers == 1:
+            for task in tasks:
+                report.merge(scan_files(task))
+        else:
+            with ProcessPoolExecutor(max_workers=workers) as pool:
+                for partial in pool.map(scan_files, tasks):
+                    report.merge(partial)
+
+        for card in CardStore(base_path).iter_raw():
+            text = f"{card.get('front', '')}\n{card.get('back', '')}"
+            report.add("card", card.get("card_id", "?"), text, automaton)
+
+    report.seconds = time.perf_counter() - started
+    return report
@@ -0,0 +1,343 @@
+"""Phase timers for the OSL workflow.
+
+Measures how long each timed phase of a micro-loop (``PHASES`` in
+:mod:`osl_cli.validation.workflow`) really took, and raises a timeout
+event when a phase outlives its limit.
+
+Durations come from monotonic clock readings. Tutor and card phases
+start in one command and end in another, so start readings are stored
+with the boot they were taken in; a reading from another boot falls back
+to wall-clock time.
+
+Running timers persist in ``ai_state/phase_timers.json``. Pending
+deadlines sit in a hashed timer wheel. The daemon advances its wheel on
+every watcher tick. Without a daemon, each invocation loads the wheel
+from the file and advances it once (lazy enforcement). Either way a
+timeout is appended to ``ai_state/phase_events.jsonl`` exactly once and
+shown on the learner's next command.
+"""
+
+import json
+import os
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, Hashable, List, Optional, Set, Tuple
+
+from osl_cli.state.locking import FileLock
+from osl_cli.state.store import write_json_atomic
+from osl_cli.validation.workflow import PHASE_LIMITS
+
+
+# Timer wheel geometry: 512 one-second slots cover 8.5 minutes per turn
+WHEEL_SLOTS = 512
+WHEEL_TICK = 1.0
+
+BOOT_ID_PATH = Path("/proc/sys/kernel/random/boot_id")
+
+_boot_id: Optional[str] = None
+
+
+def boot_id() -> str:
+    """Identifier of the current boot (monotonic readings compare within one)."""
+    global _boot_id
+    if _boot_id is None:
+        try:
+            _boot_id = BOOT_ID_PATH.read_text().strip()
+        except OSError:
+            # Approximate boot time; drifts (and so stops matching) across sleep
+            _boot_id = str(round(time.time() - time.monotonic()))
+    return _boot_id
+
+
+def stamp() -> Dict[str, Any]:
+    """A clock reading that can be stored and compared later."""
+    return {"mono": time.monotonic(), "wall": time.time(), "boot": boot_id()}
+
+
+def elapsed(start: Dict[str, Any], now: Optional[Dict[str, Any]] = None) -> float:
+    """Seconds between two readings, monotonic when both are from this boot."""
+    now = now or stamp()
+    if start.get("boot") == now["boot"]:
+        return max(0.0, now["mono"] - start["mono"])
+    return max(0.0, now["wall"] - start["wall"])
+
+
+class TimerWheel:
+    """Hashed timing wheel.
+
+    A timer hashes into the slot for its deadline tick. Advancing the
+    wheel visits only the slots of the ticks that passed (at most one full
+    turn), and each slot holds just the timers hashed there, so schedule,
+    cancel and expiry are O(1) per timer. Timers due more than a turn
+    ahead stay in their slot until their tick comes round.
+    """
+
+    def __init__(self, slots: int = WHEEL_SLOTS, tick: float = WHEEL_TICK,
+                 now: Optional[float] = None):
+        self.tick = tick
+        self.slots: List[Dict[Hashable, int]] = [{} for _ in range(slots)]
+        self.current = int((time.monotonic() if now is None else now) // tick)
+        self._slot_of: Dict[Hashable, int] = {}
+
+    def __len__(self) -> int:
+        return len(self._slot_of)
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self._slot_of
+
+    def schedule(self, key: Hashable, deadline: float) -> None:
+        """Add or move a timer to fire at ``deadline`` (monotonic seconds)."""
+        self.cancel(key)
+        # Overdue timers go in the current slot and fire on the next advance
+        due = max(int(deadline // self.tick), self.current)
+        slot = due % len(self.slots)
+        self.slots[slot][key] = due
+        self._slot_of[key] = slot
+
+    def cancel(self, key: Hashable) -> None:
+        """Remove a timer if scheduled."""
+        slot = self._slot_of.pop(key, None)
+        if slot is not None:
+            del self.slots[slot][key]
+
+    def advance(self, now: Optional[float] = None) -> List[Hashable]:
+        """Move the wheel to ``now`` and return the timers that expired."""
+        target = int((time.monotonic() if now is None else now) // self.tick)
+        n = len(self.slots)
+        ticks = range(self.current, target + 1) if target - self.current < n else range(n)
+        expired = []
+        for t in ticks:
+            slot = self.slots[t % n]
+            for key in [k for k, due in slot.items() if due <= target]:
+                del slot[key]
+                del self._slot_of[key]
+                expired.append(key)
+        self.current = max(self.current, target)
+        return expired
+
+
+def describe(event: Dict[str, Any]) -> str:
+    """One-line description of a timeout event."""
+    minutes, seconds = divmod(int(event["elapsed_s"]), 60)
+    return (f"{event['phase'].capitalize()} phase of micro-loop {event['loop_id']} "
+            f"passed its {event['limit_s'] // 60}-minute limit ({minutes}m{seconds:02d}s)")
+
+
+class PhaseTimers:
+    """Running phase timers for an OSL directory."""
+
+    def __init__(self, base_path: Optional[Path] = None):
+        """Initialize timers.
+
+        Args:
+            base_path: Base OSL directory path. Defaults to ./osl
+        """
+        self.base_path = base_path or Path.cwd() / "osl"
+        self.path = self.base_path / "ai_state" / "phase_timers.json"
+        self.events_path = self.base_path / "ai_state" / "phase_events.jsonl"
+        self.timers: Dict[str, Dict[str, Any]] = {}
+        self.wheel = TimerWheel()
+        self._changed: Set[str] = set()
+        self._removed: Set[str] = set()
+        self._signature: Optional[Tuple[int, int]] = None
+        self.refresh()
+
+    @staticmethod
+    def key(session_id: str, loop_id: int, phase: str) -> str:
+        """Timer key for one phase of one micro-loop."""
+        return f"{session_id}:{loop_id}:{phase}"
+
+    def _stat(self) -> Optional[Tuple[int, int]]:
+        try:
+            st = os.stat(self.path)
+        except FileNotFoundError:
+            return None
+        return st.st_mtime_ns, st.st_size
+
+    def _read(self) -> Dict[str, Dict[str, Any]]:
+        try:
+            with open(self.path) as f:
+                return json.load(f).get("timers", {})
+        except (FileNotFoundError, ValueError):
+            return {}
+
+    def _schedule(self, key: str, entry: Dict[str, Any], now: Dict[str, Any]) -> None:
+        if entry.get("fired"):
+            self.wheel.cancel(key)
+            return
+        remaining = entry["limit_s"] - elapsed(entry["started"], now)
+        self.wheel.schedule(key, now["mono"] + remaining)
+
+    def refresh(self) -> None:
+        """Reload timers if the file changed since it was last read."""
+        signature = self._stat()
+        if signature == self._signature:
+            return
+        self._signature = signature
+        now = stamp()
+        on_disk = self._read()
+        for key in set(self.timers) - set(on_disk) - self._changed:
+            self.timers.pop(key)
+            self.wheel.cancel(key)
+        for key, entry in on_disk.items():
+            if key in self._changed or key in self._removed:
+                continue
+            self.timers[key] = entry
+            self._schedule(key, entry, now)
+
+    def start(self, session_id: str, loop_id: int, phase: str) -> None:
+        """Start (or restart) a phase clock."""
+        key = self.key(session_id, loop_id, phase)
+        entry = {
+            "session_id": session_id,
+            "loop_id": loop_id,
+            "phase": phase,
+            "started": stamp(),
+            "limit_s": PHASE_LIMITS[phase],
+            "fired": False,
+            "notified": False,
+        }
+        self.timers[key] = entry
+        self._changed.add(key)
+        self._removed.discard(key)
+        self._schedule(key, entry, entry["started"])
+
+    def elapsed(self, session_id: str, loop_id: int, phase: str) -> Optional[float]:
+        """Seconds a running phase has taken so far, None if not running."""
+        entry = self.timers.get(self.key(session_id, loop_id, phase))
+        return None if entry is None else elapsed(entry["started"])
+
+    def stop(self, session_id: str, loop_id: int, phase: str) -> Optional[Tuple[float, bool]]:
+        """Stop a phase clock.
+
+        Returns:
+            ``(seconds, timed_out)``, or None if the phase was not running
+        """
+        key = self.key(session_id, loop_id, phase)
+        entry = self.timers.pop(key, None)
+        if entry is None:
+            return None
+        self.wheel.cancel(key)
+        self._changed.discard(key)
+        self._removed.add(key)
+
+        seconds = elapsed(entry["started"])
+        timed_out = seconds > entry["limit_s"]
+        if timed_out and not entry["fired"]:
+            self._fire(entry, seconds, "stop")
+        return seconds, timed_out
+
+    def discard_session(self, session_id: str) -> None:
+        """Drop every running timer of a session (ended early)."""
+        for key in [k for k, e in self.timers.items() if e["session_id"] == session_id]:
+            self.timers.pop(key)
+            self.wheel.cancel(key)
+            self._changed.discard(key)
+            self._removed.add(key)
+
+    def expire(self, source: str) -> List[Dict[str, Any]]:
+        """Fire timeout events for phases past their deadline.
+
+        Args:
+            source: What noticed the timeout ("daemon" or "lazy")
+
+        Returns:
+            Events fired
+        """
+        events = []
+        for key in self.wheel.advance():
+            entry = self.timers.get(key)
+            if entry is None or entry["fired"] or not self._claim(key):
+                continue
+            events.append(self._fire(entry, elapsed(entry["started"]), source))
+        return events
+
+    def _claim(self, key: str) -> bool:
+        """Mark a timer fired on disk unless another process already did."""
+        with FileLock(self.path):
+            on_disk = self._read()
+            entry = on_disk.get(key)
+            if entry is None:
+                # Not saved yet: only this process knows about it
+                return key in self._changed
+            if entry["fired"]:
+                self.timers[key] = entry
+                return False
+            entry["fired"] = True
+            write_json_atomic(self.path, {"timers": on_disk})
+        self._signature = self._stat()
+        return True
+
+    def _fire(self, entry: Dict[str, Any], seconds: float, source: str) -> Dict[str, Any]:
+        entry["fired"] = True
+        event = {
+            "ts": datetime.now().isoformat(),
+            "session_id": entry["session_id"],
+            "loop_id": entry["loop_id"],
+            "phase": entry["phase"],
+            "limit_s": entry["limit_s"],
+            "elapsed_s": round(seconds, 1),
+            "source": source,
+        }
+        self.events_path.parent.mkdir(parents=True, exist_ok=True)
+        with open(self.events_path, "a") as f:
+            f.write(json.dumps(event) + "\n")
+        return event
+
+    def take_notices(self) -> List[Dict[str, Any]]:
+        """Timeouts fired but not yet shown to the learner (marks them shown)."""
+        notices = []
+        now = stamp()
+        for key, entry in self.timers.items():
+            if entry["fired"] and not entry["notified"]:
+                entry["notified"] = True
+                self._changed.add(key)
+                notices.append({
+                    "session_id": entry["session_id"],
+                    "loop_id": entry["loop_id"],
+                    "phase": entry["phase"],
+                    "limit_s": entry["limit_s"],
+                    "elapsed_s": round(elapsed(entry["started"], now), 1),
+                })
+        return notices
+
+    def save(self) -> None:
+        """Write local changes, merged with concurrent writers' timers."""
+        if not self._changed and not self._removed:
+            return
+        with FileLock(self.path):
+            on_disk = self._read()
+            for key in self._removed:
+                on_disk.pop(key, None)
+            for key in self._changed:
+                if key in self.timers:
+                    on_disk[key] = self.timers[key]
+            if on_disk:
+                write_json_atomic(self.path, {"timers": on_disk})
+            elif self.path.exists():
+                # No file means nothing to enforce: one stat per invocation
+                self.path.unlink()
+        self._changed.clear()
+        self._removed.clear()
+        self._signature = self._stat()
+
+
+def enforce(base_path: Path) -> List[Dict[str, Any]]:
+    """Lazily fire due timeouts and collect unseen notices.
+
+    Costs one ``stat`` when no phase is running.
+
+    Args:
+        base_path: OSL directory
+
+    Returns:
+        Timeout notices to show the learner
+    """
+    if not (base_path / "ai_state" / "phase_timers.json").exists():
+        return []
+    timers = PhaseTimers(base_path)
+    timers.expire("lazy")
+    notices = timers.take_notices()
+    timers.save()
+    return notices
@@ -0,0 +1,405 @@
+"""Verification of AI-parsed fields against the learner's raw input.
+
+Per the parsing framework (``docs/OSL_Parsing_Framework.md``), every
+field the AI extracts must be found in the raw input it was parsed from.
+Raw inputs are stored in ``ai_state/session_inputs/{session_id}.json``
+(``inputs``: id -> ``raw_text``); parsed items are checked from two places:
+
+- ``recall_data.key_points`` of each micro-loop in the archived session,
+  against that loop's ``recall_{loop_id}`` input
+- ``parsed_items`` in ``ai_state/session_inputs/{session_id}_parsed.json``,
+  against the item's ``raw_text`` (or the input named by ``raw_input_id``);
+  items the learner edited are their own words and are skipped
+
+A suffix array is built once per raw input, so an exact containment
+query is a binary search, O(len(field) * log(len(input))), however many
+fields are checked. A field not found exactly is looked up case- and
+whitespace-insensitively, then within a bounded edit distance: the
+field is cut into ``k + 1`` pieces, at least one of which must occur
+exactly in any match with at most ``k`` edits; the suffix array locates
+those pieces and only the windows around them are checked with dynamic
+programming.
+"""
+
+import json
+import os
+import re
+import time
+from bisect import bisect_left
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from osl_cli.perf import trace
+
+
+# Share of a field's characters that may differ in a fuzzy match
+# (the framework's 90% similarity)
+MAX_ERROR_RATE = 0.1
+
+# Parsed-item keys that are metadata, not extracted content
+METADATA_FIELDS = frozenset({"type", "parser", "confidence"})
+
+# Input files handed to a worker at a time
+BATCH_SIZE = 128
+
+# Failing fields kept per result as examples
+MAX_EXAMPLES = 5
+
+EXACT = "exact_match"
+CASE = "case_match"
+FUZZY = "fuzzy_match"
+NOT_FOUND = "not_found"
+
+_SPACES = re.compile(r"\s+")
+
+
+def fold(text: str) -> str:
+    """Case- and whitespace-insensitive form of a text."""
+    return _SPACES.sub(" ", text.casefold()).strip()
+
+
+class SuffixArray:
+    """Suffix array of a text.
+
+    Suffixes are sorted on their first ``PREFIX`` characters, which keeps
+    memory linear while the sort runs in C. Suffixes that tie on that
+    prefix are adjacent, so a longer pattern's candidates are one range,
+    filtered with ``startswith``.
+    """
+
+    PREFIX = 32
+
+    def __init__(self, text: str):
+        self.text = text
+        keys = [text[i:i + self.PREFIX] for i in range(len(text))]
+        self.order = sorted(range(len(text)), key=keys.__getitem__)
+        self.keys = [keys[i] for i in self.order]
+
+    def __len__(self) -> int:
+        return len(self.order)
+
+    def _range(self, prefix: str) -> Tuple[int, int]:
+        """Range of sorted suffixes starting with ``prefix``."""
+        keys = self.keys
+        lo = bisect_left(keys, prefix)
+        hi, top = lo, len(keys)
+        width = len(prefix)
+        while hi < top:
+            mid = (hi + top) // 2
+            if keys[mid][:width] == prefix:
+                hi = mid + 1
+            else:
+                top = mid
+        return lo, hi
+
+    def starts(self, pattern: str) -> List[int]:
+        """Start positions of every occurrence of ``pattern``."""
+        lo, hi = self._range(pattern[:self.PREFIX])
+        found = self.order[lo:hi]
+        if len(pattern) > self.PREFIX:
+            text = self.text
+            found = [i for i in found if text.startswith(pattern, i)]
+        return sorted(found)
+
+    def __contains__(self, pattern: str) -> bool:
+        lo, hi = self._range(pattern[:self.PREFIX])
+        if len(pattern) <= self.PREFIX:
+            return hi > lo
+        text = self.text
+        return any(text.startswith(pattern, i) for i in self.order[lo:hi])
+
+
+def substring_distance(pattern: str, text: str, limit: int) -> Optional[int]:
+    """Fewest edits turning ``pattern`` into some substring of ``text``.
+
+    Sellers' algorithm: edit distance with a free start and end in the
+    text, one row per pattern character.
+
+    Returns:
+        The distance, or None if it is more than ``limit``
+    """
+    row = [0] * (len(text) + 1)
+    for i, pc in enumerate(pattern, 1):
+        prev_diag, row[0] = row[0], i
+        best = i
+        for j, tc in enumerate(text, 1):
+            cost = prev_diag if pc == tc else prev_diag + 1
+            prev_diag = row[j]
+            value = min(cost, prev_diag + 1, row[j - 1] + 1)
+            row[j] = value
+            if value < best:
+                best = value
+        if best > limit:
+            return None
+    distance = min(row)
+    return distance if distance <= limit else None
+
+
+class RawInputIndex:
+    """Containment queries against one raw input."""
+
+    def __init__(self, raw_text: str, max_error_rate: float = MAX_ERROR_RATE):
+        self.raw_text = raw_text
+        self.max_error_rate = max_error_rate
+        self.exact = SuffixArray(raw_text)
+        self._folded: Optional[SuffixArray] = None
+
+    @property
+    def folded(self) -> SuffixArray:
+        """Suffix array of the folded input, built on first use."""
+        if self._folded is None:
+            self._folded = SuffixArray(fold(self.raw_text))
+        return self._folded
+
+    def fuzzy_distance(self, pattern: str, k: int) -> Optional[int]:
+        """Edit distance of the closest match within ``k`` edits, else None."""
+        index = self.folded
+        text = index.text
+        m = len(pattern)
+        if k <= 0 or m <= k:
+            return None
+
+        # Pigeonhole: k edits leave at least one of k + 1 pieces intact
+        pieces = k + 1
+        starts = set()
+        for j in range(pieces):
+            lo, hi = j * m // pieces, (j + 1) * m // pieces
+            for pos in index.starts(pattern[lo:hi]):
+                starts.add(pos - lo)
+
+        best = None
+        for start in sorted(starts):
+            window = text[max(0, start - k):start + m + k]
+            found = substring_distance(pattern, window, k if best is None else best - 1)
+            if found is not None:
+                best = found
+                if best <= 1:
+                    break
+        return best
+
+    def verify(self, value: str) -> Tuple[str, int]:
+        """Classify one field value.
+
+        Returns:
+            ``(result, distance)``: one of ``exact_match``, ``case_match``,
+            ``fuzzy_match`` or ``not_found``, and the edit distance
+        """
+        if value in self.exact:
+            return EXACT, 0
+        folded = fold(value)
+        if folded in self.folded:
+            return CASE, 0
+        k = int(len(folded) * self.max_error_rate)
+        distance = self.fuzzy_distance(folded, k)
+        if distance is not None:
+            return FUZZY, distance
+        return NOT_FOUND, -1
+
+
+def verify_extraction(raw_text: str, parsed: Dict[str, Any],
+                      max_error_rate: float = MAX_ERROR_RATE) -> Dict[str, Any]:
+    """Verify every field of one parsed item against its raw input.
+
+    List fields are checked element by element (``key_points[0]``, ...).
+
+    Returns:
+        ``valid``, ``errors``, ``warnings`` and ``field_results`` as in
+        the parsing framework
+    """
+    index = RawInputIndex(raw_text, max_error_rate)
+    result: Dict[str, Any] = {"valid": True, "errors": [], "warnings": [], "field_results": {}}
+    for name, value in _fields(parsed):
+        outcome, distance = index.verify(value)
+        result["field_results"][name] = outcome
+        if outcome == FUZZY:
+            result["warnings"].append(f"Field '{name}' is fuzzy match ({distance} edits)")
+        elif outcome == NOT_FOUND:
+            result["valid"] = False
+            result["errors"].append({
+                "field": name,
+                "value": value,
+                "error": "Content not found in original input",
+            })
+    return result
+
+
+def _fields(parsed: Dict[str, Any]) -> Iterator[Tuple[str, str]]:
+    for name, value in parsed.items():
+        if name in METADATA_FIELDS or not value:
+            continue
+        if isinstance(value, str):
+            yield name, value
+        elif isinstance(value, list):
+            for i, item in enumerate(value):
+                if isinstance(item, str) and item:
+                    yield f"{name}[{i}]", item
+
+
+@dataclass
+class VerificationReport:
+    """Field verification results over a set of sessions."""
+    sessions: int = 0
+    sessions_failing: int = 0
+    inputs_indexed: int = 0
+    unreadable: List[str] = field(default_factory=list)
+    results: Counter = field(default_factory=Counter)  # result -> fields
+    examples: Dict[str, List[Dict[str, Any]]] = field(default_factory=dict)
+    seconds: float = 0.0
+
+    @property
+    def fields(self) -> int:
+        """Fields checked."""
+        return sum(self.results.values())
+
+    def add(self, session_id: str, source: str, name: str, value: str,
+            outcome: str, distance: int) -> None:
+        """Count one verified field."""
+        self.results[outcome] += 1
+        if outcome in (FUZZY, NOT_FOUND):
+            examples = self.examples.setdefault(outcome, [])
+            if len(examples) < MAX_EXAMPLES:
+                examples.append({"session_id": session_id, "source": source, "field": name,
+                                 "value": value, "distance": distance})
+
+    def merge(self, other: "VerificationReport") -> None:
+        """Add another (partial) report into this one."""
+        self.sessions += other.sessions
+        self.sessions_failing += other.sessions_failing
+        self.inputs_indexed += other.inputs_indexed
+        self.unreadable.extend(other.unreadable)
+        self.results.update(other.results)
+        for outcome, items in other.examples.items():
+            kept = self.examples.setdefault(outcome, [])
+            kept.extend(items[:MAX_EXAMPLES - len(kept)])
+
+    def to_dict(self) -> Dict[str, Any]:
+        """JSON-friendly representation."""
+        return {
+            "sessions": self.sessions,
+            "sessions_failing": self.sessions_failing,
+            "fields": self.fields,
+            "inputs_indexed": self.inputs_indexed,
+            "results": {key: self.results[key] for key in (EXACT, CASE, FUZZY, NOT_FOUND)},
+            "examples": self.examples,
+            "unreadable": sorted(self.unreadable),
+            "seconds": round(self.seconds, 3),
+        }
+
+
+def _load(path: Path) -> Optional[Dict[str, Any]]:
+    try:
+        with open(path, encoding="utf-8") as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return None
+
+
+def verify_session(base_path: Path, session_id: str,
+                   max_error_rate: float = MAX_ERROR_RATE) -> VerificationReport:
+    """Verify one session's parsed fields against its stored raw inputs."""
+    started = time.perf_counter()
+    ai_state = base_path / "ai_state"
+    inputs_dir = ai_state / "session_inputs"
+    report = VerificationReport(sessions=1)
+    inputs = (_load(inputs_dir / f"{session_id}.json") or {}).get("inputs", {})
+    indexes: Dict[str, RawInputIndex] = {}
+
+    def index_for(raw_text: str) -> RawInputIndex:
+        if raw_text not in indexes:
+            indexes[raw_text] = RawInputIndex(raw_text, max_error_rate)
+        return indexes[raw_text]
+
+    def check(source: str, raw_text: str, parsed: Dict[str, Any]) -> None:
+        index = index_for(raw_text)
+        for name, value in _fields(parsed):
+            outcome, distance = index.verify(value)
+            report.add(session_id, source, name, value, outcome, distance)
+
+    session = _load(ai_state / "session_logs" / f"{session_id}.json") or {}
+    for loop in session.get("micro_loops") or []:
+        recall = inputs.get(f"recall_{loop.get('loop_id')}")
+        points = (loop.get("recall_data") or {}).get("key_points")
+        if recall and points:
+            check(f"loop {loop['loop_id']}", recall["raw_text"],
+                  {"key_points": points})
+
+    parsed_items = (_load(inputs_dir / f"{session_id}_parsed.json") or {}).get("parsed_items", {})
+    for item_id, item in parsed_items.items():
+        if item.get("user_edited"):
+            continue
+        raw_text = item.get("raw_text") or inputs.get(item.get("raw_input_id"), {}).get("raw_text")
+        if raw_text:
+            check(item_id, raw_text, item.get("parsed") or {})
+
+    report.inputs_indexed = len(indexes)
+    if report.results[NOT_FOUND]:
+        report.sessions_failing = 1
+    report.seconds = time.perf_counter() - started
+    return report
+
+
+def _verify_batch(args: Tuple[str, List[str], float]) -> VerificationReport:
+    base, session_ids, max_error_rate = args
+    report = VerificationReport()
+    for session_id in session_ids:
+        try:
+            report.merge(verify_session(Path(base), session_id, max_error_rate))
+        except (OSError, ValueError, AttributeError, KeyError, TypeError):
+            report.sessions += 1
+            report.unreadable.append(session_id)
+    return report
+
+
+def iter_input_sessions(base_path: Path) -> Iterator[str]:
+    """Ids of sessions with stored raw inputs."""
+    inputs_dir = base_path / "ai_state" / "session_inputs"
+    if not inputs_dir.is_dir():
+        return
+    seen = set()
+    with os.scandir(inputs_dir) as entries:
+        for entry in entries:
+            if not entry.name.endswith(".json"):
+                continue
+            session_id = entry.name[:-len(".json")]
+            if session_id.endswith("_parsed"):
+                session_id = session_id[:-len("_parsed")]
+            if session_id not in seen:
+                seen.add(session_id)
+                yield session_id
+
+
+def verify_archive(base_path: Path, workers: Optional[int] = None,
+                   batch_size: int = BATCH_SIZE,
+                   max_error_rate: float = MAX_ERROR_RATE) -> VerificationReport:
+    """Re-verify the parsed fields of every session with stored inputs.
+
+    Args:
+        base_path: OSL directory
+        workers: Worker processes (default: CPU count; 1 checks inline)
+        batch_size: Sessions per worker task
+        max_error_rate: Share of a field's characters a fuzzy match may edit
+
+    Returns:
+        Merged report
+    """
+    started = time.perf_counter()
+    workers = workers or os.cpu_count() or 1
+    session_ids = sorted(iter_input_sessions(base_path))
+    tasks = [(str(base_path), session_ids[i:i + batch_size], max_error_rate)
+             for i in range(0, len(session_ids), batch_size)]
+    report = VerificationReport()
+
+    with trace.span("audit.inputs", "validation", workers=workers, sessions=len(session_ids)):
+        if workers == 1:
+            for task in tasks:
+                report.merge(_verify_batch(task))
+        else:
+            with ProcessPoolExecutor(max_workers=workers) as pool:
+                for partial in pool.map(_verify_batch, tasks):
+                    report.merge(partial)
+
+    report.seconds = time.perf_counter() - started
+    return report
@@ -5,7 +5,9 @@ learning methodology, ensuring no steps are skipped and prerequisites
 are met before advancing.
 """
 
-from typing import Dict, List, Optional, Any
+from array import array
+from collections import deque
+from typing import Dict, FrozenSet, Iterable, Iterator, List, Optional, Any, Sequence, Tuple, Type
 from enum import Enum
 from datetime import datetime
 
@@ -50,11 +52,13 @@ class ValidationResult:
     """Result of a validation check."""
     
     def __init__(self, valid: bool, error: Optional[str] = None, 
-                 suggestion: Optional[str] = None, allowed: Optional[List[str]] = None):
+                 suggestion: Optional[str] = None, allowed: Optional[List[str]] = None,
+                 rule: Optional[str] = None):
         self.valid = valid
         self.error = error
         self.suggestion = suggestion
         self.allowed = allowed or []
+        self.rule = rule  # Which rule failed, e.g. "transition" or "recall_words"
     
     def to_dict(self) -> Dict[str, Any]:
         """Convert to dictionary representation."""
@@ -62,10 +66,179 @@ class ValidationResult:
             "valid": self.valid,
             "error": self.error,
             "suggestion": self.suggestion,
-            "allowed": self.allowed
+            "allowed": self.allowed,
+            "rule": self.rule,
         }
 
 
+# Marker for "no path" in the compiled next-hop and distance tables
+UNREACHABLE = 0xFF
+
+# Transitions kept in a state machine's in-memory history
+HISTORY_SIZE = 256
+
+
+class TransitionTable:
+    """Transition dict compiled to integer state codes.
+
+    States are numbered by enum order. Each state's successors and its
+    transitive closure are bitmasks, so membership and reachability
+    checks are a shift and a mask. A breadth-first search from every
+    state fills flat ``n x n`` tables of shortest-path distance and
+    first hop, answering "what do I do next to get to X" by lookup.
+    """
+
+    def __init__(self, enum_cls: Type[Enum], transitions: Dict[Any, List[Any]]):
+        self.states: Tuple[Any, ...] = tuple(enum_cls)
+        self.index: Dict[Any, int] = {s: i for i, s in enumerate(self.states)}
+        self.by_name: Dict[str, int] = {s.value: i for i, s in enumerate(self.states)}
+        n = len(self.states)
+        if n >= UNREACHABLE:
+            raise ValueError(f"Too many states to compile: {n}")
+
+        # Successors in declaration order (suggestions use the first one)
+        self.ordered: Tuple[Tuple[int, ...], ...] = tuple(
+            tuple(self.index[t] for t in transitions.get(s, [])) for s in self.states
+        )
+        self.successors: Tuple[int, ...] = tuple(
+            sum(1 << t for t in targets) for targets in self.ordered
+        )
+
+        next_hop = bytearray([UNREACHABLE]) * (n * n)
+        distance = bytearray([UNREACHABLE]) * (n * n)
+        reachable = [0] * n
+        for src in range(n):
+            row = src * n
+            queue = deque()
+            for t in self.ordered[src]:
+                if distance[row + t] == UNREACHABLE:
+                    distance[row + t] = 1
+                    next_hop[row + t] = t
+                    queue.append(t)
+            while queue:
+                u = queue.popleft()
+                reachable[src] |= 1 << u
+                for v in self.ordered[u]:
+                    if distance[row + v] == UNREACHABLE:
+                        distance[row + v] = distance[row + u] + 1
+                        next_hop[row + v] = next_hop[row + u]
+                        queue.append(v)
+
+        self.size = n
+        self.reachable: Tuple[int, ...] = tuple(reachable)
+        self._next_hop = bytes(next_hop)
+        self._distance = bytes(distance)
+
+    def mask(self, states: Iterable[Any]) -> int:
+        """Bitmask of the given states' codes."""
+        return sum(1 << self.index[s] for s in set(states))
+
+    def allowed(self, src: int, dst: int) -> bool:
+        """Whether ``dst`` is a direct successor of ``src``."""
+        return (self.successors[src] >> dst) & 1 == 1
+
+    def reaches(self, src: int, dst: int) -> bool:
+        """Whether ``dst`` can be reached from ``src`` in one or more steps."""
+        return (self.reachable[src] >> dst) & 1 == 1
+
+    def next_hop(self, src: int, dst: int) -> Optional[int]:
+        """First state on a shortest path from ``src`` to ``dst``."""
+        hop = self._next_hop[src * self.size + dst]
+        return None if hop == UNREACHABLE else hop
+
+    def distance(self, src: int, dst: int) -> Optional[int]:
+        """Number of transitions on a shortest path, None if unreachable."""
+        steps = self._distance[src * self.size + dst]
+        return None if steps == UNREACHABLE else steps
+
+    def path(self, src: int, dst: int) -> List[int]:
+        """Shortest path from ``src`` to ``dst``, excluding ``src``."""
+        path: List[int] = []
+        while src != dst:
+            hop = self.next_hop(src, dst)
+            if hop is None:
+                return []
+            path.append(hop)
+            src = hop
+        return path
+
+
+class TransitionHistory:
+    """Fixed-size ring buffer of encoded transitions.
+
+    Each entry is one 16-bit code (``from << 8 | to``) and one float
+    timestamp; once full, the oldest entries are overwritten.
+    """
+
+    def __init__(self, capacity: int = HISTORY_SIZE):
+        self.capacity = capacity
+        self._codes = array("H", [0]) * capacity
+        self._times = array("d", [0.0]) * capacity
+        self._next = 0
+        self.total = 0
+
+    def append(self, src: int, dst: int, timestamp: Optional[float] = None) -> None:
+        """Record one transition."""
+        self._codes[self._next] = (src << 8) | dst
+        self._times[self._next] = datetime.now().timestamp() if timestamp is None else timestamp
+        self._next = (self._next + 1) % self.capacity
+        self.total += 1
+
+    def __len__(self) -> int:
+        return min(self.total, self.capacity)
+
+    def __iter__(self) -> Iterator[Tuple[int, int, float]]:
+        """Yield ``(from, to, timestamp)`` oldest first."""
+        start = self._next if self.total > self.capacity else 0
+        for i in range(len(self)):
+            slot = (start + i) % self.capacity
+            code = self._codes[slot]
+            yield code >> 8, code & 0xFF, self._times[slot]
+
+    def decode(self, states: Sequence[Enum]) -> List[Dict[str, Any]]:
+        """Entries as ``{"from", "to", "timestamp"}`` dicts."""
+        return [
+            {
+                "from": states[src].value,
+                "to": states[dst].value,
+                "timestamp": datetime.fromtimestamp(ts).isoformat(),
+            }
+            for src, dst, ts in self
+        ]
+
+
+# What the learner does on entering a state
+ACTIONS: Dict[SessionState, str] = {
+    SessionState.READING: "Read the next chunk (osl microloop start)",
+    SessionState.RECALL_ACTIVE: "Start free recall (osl microloop complete)",
+    SessionState.FEYNMAN_ACTIVE: "Begin Feynman explanation (osl microloop complete)",
+    SessionState.TUTOR_QA_ACTIVE: "Answer the AI tutor's questions",
+    SessionState.CARDS_ACTIVE: "Create flashcards (osl flashcard create)",
+    SessionState.NOTES_ACTIVE: "Write permanent notes in the vault",
+    SessionState.SESSION_END: "End session (osl session end)",
+}
+
+
+# Completion states whose inputs are collected outside the CLI (the AI
+# tutor conversation, notes written in the vault); the engine may pass
+# through them without a context
+DEFERRED_STATES: FrozenSet[SessionState] = frozenset({
+    SessionState.TUTOR_QA_COMPLETE,
+    SessionState.NOTES_COMPLETE,
+})
+
+
+def _describe(state: SessionState) -> str:
+    return ACTIONS.get(state, f"Proceed to {state.value.replace('_', ' ').lower()}")
+
+
+def _missing(value: Any) -> bool:
+    """Whether a required input is absent (zero counts are valid inputs)."""
+    if isinstance(value, (int, float)):
+        return False
+    return not value
+
+
 class OSLStateMachine:
     """Enforces valid OSL workflow transitions.
     
@@ -129,9 +302,30 @@ class OSLStateMachine:
         SessionState.CARDS_ACTIVE: 600,  # 10 minutes
     }
     
-    def __init__(self):
-        """Initialize the state machine."""
-        self.transition_history: List[Dict[str, Any]] = []
+    # Compiled form of VALID_TRANSITIONS (integer codes, bitmasks)
+    TABLE = TransitionTable(SessionState, VALID_TRANSITIONS)
+    
+    # State-code bitmasks: has required inputs, may defer them, has minimums
+    INPUT_MASK = TABLE.mask(REQUIRED_INPUTS)
+    DEFERRED_MASK = TABLE.mask(DEFERRED_STATES)
+    MINIMUM_MASK = TABLE.mask([
+        SessionState.RECALL_COMPLETE,
+        SessionState.FEYNMAN_COMPLETE,
+        SessionState.CARDS_COMPLETE,
+    ])
+    
+    def __init__(self, history_size: int = HISTORY_SIZE):
+        """Initialize the state machine.
+        
+        Args:
+            history_size: Transitions kept in the in-memory history
+        """
+        self.history = TransitionHistory(history_size)
+    
+    @property
+    def transition_history(self) -> List[Dict[str, Any]]:
+        """Recent successful transitions, oldest first."""
+        return self.history.decode(self.TABLE.states)
     
     def validate_transition(
         self, 
@@ -149,14 +343,36 @@ class OSLStateMachine:
         Returns:
             ValidationResult indicating if transition is valid
         """
-        # Check if transition is allowed
-        allowed_transitions = self.VALID_TRANSITIONS.get(from_state, [])
+        result = self.check_transition(from_state, to_state, context)
+        if result.valid:
+            self.record(from_state, to_state)
+        return result
+    
+    def check_transition(
+        self, 
+        from_state: SessionState, 
+        to_state: SessionState, 
+        context: Optional[Dict[str, Any]] = None
+    ) -> ValidationResult:
+        """Validate a transition without recording it in the history.
+        
+        Args:
+            from_state: Current state
+            to_state: Desired next state
+            context: Optional context with required inputs
+            
+        Returns:
+            ValidationResult indicating if transition is valid
+        """
+        table = self.TABLE
+        src, dst = table.index[from_state], table.index[to_state]
         
-        if to_state not in allowed_transitions:
+        if not table.allowed(src, dst):
             return ValidationResult(
                 valid=False,
                 error=f"Invalid transition: {from_state.value} -> {to_state.value}",
-                allowed=[s.value for s in allowed_transitions],
+                rule="transition",
+                allowed=[table.states[t].value for t in table.ordered[src]],
                 suggestion=self._get_transition_suggestion(from_state, to_state)
             )
         
@@ -172,16 +388,67 @@ class OSLStateMachine:
             if not validation.valid:
                 return validation
         
-        # Record successful validation
-        self.transition_history.append({
-            "from": from_state.value,
-            "to": to_state.value,
-            "timestamp": datetime.now().isoformat(),
-            "context": context
-        })
-        
         return ValidationResult(valid=True)
     
+    def violations(self, src: int, dst: int,
+                   context: Optional[Dict[str, Any]] = None) -> List[ValidationResult]:
+        """Every rule a recorded transition breaks, without short-circuiting.
+        
+        Takes ``TABLE`` state codes so bulk replays stay on the compiled
+        path. Unlike :meth:`check_transition`, a missing context on a
+        state with required inputs counts as missing inputs (except for
+        ``DEFERRED_STATES``), since a recorded transition should carry
+        what it was validated with.
+        
+        Args:
+            src: Code of the state left
+            dst: Code of the state entered
+            context: Context recorded with the transition
+            
+        Returns:
+            Failed results, empty if the transition conforms
+        """
+        table = self.TABLE
+        failures = []
+        if not table.allowed(src, dst):
+            failures.append(self.check_transition(table.states[src], table.states[dst]))
+        
+        bit = 1 << dst
+        if not self.INPUT_MASK & bit or (context is None and self.DEFERRED_MASK & bit):
+            return failures
+        
+        state = table.states[dst]
+        result = self._validate_required_inputs(state, context or {})
+        if not result.valid:
+            failures.append(result)
+        elif context and self.MINIMUM_MASK & bit:
+            result = self._validate_minimum_requirements(state, context)
+            if not result.valid:
+                failures.append(result)
+        return failures
+    
+    def record(self, from_state: SessionState, to_state: SessionState) -> None:
+        """Append a validated transition to the history ring buffer."""
+        self.history.append(self.TABLE.index[from_state], self.TABLE.index[to_state])
+    
+    def can_reach(self, from_state: SessionState, to_state: SessionState) -> bool:
+        """Whether ``to_state`` is reachable from ``from_state``."""
+        return self.TABLE.reaches(self.TABLE.index[from_state], self.TABLE.index[to_state])
+    
+    def shortest_path(self, from_state: SessionState, to_state: SessionState) -> List[SessionState]:
+        """States on the shortest route to ``to_state``, excluding the start.
+        
+        Returns:
+            The path, empty if unreachable or already there
+        """
+        table = self.TABLE
+        return [table.states[i] for i in table.path(table.index[from_state], table.index[to_state])]
+    
+    def next_step(self, from_state: SessionState, goal: SessionState) -> Optional[SessionState]:
+        """First state to enter on the way to ``goal``, None if unreachable."""
+        hop = self.TABLE.next_hop(self.TABLE.index[from_state], self.TABLE.index[goal])
+        return None if hop is None else self.TABLE.states[hop]
+    
     def _validate_required_inputs(
         self, 
         state: SessionState, 
@@ -197,12 +464,13 @@ class OSLStateMachine:
             ValidationResult
         """
         required = self.REQUIRED_INPUTS.get(state, [])
-        missing = [r for r in required if not context.get(r)]
+        missing = [r for r in required if _missing(context.get(r))]
         
         if missing:
             return ValidationResult(
                 valid=False,
                 error=f"Missing required inputs for {state.value}: {missing}",
+                rule="required_inputs",
                 suggestion=f"Provide the following before entering {state.value}: {', '.join(missing)}"
             )
         
@@ -232,6 +500,7 @@ class OSLStateMachine:
                 return ValidationResult(
                     valid=False,
                     error=f"Recall text too short: {word_count} words (minimum: {min_words})",
+                    rule="recall_words",
                     suggestion=f"Continue recall until you have at least {min_words} words"
                 )
         
@@ -245,6 +514,7 @@ class OSLStateMachine:
                 return ValidationResult(
                     valid=False,
                     error=f"Explanation too brief: {len(sentences)} sentences (minimum: {min_sentences})",
+                    rule="feynman_sentences",
                     suggestion=f"Expand your explanation to at least {min_sentences} complete sentences"
                 )
         
@@ -258,6 +528,7 @@ class OSLStateMachine:
                 return ValidationResult(
                     valid=False,
                     error=f"Too many cards created: {cards_created} (maximum: {max_cards})",
+                    rule="max_cards_per_session",
                     suggestion=f"Limit cards to {max_cards} per session"
                 )
             
@@ -269,7 +540,12 @@ class OSLStateMachine:
                     return ValidationResult(
                         valid=False,
                         error=f"Insufficient cards from gaps: {miss_ratio:.0%} (minimum: {required_ratio:.0%})",
-                        suggestion="Create more cards from identified knowledge gaps"
+                        rule="cards_from_misses_ratio",
+                        suggestion=(
+                            "Create more cards from identified knowledge gaps "
+                            "(osl flashcard create), or end the session with "
+                            "osl session end and confirm ending it anyway"
+                        )
                     )
         
         return ValidationResult(valid=True)
@@ -296,9 +572,13 @@ class OSLStateMachine:
         elif to_state == SessionState.TUTOR_QA_PENDING and from_state.value.startswith("RECALL"):
             return "Complete both recall and Feynman explanation before AI questions"
         else:
-            next_states = self.VALID_TRANSITIONS.get(from_state, [])
-            if next_states:
-                return f"Next valid action: {next_states[0].value.replace('_', ' ').lower()}"
+            # Head for the attempted state if it is ahead, else the default next step
+            hop = self.next_step(from_state, to_state)
+            if hop is None:
+                successors = self.TABLE.ordered[self.TABLE.index[from_state]]
+                hop = self.TABLE.states[successors[0]] if successors else None
+            if hop is not None:
+                return f"Next valid action: {hop.value.replace('_', ' ').lower()}"
             return f"Complete {from_state.value.replace('_', ' ').lower()} activities first"
     
     def get_next_actions(self, current_state: SessionState) -> List[str]:
@@ -310,28 +590,30 @@ class OSLStateMachine:
         Returns:
             List of valid next action descriptions
         """
-        next_states = self.VALID_TRANSITIONS.get(current_state, [])
-        
-        actions = []
-        for state in next_states:
-            if state == SessionState.RECALL_ACTIVE:
-                actions.append("Start free recall (osl recall start)")
-            elif state == SessionState.FEYNMAN_ACTIVE:
-                actions.append("Begin Feynman explanation (osl feynman start)")
-            elif state == SessionState.TUTOR_QA_ACTIVE:
-                actions.append("Get AI questions (osl tutor questions)")
-            elif state == SessionState.CARDS_ACTIVE:
-                actions.append("Create flashcards (osl flashcard create)")
-            elif state == SessionState.NOTES_ACTIVE:
-                actions.append("Create permanent notes (osl notes create)")
-            elif state == SessionState.SESSION_END:
-                actions.append("End session (osl session end)")
-            elif state == SessionState.READING:
-                actions.append("Continue reading (osl reading continue)")
-            else:
-                actions.append(f"Proceed to {state.value.replace('_', ' ').lower()}")
-        
-        return actions
+        table = self.TABLE
+        return [_describe(table.states[t]) for t in table.ordered[table.index[current_state]]]
+    
+    def next_action(self, current_state: SessionState) -> Optional[str]:
+        """The next thing the learner actually does from ``current_state``.
+        
+        Follows the default route past bookkeeping states (``*_PENDING``
+        and friends) to the first state that has a learner action.
+        
+        Args:
+            current_state: Current state
+            
+        Returns:
+            Action description, None at the end of the workflow
+        """
+        table = self.TABLE
+        state = table.index[current_state]
+        for _ in range(table.size):
+            if not table.ordered[state]:
+                return None
+            state = table.ordered[state][0]
+            if table.states[state] in ACTIONS:
+                return ACTIONS[table.states[state]]
+        return None
     
     def validate_timeout(
         self, 
@@ -357,6 +639,7 @@ class OSLStateMachine:
             return ValidationResult(
                 valid=False,
                 error=f"State {state.value} timeout exceeded: {elapsed:.0f}s > {timeout_seconds}s",
+                rule="timeout",
                 suggestion="Complete the current activity or save progress"
             )
         
@@ -374,6 +657,8 @@ class GovernanceStateMachine:
         GovernanceState.RECOVERY: [GovernanceState.NORMAL, GovernanceState.WARNING],
     }
     
+    TABLE = TransitionTable(GovernanceState, VALID_TRANSITIONS)
+    
     def validate_transition(
         self, 
         from_state: GovernanceState, 
@@ -390,13 +675,15 @@ class GovernanceStateMachine:
         Returns:
             ValidationResult
         """
-        allowed = self.VALID_TRANSITIONS.get(from_state, [])
+        table = self.TABLE
+        src, dst = table.index[from_state], table.index[to_state]
         
-        if to_state not in allowed:
+        if not table.allowed(src, dst):
             return ValidationResult(
                 valid=False,
                 error=f"Invalid governance transition: {from_state.value} -> {to_state.value}",
-                allowed=[s.value for s in allowed],
+                rule="transition",
+                allowed=[table.states[t].value for t in table.ordered[src]],
                 suggestion=self._get_governance_suggestion(from_state, to_state)
             )
         
@@ -421,4 +708,192 @@ class GovernanceStateMachine:
         elif from_state == GovernanceState.REMEDIATION and to_state == GovernanceState.NORMAL:
             return "Complete remediation activities and enter RECOVERY first"
         else:
-            return "Follow the governance recovery process"
\ No newline at end of file
+            return "Follow the governance recovery process"
+
+
+# Session ``state`` values written before the workflow engine existed
+LEGACY_STATES: Dict[str, SessionState] = {
+    "RECALL": SessionState.RECALL_ACTIVE,
+    "EXPLAIN": SessionState.FEYNMAN_ACTIVE,
+    "FEEDBACK": SessionState.TUTOR_QA_PENDING,
+    "FLASHCARD": SessionState.CARDS_ACTIVE,
+}
+
+
+# Timed phases of a micro-loop: (state that starts it, state that ends it).
+# Tutor Q&A happens outside the CLI as soon as ``microloop complete`` hands
+# over, so its clock starts at TUTOR_QA_PENDING.
+PHASES: Dict[str, Tuple[SessionState, SessionState]] = {
+    "recall": (SessionState.RECALL_ACTIVE, SessionState.RECALL_COMPLETE),
+    "feynman": (SessionState.FEYNMAN_ACTIVE, SessionState.FEYNMAN_COMPLETE),
+    "tutor": (SessionState.TUTOR_QA_PENDING, SessionState.TUTOR_QA_COMPLETE),
+    "cards": (SessionState.CARDS_ACTIVE, SessionState.CARDS_COMPLETE),
+}
+
+# Phase limits, from the timeouts of each phase's active state
+PHASE_LIMITS: Dict[str, int] = {
+    "recall": OSLStateMachine.STATE_TIMEOUTS[SessionState.RECALL_ACTIVE],
+    "feynman": OSLStateMachine.STATE_TIMEOUTS[SessionState.FEYNMAN_ACTIVE],
+    "tutor": OSLStateMachine.STATE_TIMEOUTS[SessionState.TUTOR_QA_ACTIVE],
+    "cards": OSLStateMachine.STATE_TIMEOUTS[SessionState.CARDS_ACTIVE],
+}
+
+_PHASE_STARTS = {start: phase for phase, (start, _) in PHASES.items()}
+_PHASE_ENDS = {end: phase for phase, (_, end) in PHASES.items()}
+
+
+class WorkflowEngine:
+    """Moves a session through the OSL workflow.
+    
+    The one place the ``microloop``, ``flashcard`` and ``session``
+    commands change ``session.state``. A command names the state it is
+    about to enter; the engine walks the compiled shortest path there,
+    validating every hop, and refuses if that would pass a completion
+    state without its inputs. Hops are appended to
+    ``session.state_history`` only once the whole path has validated.
+    
+    With ``timers`` (a :class:`~osl_cli.validation.timers.PhaseTimers`),
+    entering and leaving the states in ``PHASES`` starts and stops the
+    phase clocks, and the measured durations are written to the current
+    micro-loop.
+    """
+    
+    def __init__(self, machine: Optional[OSLStateMachine] = None, timers: Any = None):
+        self.machine = machine or OSLStateMachine()
+        self.timers = timers
+    
+    def current(self, session: Any) -> SessionState:
+        """The session's workflow state (legacy names mapped)."""
+        if session.state in LEGACY_STATES:
+            return LEGACY_STATES[session.state]
+        return SessionState(session.state)
+    
+    def begin(self, session: Any, context: Optional[Dict[str, Any]] = None) -> ValidationResult:
+        """Record a new session entering ``SESSION_INIT``.
+        
+        Args:
+            session: Newly created session
+            context: Defaults to the session's book id and title
+        """
+        context = context or {"book_id": session.book_id, "book_title": session.book_title}
+        result = self.machine.check_transition(SessionState.NONE, SessionState.SESSION_INIT, context)
+        if result.valid:
+            self._apply(session, [(SessionState.NONE, SessionState.SESSION_INIT, context)])
+        return result
+    
+    def advance(
+        self,
+        session: Any,
+        target: SessionState,
+        context: Optional[Dict[str, Any]] = None,
+        along: Optional[Dict[SessionState, Dict[str, Any]]] = None,
+    ) -> ValidationResult:
+        """Move the session to ``target`` along the shortest valid path.
+        
+        Args:
+            session: Session to update in place (not saved)
+            target: State the command is entering
+            context: Inputs for ``target``
+            along: Inputs for completion states passed on the way
+            
+        Returns:
+            ValidationResult; the session is unchanged if invalid
+        """
+        machine = self.machine
+        current = self.current(session)
+        if current == target:
+            if self.timers is not None and session.micro_loops:
+                self._resume_phase(session, target)
+            return ValidationResult(valid=True)
+        
+        path = machine.shortest_path(current, target)
+        if not path:
+            return machine.check_transition(current, target, context)
+        
+        along = along or {}
+        hops = []
+        prev = current
+        for state in path:
+            ctx = context if state == target else along.get(state)
+            if ctx is None and state in machine.REQUIRED_INPUTS and state not in DEFERRED_STATES:
+                return ValidationResult(
+                    valid=False,
+                    error=f"Cannot skip {state.value} on the way to {target.value}",
+                    rule="required_inputs",
+                    suggestion=machine.next_action(current) or machine._get_transition_suggestion(current, target),
+                    allowed=[s.value for s in machine.VALID_TRANSITIONS.get(current, [])],
+                )
+            result = machine.check_transition(prev, state, ctx)
+            if not result.valid:
+                return result
+            hops.append((prev, state, ctx))
+            prev = state
+        
+        self._apply(session, hops)
+        return ValidationResult(valid=True)
+    
+    def check_inputs(self, state: SessionState, context: Dict[str, Any]) -> ValidationResult:
+        """Check inputs against ``state``'s minimums before advancing.
+        
+        Lets a command re-prompt while it still holds the learner's input,
+        rather than discovering the shortfall in ``advance``.
+        """
+        return self.machine._validate_minimum_requirements(state, context)
+    
+    def loop_inputs(self, session: Any) -> Dict[SessionState, Dict[str, Any]]:
+        """Inputs that close the current micro-loop's flashcard step."""
+        if not session.micro_loops:
+            return {}
+        cards = session.micro_loops[-1].flashcards_created
+        return {SessionState.CARDS_COMPLETE: {
+            "cards_created": len(cards),
+            "from_misses": sum(1 for card in cards if card.created_from_gap),
+        }}
+    
+    def force(self, session: Any, target: SessionState, reason: str) -> None:
+        """Jump straight to ``target``, recording why the workflow was cut short."""
+        self._apply(session, [(self.current(session), target, {"forced": True, "reason": reason})])
+        if self.timers is not None:
+            self.timers.discard_session(session.session_id)
+    
+    def next_action(self, session: Any) -> Optional[str]:
+        """What the learner should do next in this session."""
+        return self.machine.next_action(self.current(session))
+    
+    def _apply(self, session: Any,
+               hops: List[Tuple[SessionState, SessionState, Optional[Dict[str, Any]]]]) -> None:
+        timestamp = datetime.now().isoformat()
+        for src, dst, ctx in hops:
+            self.machine.record(src, dst)
+            session.state_history.append({
+                "from": src.value,
+                "to": dst.value,
+                "timestamp": timestamp,
+                "context": ctx,
+            })
+            if self.timers is not None and session.micro_loops:
+                self._time_phase(session, dst)
+        session.state = hops[-1][1].value
+    
+    def _resume_phase(self, session: Any, state: SessionState) -> None:
+        # Re-entering a phase whose clock is not running (a session saved
+        # before phase timing, or a timer file left on another machine)
+        if state not in _PHASE_STARTS:
+            return
+        loop = session.micro_loops[-1]
+        phase = _PHASE_STARTS[state]
+        if self.timers.elapsed(session.session_id, loop.loop_id, phase) is None:
+            self.timers.start(session.session_id, loop.loop_id, phase)
+    
+    def _time_phase(self, session: Any, state: SessionState) -> None:
+        loop = session.micro_loops[-1]
+        if state in _PHASE_STARTS:
+            self.timers.start(session.session_id, loop.loop_id, _PHASE_STARTS[state])
+        elif state in _PHASE_ENDS:
+            phase = _PHASE_ENDS[state]
+            stopped = self.timers.stop(session.session_id, loop.loop_id, phase)
+            if stopped is not None:
+                seconds, timed_out = stopped
+                loop.phase_durations[phase] = round(seconds, 1)
+                if timed_out and phase not in loop.timed_out:
+                    loop.timed_out.append(phase)
@@ -0,0 +1,101 @@
+"""Tests for deduplicating backups."""
+
+import random
+import tempfile
+import unittest
+from pathlib import Path
+
+from osl_cli.state.backup import MAX_CHUNK, MIN_CHUNK, BackupRepository, chunk_ends
+
+
+class TestChunking(unittest.TestCase):
+    """Test content-defined chunk boundaries."""
+
+    def test_insert_only_moves_nearby_boundaries(self):
+        """Test chunks after an insertion keep their boundaries."""
+        rng = random.Random(3)
+        data = bytes(rng.getrandbits(8) for _ in range(200_000))
+        ends = chunk_ends(data)
+        self.assertEqual(ends[-1], len(data))
+        sizes = [b - a for a, b in zip([0] + ends, ends)]
+        self.assertTrue(all(MIN_CHUNK < s <= MAX_CHUNK for s in sizes[:-1]))
+
+        edited = data[:1000] + b"inserted" + data[1000:]
+        shifted = {end - 8 for end in chunk_ends(edited)}
+        self.assertGreaterEqual(len(shifted & set(ends)), len(ends) - 1)
+
+        self.assertEqual(chunk_ends(b""), [])
+        self.assertEqual(chunk_ends(b"short"), [5])
+
+
+class TestBackupRepository(unittest.TestCase):
+    """Test snapshots and restores of an OSL directory."""
+
+    def setUp(self):
+        """Create a small OSL directory."""
+        self.base = Path(tempfile.mkdtemp()) / "osl"
+        (self.base / "ai_state").mkdir(parents=True)
+        self.log = self.base / "ai_state" / "review_log.jsonl"
+        self.log.write_text("".join(f'{{"card_id": "c{i}", "grade": 3}}\n' for i in range(5000)))
+        (self.base / "ai_state" / "coach_state.json").write_text('{"revision": 1}')
+        (self.base / "ai_state" / "coach_state.bak").write_text('{"revision": 0}')
+        self.repo = BackupRepository(self.base)
+
+    def test_snapshots_store_only_new_chunks(self):
+        """Test unchanged files and repeated snapshots add nothing."""
+        first = self.repo.create(note="first")
+        self.assertEqual(first.files, 2)  # .bak files are left out
+        self.assertLess(first.stored_bytes, first.new_bytes)
+
+        again = self.repo.create()
+        self.assertTrue(again.unchanged)
+        self.assertEqual(again.snapshot, first.snapshot)
+
+        with open(self.log, "a") as f:
+            f.write('{"card_id": "new", "grade": 4}\n')
+        appended = self.repo.create()
+        self.assertFalse(appended.unchanged)
+        self.assertEqual(appended.reused_files, 1)
+        self.assertEqual(appended.new_chunks, 1)
+        self.assertEqual([s["id"] for s in self.repo.snapshots()], [first.snapshot, appended.snapshot])
+
+    def test_restore_in_place_and_elsewhere(self):
+        """Test restore rewrites differing files and can be undone."""
+        original = self.log.read_bytes()
+        first = self.repo.create()
+        self.log.write_text("replaced\n")
+        (self.base / "ai_state" / "extra.json").write_text("{}")
+
+        report = self.repo.restore(first.snapshot)
+        self.assertEqual(report.restored, ["ai_state/review_log.jsonl"])
+        self.assertEqual(report.removed, ["ai_state/extra.json"])
+        self.assertEqual(self.log.read_bytes(), original)
+        self.assertTrue((self.base / "ai_state" / "coach_state.bak").exists())
+        self.assertEqual(self.repo.resolve("latest"), report.safety_snapshot)
+
+        again = self.repo.restore(first.snapshot, target=self.base)
+        self.assertEqual(again.restored, [])
+
+        undo = self.repo.restore(report.safety_snapshot)
+        self.assertEqual(self.log.read_text(), "replaced\n")
+        self.assertEqual(undo.restored, ["ai_state/extra.json", "ai_state/review_log.jsonl"])
+
+        elsewhere = Path(tempfile.mkdtemp()) / "copy"
+        self.repo.restore(first.snapshot, target=elsewhere, paths=["ai_state/review_log.jsonl"])
+        self.assertEqual((elsewhere / "ai_state" / "review_log.jsonl").read_bytes(), original)
+        self.assertFalse((elsewhere / "ai_state" / "coach_state.json").exists())
+
+    def test_resolve(self):
+        """Test snapshot references."""
+        first = self.repo.create()
+        created = self.repo.snapshots()[0]["created_at"]
+        self.assertEqual(self.repo.resolve(first.snapshot[:8]), first.snapshot)
+        self.assertEqual(self.repo.resolve(created[:10]), first.snapshot)
+        with self.assertRaises(ValueError):
+            self.repo.resolve("2001-01-01")
+        with self.assertRaises(ValueError):
+            self.repo.resolve("nope")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,84 @@
+"""Tests for the OSL daemon, thin client and state cache."""
+
+import json
+import os
+import tempfile
+import unittest
+from pathlib import Path
+
+from pydantic import BaseModel
+
+from osl_cli.client import _forwardable, socket_path
+from osl_cli.daemon.server import OSLDaemon
+from osl_cli.state.cache import StateCache
+
+
+class Counter(BaseModel):
+    """Tiny model standing in for a state file."""
+
+    value: int
+
+
+class TestStateCache(unittest.TestCase):
+    """Test the daemon's validated-model cache."""
+
+    def setUp(self):
+        """Set up test environment."""
+        self.path = Path(tempfile.mkdtemp()) / "state.json"
+        self.path.write_text(json.dumps({"value": 1}))
+        self.reads = 0
+
+    def _read(self) -> Counter:
+        self.reads += 1
+        return Counter.model_validate(json.loads(self.path.read_text()))
+
+    def test_hits_return_independent_copies(self):
+        """Test repeated loads skip the file and never share objects."""
+        cache = StateCache()
+        first = cache.load(self.path, self._read)
+        first.value = 99
+        second = cache.load(self.path, self._read)
+
+        self.assertEqual(second.value, 1)
+        self.assertEqual(self.reads, 1)
+        self.assertEqual(cache.stats()["hits"], 1)
+
+    def test_external_edit_is_reloaded(self):
+        """Test a changed stat signature triggers a reload."""
+        cache = StateCache()
+        cache.load(self.path, self._read)
+
+        self.path.write_text(json.dumps({"value": 22}))
+        os.utime(self.path, ns=(0, 0))
+        self.assertEqual(cache.refresh_stale(), 1)
+        self.assertEqual(cache.load(self.path, self._read).value, 22)
+        self.assertEqual(self.reads, 2)
+
+
+class TestDaemonProtocol(unittest.TestCase):
+    """Test request routing without a socket."""
+
+    def test_only_read_only_commands_forward(self):
+        """Test interactive and help invocations stay local."""
+        self.assertTrue(_forwardable(["state", "show"]))
+        self.assertTrue(_forwardable(["review", "due"]))
+        self.assertFalse(_forwardable(["review", "start"]))
+        self.assertFalse(_forwardable(["governance", "tune"]))
+        self.assertFalse(_forwardable(["state", "--help"]))
+        self.assertFalse(_forwardable(["--profile", "state"]))
+
+    def test_socket_path_is_per_directory(self):
+        """Test two OSL directories never share a socket."""
+        root = Path(tempfile.mkdtemp())
+        self.assertNotEqual(socket_path(root / "a" / "osl"), socket_path(root / "b" / "osl"))
+
+    def test_foreign_cwd_falls_back(self):
+        """Test requests from another project are run locally."""
+        daemon = OSLDaemon(Path(tempfile.mkdtemp()) / "osl")
+        reply = daemon.handle({"op": "run", "argv": ["state"], "cwd": tempfile.mkdtemp()})
+        self.assertTrue(reply["fallback"])
+        self.assertEqual(daemon.handle({"op": "ping"})["requests"], 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,73 @@
+"""Tests for the synthetic history generator."""
+
+import json
+import tempfile
+import unittest
+from datetime import datetime
+from pathlib import Path
+
+from osl_cli.dev.synth import HistoryGenerator, parse_scale
+from osl_cli.state.cards import CardStore
+from osl_cli.state.manager import StateManager
+from osl_cli.state.schemas import CardRecord, SessionState
+
+
+END = datetime(2026, 1, 1)
+
+
+def generate(seed: int = 7, scale: float = 0.25) -> Path:
+    """Generate a small history and return its OSL directory."""
+    output = Path(tempfile.mkdtemp())
+    HistoryGenerator(output, scale=scale, years=0.25, seed=seed, end=END).generate()
+    return output / "osl"
+
+
+class TestHistoryGenerator(unittest.TestCase):
+    """Test generated histories are valid and reproducible."""
+
+    def test_parse_scale(self):
+        """Test scale strings with and without the x suffix."""
+        self.assertEqual(parse_scale("10x"), 10.0)
+        self.assertEqual(parse_scale("0.5"), 0.5)
+        with self.assertRaises(ValueError):
+            parse_scale("0x")
+
+    def test_same_seed_same_history(self):
+        """Test archives and stores are identical for equal seeds."""
+        a, b, c = generate(), generate(), generate(seed=8)
+        for rel in ("ai_state/cards/index.json", "ai_state/review_log.jsonl"):
+            self.assertEqual((a / rel).read_text(), (b / rel).read_text())
+
+        logs = sorted(p.name for p in (a / "ai_state" / "session_logs").iterdir())
+        self.assertEqual(logs, sorted(p.name for p in (b / "ai_state" / "session_logs").iterdir()))
+        first = f"ai_state/session_logs/{logs[0]}"
+        self.assertEqual((a / first).read_text(), (b / first).read_text())
+        self.assertNotEqual((a / "ai_state/review_log.jsonl").read_text(),
+                            (c / "ai_state/review_log.jsonl").read_text())
+
+    def test_output_matches_schemas(self):
+        """Test generated records validate against the state models."""
+        base = generate()
+        for path in (base / "ai_state" / "session_logs").glob("*.json"):
+            session = SessionState.model_validate(json.loads(path.read_text()))
+            self.assertGreaterEqual(len(session.micro_loops), 4)
+            inputs = json.loads((base / "ai_state" / "session_inputs" / path.name).read_text())
+            self.assertEqual(inputs["inputs"]["recall_1"]["raw_text"],
+                             session.micro_loops[0].recall_data.verbatim_recall)
+
+        cards = CardStore(base)
+        for record in cards.iter_raw():
+            CardRecord.model_validate(record)
+        coach = StateManager(base).load_coach_state()
+        self.assertEqual(coach.performance_metrics.total_flashcards, cards.count())
+        self.assertEqual(len(coach.active_books), 2)
+
+    def test_scale_multiplies_history(self):
+        """Test 4x scale writes about four times the sessions."""
+        small = len(list((generate(scale=0.25) / "ai_state" / "session_logs").iterdir()))
+        large = len(list((generate(scale=1.0) / "ai_state" / "session_logs").iterdir()))
+        self.assertAlmostEqual(large, 4 * small, delta=4)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,101 @@
+"""Tests for modification quantification."""
+
+import json
+import random
+import tempfile
+import unittest
+from datetime import datetime
+from pathlib import Path
+
+from osl_cli.dev.synth import HistoryGenerator
+from osl_cli.validation.diff import compare_archive, diff_texts, levenshtein, myers_blocks
+from osl_cli.validation.hash import ContentHasher
+
+
+def edit_distance(a: str, b: str) -> int:
+    previous = list(range(len(b) + 1))
+    for i, ca in enumerate(a, 1):
+        current = [i]
+        for j, cb in enumerate(b, 1):
+            current.append(min(previous[j] + 1, current[j - 1] + 1,
+                               previous[j - 1] + (ca != cb)))
+        previous = current
+    return previous[-1]
+
+
+class TestEditDistance(unittest.TestCase):
+    """Test the bit-parallel distance and the Myers diff."""
+
+    def test_levenshtein_matches_dynamic_programming(self):
+        """Test exact and bounded distances on random strings."""
+        rng = random.Random(5)
+        for _ in range(300):
+            a = "".join(rng.choice("abc") for _ in range(rng.randint(0, 25)))
+            b = "".join(rng.choice("abc") for _ in range(rng.randint(0, 25)))
+            expected = edit_distance(a, b)
+            self.assertEqual(levenshtein(a, b), expected)
+            limit = rng.randint(0, 10)
+            self.assertEqual(levenshtein(a, b, limit), expected if expected <= limit else None)
+
+    def test_diff_spans_rebuild_the_current_text(self):
+        """Test changed spans are minimal and replay into the current text."""
+        rng = random.Random(9)
+        for _ in range(300):
+            a = "".join(rng.choice("ab ") for _ in range(rng.randint(0, 30)))
+            b = "".join(rng.choice("ab ") for _ in range(rng.randint(0, 30)))
+            blocks = myers_blocks(a, b)
+            for i, j, size in blocks:
+                self.assertEqual(a[i:i + size], b[j:j + size])
+
+            diff = diff_texts(a, b)
+            rebuilt, pos = [], 0
+            for span in diff.changed_spans:
+                rebuilt.append(a[pos:span["original"][0]])
+                rebuilt.append(b[span["current"][0]:span["current"][1]])
+                pos = span["original"][1]
+            rebuilt.append(a[pos:])
+            self.assertEqual("".join(rebuilt), b)
+            self.assertGreaterEqual(diff.edit_distance, edit_distance(a, b))
+
+    def test_detect_modification_measures_changes(self):
+        """Test distance, spans and preservation on a long edited text."""
+        words = ["retrieval", "practice", "spacing", "beats", "rereading", "for", "memory"]
+        rng = random.Random(1)
+        original = " ".join(rng.choice(words) for _ in range(3000))
+        tokens = original.split(" ")
+        tokens[1000] = "cramming"
+        current = " ".join(tokens[:2000] + tokens[2010:])
+
+        result = ContentHasher().detect_modification(original, current)
+        self.assertTrue(result["modified"])
+        self.assertEqual(len(result["changed_spans"]), 2)
+        self.assertEqual(result["edit_distance"], levenshtein(original, current))
+        self.assertGreater(result["percent_preserved"], 99.0)
+        self.assertLess(result["percent_preserved"], 100.0)
+
+
+class TestArchiveComparison(unittest.TestCase):
+    """Test the batch preservation audit."""
+
+    def test_finds_edited_recall(self):
+        """Test an archived recall edited after entry is measured."""
+        output = Path(tempfile.mkdtemp())
+        HistoryGenerator(output, scale=0.25, years=0.05, seed=4,
+                         end=datetime(2026, 1, 1), vault=False).generate()
+        base = output / "osl"
+        self.assertEqual(compare_archive(base, workers=1).modified, 0)
+
+        path = sorted((base / "ai_state" / "session_logs").glob("*.json"))[0]
+        session = json.loads(path.read_text())
+        recall = session["micro_loops"][0]["recall_data"]
+        recall["verbatim_recall"] = recall["verbatim_recall"].replace(" ", "  ", 1)
+        path.write_text(json.dumps(session))
+
+        report = compare_archive(base, workers=2, batch_size=2)
+        self.assertEqual(report.modified, 1)
+        self.assertEqual(report.edit_distance, 1)
+        self.assertEqual(report.examples[0]["input"], "recall_1")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,139 @@
+"""Tests for storage garbage collection."""
+
+import json
+import os
+import tempfile
+import time
+import unittest
+from datetime import datetime, timedelta
+from pathlib import Path
+
+from osl_cli.state.gc import collect_garbage
+from osl_cli.state.history import StateHistory
+from osl_cli.state.manager import StateManager
+from osl_cli.state.merkle import archive_index, check_index
+from osl_cli.state.schemas import MicroLoop, RecallData, SessionState
+from osl_cli.validation.hash import HashRegistry
+
+
+def _age(path: Path, days: float) -> None:
+    then = time.time() - days * 86400
+    os.utime(path, (then, then))
+
+
+class TestGarbageCollection(unittest.TestCase):
+    """Test pruning, registry merging, history thinning and blob pruning."""
+
+    def setUp(self):
+        """Set up test environment."""
+        self.osl_path = Path(tempfile.mkdtemp()) / "osl"
+        self.ai_state = self.osl_path / "ai_state"
+        self.ai_state.mkdir(parents=True)
+        self.state_manager = StateManager(self.osl_path)
+
+    def _archive(self, session_id: str, recall: str) -> None:
+        now = datetime(2025, 1, 6, 9, 0)
+        HashRegistry(session_id, self.ai_state).register_content("recall_1", recall, "recall")
+        self.state_manager.archive_session(SessionState(
+            session_id=session_id, book_id="bio", book_title="Biology",
+            start_time=now, last_activity=now, session_type="standard",
+            micro_loops=[MicroLoop(
+                loop_id=1, pages="1-4", chunk_type="standard", start_time=now,
+                recall_data=RecallData(duration_seconds=60, key_points=["carbon"],
+                                       confidence_score=3, verbatim_recall=recall,
+                                       recall_hash="h"),
+            )],
+        ))
+
+    def test_prunes_stale_copies_but_keeps_locks(self):
+        """Test old .bak/.last/.tmp files go and lock files stay."""
+        for name, days in (("coach_state.bak", 30), ("coach_state.v2.bak", 30),
+                           ("current_session.last", 30), (".coach_state.json.1.tmp", 1),
+                           ("cards/book_0001.bak", 1), (".coach_state.json.lock", 30)):
+            path = self.ai_state / name
+            path.parent.mkdir(exist_ok=True)
+            path.write_text("x" * 100)
+            _age(path, days)
+
+        report = collect_garbage(self.osl_path, dry_run=True)
+        self.assertTrue((self.ai_state / "coach_state.bak").exists())
+
+        report = collect_garbage(self.osl_path)
+        self.assertEqual(sorted(report.removed), [
+            "ai_state/.coach_state.json.1.tmp", "ai_state/coach_state.bak",
+            "ai_state/coach_state.v2.bak", "ai_state/current_session.last",
+        ])
+        self.assertEqual(report.reclaimed["copies"], 300)
+        self.assertEqual(report.reclaimed["temp"], 100)
+        self.assertTrue((self.ai_state / ".coach_state.json.lock").exists())
+        self.assertTrue((self.ai_state / "cards" / "book_0001.bak").exists())
+
+        collect_garbage(self.osl_path, keep_days=0)
+        self.assertFalse((self.ai_state / "cards" / "book_0001.bak").exists())
+
+    def test_merges_registries_of_archived_sessions(self):
+        """Test registries are merged, still load and stay indexed."""
+        recall = "Light reactions split water and release oxygen. " * 4
+        self._archive("s1", recall)
+        self._archive("s2", recall)
+        HashRegistry("active", self.ai_state).register_content("recall_1", recall, "recall")
+        (self.ai_state / "current_session.json").write_text(json.dumps({"session_id": "active"}))
+
+        report = collect_garbage(self.osl_path)
+        self.assertEqual(report.registries_merged, 2)
+        self.assertGreater(report.reclaimed["registries"], 0)
+        self.assertEqual(sorted(n for n in os.listdir(self.ai_state / "hash_registry")
+                                if not n.startswith(".")),
+                         ["active.json", "consolidated.json"])
+        registry = HashRegistry("s1", self.ai_state)
+        self.assertTrue(registry.verify_content("recall_1", recall)["valid"])
+        self.assertTrue(check_index(archive_index(self.osl_path)).match)
+        self.assertEqual(collect_garbage(self.osl_path).registries_merged, 1)  # s1, saved again
+
+    def test_prunes_only_unreferenced_blobs(self):
+        """Test blobs of sessions and sync merge bases are live."""
+        blobs = self.state_manager.blobs
+        self._archive("s1", "Chlorophyll absorbs red and blue light. " * 5)
+        referenced = next(blobs.iter_digests())
+        merge_base = blobs.put('{"revision": 3, "cards_due": 12, "padding": "' + "p" * 200 + '"}')
+        peers = self.ai_state / "sync" / "peers"
+        peers.mkdir(parents=True)
+        (peers / "peer.json").write_text(json.dumps({
+            "ours": {"ai_state/coach_state.json": merge_base},
+            "theirs": {"ai_state/coach_state.json": merge_base},
+        }))
+        orphan = blobs.put("Text from a session that was never saved. " * 5)
+        fresh = blobs.put("Text from a save still in progress. " * 5)
+        for digest in (referenced, merge_base, orphan):
+            _age(blobs.path(digest), 1)
+
+        report = collect_garbage(self.osl_path)
+        self.assertEqual(report.blobs_removed, 1)
+        self.assertEqual(sorted(blobs.iter_digests()), sorted([referenced, merge_base, fresh]))
+        self.state_manager.load_archived_session("s1")
+
+    def test_thins_old_coach_history(self):
+        """Test old history keeps one version per day."""
+        history = StateHistory(self.ai_state / "history" / "coach_state", checkpoint_every=5)
+        start = datetime(2026, 1, 1, 8, 0)
+        previous = None
+        for i in range(40):
+            version = {"revision": i, "cards_due": i}
+            history.record(previous, version, now=start + timedelta(hours=6 * i))
+            previous = version
+        before = {day: history.as_of(datetime(2026, 1, day, 23, 59)) for day in range(1, 11)}
+
+        report = collect_garbage(self.osl_path, history_days=5, now=datetime(2026, 1, 5))
+        self.assertEqual(report.history_versions_dropped, 0)
+
+        report = collect_garbage(self.osl_path, now=datetime(2026, 3, 1))
+        # The last segment is kept whole; the 35 versions before it span 9 days
+        self.assertEqual(report.history_versions_dropped, 35 - 9)
+        self.assertGreater(report.reclaimed["history"], 0)
+        for day, version in before.items():
+            self.assertEqual(history.as_of(datetime(2026, 1, day, 23, 59)), version)
+        self.assertEqual(collect_garbage(self.osl_path, now=datetime(2026, 3, 1)).history_versions_dropped, 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
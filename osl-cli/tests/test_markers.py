@@ -0,0 +1,95 @@
+"""Tests for AI-paraphrase marker scanning."""
+
+import json
+import random
+import tempfile
+import unittest
+from datetime import datetime
+from pathlib import Path
+
+from osl_cli.dev.synth import HistoryGenerator
+from osl_cli.validation.hash import ContentHasher, HashRegistry
+from osl_cli.validation.markers import AhoCorasick, scan_archive
+
+
+class TestAhoCorasick(unittest.TestCase):
+    """Test the automaton against naive counting."""
+
+    def test_counts_match_naive_search(self):
+        """Test overlapping and nested patterns are all counted."""
+        rng = random.Random(3)
+        for _ in range(300):
+            patterns = ["".join(rng.choice("ab") for _ in range(rng.randint(1, 4)))
+                        for _ in range(rng.randint(1, 6))]
+            text = "".join(rng.choice("abc") for _ in range(rng.randint(0, 40)))
+            automaton = AhoCorasick(patterns)
+            expected = [sum(text.startswith(p, i) for i in range(len(text)))
+                        for p in automaton.patterns]
+            self.assertEqual(automaton.counts(text), expected)
+
+    def test_case_insensitive(self):
+        """Test folded matching."""
+        automaton = AhoCorasick(["In summary,"], case_sensitive=False)
+        self.assertEqual(automaton.scan("IN SUMMARY, it works. in summary, again"),
+                         {"In summary,": 2})
+
+
+class TestMarkerDetection(unittest.TestCase):
+    """Test markers in modification analysis and archive scans."""
+
+    def test_detect_modification_reports_added_markers(self):
+        """Test only markers the modification introduced are reported."""
+        hasher = ContentHasher()
+        result = hasher.detect_modification(
+            "In summary, sleep matters",
+            "In summary, sleep matters. In other words: rest")
+        self.assertEqual(result["modification_type"], "ai_paraphrase")
+        self.assertEqual(result["markers"], {"In other words:": 1})
+
+        custom = ContentHasher(markers=["As an AI"])
+        result = custom.detect_modification("notes", "As an AI, notes")
+        self.assertEqual(result["details"], "AI pattern detected: 'As an AI'")
+
+    def test_hash_registry_uses_configured_markers(self):
+        """Test registration flags the directory's configured markers."""
+        base = Path(tempfile.mkdtemp()) / "osl"
+        (base / "config").mkdir(parents=True)
+        (base / "config" / "ai_markers.json").write_text(
+            json.dumps({"case_sensitive": False, "markers": ["as an ai"]}))
+
+        registry = HashRegistry("s1", base / "ai_state")
+        registry.register_content("recall_1", "As an AI, I recall that sleep matters.", "recall")
+        registry.register_content("recall_2", "In summary, sleep matters.", "recall")
+        self.assertEqual(registry.registry["hashes"]["recall_1"]["ai_markers"], {"as an ai": 1})
+        self.assertNotIn("ai_markers", registry.registry["hashes"]["recall_2"])
+
+        result = registry.hasher.detect_modification("Sleep matters.", "As an AI: sleep matters.")
+        self.assertEqual(result["markers"], {"as an ai": 1})
+
+    def test_scan_archive_uses_configured_markers(self):
+        """Test per-marker hit counts across sessions, cards and notes."""
+        output = Path(tempfile.mkdtemp())
+        HistoryGenerator(output, scale=0.25, years=0.05, seed=2,
+                         end=datetime(2026, 1, 1)).generate()
+        base = output / "osl"
+        path = sorted((base / "ai_state" / "session_logs").glob("*.json"))[0]
+        session = json.loads(path.read_text())
+        recall = session["micro_loops"][0]["recall_data"]
+        recall["verbatim_recall"] = "To summarize, " + recall["verbatim_recall"]
+        path.write_text(json.dumps(session))
+
+        report = scan_archive(base, workers=1)
+        self.assertEqual(report.hits["To summarize,"], 1)
+        self.assertEqual(report.flagged["recall"], 1)
+        self.assertGreater(report.scanned["card"], 0)
+        self.assertGreater(report.scanned["note"], 0)
+
+        (base / "config" / "ai_markers.json").write_text(
+            json.dumps({"case_sensitive": False, "markers": ["to SUMMARIZE,"]}))
+        report = scan_archive(base, workers=2, batch_size=4)
+        self.assertEqual(report.markers, ["to SUMMARIZE,"])
+        self.assertEqual(report.hits["to SUMMARIZE,"], 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
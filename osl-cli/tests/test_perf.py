@@ -0,0 +1,61 @@
+"""Tests for OSL timing instrumentation."""
+
+import tempfile
+import unittest
+from pathlib import Path
+
+from osl_cli.perf import trace
+from osl_cli.perf.report import aggregate, load_run, phase_totals
+
+
+class TestTracing(unittest.TestCase):
+    """Test span recording and trace aggregation."""
+
+    def setUp(self):
+        """Set up test environment."""
+        self.trace_dir = Path(tempfile.mkdtemp())
+
+    def tearDown(self):
+        """Make sure tracing is switched off again."""
+        trace.finish()
+
+    def _traced_run(self, fmt: str) -> Path:
+        trace.enable(self.trace_dir, fmt).command = "state show"
+        with trace.span("state.load", "state"):
+            with trace.span("io.read", "io"):
+                pass
+            with trace.span("validate.coach_state", "validation"):
+                pass
+        return trace.finish()
+
+    def test_disabled_spans_are_noops(self):
+        """Test spans record nothing while tracing is off."""
+        self.assertIsNone(trace.active())
+        with trace.span("state.load", "state"):
+            pass
+        self.assertIsNone(trace.finish())
+
+    def test_jsonl_round_trip(self):
+        """Test JSON-lines traces load with header and spans."""
+        run = load_run(self._traced_run("jsonl"))
+        self.assertEqual(run["command"], "state show")
+        self.assertEqual(
+            sorted(s["name"] for s in run["spans"]),
+            ["cli.import", "io.read", "state.load", "validate.coach_state"],
+        )
+
+    def test_self_time_excludes_children(self):
+        """Test aggregation subtracts child spans from parents (both formats)."""
+        runs = [load_run(self._traced_run(fmt)) for fmt in trace.FORMATS]
+        rows = {r["name"]: r for r in aggregate(runs)}
+
+        load = rows["state.load"]
+        children = rows["io.read"]["total_ms"] + rows["validate.coach_state"]["total_ms"]
+        self.assertEqual(load["calls"], 2)
+        self.assertEqual(load["runs"], 2)
+        self.assertAlmostEqual(load["self_ms"], load["total_ms"] - children, places=2)
+        self.assertIn("io", phase_totals(list(rows.values())))
+
+
+if __name__ == "__main__":
+    unittest.main()
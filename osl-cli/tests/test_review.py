@@ -0,0 +1,281 @@
+"""Tests for OSL review, quiz and calibration."""
+
+import random
+import tempfile
+import unittest
+from datetime import datetime, timedelta
+from pathlib import Path
+
+from osl_cli.state.schemas import FlashcardCreated, MisconceptionRecord
+from osl_cli.state.cards import CardStore
+from osl_cli.state.misconceptions import MisconceptionStore
+from osl_cli.state.questions import QuestionStore
+from osl_cli.review.calibration import CalibrationTracker
+from osl_cli.review.quiz import QuizEngine, allocate, weighted_sample
+from osl_cli.review.interleave import InterleavingScheduler, InterleavingLog
+from osl_cli.review.runner import ReviewRunner, Prefetcher, apply_grade, AGAIN, GOOD
+
+
+def make_card(card_id: str) -> FlashcardCreated:
+    """Build a minimal learner-authored card."""
+    return FlashcardCreated(
+        card_id=card_id,
+        front=f"Front {card_id}",
+        back=f"Back {card_id}",
+        source_page=1,
+        created_from_gap="gap",
+        verbatim_hash="hash",
+    )
+
+
+class TestQuizEngine(unittest.TestCase):
+    """Test stratified quiz sampling."""
+
+    def setUp(self):
+        """Set up test environment."""
+        self.osl_path = Path(tempfile.mkdtemp()) / "osl"
+
+        cards = CardStore(self.osl_path)
+        for i in range(20):
+            cards.add(make_card(f"c{i}"), "book_a")
+
+        questions = QuestionStore(self.osl_path)
+        for i in range(5):
+            questions.add("book_a", f"Open question {i}")
+
+        MisconceptionStore(self.osl_path).save(MisconceptionRecord(
+            misconception_id="misc_1",
+            book_id="book_a",
+            identified_at=datetime.now(),
+            description="Confused A with B",
+            source="p. 3",
+        ))
+
+    def test_allocate_follows_blueprint(self):
+        """Test allocation of 10 items is 3/4/3."""
+        plan = allocate(10, {"recall": 50, "application": 50, "transfer": 50})
+        self.assertEqual(plan, {"recall": 3, "application": 4, "transfer": 3})
+
+    def test_allocate_redistributes_shortfall(self):
+        """Test thin strata hand their share to others."""
+        plan = allocate(10, {"recall": 50, "application": 1, "transfer": 2})
+        self.assertEqual(plan, {"recall": 7, "application": 1, "transfer": 2})
+
+    def test_weighted_sample_without_replacement(self):
+        """Test sampling returns distinct candidates and skips zero weights."""
+        candidates = [(1.0, "card", "b", {"i": i}) for i in range(100)]
+        candidates.append((0.0, "card", "b", {"i": "never"}))
+        picked = weighted_sample(candidates, 10, random.Random(7))
+
+        self.assertEqual(len(picked), 10)
+        self.assertEqual(len({c[3]["i"] for c in picked}), 10)
+        self.assertNotIn("never", [c[3]["i"] for c in picked])
+
+    def test_sample_is_stratified(self):
+        """Test a quiz draws from every available stratum."""
+        items = QuizEngine(self.osl_path, seed=1).sample(10, ["book_a"])
+        strata = [i.stratum for i in items]
+
+        self.assertEqual(len(items), 10)
+        self.assertEqual(strata.count("application"), 1)
+        self.assertEqual(strata.count("transfer"), 3)
+        self.assertEqual(strata.count("recall"), 6)
+
+
+class TestCalibrationTracker(unittest.TestCase):
+    """Test incremental calibration metrics."""
+
+    def setUp(self):
+        """Set up test environment."""
+        self.osl_path = Path(tempfile.mkdtemp()) / "osl"
+
+    def _result(self, when: datetime, predicted: int, outcomes) -> dict:
+        return {
+            "quiz_id": "q",
+            "taken_at": when.isoformat(),
+            "predicted_score": predicted,
+            "actual_score": round(100 * sum(c for _, c in outcomes) / len(outcomes)),
+            "items": [
+                {"item_id": str(i), "stratum": "recall", "confidence": conf, "correct": c}
+                for i, (conf, c) in enumerate(outcomes)
+            ],
+        }
+
+    def test_brier_and_curve(self):
+        """Test Brier score and curve bins from recorded items."""
+        tracker = CalibrationTracker(self.osl_path)
+        tracker.record_quiz(self._result(datetime.now(), 50, [(100, True), (100, False)]))
+
+        self.assertAlmostEqual(tracker.brier_score(), 0.5)
+        curve = tracker.calibration_curve()
+        self.assertEqual(len(curve), 1)
+        self.assertEqual(curve[0]["n"], 2)
+        self.assertAlmostEqual(curve[0]["hit_rate"], 0.5)
+
+    def test_prediction_accuracy_window(self):
+        """Test 7-day prediction accuracy ignores older quizzes."""
+        now = datetime.now()
+        tracker = CalibrationTracker(self.osl_path)
+        tracker.record_quiz(self._result(now - timedelta(days=20), 0, [(50, True)]))
+        tracker.record_quiz(self._result(now - timedelta(days=1), 80, [(50, True), (50, True)]))
+
+        reloaded = CalibrationTracker(self.osl_path)
+        self.assertAlmostEqual(reloaded.prediction_accuracy(7, now), 80.0)
+        self.assertIsNone(reloaded.prediction_accuracy(7, now + timedelta(days=30)))
+        self.assertEqual(reloaded.state["quizzes"], 2)
+        self.assertTrue(reloaded.log_path.exists())
+
+    def test_concurrent_trackers_add_up(self):
+        """Test quizzes saved by two open trackers are both counted."""
+        now = datetime.now()
+        first, second = CalibrationTracker(self.osl_path), CalibrationTracker(self.osl_path)
+        first.record_quiz(self._result(now, 100, [(90, True)]))
+        second.record_quiz(self._result(now, 50, [(10, False), (90, True)]))
+
+        reloaded = CalibrationTracker(self.osl_path)
+        self.assertEqual((reloaded.state["quizzes"], reloaded.state["items"]), (2, 3))
+        self.assertEqual(reloaded.state["daily"][now.strftime("%Y-%m-%d")]["quizzes"], 2)
+        self.assertAlmostEqual(reloaded.prediction_accuracy(7, now), 100.0)
+        self.assertEqual(second.state, reloaded.state)
+
+
+class TestInterleavingScheduler(unittest.TestCase):
+    """Test interleaved queue construction."""
+
+    def setUp(self):
+        """Set up test environment."""
+        self.osl_path = Path(tempfile.mkdtemp()) / "osl"
+        cards = CardStore(self.osl_path)
+        for i in range(12):
+            cards.add(make_card(f"a{i}"), "book_a")
+        for i in range(3):
+            cards.add(make_card(f"b{i}"), "book_b")
+        self.until = datetime.now() + timedelta(days=2)
+
+    def test_queue_covers_all_due_cards(self):
+        """Test every due card appears exactly once."""
+        scheduler = InterleavingScheduler(self.osl_path)
+        queue = scheduler.build_queue(["book_a", "book_b"], 100, self.until)
+        self.assertEqual(sorted(c["card_id"] for c in queue),
+                         sorted([f"a{i}" for i in range(12)] + [f"b{i}" for i in range(3)]))
+
+    def test_run_length_constraint(self):
+        """Test no topic runs past max_run while another topic remains."""
+        scheduler = InterleavingScheduler(self.osl_path, max_run=2)
+        queue = scheduler.build_queue(["book_a", "book_b"], 100, self.until)
+        books = [c["book_id"] for c in queue]
+
+        last_b = max(i for i, b in enumerate(books) if b == "book_b")
+        for i in range(2, last_b + 1):
+            self.assertFalse(books[i] == books[i - 1] == books[i - 2],
+                             f"run of 3 at {i}: {books}")
+
+    def test_nothing_due_skips_book(self):
+        """Test books with no due cards are filtered by the index."""
+        scheduler = InterleavingScheduler(self.osl_path)
+        self.assertEqual(scheduler.books_with_due(["book_a", "book_b"], datetime.now()), [])
+        self.assertEqual(scheduler.build_queue(["book_a"], 10, datetime.now()), [])
+
+    def test_cutoff_is_exact_time(self):
+        """Test cards due later on the cutoff day are not yet due."""
+        cards = CardStore(self.osl_path)
+        first = min(datetime.fromisoformat(c["schedule"]["due"]) for c in cards.iter_book("book_b"))
+        self.assertEqual(list(cards.iter_due("book_b", first - timedelta(microseconds=1))), [])
+        self.assertEqual(len(list(cards.iter_due("book_b", first))), 1)
+
+    def test_weekly_session_count(self):
+        """Test the interleaving log counts only the trailing week."""
+        log = InterleavingLog(self.osl_path)
+        now = datetime.now()
+        log.record(["book_a", "book_b"], 10, now - timedelta(days=9))
+        log.record(["book_a", "book_b"], 10, now - timedelta(days=2))
+        log.record(["book_a", "book_b"], 10, now)
+        self.assertEqual(log.sessions_this_week(now), 2)
+
+    def test_reversed_lines_across_blocks(self):
+        """Test lines come back last first whatever the block size."""
+        from osl_cli.review.interleave import reversed_lines
+
+        path = self.osl_path / "lines.txt"
+        lines = [f"line {i} " + "é" * (i % 7) for i in range(50)]
+        path.write_text("\n".join(lines) + "\n")
+        for block_size in (1, 3, 16, 4096):
+            self.assertEqual(list(reversed_lines(path, block_size)), [""] + lines[::-1])
+
+    def test_book_summary_kept_incrementally(self):
+        """Test summaries updated per record match a full recount."""
+        cards = CardStore(self.osl_path)
+        runner = ReviewRunner(self.osl_path, checkpoint_every=2)
+        for i, card in enumerate(runner.stream(cards.iter_due("book_a", self.until))):
+            runner.record(card, AGAIN if i % 3 else GOOD)
+        runner.checkpoint()
+
+        cards = CardStore(self.osl_path)
+        for book_id in ("book_a", "book_b"):
+            shard = cards._load_shard(book_id)
+            self.assertEqual(cards.index["books"][book_id], cards._book_summary(shard))
+        self.assertGreater(cards.index["books"]["book_a"]["lapses"], 0)
+
+
+class TestReviewRunner(unittest.TestCase):
+    """Test streamed review logging and batched schedule updates."""
+
+    def setUp(self):
+        """Set up test environment."""
+        self.osl_path = Path(tempfile.mkdtemp()) / "osl"
+        cards = CardStore(self.osl_path)
+        for i in range(5):
+            cards.add(make_card(f"c{i}"), "book_a")
+        self.until = datetime.now() + timedelta(days=2)
+
+    def _due(self):
+        return CardStore(self.osl_path).iter_due("book_a", self.until)
+
+    def test_apply_grade(self):
+        """Test lapses reset the interval and successes grow it."""
+        now = datetime.now()
+        schedule = {"due": now.isoformat(), "interval_days": 4.0, "ease": 2.5, "reps": 3, "lapses": 0}
+
+        good = apply_grade(schedule, GOOD, now)
+        self.assertAlmostEqual(good["interval_days"], 10.0)
+        self.assertEqual(good["reps"], 4)
+
+        again = apply_grade(schedule, AGAIN, now)
+        self.assertEqual(again["interval_days"], 0.0)
+        self.assertEqual(again["lapses"], 1)
+        self.assertLess(again["ease"], 2.5)
+
+    def test_prefetcher_preserves_order(self):
+        """Test read-ahead yields every item in order."""
+        self.assertEqual(list(Prefetcher(range(100), depth=4)), list(range(100)))
+
+    def test_updates_written_at_checkpoints(self):
+        """Test schedules change on disk only at checkpoints."""
+        runner = ReviewRunner(self.osl_path, checkpoint_every=3)
+        stream = runner.stream(self._due())
+        for _ in range(2):
+            runner.record(next(stream), GOOD)
+        self.assertEqual(CardStore(self.osl_path).get("c0").schedule.reps, 0)
+
+        runner.record(next(stream), GOOD)
+        self.assertEqual(CardStore(self.osl_path).get("c0").schedule.reps, 1)
+        self.assertEqual(len(runner.log.log_path.read_text().splitlines()), 3)
+
+    def test_recover_replays_unapplied_answers(self):
+        """Test answers logged before a crash are applied exactly once."""
+        runner = ReviewRunner(self.osl_path, checkpoint_every=100)
+        for card in list(runner.stream(self._due()))[:4]:
+            runner.record(card, AGAIN)
+        # Simulated crash: no checkpoint
+
+        restarted = ReviewRunner(self.osl_path)
+        self.assertEqual(restarted.recover(), 4)
+        self.assertEqual(ReviewRunner(self.osl_path).recover(), 0)
+
+        cards = CardStore(self.osl_path)
+        self.assertEqual(cards.get("c0").schedule.lapses, 1)
+        self.assertEqual(cards.get("c4").schedule.lapses, 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -119,6 +119,410 @@ class TestStateManager(unittest.TestCase):
             loaded = json.load(f)
         self.assertEqual(loaded["data"], "updated")
 
+    def test_atomic_write_keeps_file_mode(self):
+        """Test atomic writes create files per umask and keep their mode."""
+        import os
+        import stat
+
+        umask = os.umask(0o022)
+        try:
+            test_path = self.temp_path / "mode.json"
+            self.state_manager._atomic_write(test_path, {"data": 1})
+            self.assertEqual(stat.S_IMODE(test_path.stat().st_mode), 0o644)
+
+            os.chmod(test_path, 0o640)
+            self.state_manager._atomic_write(test_path, {"data": 2})
+            self.assertEqual(stat.S_IMODE(test_path.stat().st_mode), 0o640)
+        finally:
+            os.umask(umask)
+
+
+class TestConcurrentState(unittest.TestCase):
+    """Test revision checks, merging and locking of state files."""
+    
+    def setUp(self):
+        """Set up test environment."""
+        self.osl_path = Path(tempfile.mkdtemp()) / "osl"
+        (self.osl_path / "ai_state").mkdir(parents=True)
+        
+        now = datetime.now()
+        self.state_manager = StateManager(self.osl_path)
+        self.state_manager.save_coach_state(CoachState(
+            governance_thresholds=GovernanceThresholds(
+                calibration_gate=GovernanceThreshold(min=75, current=80, max=85, last_adjusted=now),
+                card_debt_multiplier=GovernanceThreshold(min=1.5, current=2.0, max=2.5, last_adjusted=now),
+                max_new_cards=GovernanceThreshold(min=4, current=8, max=10, last_adjusted=now),
+                interleaving_per_week=GovernanceThreshold(min=1, current=2, max=3, last_adjusted=now),
+            ),
+            governance_status=GovernanceStatus(
+                calibration_gate="passing",
+                card_debt_gate="passing",
+                transfer_gate="passing",
+                overall_state="NORMAL",
+            ),
+        ))
+    
+    def test_three_way_merge(self):
+        """Test one-sided changes, nested merges and list appends."""
+        from osl_cli.state.locking import three_way_merge
+        
+        base = {"a": 1, "b": {"x": 1, "y": 1}, "log": [1]}
+        ours = {"a": 2, "b": {"x": 2, "y": 1}, "log": [1, 2]}
+        theirs = {"a": 1, "b": {"x": 1, "y": 3}, "log": [1, 3], "new": True}
+        
+        self.assertEqual(
+            three_way_merge(base, ours, theirs),
+            {"a": 2, "b": {"x": 2, "y": 3}, "log": [1, 3, 2], "new": True},
+        )
+    
+    def test_stale_save_merges_instead_of_overwriting(self):
+        """Test two writers from the same revision both keep their changes."""
+        first = self.state_manager.load_coach_state()
+        second = StateManager(self.osl_path).load_coach_state()
+        
+        first.performance_metrics.cards_due = 12
+        self.state_manager.save_coach_state(first)
+        
+        second.review_schedule.daily_review_time = "21:00"
+        StateManager(self.osl_path).save_coach_state(second)
+        
+        final = self.state_manager.load_coach_state()
+        self.assertEqual(final.performance_metrics.cards_due, 12)
+        self.assertEqual(final.review_schedule.daily_review_time, "21:00")
+        self.assertEqual(final.revision, 3)
+        self.assertEqual(second.performance_metrics.cards_due, 12)
+    
+    def test_update_retries_after_lost_race(self):
+        """Test compare-and-swap re-applies the mutation to newer state."""
+        other = StateManager(self.osl_path)
+        calls = []
+        
+        def bump(state):
+            calls.append(state.revision)
+            if len(calls) == 1:
+                # Another process commits between our read and write
+                concurrent = other.load_coach_state()
+                concurrent.performance_metrics.cards_completed_today += 1
+                other.save_coach_state(concurrent)
+            state.performance_metrics.cards_completed_today += 1
+        
+        result = self.state_manager.update_coach_state(bump)
+        self.assertEqual(calls, [1, 2])
+        self.assertEqual(result.performance_metrics.cards_completed_today, 2)
+    
+    def test_exclusive_lock_blocks_writers_not_readers(self):
+        """Test shared locks coexist and exclude writers."""
+        from osl_cli.state.locking import FileLock, StateLockTimeoutError
+        
+        path = self.state_manager.coach_state_path
+        with FileLock(path, shared=True):
+            with FileLock(path, shared=True, timeout=0.1):
+                pass
+            with self.assertRaises(StateLockTimeoutError):
+                with FileLock(path, timeout=0.1):
+                    pass
+        self.assertEqual(list(path.parent.glob("*.tmp")), [])
+
+class TestBlobStore(unittest.TestCase):
+    """Test content-addressed storage of verbatim session text."""
+    
+    def setUp(self):
+        """Set up test environment."""
+        self.osl_path = Path(tempfile.mkdtemp()) / "osl"
+        (self.osl_path / "ai_state").mkdir(parents=True)
+        self.state_manager = StateManager(self.osl_path)
+    
+    def test_put_deduplicates_and_compresses(self):
+        """Test identical text is stored once, long text compressed."""
+        from osl_cli.state.blobs import BlobStore
+        
+        blobs = BlobStore(self.osl_path)
+        short = "A short recall about photosynthesis."
+        long = "Chlorophyll absorbs light in the thylakoids. " * 100
+        
+        self.assertEqual(blobs.put(short), blobs.put(short))
+        digest = blobs.put(long)
+        self.assertTrue(blobs.path(digest, compressed=True).exists())
+        self.assertFalse(blobs.path(digest).exists())
+        self.assertEqual(blobs.get(digest), long)
+        self.assertEqual(blobs.stats()["blobs"], 2)
+        self.assertEqual(blobs.store("tiny"), "tiny")
+    
+    def test_tampered_blob_is_rejected(self):
+        """Test reads are verified against the blob's hash."""
+        from osl_cli.state.blobs import BlobIntegrityError, BlobStore
+        
+        blobs = BlobStore(self.osl_path)
+        digest = blobs.put("Mitochondria make ATP through oxidative phosphorylation.")
+        blobs.path(digest).write_text("Mitochondria make glucose.")
+        
+        with self.assertRaises(BlobIntegrityError):
+            blobs.get(digest)
+    
+    def test_session_text_stored_by_reference(self):
+        """Test sessions round-trip through blob references."""
+        from osl_cli.state.schemas import MicroLoop, RecallData
+        from osl_cli.validation.markers import scan_archive
+        
+        recall = "In summary, the Calvin cycle fixes carbon dioxide into sugar. " * 4
+        now = datetime.now()
+        session = SessionState(
+            session_id="blob_session", book_id="bio", book_title="Biology",
+            start_time=now, last_activity=now, session_type="standard",
+            micro_loops=[MicroLoop(
+                loop_id=1, pages="1-4", chunk_type="standard", start_time=now,
+                recall_data=RecallData(duration_seconds=60, key_points=["carbon"],
+                                       confidence_score=3, verbatim_recall=recall,
+                                       recall_hash="h"),
+            )],
+            state_history=[{"from": "READING", "to": "RECALL_COMPLETE",
+                            "context": {"recall_text": recall}}],
+        )
+        self.state_manager.save_current_session(session)
+        
+        with open(self.state_manager.current_session_path) as f:
+            stored = json.load(f)
+        ref = stored["micro_loops"][0]["recall_data"]["verbatim_recall"]
+        self.assertEqual(ref, stored["state_history"][0]["context"]["recall_text"])
+        self.assertEqual(self.state_manager.blobs.get(ref["blob"]), recall)
+        self.assertEqual(self.state_manager.blobs.stats()["blobs"], 1)
+        
+        loaded = StateManager(self.osl_path).load_current_session()
+        self.assertEqual(loaded.micro_loops[0].recall_data.verbatim_recall, recall)
+        loaded.micro_loops[0].notes = "edited"
+        StateManager(self.osl_path).save_current_session(loaded)
+        
+        self.state_manager.archive_session(loaded)
+        archived = self.state_manager.load_archived_session("blob_session")
+        self.assertEqual(archived.state_history[0]["context"]["recall_text"], recall)
+        report = scan_archive(self.osl_path, workers=1)
+        self.assertEqual(report.hits["In summary,"], 4)
+
+    def test_session_text_loaded_on_access(self):
+        """Test loading a session reads no text until a field is used."""
+        from osl_cli.state.blobs import BlobIntegrityError
+        from osl_cli.state.schemas import FlashcardCreated, MicroLoop
+
+        front = "What does the electron transport chain pump across the membrane? " * 2
+        back = "Protons, building the gradient that drives ATP synthase. " * 3
+        now = datetime.now()
+        session = SessionState(
+            session_id="cold_session", book_id="bio", book_title="Biology",
+            start_time=now, last_activity=now, session_type="standard",
+            micro_loops=[MicroLoop(
+                loop_id=1, pages="5-9", chunk_type="standard", start_time=now,
+                flashcards_created=[FlashcardCreated(
+                    card_id="c1", front=front, back=back, source_page=7,
+                    created_from_gap="gradient", verbatim_hash="h",
+                )],
+            )],
+        )
+        self.state_manager.save_current_session(session)
+        blobs = self.state_manager.blobs
+        back_digest = blobs.put(back)
+        blobs.path(back_digest).write_text("Tampered")
+
+        # Status fields and saving never read the text
+        loaded = StateManager(self.osl_path).load_current_session()
+        self.assertEqual(loaded.micro_loops[0].flashcards_created[0].card_id, "c1")
+        loaded.flashcards_created = 1
+        StateManager(self.osl_path).save_current_session(loaded)
+        with open(self.state_manager.current_session_path) as f:
+            stored = json.load(f)
+        self.assertEqual(stored["micro_loops"][0]["flashcards_created"][0]["back"],
+                         {"blob": back_digest})
+
+        card = loaded.micro_loops[0].flashcards_created[0]
+        self.assertEqual(card.front, front)
+        with self.assertRaises(BlobIntegrityError):
+            card.back
+
+
+class TestMerkleIndex(unittest.TestCase):
+    """Test the Merkle index over archived sessions."""
+    
+    def setUp(self):
+        """Set up test environment."""
+        self.osl_path = Path(tempfile.mkdtemp()) / "osl"
+        (self.osl_path / "ai_state").mkdir(parents=True)
+        self.state_manager = StateManager(self.osl_path)
+    
+    def _archive(self, manager, session_id):
+        now = datetime(2025, 1, 6, 9, 0)
+        manager.archive_session(SessionState(
+            session_id=session_id, book_id="bio", book_title="Biology",
+            start_time=now, last_activity=now, session_type="standard",
+        ))
+    
+    def test_diff_descends_only_into_changed_subtrees(self):
+        """Test a changed leaf is found in O(log n) comparisons."""
+        from osl_cli.state.merkle import BUCKET_SIZE, MerkleTree
+        
+        for size in (1000, 20000):
+            leaves = {f"session_logs/{i:05d}.json": f"{i:064x}" for i in range(size)}
+            ours = MerkleTree(leaves)
+            theirs = MerkleTree(dict(reversed(list(leaves.items()))))
+            self.assertEqual(ours.root, theirs.root)
+            
+            theirs.set("session_logs/00421.json", "f" * 64)
+            theirs.remove("session_logs/00007.json")
+            changed, comparisons = ours.diff(theirs)
+            self.assertEqual(changed, ["session_logs/00007.json", "session_logs/00421.json"])
+            # Two paths of 16 nodes per level, and the leaves of two buckets
+            self.assertLessEqual(comparisons, 1 + 2 * 16 * ours.depth + 2 * 2 * BUCKET_SIZE)
+        self.assertEqual(ours.depth, 3)
+    
+    def test_depth_follows_leaf_count(self):
+        """Test the shape depends only on the leaves, however they got there."""
+        from osl_cli.state.merkle import MerkleTree
+        
+        leaves = {f"k{i}": f"{i:064x}" for i in range(300)}
+        grown = MerkleTree()
+        for key, digest in leaves.items():
+            grown.set(key, digest)
+        self.assertEqual((grown.depth, grown.root), (2, MerkleTree(leaves).root))
+        for i in range(100):
+            grown.remove(f"k{i}")
+        small = MerkleTree({k: v for k, v in leaves.items() if k not in {f"k{i}" for i in range(100)}})
+        self.assertEqual((grown.depth, grown.root), (1, small.root))
+        
+        changed, _ = MerkleTree(leaves).diff(small)
+        self.assertEqual(changed, sorted(f"k{i}" for i in range(100)))
+    
+    def test_archive_updates_index_incrementally(self):
+        """Test archiving records sessions and --quick finds tampering."""
+        import os
+        from osl_cli.state.merkle import archive_index, check_index, compare_indexes
+        
+        self._archive(self.state_manager, "s1")
+        self._archive(self.state_manager, "s2")
+        index = archive_index(self.osl_path)
+        self.assertEqual(sorted(index.load()), ["session_logs/s1.json", "session_logs/s2.json"])
+        self.assertTrue(check_index(index).match)
+        
+        other_path = Path(tempfile.mkdtemp()) / "osl"
+        (other_path / "ai_state").mkdir(parents=True)
+        other = StateManager(other_path)
+        self._archive(other, "s1")
+        
+        # Tamper without changing size or mtime: only a rehash sees it
+        path = self.state_manager.session_logs_path / "s2.json"
+        stat = path.stat()
+        text = path.read_text()
+        path.write_text(text.replace('"bio"', '"BIO"'))
+        os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns))
+        self.assertTrue(check_index(index).match)
+        self.assertEqual(check_index(index, rehash=True).changed, ["session_logs/s2.json"])
+        
+        result = compare_indexes(index, archive_index(other_path), rehash=True)
+        self.assertEqual(result.removed, ["session_logs/s2.json"])
+        self.assertEqual(result.changed, [])
+
+    def test_registry_saves_leave_index_alone_until_archived(self):
+        """Test an active session's registry is indexed only on archive."""
+        from osl_cli.state.merkle import archive_index, check_index
+        from osl_cli.validation.hash import HashRegistry
+
+        ai_state = self.osl_path / "ai_state"
+        self._archive(self.state_manager, "s1")
+        index = archive_index(self.osl_path)
+        root = index.stored_root()
+        HashRegistry("s2", ai_state).register_content("recall_1", "Light splits water.", "recall")
+        self.assertEqual(index.stored_root(), root)
+        self.assertTrue(check_index(index).match)
+
+        self._archive(self.state_manager, "s2")
+        self.assertIn("hash_registry/s2.json", index.load())
+        self.assertTrue(check_index(index).match)
+
+        # Registries outside an OSL directory are never indexed
+        HashRegistry("s3", Path(tempfile.mkdtemp())).register_content("recall_1", "Text.", "recall")
+
+
+class TestStateHistory(unittest.TestCase):
+    """Test coach state history as JSON-patch deltas."""
+
+    def setUp(self):
+        """Set up test environment."""
+        self.osl_path = Path(tempfile.mkdtemp()) / "osl"
+        (self.osl_path / "ai_state").mkdir(parents=True)
+        self.state_manager = StateManager(self.osl_path)
+
+    def test_patch_round_trip(self):
+        """Test generated patches rebuild the new document."""
+        from osl_cli.state.history import JsonPatchError, apply_patch, make_patch
+
+        old = {"a": 1, "b/c": [1, 2, 3], "d": {"e": True}, "gone": None}
+        new = {"a": 1.0, "b/c": [1, 5], "d": {"e": 1, "f": ["x"]}, "new~key": []}
+        patch = make_patch(old, new)
+        self.assertIn({"op": "replace", "path": "/b~1c/1", "value": 5}, patch)
+        self.assertIn({"op": "add", "path": "/new~0key", "value": []}, patch)
+        self.assertEqual(json.dumps(apply_patch(json.loads(json.dumps(old)), patch)), json.dumps(new))
+        self.assertEqual(make_patch(new, new), [])
+
+        doc = apply_patch({"a": {"b": 1}, "l": [1]}, [
+            {"op": "move", "from": "/a/b", "path": "/c"},
+            {"op": "copy", "from": "/l", "path": "/l/0"},
+            {"op": "test", "path": "/c", "value": 1},
+        ])
+        self.assertEqual(doc, {"a": {}, "l": [[1], 1], "c": 1})
+        with self.assertRaises(JsonPatchError):
+            apply_patch({"a": 1}, [{"op": "remove", "path": "/b"}])
+        with self.assertRaises(JsonPatchError):
+            apply_patch({"a": 1}, [{"op": "test", "path": "/a", "value": 2}])
+
+    def test_as_of_rebuilds_past_versions(self):
+        """Test past versions come back from checkpoints plus deltas."""
+        from osl_cli.state.history import StateHistory
+
+        history = StateHistory(self.osl_path / "ai_state" / "history" / "coach_state", checkpoint_every=4)
+        versions = [{"revision": i, "cards_due": i * 10, "books": list(range(i % 3))} for i in range(10)]
+        previous = None
+        for i, version in enumerate(versions):
+            history.record(previous, version, now=datetime(2026, 1, 1 + i, 12, 0))
+            previous = version
+
+        self.assertEqual(len(history.segments()), 3)
+        self.assertIsNone(history.as_of(datetime(2025, 12, 31)))
+        self.assertEqual(history.as_of(datetime(2026, 1, 1, 12, 0)), versions[0])
+        self.assertEqual(history.as_of(datetime(2026, 1, 7, 8, 0)), versions[5])
+        self.assertEqual(history.as_of(datetime(2027, 1, 1)), versions[9])
+        stats = history.stats()
+        self.assertEqual(stats["versions"], 10)
+
+        # A version that did not come from the last entry starts a checkpoint
+        history.record({"revision": 99}, {"revision": 100}, now=datetime(2026, 2, 1))
+        self.assertEqual(len(history.segments()), 4)
+        self.assertEqual(history.as_of(datetime(2026, 2, 2)), {"revision": 100})
+
+    def test_save_coach_state_records_history(self):
+        """Test every save is recorded and --as-of finds it."""
+        now = datetime.now()
+        state = CoachState(
+            version="3.0",
+            governance_thresholds=GovernanceThresholds(
+                calibration_gate=GovernanceThreshold(min=75, current=80, max=85, last_adjusted=now),
+                card_debt_multiplier=GovernanceThreshold(min=1.5, current=2.0, max=2.5, last_adjusted=now),
+                max_new_cards=GovernanceThreshold(min=4, current=8, max=10, last_adjusted=now),
+                interleaving_per_week=GovernanceThreshold(min=1, current=2, max=3, last_adjusted=now),
+            ),
+            governance_status=GovernanceStatus(
+                calibration_gate="passing", card_debt_gate="passing",
+                transfer_gate="passing", overall_state="NORMAL",
+            ),
+        )
+        self.state_manager.save_coach_state(state)
+        before_block = datetime.now()
+        state.governance_status.overall_state = "BLOCKED"
+        self.state_manager.save_coach_state(state)
+
+        past = self.state_manager.load_coach_state_as_of(before_block)
+        self.assertEqual(past.governance_status.overall_state, "NORMAL")
+        self.assertEqual(past.revision, 1)
+        now = self.state_manager.load_coach_state_as_of(datetime.now())
+        self.assertEqual(now.governance_status.overall_state, "BLOCKED")
+        self.assertEqual(self.state_manager.coach_history.stats()["segments"], 1)
+
 
 class TestGovernanceGates(unittest.TestCase):
     """Test governance gate checking."""
@@ -181,5 +585,300 @@ class TestGovernanceGates(unittest.TestCase):
         self.assertFalse(result["passing"])  # 150 > 60 * 2.0
 
 
+class TestGovernanceMemo(unittest.TestCase):
+    """Test memoized gate evaluation and the governance timeline."""
+    
+    def setUp(self):
+        """Set up test environment."""
+        now = datetime.now()
+        self.osl_path = Path(tempfile.mkdtemp()) / "osl"
+        self.coach_state = CoachState(
+            governance_thresholds=GovernanceThresholds(
+                calibration_gate=GovernanceThreshold(min=75, current=80, max=85, last_adjusted=now),
+                card_debt_multiplier=GovernanceThreshold(min=1.5, current=2.0, max=2.5, last_adjusted=now),
+                max_new_cards=GovernanceThreshold(min=4, current=8, max=10, last_adjusted=now),
+                interleaving_per_week=GovernanceThreshold(min=1, current=2, max=3, last_adjusted=now),
+            ),
+            governance_status=GovernanceStatus(
+                calibration_gate="passing",
+                card_debt_gate="passing",
+                transfer_gate="passing",
+                overall_state="NORMAL",
+            ),
+        )
+        metrics = self.coach_state.performance_metrics
+        metrics.avg_retrieval_7d = 82
+        metrics.interleaving_sessions_week = 2
+    
+    def _check(self):
+        from osl_cli.governance.gates import GovernanceChecker
+        
+        checker = GovernanceChecker(self.coach_state, self.osl_path, source="test")
+        return checker, checker.check_all_gates()
+    
+    def test_only_changed_gates_reevaluated(self):
+        """Test gates are re-run only when their own inputs change."""
+        checker, _ = self._check()
+        self.assertEqual(checker.memo.misses, 5)
+        
+        checker, _ = self._check()
+        self.assertEqual((checker.memo.hits, checker.memo.misses), (5, 0))
+        
+        self.coach_state.performance_metrics.cards_due = 500
+        checker, gates = self._check()
+        self.assertEqual((checker.memo.hits, checker.memo.misses), (4, 1))
+        self.assertFalse(gates["card_debt"]["passing"])
+    
+    def test_timeline_records_flips(self):
+        """Test the timeline gains an entry only when an outcome changes."""
+        from osl_cli.governance.timeline import GateTimeline
+        
+        self._check()
+        self._check()
+        self.coach_state.performance_metrics.avg_retrieval_7d = 70
+        self._check()
+        
+        entries = GateTimeline(self.osl_path).entries()
+        self.assertEqual([(e["from"], e["to"]) for e in entries],
+                         [(None, "NORMAL"), ("NORMAL", "BLOCKED")])
+        self.assertEqual(entries[1]["flipped"], ["calibration"])
+        self.assertEqual(entries[1]["reasons"]["calibration"]["inputs"]["avg_retrieval_7d"], 70)
+    
+    def test_concurrent_memos_keep_each_others_gates(self):
+        """Test a stale memo saves only the gates it re-evaluated."""
+        from osl_cli.governance.memo import GateMemo
+        
+        first, second = GateMemo(self.osl_path), GateMemo(self.osl_path)
+        first.evaluate("calibration", {"x": 1}, lambda: {"passing": True})
+        first.save()
+        second.evaluate("card_debt", {"y": 1}, lambda: {"passing": False})
+        second.save()
+        
+        reloaded = GateMemo(self.osl_path)
+        self.assertEqual(sorted(reloaded.data["gates"]), ["calibration", "card_debt"])
+
+
+class TestGovernanceBacktest(unittest.TestCase):
+    """Test vectorized threshold backtesting."""
+    
+    def setUp(self):
+        """Skip without the analysis extra."""
+        from osl_cli.governance import backtest
+        if backtest.np is None:
+            self.skipTest("numpy not installed")
+        self.bt = backtest
+    
+    def test_outcomes_match_gate_rules(self):
+        """Test per-day outcomes follow check_all_gates' blocking rules."""
+        np = self.bt.np
+        history = self.bt.DailyHistory(
+            days=[datetime(2026, 1, d).date() for d in range(1, 5)],
+            avg_retrieval_7d=np.array([np.nan, 70.0, 82.0, 82.0]),
+            cards_due=np.array([0, 0, 0, 200]),
+            interleaving_week=np.array([2, 2, 0, 2]),
+        )
+        result = self.bt.backtest(history, [80, 65], [2.0], [1, 3], throughput=60)
+        rows = {(r["calibration_gate"], r["interleaving_per_week"]): r for r in result.rows()}
+        
+        # Day 2 fails calibration at 80, day 4 fails card debt (200 > 120)
+        self.assertEqual(rows[(80, 1)]["blocked_days"], 2)
+        self.assertEqual(rows[(80, 1)]["remediation_days"], 1)  # day 3, no interleaving
+        self.assertEqual(rows[(65, 1)]["blocked_days"], 1)
+        self.assertEqual(rows[(65, 3)]["remediation_days"], 3)
+        self.assertEqual(rows[(65, 3)]["flips"], 1)
+    
+    def test_history_matches_card_store(self):
+        """Test replayed due counts agree with the stored schedules."""
+        from osl_cli.dev.synth import HistoryGenerator
+        from osl_cli.state.cards import CardStore
+        
+        end = datetime(2026, 1, 1)
+        output = Path(tempfile.mkdtemp())
+        HistoryGenerator(output, scale=0.25, years=0.25, end=end).generate()
+        base = output / "osl"
+        
+        history = self.bt.load_history(base, end=end.date())
+        self.assertEqual(history.days[-1], end.date())
+        self.assertEqual(int(history.cards_due[-1]), CardStore(base).due_count(end))
+
+
+class TestChangePoint(unittest.TestCase):
+    """Test streaming drop detection."""
+    
+    def setUp(self):
+        """Set up test environment."""
+        self.osl_path = Path(tempfile.mkdtemp()) / "osl"
+    
+    def test_page_hinkley_flags_drop_only(self):
+        """Test a stable stream never alarms and a sharp drop does."""
+        from osl_cli.governance.changepoint import PageHinkley, SIGNALS
+        
+        detector = PageHinkley(SIGNALS["retrieval"])
+        for i in range(500):
+            self.assertIsNone(detector.update(80 + (i % 5) - 2))
+        
+        alarms = [detector.update(50) for _ in range(20)]
+        self.assertTrue(any(alarms))
+        self.assertLess(alarms.index(next(a for a in alarms if a)), 10)
+    
+    def test_review_log_ingested_incrementally(self):
+        """Test answers are read once from the saved offset and alarm the drift gate."""
+        from osl_cli.governance.changepoint import ChangePointMonitor, raise_remediation
+        from osl_cli.governance.gates import GovernanceChecker
+        from osl_cli.review.runner import ReviewLog, AGAIN, GOOD
+        
+        log = ReviewLog(self.osl_path)
+        for i in range(200):
+            log.append({"type": "answer", "ts": datetime.now().isoformat(), "card_id": f"c{i}",
+                        "book_id": "book_a", "grade": GOOD})
+        monitor = ChangePointMonitor(self.osl_path)
+        self.assertEqual(monitor.ingest_review_log(), [])
+        monitor.save()
+        
+        for i in range(60):
+            log.append({"type": "answer", "ts": datetime.now().isoformat(), "card_id": f"c{i}",
+                        "book_id": "book_a", "grade": AGAIN})
+        monitor = ChangePointMonitor(self.osl_path)
+        alarms = monitor.ingest_review_log()
+        monitor.save()
+        self.assertEqual([a["book_id"] for a in alarms], ["book_a"])
+        self.assertEqual(monitor.data["review_offset"], log.log_path.stat().st_size)
+        self.assertEqual(ChangePointMonitor(self.osl_path).ingest_review_log(), [])
+        
+        now = datetime.now()
+        manager = StateManager(self.osl_path)
+        manager.save_coach_state(CoachState(
+            governance_thresholds=GovernanceThresholds(
+                calibration_gate=GovernanceThreshold(min=75, current=80, max=85, last_adjusted=now),
+                card_debt_multiplier=GovernanceThreshold(min=1.5, current=2.0, max=2.5, last_adjusted=now),
+                max_new_cards=GovernanceThreshold(min=4, current=8, max=10, last_adjusted=now),
+                interleaving_per_week=GovernanceThreshold(min=1, current=2, max=3, last_adjusted=now),
+            ),
+            governance_status=GovernanceStatus(
+                calibration_gate="passing", card_debt_gate="passing",
+                transfer_gate="passing", overall_state="NORMAL",
+            ),
+        ))
+        raise_remediation(self.osl_path, alarms)
+        state = manager.load_coach_state()
+        self.assertEqual(state.governance_status.overall_state, "REMEDIATION")
+        
+        state.performance_metrics.avg_retrieval_7d = 90
+        state.performance_metrics.interleaving_sessions_week = 3
+        gates = GovernanceChecker(state, self.osl_path).check_all_gates()
+        self.assertFalse(gates["drift"]["passing"])
+        self.assertEqual(state.governance_status.overall_state, "REMEDIATION")
+        
+        # Concurrent monitors keep each other's streams, alarms and clears
+        clearing, observing = ChangePointMonitor(self.osl_path), ChangePointMonitor(self.osl_path)
+        self.assertEqual(clearing.clear("book_a"), 1)
+        clearing.save()
+        observing.observe_retrieval("book_b", 80.0)
+        observing.save()
+        merged = ChangePointMonitor(self.osl_path)
+        self.assertEqual(merged.active_alarms(), [])
+        self.assertEqual(len(merged.data["alarms"]), 1)
+        self.assertIn("retrieval:book_b", merged.data["streams"])
+        self.assertIn("reviews:book_a", merged.data["streams"])
+
+
+def _add_questions(osl_path, book_id, count):
+    """Add questions from a separate process (see TestQuestionStore)."""
+    from osl_cli.state.questions import QuestionStore
+    
+    store = QuestionStore(Path(osl_path))
+    for i in range(count):
+        store.add(book_id, f"{book_id} question {i}?")
+
+
+class TestQuestionStore(unittest.TestCase):
+    """Test the persistent curiosity-question backlog."""
+    
+    def setUp(self):
+        """Set up test environment."""
+        from osl_cli.state.questions import QuestionStore
+        
+        self.osl_path = Path(tempfile.mkdtemp()) / "osl"
+        self.store = QuestionStore(self.osl_path)
+    
+    def test_ids_are_stable_across_instances(self):
+        """Test IDs are never reused across store instances."""
+        from osl_cli.state.questions import QuestionStore
+        
+        q1 = self.store.add("book_a", "Why?", session_id="s1")
+        q2 = QuestionStore(self.osl_path).add("book_b", "How?", session_id="s2")
+        
+        self.assertEqual(q1.id, 1)
+        self.assertEqual(q2.id, 2)
+        self.assertEqual(QuestionStore(self.osl_path).get(1).question, "Why?")
+    
+    def test_concurrent_writers_keep_all_records(self):
+        """Test processes adding at once lose no records and share no IDs."""
+        import multiprocessing
+        from osl_cli.state.questions import QuestionStore
+        
+        self.store.add("book_0", "Seen by a cached instance?")
+        workers = [
+            multiprocessing.Process(target=_add_questions, args=(str(self.osl_path), f"book_{i}", 25))
+            for i in range(4)
+        ]
+        for worker in workers:
+            worker.start()
+        for worker in workers:
+            worker.join()
+            self.assertEqual(worker.exitcode, 0)
+        
+        # The instance cached before the workers ran must not clobber them
+        self.store.add("book_0", "Added after?")
+        
+        reloaded = QuestionStore(self.osl_path)
+        ids = [q.id for b in reloaded.book_ids() for q in reloaded.list_book(b)]
+        self.assertEqual(len(ids), 102)
+        self.assertEqual(len(set(ids)), 102)
+        self.assertEqual(len(reloaded.index["locations"]), 102)
+        self.assertEqual(reloaded.index["next_id"], 103)
+        self.assertEqual(len(reloaded.list_book("book_0")), 27)
+    
+    def test_open_index_follows_resolution(self):
+        """Test open/resolved and page indexes update on resolve."""
+        from osl_cli.state.questions import QuestionStore
+        
+        q1 = self.store.add("book_a", "First", page_asked=10)
+        self.store.add("book_a", "Second", page_asked=12)
+        self.store.add("book_b", "Other book")
+        
+        self.store.resolve(q1.id, page=14, answer="Because")
+        
+        reloaded = QuestionStore(self.osl_path)
+        self.assertEqual([q.question for q in reloaded.list_open("book_a")], ["Second"])
+        self.assertEqual(len(reloaded.list_book("book_a")), 2)
+        self.assertEqual([q.id for q in reloaded.list_page("book_a", 14)], [q1.id])
+        self.assertEqual(reloaded.open_count("book_b"), 1)
+        self.assertEqual(reloaded.list_open("missing_book"), [])
+    
+    def test_similar_book_ids_get_separate_shards(self):
+        """Test IDs that sanitize alike don't share a shard, and old shards move."""
+        import shutil
+        from osl_cli.state.questions import QuestionStore
+        from osl_cli.state.store import legacy_shard_name, shard_name
+        
+        self.store.add("a/b", "Slash?")
+        self.store.add("a_b", "Underscore?")
+        self.assertNotEqual(shard_name("a/b"), shard_name("a_b"))
+        reloaded = QuestionStore(self.osl_path)
+        self.assertEqual([q.question for q in reloaded.list_book("a/b")], ["Slash?"])
+        self.assertEqual([q.question for q in reloaded.list_book("a_b")], ["Underscore?"])
+        
+        # A shard written under its pre-hash name is read, and moved on save
+        store_path = self.store.store_path
+        shutil.move(str(store_path / f"{shard_name('a_b')}.json"),
+                    str(store_path / f"{legacy_shard_name('a_b')}.json"))
+        reloaded = QuestionStore(self.osl_path)
+        self.assertEqual([q.question for q in reloaded.list_book("a_b")], ["Underscore?"])
+        reloaded.add("a_b", "Another?")
+        self.assertFalse((store_path / f"{legacy_shard_name('a_b')}.json").exists())
+        self.assertEqual(len(QuestionStore(self.osl_path).list_book("a_b")), 2)
+
+
 if __name__ == "__main__":
     unittest.main()
\ No newline at end of file
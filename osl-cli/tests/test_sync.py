@@ -0,0 +1,141 @@
+"""Tests for syncing OSL directories."""
+
+import tempfile
+import unittest
+from datetime import datetime
+from pathlib import Path
+
+from osl_cli.dev.synth import HistoryGenerator
+from osl_cli.review.runner import ReviewLog
+from osl_cli.state.manager import StateManager
+from osl_cli.state.questions import QuestionStore
+from osl_cli.state.schemas import SessionState as Session
+from osl_cli.state.sync import merge_counters, merge_logs, sync_dirs
+
+
+class TestSync(unittest.TestCase):
+    """Test two-way sync between a laptop and a workstation copy."""
+
+    def setUp(self):
+        """Generate one history and sync it into an empty directory."""
+        output = Path(tempfile.mkdtemp())
+        HistoryGenerator(output / "laptop", scale=0.25, years=0.05, seed=7,
+                         end=datetime(2026, 1, 1), vault=False).generate()
+        self.laptop = output / "laptop" / "osl"
+        self.desktop = output / "desktop" / "osl"
+        (self.desktop / "ai_state").mkdir(parents=True)
+        self.first = sync_dirs(self.laptop, self.desktop)
+
+    def test_first_sync_copies_and_second_is_a_no_op(self):
+        """Test an unchanged pair is recognised from the roots alone."""
+        self.assertTrue(self.first.pushed)
+        self.assertFalse(self.first.conflicts)
+        self.assertTrue((self.desktop / "ai_state" / "coach_state.json").exists())
+        self.assertFalse((self.desktop / "ai_state" / "sync" / "index.json").samefile(
+            self.laptop / "ai_state" / "sync" / "index.json"))
+
+        again = sync_dirs(self.desktop, self.laptop)
+        self.assertTrue(again.up_to_date)
+        self.assertEqual(again.hashed, 0)
+
+    def test_logs_and_records_merge_from_both_sides(self):
+        """Test appended log lines and new records reach both sides."""
+        for side, card_id in ((self.laptop, "a"), (self.desktop, "b")):
+            log = ReviewLog(side)
+            log.append({"type": "answer", "card_id": card_id, "grade": 3, "ts": "2026-01-02T09:00:00"})
+            log.mark_applied()
+        question = QuestionStore(self.laptop).add("book_0001", "Why does the gradient matter?")
+        (self.desktop / "obsidian").mkdir(exist_ok=True)
+        (self.desktop / "obsidian" / "note.md").write_text("Gradient note")
+
+        report = sync_dirs(self.laptop, self.desktop)
+        self.assertEqual(report.merged, ["ai_state/review_log.jsonl"])
+        self.assertEqual(report.pulled, ["obsidian/note.md"])
+        for side in (self.laptop, self.desktop):
+            card_ids = [entry["card_id"] for entry in ReviewLog(side).iter_since(datetime(2026, 1, 2))]
+            self.assertEqual(sorted(card_ids), ["a", "b"])
+            self.assertEqual(ReviewLog(side).applied_offset(),
+                             (side / "ai_state" / "review_log.jsonl").stat().st_size)
+        desktop_questions = QuestionStore(self.desktop)
+        self.assertEqual(desktop_questions.get(question.id).question, question.question)
+        self.assertEqual(desktop_questions.index["next_id"], question.id + 1)
+        self.assertTrue(sync_dirs(self.laptop, self.desktop).up_to_date)
+
+    def test_independently_allocated_ids_are_renumbered(self):
+        """Test questions given the same ID on both sides both survive."""
+        laptop, desktop = QuestionStore(self.laptop), QuestionStore(self.desktop)
+        contested = laptop.index["next_id"]
+        first = laptop.add("book_0001", "Asked on the laptop?")
+        other_book = desktop.add("book_0002", "Asked on the desktop?")
+        same_book = desktop.add("book_0001", "Also asked on the desktop?")
+        laptop.add("book_0001", "Asked on the laptop again?")
+        self.assertEqual((first.id, other_book.id, same_book.id),
+                         (contested, contested, contested + 1))
+        # The desktop's active session holds its copy under the old ID
+        now = datetime.now()
+        StateManager(self.desktop).save_current_session(Session(
+            session_id="s1", book_id="book_0002", book_title="Book", start_time=now,
+            last_activity=now, session_type="standard", curiosity_questions=[other_book]))
+
+        report = sync_dirs(self.laptop, self.desktop)
+        self.assertFalse(report.conflicts)
+        self.assertEqual(
+            [(entry["side"], entry["from"], entry["to"]) for entry in report.renumbered],
+            [("theirs", str(contested), str(contested + 2)),
+             ("ours", str(contested + 1), str(contested + 3))],
+        )
+        # The question created first keeps a contested ID
+        for side in (self.laptop, self.desktop):
+            store = QuestionStore(side)
+            self.assertEqual(store.get(contested).question, "Asked on the laptop?")
+            self.assertEqual(store.get(contested + 1).question, "Also asked on the desktop?")
+            self.assertEqual(store.get(contested + 2).question, "Asked on the desktop?")
+            self.assertEqual(store.get(contested + 2).id, contested + 2)
+            self.assertEqual(store.get(contested + 3).question, "Asked on the laptop again?")
+            self.assertEqual(store.index["next_id"], contested + 4)
+        self.assertEqual(QuestionStore(self.laptop).list_book("book_0001"),
+                         QuestionStore(self.desktop).list_book("book_0001"))
+        session = StateManager(self.desktop).load_current_session()
+        self.assertEqual([q.id for q in session.curiosity_questions], [contested + 2])
+        self.assertTrue(sync_dirs(self.laptop, self.desktop).up_to_date)
+
+    def test_coach_state_conflicts_are_detected(self):
+        """Test field-level merging, conflicts and --prefer."""
+        laptop, desktop = StateManager(self.laptop), StateManager(self.desktop)
+        state = laptop.load_coach_state()
+        state.performance_metrics.cards_due = 40
+        state.review_schedule.daily_review_time = "07:30"
+        laptop.save_coach_state(state)
+        state = desktop.load_coach_state()
+        state.performance_metrics.cards_due = 41
+        state.performance_metrics.total_permanent_notes = 12
+        desktop.save_coach_state(state)
+
+        report = sync_dirs(self.laptop, self.desktop)
+        self.assertEqual(report.conflicts,
+                         {"ai_state/coach_state.json": ["/performance_metrics/cards_due"]})
+        self.assertEqual(desktop.load_coach_state().performance_metrics.cards_due, 41)
+        self.assertFalse(sync_dirs(self.laptop, self.desktop).up_to_date)
+
+        report = sync_dirs(self.laptop, self.desktop, prefer="ours")
+        self.assertEqual(report.merged, ["ai_state/coach_state.json"])
+        for manager in (laptop, desktop):
+            merged = manager.load_coach_state()
+            self.assertEqual(merged.performance_metrics.cards_due, 40)
+            self.assertEqual(merged.performance_metrics.total_permanent_notes, 12)
+            self.assertEqual(merged.review_schedule.daily_review_time, "07:30")
+
+    def test_merge_helpers(self):
+        """Test log union and counter merging."""
+        ours, theirs = merge_logs(b"a\nb\nc\n", b"a\nb\nd\n")
+        self.assertEqual((ours, theirs), (b"a\nb\nc\nd\n", b"a\nb\nd\nc\n"))
+        self.assertEqual(merge_logs(b"a\n", b"a\nb\n"), (b"a\nb\n", b"a\nb\n"))
+        self.assertEqual(
+            merge_counters({"items": 10, "bins": [1, 2]}, {"items": 12, "bins": [2, 2]},
+                           {"items": 15, "bins": [1, 5]}),
+            {"items": 17, "bins": [2, 5]},
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,91 @@
+"""Tests for verification of parsed fields against raw input."""
+
+import json
+import random
+import tempfile
+import unittest
+from datetime import datetime
+from pathlib import Path
+
+from osl_cli.dev.synth import HistoryGenerator
+from osl_cli.validation.verifier import (
+    RawInputIndex,
+    SuffixArray,
+    fold,
+    substring_distance,
+    verify_archive,
+    verify_extraction,
+)
+
+
+class TestRawInputIndex(unittest.TestCase):
+    """Test containment queries against brute force."""
+
+    def test_suffix_array_queries(self):
+        """Test occurrences, including patterns longer than the sort prefix."""
+        rng = random.Random(7)
+        for _ in range(200):
+            text = "".join(rng.choice("ab ") for _ in range(rng.randint(0, 80)))
+            index = SuffixArray(text)
+            for _ in range(10):
+                pattern = "".join(rng.choice("ab ") for _ in range(rng.randint(1, 40)))
+                starts = [i for i in range(len(text)) if text.startswith(pattern, i)]
+                self.assertEqual(index.starts(pattern), starts)
+                self.assertEqual(pattern in index, bool(starts))
+
+    def test_fuzzy_distance_matches_dynamic_programming(self):
+        """Test the pigeonhole filter never misses a match within k edits."""
+        rng = random.Random(11)
+        words = "deep work has a maximum of four hours per day and needs total focus".split()
+        for _ in range(100):
+            text = " ".join(rng.choice(words) for _ in range(40))
+            start = rng.randint(0, len(text) - 30)
+            pattern = list(text[start:start + 30])
+            for _ in range(rng.randint(0, 5)):
+                pattern[rng.randrange(30)] = rng.choice("xyz")
+            pattern = fold("".join(pattern))
+            expected = substring_distance(pattern, fold(text), 3)
+            self.assertEqual(RawInputIndex(text).fuzzy_distance(pattern, 3), expected)
+
+    def test_verify_extraction(self):
+        """Test each result tier on the framework's examples."""
+        result = verify_extraction(
+            "dont forget the 4-hour maximum, deep work needs Total Focus",
+            {"type": "flashcard", "front": "What shouldn't you forget?",
+             "back": "4 hour maximum", "key_points": ["deep work needs", "total focus"]})
+        self.assertFalse(result["valid"])
+        self.assertEqual(result["field_results"], {
+            "front": "not_found",
+            "back": "fuzzy_match",
+            "key_points[0]": "exact_match",
+            "key_points[1]": "case_match",
+        })
+
+
+class TestArchiveVerification(unittest.TestCase):
+    """Test bulk re-verification of a synthetic archive."""
+
+    def test_tampered_key_point_is_found(self):
+        """Test synthetic key points verify and an edited one does not."""
+        output = Path(tempfile.mkdtemp())
+        HistoryGenerator(output, scale=0.25, years=0.1, seed=5,
+                         end=datetime(2026, 1, 1), vault=False).generate()
+        base = output / "osl"
+
+        report = verify_archive(base, workers=1)
+        self.assertGreater(report.fields, 0)
+        self.assertEqual(report.results["exact_match"], report.fields)
+
+        path = sorted((base / "ai_state" / "session_logs").glob("*.json"))[0]
+        session = json.loads(path.read_text())
+        session["micro_loops"][0]["recall_data"]["key_points"][0] = "A claim the learner never made"
+        path.write_text(json.dumps(session))
+
+        report = verify_archive(base, workers=2, batch_size=4)
+        self.assertEqual(report.results["not_found"], 1)
+        self.assertEqual(report.sessions_failing, 1)
+        self.assertEqual(report.examples["not_found"][0]["session_id"], session["session_id"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,265 @@
+"""Tests for the compiled workflow state machine."""
+
+import json
+import tempfile
+import unittest
+from datetime import datetime
+from pathlib import Path
+
+from osl_cli.dev.synth import HistoryGenerator
+from osl_cli.state.schemas import MicroLoop, SessionState as Session
+from osl_cli.validation import timers
+from osl_cli.validation.conformance import check_archive, session_violations
+from osl_cli.validation.workflow import (
+    OSLStateMachine,
+    SessionState,
+    TransitionHistory,
+    WorkflowEngine,
+)
+
+
+def make_session(state: str = "SESSION_INIT") -> Session:
+    now = datetime.now()
+    return Session(session_id="s1", book_id="b1", book_title="Book", start_time=now,
+                   last_activity=now, session_type="standard", state=state)
+
+
+class TestStateMachine(unittest.TestCase):
+    """Test the compiled table agrees with the transition dict."""
+
+    def test_table_matches_transitions(self):
+        """Test every pair of states is allowed exactly when listed."""
+        machine = OSLStateMachine()
+        for src in SessionState:
+            listed = OSLStateMachine.VALID_TRANSITIONS.get(src, [])
+            for dst in SessionState:
+                result = machine.check_transition(src, dst)
+                self.assertEqual(result.valid, dst in listed, f"{src} -> {dst}")
+
+    def test_shortest_path_and_reachability(self):
+        """Test path lookups, including around the micro-loop cycle."""
+        machine = OSLStateMachine()
+        path = machine.shortest_path(SessionState.TUTOR_QA_PENDING, SessionState.READING)
+        self.assertEqual(path[0], SessionState.TUTOR_QA_ACTIVE)
+        self.assertEqual(path[-2:], [SessionState.CARDS_COMPLETE, SessionState.READING])
+        self.assertTrue(machine.can_reach(SessionState.CARDS_COMPLETE, SessionState.CARDS_COMPLETE))
+        self.assertFalse(machine.can_reach(SessionState.SESSION_END, SessionState.READING))
+        self.assertEqual(machine.next_action(SessionState.READING),
+                         "Start free recall (osl microloop complete)")
+        self.assertIsNone(machine.next_action(SessionState.ARCHIVED))
+
+    def test_history_ring_buffer(self):
+        """Test the history keeps only the newest transitions."""
+        history = TransitionHistory(capacity=4)
+        for i in range(6):
+            history.append(i, i + 1, float(i))
+        self.assertEqual(len(history), 4)
+        self.assertEqual([(s, d) for s, d, _ in history], [(2, 3), (3, 4), (4, 5), (5, 6)])
+
+        machine = OSLStateMachine(history_size=2)
+        machine.validate_transition(SessionState.NONE, SessionState.SESSION_INIT)
+        machine.validate_transition(SessionState.SESSION_INIT, SessionState.READING)
+        machine.validate_transition(SessionState.READING, SessionState.RECALL_PENDING)
+        self.assertEqual([h["to"] for h in machine.transition_history],
+                         ["READING", "RECALL_PENDING"])
+
+
+class TestWorkflowEngine(unittest.TestCase):
+    """Test the engine the session commands drive."""
+
+    def test_advance_walks_bookkeeping_states(self):
+        """Test recall completion records every hop and its inputs."""
+        engine = WorkflowEngine()
+        session = make_session("READING")
+        context = {"recall_text": "word " * 60, "duration_seconds": 90, "text_hash": "ab"}
+        result = engine.advance(session, SessionState.RECALL_COMPLETE, context)
+
+        self.assertTrue(result.valid)
+        self.assertEqual(session.state, "RECALL_COMPLETE")
+        self.assertEqual([h["to"] for h in session.state_history],
+                         ["RECALL_PENDING", "RECALL_ACTIVE", "RECALL_COMPLETE"])
+        self.assertIs(session.state_history[-1]["context"], context)
+
+    def test_advance_refuses_skips(self):
+        """Test skipping a completion step leaves the session unchanged."""
+        engine = WorkflowEngine()
+        session = make_session("READING")
+        result = engine.advance(session, SessionState.CARDS_ACTIVE)
+        self.assertFalse(result.valid)
+        self.assertIn("RECALL_COMPLETE", result.error)
+        self.assertEqual(session.state, "READING")
+        self.assertEqual(session.state_history, [])
+
+        # Legacy coarse state; tutor Q&A is deferred, zero cards is a valid input
+        session = make_session("FEEDBACK")
+        result = engine.advance(session, SessionState.READING, {"pages_read": "5-9"},
+                                along={SessionState.CARDS_COMPLETE: {"cards_created": 0,
+                                                                    "from_misses": 0}})
+        self.assertTrue(result.valid, result.error)
+        self.assertEqual(session.state, "READING")
+
+
+class TestConformance(unittest.TestCase):
+    """Test the bulk conformance checker against synthetic violations."""
+
+    def test_finds_every_injected_violation(self):
+        """Test each injected session is flagged, serially and in a pool."""
+        output = Path(tempfile.mkdtemp())
+        summary = HistoryGenerator(output, scale=0.25, years=0.25, seed=3,
+                                   end=datetime(2026, 1, 1), violation_rate=0.3,
+                                   vault=False).generate()
+        injected = summary["counts"]["workflow_violations"]
+        self.assertGreater(injected, 0)
+
+        report = check_archive(output / "osl", workers=1)
+        self.assertEqual(report.checked - report.conforming, injected)
+        self.assertLessEqual({row["rule"] for row in report.rows()},
+                             {"transition", "recall_words", "required_inputs"})
+
+        pooled = check_archive(output / "osl", workers=2, batch_size=8)
+        self.assertEqual(pooled.violations, report.violations)
+        self.assertEqual(pooled.conforming, report.conforming)
+
+    def test_session_rules(self):
+        """Test broken sequences, forced ends and unfinished histories."""
+        history = [
+            {"from": "NONE", "to": "SESSION_INIT", "context": {"book_id": "b", "book_title": "t"}},
+            {"from": "READING", "to": "RECALL_PENDING", "context": None},
+            {"from": "RECALL_PENDING", "to": "SESSION_END",
+             "context": {"forced": True, "reason": "ended early"}},
+        ]
+        found = session_violations(history)
+        self.assertEqual(found, {"sequence": 1, "forced": 1})
+        self.assertEqual(session_violations(history[:2]), {"sequence": 1, "incomplete": 1})
+
+
+class TestPhaseTimers(unittest.TestCase):
+    """Test phase clocks and timeout enforcement."""
+
+    def setUp(self):
+        self.base = Path(tempfile.mkdtemp()) / "osl"
+
+    def backdate(self, key: str, seconds: float) -> None:
+        path = self.base / "ai_state" / "phase_timers.json"
+        data = json.loads(path.read_text())
+        data["timers"][key]["started"]["mono"] -= seconds
+        data["timers"][key]["started"]["wall"] -= seconds
+        path.write_text(json.dumps(data))
+
+    def test_timer_wheel(self):
+        """Test expiry, cancellation and deadlines beyond one turn."""
+        wheel = timers.TimerWheel(slots=8, tick=1.0, now=0.0)
+        wheel.schedule("a", 3.0)
+        wheel.schedule("b", 5.0)
+        wheel.schedule("far", 20.0)  # Shares a slot with "a" / "b" on later turns
+        wheel.schedule("gone", 4.0)
+        wheel.cancel("gone")
+
+        self.assertEqual(wheel.advance(2.0), [])
+        self.assertEqual(wheel.advance(4.0), ["a"])
+        self.assertEqual(wheel.advance(12.0), ["b"])
+        self.assertIn("far", wheel)
+        self.assertEqual(wheel.advance(20.0), ["far"])
+        self.assertEqual(len(wheel), 0)
+
+    def test_lazy_enforcement_fires_once(self):
+        """Test an overdue phase fires one event and one notice."""
+        self.assertEqual(timers.enforce(self.base), [])
+
+        phase_timers = timers.PhaseTimers(self.base)
+        phase_timers.start("s1", 1, "tutor")
+        phase_timers.save()
+        key = timers.PhaseTimers.key("s1", 1, "tutor")
+        self.backdate(key, timers.PHASE_LIMITS["tutor"] + 30)
+
+        notices = timers.enforce(self.base)
+        self.assertEqual([n["phase"] for n in notices], ["tutor"])
+        self.assertEqual(timers.enforce(self.base), [])
+
+        # Stopping after the timeout reports it without firing again
+        phase_timers = timers.PhaseTimers(self.base)
+        seconds, timed_out = phase_timers.stop("s1", 1, "tutor")
+        phase_timers.save()
+        self.assertTrue(timed_out)
+        self.assertGreater(seconds, timers.PHASE_LIMITS["tutor"])
+        events = (self.base / "ai_state" / "phase_events.jsonl").read_text().splitlines()
+        self.assertEqual([json.loads(e)["source"] for e in events], ["lazy"])
+        self.assertFalse((self.base / "ai_state" / "phase_timers.json").exists())
+
+    def test_engine_records_phase_durations(self):
+        """Test the engine starts and stops clocks as the session moves."""
+        engine = WorkflowEngine(timers=timers.PhaseTimers(self.base))
+        session = make_session("READING")
+        session.micro_loops.append(MicroLoop(loop_id=1, pages="1-5", chunk_type="standard",
+                                             start_time=datetime.now()))
+        engine.advance(session, SessionState.RECALL_ACTIVE)
+        self.assertIsNotNone(engine.timers.elapsed("s1", 1, "recall"))
+        engine.advance(session, SessionState.RECALL_COMPLETE,
+                       {"recall_text": "word " * 60, "duration_seconds": 1, "text_hash": "ab"})
+
+        loop = session.micro_loops[-1]
+        self.assertIn("recall", loop.phase_durations)
+        self.assertEqual(loop.timed_out, [])
+        self.assertIsNone(engine.timers.elapsed("s1", 1, "recall"))
+
+    def test_engine_resumes_missing_phase_clock(self):
+        """Test re-entering a phase with no running clock starts one."""
+        engine = WorkflowEngine(timers=timers.PhaseTimers(self.base))
+        session = make_session("RECALL")  # legacy name for RECALL_ACTIVE
+        session.micro_loops.append(MicroLoop(loop_id=1, pages="1-5", chunk_type="standard",
+                                             start_time=datetime.now()))
+        self.assertIsNone(engine.timers.elapsed("s1", 1, "recall"))
+
+        self.assertTrue(engine.advance(session, SessionState.RECALL_ACTIVE).valid)
+        self.assertIsNotNone(engine.timers.elapsed("s1", 1, "recall"))
+        self.assertEqual(session.state, "RECALL")
+
+
+class TestMicroloopCommand(unittest.TestCase):
+    """Test `osl microloop complete` against the workflow minimums."""
+
+    def setUp(self):
+        self.cwd = Path(tempfile.mkdtemp())
+        (self.cwd / "osl" / "ai_state").mkdir(parents=True)
+
+    def test_short_answers_are_extended_not_lost(self):
+        """Test a too-short recall or explanation re-prompts and keeps the text."""
+        import os
+        from click.testing import CliRunner
+        from osl_cli.main import cli
+        from osl_cli.state.manager import StateManager
+
+        session = make_session("READING")
+        session.micro_loops.append(MicroLoop(loop_id=1, pages="1-5", chunk_type="standard",
+                                             start_time=datetime.now()))
+        manager = StateManager(self.cwd / "osl")
+        manager.save_current_session(session)
+
+        answers = [
+            "Gradients point uphill", "",  # key points
+            "three word recall",  # refused: too short
+            " ".join(["more"] * 50),  # continuation
+            "7",  # confidence
+            "One sentence only.",  # refused: too brief
+            "Second sentence. Third sentence.",  # continuation
+            "", "",  # no analogies or examples
+        ]
+        cwd = os.getcwd()
+        os.chdir(self.cwd)
+        try:
+            result = CliRunner().invoke(cli, ["microloop", "complete"], input="\n".join(answers) + "\n")
+        finally:
+            os.chdir(cwd)
+
+        self.assertEqual(result.exit_code, 0, result.output)
+        self.assertIn("Recall text too short", result.output)
+        saved = StateManager(self.cwd / "osl").load_current_session()
+        self.assertEqual(saved.state, SessionState.TUTOR_QA_PENDING.value)
+        loop = saved.micro_loops[-1]
+        self.assertTrue(loop.recall_data.verbatim_recall.startswith("three word recall more"))
+        self.assertEqual(loop.feynman_explanation.explanation_text,
+                         "One sentence only. Second sentence. Third sentence.")
+
+
+if __name__ == "__main__":
+    unittest.main()